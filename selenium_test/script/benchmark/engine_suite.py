@@ -0,0 +1,374 @@
+# Python
+import argparse
+import base64
+import contextlib
+import json
+import os
+import platform
+import shutil
+import statistics
+import struct
+import sys
+import tempfile
+import time
+import zlib
+from datetime import datetime
+from typing import Callable
+from pathlib import Path
+
+# Selenium
+from selenium.webdriver.common.by import By
+from selenium.webdriver.common.action_chains import ActionChains
+
+# engine
+from script.engine.launch_profile import get_launch_profile
+from script.engine.path_manager import PathManager
+from script.engine.report_directory import ReportDirectory
+from script.engine.run_number_allocator import RunNumberAllocator
+from script.engine.save_screenshot import SaveScreenshot
+from script.engine.screenshot_pipeline import ScreenshotPipeline
+from script.engine.screenshot_store import ScreenshotStore
+from script.engine.text_report import TextReport
+
+# lib
+from script.lib import functions
+
+# tools
+from script.tools.webdriver_stub import CALENDAR_URL, HOME_URL, WebDriverStub
+
+BASELINE_PATH = Path(__file__).resolve().parent / 'engine_suite_baseline.json'
+
+# 性能劣化とみなさない所要時間の差（ミリ秒）
+NOISE_FLOOR_MS = 1.0
+
+# スクリーンショットの計測に使用する画像サイズ（幅, 高さ）
+SCREENSHOT_SIZES = [(640, 360), (1280, 720), (1920, 1080), (3840, 2160)]
+
+def parse_args(argv: list[str]) -> argparse.Namespace:
+    """
+    コマンドライン引数を解析する。
+
+    Args:
+        argv (list[str]): コマンドライン引数。
+
+    Returns:
+        argparse.Namespace: 解析結果。
+    """
+    parser = argparse.ArgumentParser(description='レポート・成果物出力部（TextReport、ReportDirectory、SaveScreenshot）'
+                                                 'と試験手順あたりのオーバーヘッドを計測する。')
+    parser.add_argument('--lines', type=int, default=20000, help='テキストレポートに追記する行数。')
+    parser.add_argument('--dir-counts', type=int, nargs='+', default=[10, 1000, 100000],
+                        help='連番払い出しの計測時に作成しておく既存の結果ディレクトリ数。')
+    parser.add_argument('--screenshots', type=int, default=20, help='画像サイズごとに保存するスクリーンショットの枚数。')
+    parser.add_argument('--iterations', type=int, default=20, help='試験手順のオーバーヘッドの計測回数。')
+    parser.add_argument('--output', type=Path, default=None, help='計測結果（JSON）の出力先。')
+    parser.add_argument('--baseline', type=Path, default=BASELINE_PATH, help='比較対象のベースライン（JSON）。')
+    parser.add_argument('--update-baseline', action='store_true', help='計測結果をベースラインとして保存する。')
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help='性能劣化とみなすベースラインからの変化率（0.2 なら 20%%）。')
+    return parser.parse_args(argv)
+
+def make_noise_png(width: int, height: int) -> bytes:
+    """
+    圧縮の効きにくい（実際のスクリーンショットより大きめの）PNG画像を生成する。
+
+    Args:
+        width (int): 幅。
+        height (int): 高さ。
+
+    Returns:
+        bytes: PNG画像のバイト列。
+    """
+    def chunk(chunk_type: bytes, data: bytes) -> bytes:
+        return struct.pack('>I', len(data)) + chunk_type + data + struct.pack('>I', zlib.crc32(chunk_type + data))
+
+    # 128行分のノイズを繰り返し、生成時間を抑えつつ行単位では圧縮しにくくする
+    rows = [b'\x00' + os.urandom(width * 3) for _ in range(128)]
+    raw = b''.join(rows[y % len(rows)] for y in range(height))
+    header = struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0)
+    return (b'\x89PNG\r\n\x1a\n' + chunk(b'IHDR', header)
+            + chunk(b'IDAT', zlib.compress(raw, 1)) + chunk(b'IEND', b''))
+
+class ScreenshotDriver:
+    """
+    決まったPNG画像を返すドライバーの代用品（スクリーンショット関連のメソッドのみ実装する）。
+    """
+    def __init__(self, png: bytes):
+        """
+        Args:
+            png (bytes): 返却するPNG画像。
+        """
+        self._png = png
+        self._png_base64 = base64.b64encode(png).decode('ascii')
+
+    def get_screenshot_as_base64(self) -> str:
+        return self._png_base64
+
+    def get_screenshot_as_png(self) -> bytes:
+        # Selenium と同様に、Base64文字列をデコードして返す
+        return base64.b64decode(self._png_base64.encode('ascii'))
+
+    def save_screenshot(self, filename: str) -> bool:
+        try:
+            with open(filename, 'wb') as f:
+                f.write(self.get_screenshot_as_png())
+        except OSError:
+            return False
+        return True
+
+def metric(value: float, unit: str, is_higher_better: bool) -> dict:
+    """
+    計測結果1件を表す辞書を生成する。
+
+    Args:
+        value (float): 計測値。
+        unit (str): 単位。
+        is_higher_better (bool): 値が大きいほど良いか否か。
+
+    Returns:
+        dict: 計測結果。
+    """
+    return {'value': value, 'unit': unit, 'higher_is_better': is_higher_better}
+
+def bench_text_report(work_dir_path: Path, lines: int, repeat: int=3) -> dict[str, dict]:
+    """
+    add_line_on_text_report の1秒あたりの追記行数を計測する（直接書き込み・バッファリングの両モード）。
+    揺らぎを抑えるため、repeat 回計測した中で最も良い値を採用する。
+
+    Args:
+        work_dir_path (Path): 作業ディレクトリのパス。
+        lines (int): 追記する行数。
+        repeat (int): 計測回数。Default to 3.
+
+    Returns:
+        dict[str, dict]: 計測結果。
+    """
+    results = {}
+    for label, is_buffered in [('direct', False), ('buffered', True)]:
+        samples = []
+        for i in range(repeat):
+            text_report = TextReport(work_dir_path / f'text_report_{label}_{i}', is_buffered=is_buffered)
+            text_report.make_text_report()
+            start = time.perf_counter()
+            for j in range(lines):
+                text_report.add_line_on_text_report(f'計測用の行 {j}', is_terminal=False)
+            text_report.close()
+            samples.append(lines / (time.perf_counter() - start))
+        results[f'text_report.{label}.lines_per_sec'] = metric(max(samples), 'lines/s', True)
+    return results
+
+def bench_allocation(work_dir_path: Path, dir_counts: list[int], repeat: int=20) -> dict[str, dict]:
+    """
+    既存の結果ディレクトリ数ごとに、結果ディレクトリの作成時間を計測する。
+    カウンタファイルがない状態（初回、'results' の走査あり）と、ある状態（2回目以降）を分けて計測する。
+
+    Args:
+        work_dir_path (Path): 作業ディレクトリのパス。
+        dir_counts (list[int]): 既存の結果ディレクトリ数の一覧。
+        repeat (int): 2回目以降の計測回数。Default to 20.
+
+    Returns:
+        dict[str, dict]: 計測結果。
+    """
+    results = {}
+    for dir_count in dir_counts:
+        test_dir_path = work_dir_path / f'allocation_{dir_count}'
+        results_dir_path = test_dir_path / 'results'
+        results_dir_path.mkdir(parents=True)
+        for i in range(1, dir_count + 1):
+            (results_dir_path / f'test_case_bench_{i}').mkdir()
+        report_directory = ReportDirectory(test_dir_path / 'test_case_bench.py')
+
+        start = time.perf_counter()
+        report_directory.get_directory_max_num()
+        results[f'allocation.{dir_count}.scan_ms'] = metric((time.perf_counter() - start) * 1000, 'ms', False)
+
+        samples = []
+        for _ in range(5):
+            # カウンタファイルを削除し、'results' の走査を伴う初回の払い出しを再現する
+            shutil.rmtree(results_dir_path / RunNumberAllocator.INDEX_DIR_NAME, ignore_errors=True)
+            start = time.perf_counter()
+            report_directory.make_result_directory()
+            samples.append((time.perf_counter() - start) * 1000)
+        results[f'allocation.{dir_count}.cold_ms'] = metric(statistics.median(samples), 'ms', False)
+
+        samples = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            report_directory.make_result_directory()
+            samples.append((time.perf_counter() - start) * 1000)
+        results[f'allocation.{dir_count}.warm_ms'] = metric(statistics.median(samples), 'ms', False)
+        shutil.rmtree(test_dir_path)
+    return results
+
+def bench_screenshot(work_dir_path: Path, count: int, repeat: int=3) -> dict[str, dict]:
+    """
+    画像サイズごとに、SaveScreenshot の保存スループットを計測する（同期・非同期・重複排除の各モード）。
+    揺らぎを抑えるため、repeat 回計測した中で最も良い値を採用する。
+
+    Args:
+        work_dir_path (Path): 作業ディレクトリのパス。
+        count (int): 画像サイズごとに保存する枚数。
+        repeat (int): 計測回数。Default to 3.
+
+    Returns:
+        dict[str, dict]: 計測結果。
+    """
+    results = {}
+    for width, height in SCREENSHOT_SIZES:
+        driver = ScreenshotDriver(make_noise_png(width, height))
+        for label in ['sync', 'async', 'store']:
+            samples = []
+            for _ in range(repeat):
+                output_dir_path = work_dir_path / f'screenshot_{width}x{height}_{label}'
+                output_dir_path.mkdir()
+                pipeline = ScreenshotPipeline() if label == 'async' else None
+                store = ScreenshotStore(work_dir_path / f'.store_{width}x{height}') if label == 'store' else None
+                save_screenshot = SaveScreenshot(PathManager(output_dir_path), pipeline, store)
+                start = time.perf_counter()
+                for i in range(count):
+                    save_screenshot.save(driver, f'screenshot_{i}', is_add_datetime=False)
+                if pipeline is not None:
+                    pipeline.close()
+                samples.append(count / (time.perf_counter() - start))
+                shutil.rmtree(output_dir_path)
+            results[f'screenshot.{width}x{height}.{label}.images_per_sec'] = metric(max(samples), 'images/s', True)
+    return results
+
+def run_steps(driver, report_dir_path: Path, text_report: TextReport) -> int:
+    """
+    テストケース（test_case_02）と同等の試験手順を実行する。
+
+    Args:
+        driver (webdriver.Remote): webdriver.Remoteインスタンス。
+        report_dir_path (Path): 結果ディレクトリのパス。
+        text_report (TextReport): TextReportインスタンス。
+
+    Returns:
+        int: 実行した手順数（procedure / expected_result の記入数）。
+    """
+    text_report.procedure('手順1.ページを開く')
+    functions.open_web_page(driver, report_dir_path=report_dir_path, url=HOME_URL, text_report=text_report)
+    text_report.expected_result('期待結果1.ページタイトルを確認する')
+    functions.confirm_page_title(driver, report_dir_path, text_report, 'web-pattern1(home) | portfolio')
+    text_report.procedure('手順2.マウスオーバーする')
+    ActionChains(driver).move_to_element(driver.find_element(By.XPATH, '//li[@class="subnavi"][2]')).perform()
+    functions.wait_for_element_visible(driver, By.LINK_TEXT, 'カレンダー', text_report=text_report)
+    text_report.procedure('手順3.リンクをクリックする')
+    functions.wait_for_element_clickable(driver, By.LINK_TEXT, 'カレンダー', text_report=text_report).click()
+    text_report.expected_result('期待結果3.URLとカレンダーの年月を確認する')
+    functions.confirm_url(driver, report_dir_path, text_report, CALENDAR_URL)
+    functions.get_calender_year_and_month(driver, report_dir_path, text_report)
+    return 5
+
+def bench_step_overhead(work_dir_path: Path, iterations: int) -> dict[str, dict]:
+    """
+    WebDriverスタブサーバー（遅延なし）に対して試験手順を実行し、手順あたりの所要時間とコマンド数を計測する。
+    ブラウザ側の処理時間を含まないため、フレームワーク自体のオーバーヘッドとなる。
+
+    Args:
+        work_dir_path (Path): 作業ディレクトリのパス。
+        iterations (int): 計測回数。
+
+    Returns:
+        dict[str, dict]: 計測結果。
+    """
+    with WebDriverStub() as stub:
+        os.environ['SELENIUM_HUB_URL'] = stub.url
+        driver = functions.generate_new_selenium_driver(get_launch_profile('default'))
+        samples = []
+        steps = 0
+        commands = sum(stub.command_counts.values())
+        try:
+            with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+                for i in range(iterations):
+                    report_dir_path = work_dir_path / f'steps_{i}'
+                    text_report = TextReport(report_dir_path)
+                    start = time.perf_counter()
+                    steps = run_steps(driver, report_dir_path, text_report)
+                    text_report.test_result(result='OK')
+                    samples.append((time.perf_counter() - start) * 1000 / steps)
+        finally:
+            driver.quit()
+        commands = (sum(stub.command_counts.values()) - commands - 1) / (iterations * steps)
+    return {'steps.ms_per_step': metric(statistics.median(samples), 'ms', False),
+            'steps.commands_per_step': metric(commands, 'commands', False)}
+
+def compare(results: dict[str, dict], baseline: dict[str, dict], threshold: float) -> list[str]:
+    """
+    計測結果をベースラインと比較し、性能劣化した項目を抽出する。
+
+    Args:
+        results (dict[str, dict]): 計測結果。
+        baseline (dict[str, dict]): ベースライン。
+        threshold (float): 性能劣化とみなす変化率。
+
+    Returns:
+        list[str]: 性能劣化した項目名の一覧。
+    """
+    regressions = []
+    print(f'{"項目":<48}  {"ベースライン":>12}  {"今回":>12}  変化率')
+    for name, result in results.items():
+        if name not in baseline or not baseline[name]['value']:
+            continue
+        base_value = baseline[name]['value']
+        change = (result['value'] - base_value) / base_value
+        # 値が大きいほど良い項目は減少を、小さいほど良い項目は増加を劣化とする
+        is_regression = -change > threshold if result['higher_is_better'] else change > threshold
+        if result['unit'] == 'ms' and abs(result['value'] - base_value) < NOISE_FLOOR_MS:
+            # 1ミリ秒未満の差は計測誤差とみなす
+            is_regression = False
+        if is_regression:
+            regressions.append(name)
+        print(f'{name:<48}  {base_value:>12.3f}  {result["value"]:>12.3f}  {change * 100:+.1f}%'
+              f'{"  ← 劣化" if is_regression else ""}')
+    return regressions
+
+def main(argv: list[str]) -> int:
+    """
+    全ての計測を実行し、結果の出力とベースラインとの比較を行う。
+
+    Args:
+        argv (list[str]): コマンドライン引数。
+
+    Returns:
+        int: 終了コード。ベースラインから性能劣化した項目があれば 1。
+    """
+    args = parse_args(argv)
+    benches: list[tuple[str, Callable[[Path], dict[str, dict]]]] = [
+        ('テキストレポート追記', lambda path: bench_text_report(path, args.lines)),
+        ('結果ディレクトリ作成', lambda path: bench_allocation(path, args.dir_counts)),
+        ('スクリーンショット保存', lambda path: bench_screenshot(path, args.screenshots)),
+        ('試験手順のオーバーヘッド', lambda path: bench_step_overhead(path, args.iterations)),
+    ]
+    results = {}
+    for label, bench in benches:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            start = time.perf_counter()
+            results.update(bench(Path(temp_dir)))
+            print(f'計測完了: {label}（{time.perf_counter() - start:.1f}秒）')
+
+    for name, result in results.items():
+        print(f'{name:<48}  {result["value"]:>12.3f} {result["unit"]}')
+    report = {'created_at': datetime.now().isoformat(timespec='seconds'),
+              'python': platform.python_version(),
+              'platform': platform.platform(),
+              'results': results}
+    if args.output is not None:
+        args.output.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding='utf-8')
+    if args.update_baseline:
+        args.baseline.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding='utf-8')
+        print(f'ベースラインを更新した: {args.baseline}')
+        return 0
+    if not args.baseline.is_file():
+        print(f'ベースラインがない（--update-baseline で作成できる）: {args.baseline}')
+        return 0
+
+    baseline = json.loads(args.baseline.read_text(encoding='utf-8'))['results']
+    print()
+    regressions = compare(results, baseline, args.threshold)
+    print(f'性能劣化: {len(regressions)} 件（しきい値 {args.threshold * 100:.0f}%）')
+    return 1 if regressions else 0
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,88 @@
+# Python
+import argparse
+import os
+import statistics
+import sys
+import time
+
+# engine
+from script.engine.launch_profile import PROFILES, get_launch_profile
+
+# lib
+from script.lib import functions
+
+def parse_args(argv: list[str]) -> argparse.Namespace:
+    """
+    コマンドライン引数を解析する。
+
+    Args:
+        argv (list[str]): コマンドライン引数。
+
+    Returns:
+        argparse.Namespace: 解析結果。
+    """
+    parser = argparse.ArgumentParser(description='起動プロファイルごとのセッション起動時間を計測する。')
+    parser.add_argument('profiles', nargs='*', default=None,
+                        help=f'計測する起動プロファイル（{" / ".join(PROFILES)}）。省略時は全プロファイル。')
+    parser.add_argument('-n', '--repeat', type=int, default=3, help='プロファイルごとの計測回数。')
+    parser.add_argument('--url', default='https://akira-umeda-dev.github.io/web-pattern1/index.html',
+                        help='ページ読み込み時間の計測に使用するURL。空文字の場合は計測しない。')
+    parser.add_argument('--hub-url', default=None,
+                        help='接続先のSelenium GridのURL（環境変数 SELENIUM_HUB_URL と同等）。')
+    return parser.parse_args(argv)
+
+def measure(profile_name: str, url: str) -> dict[str, float]:
+    """
+    1回分のセッション起動・最初のコマンド・ページ読み込み・終了の所要時間を計測する。
+
+    Args:
+        profile_name (str): 起動プロファイル名。
+        url (str): ページ読み込み時間の計測に使用するURL。空文字の場合は計測しない。
+
+    Returns:
+        dict[str, float]: 計測項目と所要時間（秒）。
+    """
+    start = time.perf_counter()
+    driver = functions.generate_new_selenium_driver(get_launch_profile(profile_name))
+    started = time.perf_counter()
+    try:
+        driver.execute_script('return 1;')
+        first_command = time.perf_counter()
+        if url:
+            driver.get(url)
+            functions.wait_for_page_load(driver)
+        loaded = time.perf_counter()
+    finally:
+        driver.quit()
+    return {'起動': started - start,
+            '最初のコマンドまで': first_command - start,
+            'ページ読み込み': loaded - first_command,
+            '終了': time.perf_counter() - loaded}
+
+def main(argv: list[str]) -> int:
+    """
+    起動プロファイルごとの所要時間を計測し、結果を出力する。
+
+    Args:
+        argv (list[str]): コマンドライン引数。
+
+    Returns:
+        int: 終了コード。
+    """
+    args = parse_args(argv)
+    for profile_name in args.profiles:
+        # 未定義のプロファイル名は計測前に検出する
+        get_launch_profile(profile_name)
+    if args.hub_url:
+        os.environ['SELENIUM_HUB_URL'] = args.hub_url
+    print(f'接続先: {functions.get_selenium_url()}  計測回数: {args.repeat}')
+    print('プロファイル  ' + '  '.join(f'{label}(秒)' for label in ['起動', '最初のコマンドまで', 'ページ読み込み', '終了']))
+    for profile_name in args.profiles or list(PROFILES):
+        samples = [measure(profile_name, args.url) for _ in range(args.repeat)]
+        columns = [f'{statistics.median([sample[key] for sample in samples]):.3f}' for key in samples[0]]
+        print(f'{profile_name}  ' + '  '.join(columns))
+    print('※ 各値は中央値')
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
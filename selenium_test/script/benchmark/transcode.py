@@ -0,0 +1,139 @@
+# Python
+import argparse
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# engine
+from script.engine.screenshot_transcoder import ScreenshotTranscoder
+
+RESULTS_DIR_PATH = Path(__file__).resolve().parent.parent / 'test' / 'results'
+
+def parse_args(argv: list[str]) -> argparse.Namespace:
+    """
+    コマンドライン引数を解析する。
+
+    Args:
+        argv (list[str]): コマンドライン引数。
+
+    Returns:
+        argparse.Namespace: 解析結果。
+    """
+    parser = argparse.ArgumentParser(description='スクリーンショット変換の削減バイト数とスループットを計測する。')
+    parser.add_argument('sources', nargs='*', type=Path,
+                        help='計測に使用するPNG画像またはディレクトリ。省略時は test/results 配下の全PNG。')
+    parser.add_argument('--format', dest='image_format', choices=['png', 'webp', 'jpeg'], default='webp',
+                        help='変換後の形式。')
+    parser.add_argument('--quality', type=int, default=None,
+                        help='非可逆圧縮時の品質（1〜100）。省略時は可逆圧縮（webp）。')
+    parser.add_argument('--workers', type=int, default=None, help='ワーカープロセス数（省略時はCPU数）。')
+    parser.add_argument('--no-thumbnail', action='store_true', help='サムネイルを生成しない。')
+    parser.add_argument('--synthetic', type=int, default=0,
+                        help='計測用に生成する疑似スクリーンショット（1920x1080）の枚数。')
+    return parser.parse_args(argv)
+
+def collect_sources(sources: list[Path]) -> list[Path]:
+    """
+    計測対象のPNG画像を収集する。
+
+    Args:
+        sources (list[Path]): PNG画像またはディレクトリのパス一覧。
+
+    Returns:
+        list[Path]: PNG画像のパス一覧。
+    """
+    png_paths = []
+    for source in sources:
+        if source.is_dir():
+            png_paths.extend(sorted(source.rglob('*.png')))
+        elif source.is_file():
+            png_paths.append(source)
+    return png_paths
+
+def make_synthetic_screenshots(count: int, output_dir: Path) -> list[Path]:
+    """
+    単色の領域とノイズ（文字や写真を模したもの）を含む疑似スクリーンショットを生成する。
+
+    Args:
+        count (int): 生成する枚数。
+        output_dir (Path): 保存先ディレクトリ。
+
+    Returns:
+        list[Path]: 生成したPNG画像のパス一覧。
+    """
+    from PIL import Image, ImageDraw
+
+    png_paths = []
+    rng = random.Random(0)
+    for i in range(count):
+        image = Image.new('RGB', (1920, 1080), (255, 255, 255))
+        draw = ImageDraw.Draw(image)
+        for _ in range(40):
+            x, y = rng.randrange(1800), rng.randrange(1000)
+            color = tuple(rng.randrange(256) for _ in range(3))
+            draw.rectangle((x, y, x + rng.randrange(20, 400), y + rng.randrange(10, 80)), fill=color)
+        noise = Image.effect_noise((480, 270), 64).convert('RGB')
+        image.paste(noise, (rng.randrange(1400), rng.randrange(800)))
+        path = output_dir / f'synthetic_{i:04d}.png'
+        image.save(path)
+        png_paths.append(path)
+    return png_paths
+
+def main(argv: list[str]) -> int:
+    """
+    スクリーンショット変換を計測し、結果を出力する。
+
+    Args:
+        argv (list[str]): コマンドライン引数。
+
+    Returns:
+        int: 終了コード。
+    """
+    args = parse_args(argv)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        temp_dir_path = Path(temp_dir)
+        input_dir_path = temp_dir_path / 'input'
+        input_dir_path.mkdir()
+        png_paths = collect_sources(args.sources or ([RESULTS_DIR_PATH] if RESULTS_DIR_PATH.is_dir() else []))
+        png_paths += make_synthetic_screenshots(args.synthetic, input_dir_path)
+        if not png_paths:
+            print('計測対象のPNG画像がない（--synthetic で疑似画像を生成できる）')
+            return 1
+
+        # 異なる結果ディレクトリの同名ファイルが衝突しないよう、連番のシンボリックリンク経由で変換する
+        link_paths = []
+        for i, png_path in enumerate(png_paths):
+            link_path = input_dir_path / f'{i:06d}.png'
+            if link_path != png_path:
+                link_path.symlink_to(png_path.resolve())
+            link_paths.append(link_path)
+
+        transcoder = ScreenshotTranscoder(image_format=args.image_format,
+                                          quality=args.quality if args.quality else 80,
+                                          is_lossless=args.quality is None,
+                                          thumbnail_size=None if args.no_thumbnail else (320, 180),
+                                          is_keep_source=True,
+                                          output_dir=temp_dir_path / 'output',
+                                          max_workers=args.workers)
+        start = time.perf_counter()
+        for link_path in link_paths:
+            transcoder.submit(link_path)
+        results = transcoder.close()
+        elapsed = time.perf_counter() - start
+
+    source_bytes = sum(result.source_bytes for result in results)
+    output_bytes = sum(result.output_bytes for result in results)
+    saved_bytes = source_bytes - output_bytes
+    print(f'形式: {args.image_format}（{"品質 " + str(args.quality) if args.quality else "可逆"}）')
+    print(f'画像数: {len(results)}')
+    print(f'変換前: {source_bytes:,} バイト')
+    print(f'変換後: {output_bytes:,} バイト')
+    print(f'削減量: {saved_bytes:,} バイト（{saved_bytes / source_bytes * 100:.1f}%）')
+    print(f'所要時間: {elapsed:.2f}秒')
+    print(f'スループット: {len(results) / elapsed:.1f} 枚/秒、{source_bytes / elapsed / 1024 / 1024:.1f} MB/秒（変換前換算）')
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
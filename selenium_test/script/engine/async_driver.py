@@ -0,0 +1,385 @@
+# Python
+import asyncio
+import base64
+import contextlib
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Optional
+
+# engine
+from script.engine.async_http import AsyncHttpPool
+from script.engine.step_tracer import StepTracer
+
+# W3C WebDriver の要素参照のキー
+ELEMENT_KEY = 'element-6066-11e4-a52e-4f735466cecf'
+
+# W3C WebDriver が直接対応していないロケータは、Selenium と同様にCSSセレクタへ変換する
+_CSS_LOCATORS = {
+    'id': '[id="{}"]',
+    'name': '[name="{}"]',
+    'class name': '.{}',
+}
+
+class AsyncWebDriverError(Exception):
+    """
+    WebDriver のコマンドが失敗した場合の例外。
+
+    Attributes:
+        error (str): W3C WebDriver のエラー名（例: 'no such element'）。
+        message (str): エラー内容。
+        status (int): HTTPステータスコード。
+    """
+    def __init__(self, error: str, message: str='', status: int=500):
+        """
+        Args:
+            error (str): W3C WebDriver のエラー名。
+            message (str): エラー内容。Default to ''.
+            status (int): HTTPステータスコード。Default to 500.
+        """
+        super().__init__(f'{error}: {message}' if message else error)
+        self.error = error
+        self.message = message
+        self.status = status
+
+@dataclass(frozen=True)
+class AsyncWebElement:
+    """
+    AsyncWebDriver で取得した要素への参照を保持するクラス（変更不可）。
+
+    Attributes:
+        driver (AsyncWebDriver): 要素を取得したセッション。
+        element_id (str): 要素の識別子。
+    """
+    driver: 'AsyncWebDriver'
+    element_id: str
+
+    def to_reference(self) -> dict[str, str]:
+        """
+        スクリプトの引数などに渡す要素参照を取得する。
+
+        Returns:
+            dict[str, str]: W3C WebDriver の要素参照。
+        """
+        return {ELEMENT_KEY: self.element_id}
+
+    async def click(self):
+        """
+        要素をクリックする。
+        """
+        await self.driver.execute('POST', f'/element/{self.element_id}/click', {})
+
+    async def text(self) -> str:
+        """
+        要素の表示テキストを取得する。
+
+        Returns:
+            str: 表示テキスト。
+        """
+        return await self.driver.execute('GET', f'/element/{self.element_id}/text')
+
+class AsyncWebDriver:
+    """
+    1つのWebDriverセッションを asyncio で操作するクラス。
+
+    webdriver.Remote と異なり、コマンドごとにスレッドを占有せず、応答待ちの間は他のセッションの処理に制御を譲る。
+    HTTP接続は AsyncHttpPool を通じて他のセッションと共有する。
+
+    Attributes:
+        http (AsyncHttpPool): コマンドの送信に使用する接続プール。
+        session_id (str): セッションID。
+        capabilities (dict): セッションのケイパビリティ。
+    """
+    def __init__(self, http: AsyncHttpPool, session_id: str, capabilities: dict):
+        """
+        Args:
+            http (AsyncHttpPool): コマンドの送信に使用する接続プール。
+            session_id (str): セッションID。
+            capabilities (dict): セッションのケイパビリティ。
+        """
+        self.http = http
+        self.session_id = session_id
+        self.capabilities = capabilities
+
+    @staticmethod
+    async def call(http: AsyncHttpPool, method: str, path: str, body: Optional[Any]=None) -> Any:
+        """
+        コマンドを送信し、応答の 'value' を取得する。
+
+        Args:
+            http (AsyncHttpPool): コマンドの送信に使用する接続プール。
+            method (str): HTTPメソッド。
+            path (str): パス（例: '/session'）。
+            body (Optional[Any]): リクエストボディ。Default to None.
+
+        Returns:
+            Any: 応答の 'value'。
+
+        Raises:
+            AsyncWebDriverError: コマンドが失敗した場合。
+        """
+        status, payload = await http.request(method, path, body)
+        value = payload.get('value') if isinstance(payload, dict) else None
+        if status >= 400 or (isinstance(value, dict) and 'error' in value):
+            value = value if isinstance(value, dict) else {}
+            raise AsyncWebDriverError(value.get('error', 'unknown error'), value.get('message', ''), status)
+        return value
+
+    @classmethod
+    async def start(cls, http: AsyncHttpPool, capabilities: dict) -> 'AsyncWebDriver':
+        """
+        新しいセッションを生成する。
+
+        Args:
+            http (AsyncHttpPool): コマンドの送信に使用する接続プール。
+            capabilities (dict): 要求するケイパビリティ（例: options.to_capabilities() の値）。
+
+        Returns:
+            AsyncWebDriver: 生成したセッション。
+        """
+        with StepTracer.trace('newSession', 'webdriver'):
+            value = await cls.call(http, 'POST', '/session',
+                                   {'capabilities': {'alwaysMatch': capabilities, 'firstMatch': [{}]}})
+        return cls(http, value['sessionId'], value.get('capabilities', {}))
+
+    async def execute(self, method: str, path: str, body: Optional[Any]=None) -> Any:
+        """
+        このセッションのコマンドを送信する。
+
+        Args:
+            method (str): HTTPメソッド。
+            path (str): セッションのURLからの相対パス（例: '/url'）。
+            body (Optional[Any]): リクエストボディ。Default to None.
+
+        Returns:
+            Any: 応答の 'value'。
+        """
+        with StepTracer.trace(f'{method} {path or "/"}', 'webdriver'):
+            return await self.call(self.http, method, f'/session/{self.session_id}{path}', body)
+
+    async def get(self, url: str):
+        """
+        URLを開く。
+
+        Args:
+            url (str): 遷移先URL。
+        """
+        await self.execute('POST', '/url', {'url': url})
+
+    async def title(self) -> str:
+        """
+        ページタイトルを取得する。
+
+        Returns:
+            str: ページタイトル。
+        """
+        return await self.execute('GET', '/title')
+
+    async def current_url(self) -> str:
+        """
+        現在のURLを取得する。
+
+        Returns:
+            str: URL。
+        """
+        return await self.execute('GET', '/url')
+
+    async def find_element(self, by: str, value: str) -> AsyncWebElement:
+        """
+        要素を1つ取得する。
+
+        Args:
+            by (str): ロケータの種類（例: By.XPATH）。
+            value (str): ロケータの値。
+
+        Returns:
+            AsyncWebElement: 要素。
+
+        Raises:
+            AsyncWebDriverError: 要素が見つからない場合（'no such element'）。
+        """
+        found = await self.execute('POST', '/element', self._locator(by, value))
+        return AsyncWebElement(self, found[ELEMENT_KEY])
+
+    async def find_elements(self, by: str, value: str) -> list[AsyncWebElement]:
+        """
+        要素を全て取得する。
+
+        Args:
+            by (str): ロケータの種類。
+            value (str): ロケータの値。
+
+        Returns:
+            list[AsyncWebElement]: 要素の一覧。見つからない場合は空。
+        """
+        found = await self.execute('POST', '/elements', self._locator(by, value))
+        return [AsyncWebElement(self, element[ELEMENT_KEY]) for element in found]
+
+    async def move_to_element(self, element: AsyncWebElement):
+        """
+        要素の中央へマウスを移動する（マウスオーバー）。
+
+        Args:
+            element (AsyncWebElement): 移動先の要素。
+        """
+        await self.execute('POST', '/actions', {'actions': [{
+            'type': 'pointer', 'id': 'mouse', 'parameters': {'pointerType': 'mouse'},
+            'actions': [{'type': 'pointerMove', 'duration': 250, 'x': 0, 'y': 0,
+                         'origin': element.to_reference()}]}]})
+
+    async def execute_script(self, script: str, *args: Any) -> Any:
+        """
+        スクリプトを実行する。
+
+        Args:
+            script (str): スクリプト。
+            *args (Any): スクリプトの引数（AsyncWebElement は要素参照に変換する）。
+
+        Returns:
+            Any: スクリプトの戻り値。
+        """
+        args = [arg.to_reference() if isinstance(arg, AsyncWebElement) else arg for arg in args]
+        return await self.execute('POST', '/execute/sync', {'script': script, 'args': args})
+
+    async def get_screenshot_as_base64(self) -> str:
+        """
+        スクリーンショットを取得する。
+
+        Returns:
+            str: PNG画像のBase64文字列。
+        """
+        return await self.execute('GET', '/screenshot')
+
+    async def get_screenshot_as_png(self) -> bytes:
+        """
+        スクリーンショットを取得する。
+
+        Returns:
+            bytes: PNG画像データ。
+        """
+        return base64.b64decode(await self.get_screenshot_as_base64())
+
+    async def maximize_window(self):
+        """
+        ウィンドウを最大化する。
+        """
+        await self.execute('POST', '/window/maximize', {})
+
+    async def quit(self):
+        """
+        セッションを終了する。
+        """
+        await self.execute('DELETE', '')
+
+    @staticmethod
+    def _locator(by: str, value: str) -> dict[str, str]:
+        """
+        ロケータを W3C WebDriver の形式に変換する。
+
+        Args:
+            by (str): ロケータの種類。
+            value (str): ロケータの値。
+
+        Returns:
+            dict[str, str]: 要素検索コマンドのリクエストボディ。
+        """
+        if by in _CSS_LOCATORS:
+            return {'using': 'css selector', 'value': _CSS_LOCATORS[by].format(value)}
+        return {'using': by, 'value': value}
+
+class AsyncWebDriverClient:
+    """
+    1プロセスから多数の AsyncWebDriver セッションを並行して操作するためのクライアント。
+
+    全てのセッションで1つの接続プールを共有し、同時に開くセッション数をセマフォで max_sessions 以下に制限する。
+    max_sessions を指定しない場合は、Selenium Grid の状態（/status）から求めたスロット数とする。
+
+    Attributes:
+        url (str): 接続先のURL（例: 'http://selenium:4444/wd/hub'）。
+        max_sessions (Optional[int]): 同時に開くセッション数の上限。open 前に未指定の場合は None。
+        http (AsyncHttpPool): 全セッションで共有する接続プール。
+        active_sessions (int): 使用中のセッション数。
+    """
+    def __init__(self, url: str, max_sessions: Optional[int]=None, max_connections: int=64,
+                 timeout: float=120.0):
+        """
+        Args:
+            url (str): 接続先のURL。
+            max_sessions (Optional[int]): 同時に開くセッション数の上限。Noneの場合はGridのスロット数（取得できなければ 1）。
+            max_connections (int): 同時に使用するHTTP接続数の上限。Default to 64.
+            timeout (float): 1コマンドあたりのタイムアウト秒数。Default to 120.0.
+        """
+        self.url = url
+        self.max_sessions = max_sessions
+        self.http = AsyncHttpPool(url, max_connections=max_connections, timeout=timeout)
+        self.active_sessions = 0
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._open_lock = asyncio.Lock()
+
+    async def get_grid_capacity(self) -> Optional[int]:
+        """
+        Selenium Grid の稼働中のノードのスロット数の合計を取得する。
+
+        Returns:
+            Optional[int]: スロット数。Grid 以外（スロットの情報がない）の場合や取得に失敗した場合は None。
+        """
+        try:
+            status = await AsyncWebDriver.call(self.http, 'GET', '/status')
+        except Exception:
+            return None
+        nodes = status.get('nodes') if isinstance(status, dict) else None
+        if not nodes:
+            return None
+        return sum(len(node.get('slots', [])) for node in nodes if node.get('availability', 'UP') == 'UP') or None
+
+    async def open(self) -> int:
+        """
+        同時に開くセッション数の上限を確定する。session から自動的に呼び出される。
+
+        Returns:
+            int: 同時に開くセッション数の上限。
+        """
+        async with self._open_lock:
+            if self._semaphore is None:
+                if self.max_sessions is None:
+                    self.max_sessions = await self.get_grid_capacity() or 1
+                self._semaphore = asyncio.Semaphore(self.max_sessions)
+        return self.max_sessions
+
+    @contextlib.asynccontextmanager
+    async def session(self, capabilities: dict) -> AsyncIterator[AsyncWebDriver]:
+        """
+        セッションを生成し、with ブロックを抜ける際に終了する。
+        使用中のセッション数が上限に達している場合は、空きが出るまで待機する。
+
+        Args:
+            capabilities (dict): 要求するケイパビリティ。
+
+        Yields:
+            AsyncWebDriver: 生成したセッション。
+        """
+        if self._semaphore is None:
+            await self.open()
+        async with self._semaphore:
+            driver = await AsyncWebDriver.start(self.http, capabilities)
+            self.active_sessions += 1
+            try:
+                yield driver
+            finally:
+                self.active_sessions -= 1
+                try:
+                    await driver.quit()
+                except Exception:
+                    # 終了に失敗したセッションは Grid 側のタイムアウトで回収される
+                    pass
+
+    async def close(self):
+        """
+        接続プールを終了する。
+        """
+        await self.http.close()
+
+    async def __aenter__(self) -> 'AsyncWebDriverClient':
+        await self.open()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
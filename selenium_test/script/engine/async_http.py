@@ -0,0 +1,247 @@
+# Python
+import asyncio
+import json
+import ssl
+from collections import deque
+from typing import Any, Optional
+from urllib.parse import urlsplit
+
+# 再送してよいメソッド（WebDriver のコマンドで使用するメソッドのうち冪等なもの）
+IDEMPOTENT_METHODS = frozenset({'GET', 'DELETE'})
+
+class AsyncHttpError(Exception):
+    """
+    HTTP通信（接続・送受信・応答の解析）に失敗した場合の例外。
+    """
+
+class _Connection:
+    """
+    keep-alive で使い回す1本の接続。
+
+    Attributes:
+        reader (asyncio.StreamReader): 受信用のストリーム。
+        writer (asyncio.StreamWriter): 送信用のストリーム。
+        is_reused (bool): 過去にリクエストを送信したことがあるか否か。
+    """
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """
+        Args:
+            reader (asyncio.StreamReader): 受信用のストリーム。
+            writer (asyncio.StreamWriter): 送信用のストリーム。
+        """
+        self.reader = reader
+        self.writer = writer
+        self.is_reused = False
+
+    def close(self):
+        """
+        接続を切断する。
+        """
+        self.writer.close()
+
+class AsyncHttpPool:
+    """
+    1つの接続先に対する HTTP/1.1 の keep-alive 接続を、複数のコルーチンで共有する接続プール。
+
+    WebDriver のエンドポイントとの JSON の送受信に必要な機能のみを asyncio のストリームで実装する。
+    応答を受信し終えた接続はプールに戻して次のリクエストで使い回し、同時に使用する接続数は
+    max_connections で制限する。待機中に相手側で切断された接続を使い回した場合は、応答を1バイトも受信しておらず、
+    かつ冪等なメソッド（GET / DELETE）の場合のみ別の接続で再送する。それ以外はリクエストが実行された可能性があるため再送しない。
+
+    Attributes:
+        base_url (str): 接続先のURL（例: 'http://selenium:4444/wd/hub'）。
+        max_connections (int): 同時に使用する接続数の上限。
+        max_idle (int): プールに保持する待機中の接続数の上限。
+        timeout (float): 1リクエストあたりのタイムアウト秒数。
+    """
+
+    def __init__(self, base_url: str, max_connections: int=32, max_idle: Optional[int]=None,
+                 timeout: float=120.0):
+        """
+        Args:
+            base_url (str): 接続先のURL。
+            max_connections (int): 同時に使用する接続数の上限。Default to 32.
+            max_idle (Optional[int]): プールに保持する待機中の接続数の上限。Noneの場合は max_connections と同じ。
+            timeout (float): 1リクエストあたりのタイムアウト秒数。Default to 120.0.
+        """
+        parts = urlsplit(base_url)
+        self.base_url = base_url
+        self.max_connections = max_connections
+        self.max_idle = max_connections if max_idle is None else max_idle
+        self.timeout = timeout
+        self._host = parts.hostname or 'localhost'
+        self._port = parts.port or (443 if parts.scheme == 'https' else 80)
+        self._ssl = ssl.create_default_context() if parts.scheme == 'https' else None
+        self._prefix = parts.path.rstrip('/')
+        self._host_header = parts.netloc
+        self._idle: deque[_Connection] = deque()
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._is_closed = False
+
+    async def request(self, method: str, path: str, body: Optional[Any]=None) -> tuple[int, Any]:
+        """
+        リクエストを送信し、JSONの応答を受信する。
+
+        Args:
+            method (str): HTTPメソッド。
+            path (str): base_url からの相対パス（例: '/session'）。
+            body (Optional[Any]): リクエストボディ（JSONに変換できる値）。Noneの場合はボディなし。
+
+        Returns:
+            tuple[int, Any]: ステータスコードと、JSONを解析した応答ボディ（ボディが空の場合は None）。
+
+        Raises:
+            AsyncHttpError: 接続・送受信・応答の解析に失敗した場合。
+            asyncio.TimeoutError: タイムアウトした場合。
+        """
+        if self._is_closed:
+            raise AsyncHttpError('接続プールは終了している')
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_connections)
+        data = json.dumps(body, ensure_ascii=False).encode('utf-8') if body is not None else b''
+        head = (f'{method} {self._prefix}{path} HTTP/1.1\r\n'
+                f'Host: {self._host_header}\r\n'
+                'Accept: application/json\r\n'
+                'Connection: keep-alive\r\n'
+                + ('Content-Type: application/json; charset=utf-8\r\n' if body is not None else '')
+                + f'Content-Length: {len(data)}\r\n\r\n').encode('ascii')
+
+        async with self._semaphore:
+            return await asyncio.wait_for(self._send(method, head + data), self.timeout)
+
+    async def _send(self, method: str, message: bytes) -> tuple[int, Any]:
+        """
+        接続を取得してリクエストを送信し、応答を受信する。
+
+        Args:
+            method (str): HTTPメソッド。
+            message (bytes): リクエスト（ヘッダーとボディ）。
+
+        Returns:
+            tuple[int, Any]: ステータスコードと応答ボディ。
+
+        Raises:
+            AsyncHttpError: 送受信に失敗し、再送できない場合。
+        """
+        while True:
+            connection = await self._acquire()
+            is_received = False
+            try:
+                connection.writer.write(message)
+                await connection.writer.drain()
+                status_line = await connection.reader.readuntil(b'\r\n')
+                is_received = True
+                status, headers, payload = await self._read_response(status_line, connection.reader)
+            except (ConnectionError, asyncio.IncompleteReadError) as e:
+                connection.close()
+                if isinstance(e, asyncio.IncompleteReadError) and e.partial:
+                    is_received = True
+                # 待機中に相手側が切断した接続で、応答を受信していない冪等なリクエストの場合のみ、新しい接続で再送する
+                if connection.is_reused and not is_received and method in IDEMPOTENT_METHODS:
+                    continue
+                reason = '（リクエストが実行された可能性があるため再送しない）' if connection.is_reused else ''
+                raise AsyncHttpError(f'{self.base_url} との通信に失敗した{reason}: {e!r}') from e
+            except BaseException:
+                connection.close()
+                raise
+            connection.is_reused = True
+            if headers.get('connection', '').lower() == 'close':
+                connection.close()
+            else:
+                self._release(connection)
+            try:
+                return status, json.loads(payload) if payload else None
+            except ValueError as e:
+                raise AsyncHttpError(f'JSONではない応答（ステータス {status}）: {payload[:200]!r}') from e
+
+    async def _acquire(self) -> _Connection:
+        """
+        待機中の接続を取り出す。なければ新しく接続する。
+
+        Returns:
+            _Connection: 接続。
+        """
+        while self._idle:
+            connection = self._idle.pop()
+            if not connection.reader.at_eof():
+                return connection
+            connection.close()
+        try:
+            reader, writer = await asyncio.open_connection(self._host, self._port, ssl=self._ssl)
+        except OSError as e:
+            raise AsyncHttpError(f'{self.base_url} に接続できない: {e!r}') from e
+        return _Connection(reader, writer)
+
+    def _release(self, connection: _Connection):
+        """
+        応答を受信し終えた接続をプールに戻す。上限を超える場合は切断する。
+
+        Args:
+            connection (_Connection): 接続。
+        """
+        if self._is_closed or len(self._idle) >= self.max_idle:
+            connection.close()
+        else:
+            self._idle.append(connection)
+
+    @staticmethod
+    async def _read_response(status_line: bytes,
+                             reader: asyncio.StreamReader) -> tuple[int, dict[str, str], bytes]:
+        """
+        ステータス行に続く応答のヘッダー・ボディを受信する。Content-Length と chunked 形式に対応する。
+
+        Args:
+            status_line (bytes): 受信済みのステータス行。
+            reader (asyncio.StreamReader): 受信用のストリーム。
+
+        Returns:
+            tuple[int, dict[str, str], bytes]: ステータスコード、ヘッダー（名前は小文字）、ボディ。
+        """
+        try:
+            status = int(status_line.split(b' ', 2)[1])
+        except (IndexError, ValueError):
+            raise AsyncHttpError(f'不正なステータス行: {status_line!r}')
+        headers = {}
+        while True:
+            line = await reader.readuntil(b'\r\n')
+            if line == b'\r\n':
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+        if headers.get('transfer-encoding', '').lower() == 'chunked':
+            chunks = []
+            while True:
+                size = int((await reader.readuntil(b'\r\n')).split(b';')[0], 16)
+                if size == 0:
+                    # トレーラーを読み飛ばす
+                    while await reader.readuntil(b'\r\n') != b'\r\n':
+                        pass
+                    return status, headers, b''.join(chunks)
+                chunks.append(await reader.readexactly(size))
+                await reader.readexactly(2)
+        if 'content-length' not in headers:
+            # 長さの指定がない場合は切断までをボディとし、接続は使い回さない
+            headers['connection'] = 'close'
+            return status, headers, await reader.read()
+        return status, headers, await reader.readexactly(int(headers['content-length']))
+
+    async def close(self):
+        """
+        待機中の接続を全て切断する。以降のリクエストは失敗する。
+        """
+        self._is_closed = True
+        while self._idle:
+            connection = self._idle.pop()
+            connection.close()
+            try:
+                await connection.writer.wait_closed()
+            except (ConnectionError, OSError):
+                pass
+
+    async def __aenter__(self) -> 'AsyncHttpPool':
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
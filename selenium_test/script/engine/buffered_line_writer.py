@@ -0,0 +1,104 @@
+# Python
+import atexit
+import threading
+import weakref
+from pathlib import Path
+
+# 生成済みの全ライターを保持し、インタプリタ終了時にまとめてフラッシュする
+_writers = weakref.WeakSet()
+
+class BufferedLineWriter:
+    """
+    行単位の書き込みをメモリ上にバッファリングし、バックグラウンドスレッドでファイルへ追記するクラス。
+
+    行数または経過時間がしきい値に達した時点でまとめて書き込むことで、
+    1行ごとのファイルオープン・クローズを削減する。書き込み順序は追記した順序のまま保持される。
+
+    Attributes:
+        path (Path): 書き込み先ファイルのパス。
+        flush_lines (int): 書き込みを行うバッファ行数のしきい値。
+        flush_interval (float): 書き込みを行う経過時間のしきい値（秒）。
+        encoding (str): 書き込み時の文字コード。
+    """
+    def __init__(self, path: Path, flush_lines: int=100, flush_interval: float=1.0, encoding: str='utf-8'):
+        """
+        Args:
+            path (Path): 書き込み先ファイルのパス。
+            flush_lines (int): 書き込みを行うバッファ行数のしきい値。Default to 100.
+            flush_interval (float): 書き込みを行う経過時間のしきい値（秒）。Default to 1.0.
+            encoding (str): 書き込み時の文字コード。Default to 'utf-8'.
+        """
+        self.path = path
+        self.flush_lines = flush_lines
+        self.flush_interval = flush_interval
+        self.encoding = encoding
+        self._pending = []
+        self._condition = threading.Condition()
+        self._io_lock = threading.Lock()
+        self._is_closed = False
+        self._thread = threading.Thread(target=self._run, name=f'BufferedLineWriter-{path.name}', daemon=True)
+        self._thread.start()
+        _writers.add(self)
+
+    def write(self, line: str):
+        """
+        1行をバッファに追加する。クローズ済みの場合は即座に書き込む。
+
+        Args:
+            line (str): 書き込む文字列（改行なし）。
+        """
+        with self._condition:
+            self._pending.append(line)
+            is_closed = self._is_closed
+            if len(self._pending) >= self.flush_lines:
+                self._condition.notify()
+        if is_closed:
+            self.flush()
+
+    def flush(self):
+        """
+        バッファ内の全行をファイルへ書き込む。書き込み完了まで呼び出し元をブロックする。
+        """
+        with self._io_lock:
+            with self._condition:
+                lines, self._pending = self._pending, []
+            if not lines:
+                return
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self.path.open(mode='a', encoding=self.encoding) as f:
+                f.write(''.join(f'{line}\n' for line in lines))
+
+    def close(self):
+        """
+        バックグラウンドスレッドを停止し、バッファ内の全行を書き込む。
+        """
+        with self._condition:
+            if self._is_closed:
+                return
+            self._is_closed = True
+            self._condition.notify()
+        if self._thread is not threading.current_thread():
+            self._thread.join()
+        self.flush()
+
+    def _run(self):
+        """
+        バックグラウンドスレッドの処理。しきい値に達するかクローズされるまで待機し、バッファを書き込む。
+        """
+        while True:
+            with self._condition:
+                self._condition.wait_for(
+                    lambda: len(self._pending) >= self.flush_lines or self._is_closed,
+                    timeout=self.flush_interval)
+                is_closed = self._is_closed
+            self.flush()
+            if is_closed:
+                return
+
+@atexit.register
+def _close_all_writers():
+    """
+    インタプリタ終了時に、未書き込みの行が残っている全ライターをクローズする。
+    """
+    for writer in list(_writers):
+        writer.close()
@@ -0,0 +1,136 @@
+# Python
+import ast
+import os
+import threading
+from dataclasses import dataclass
+from types import CodeType
+from typing import TYPE_CHECKING, Any, Callable, Optional
+from pathlib import Path
+
+if TYPE_CHECKING:
+    # Selenium（型注釈のみに使用し、ランナーのメインプロセスでは読み込まない）
+    from selenium import webdriver
+
+# engine
+from script.engine.text_report import TextReport
+
+# エントリーポイント形式のスクリプトを読み込む際のモジュール名（'__main__' 以外とし、実行部を走らせない）
+CASE_MODULE_NAME = '__selenium_test_case__'
+
+@dataclass
+class CaseContext:
+    """
+    エントリーポイント形式のテストケース（main(ctx)）に渡す実行コンテキスト。
+    結果ディレクトリ・テキストレポート・ドライバーの準備と後片付けはフレームワーク側で行う。
+
+    Attributes:
+        script_path (Path): テストケーススクリプトのパス。
+        report_dir_path (Path): 結果ディレクトリのパス。
+        text_report (TextReport): TextReportインスタンス。
+        driver (Optional[webdriver.Remote]): webdriver.Remoteインスタンス。生成前は None。
+    """
+    script_path: Path
+    report_dir_path: Path
+    text_report: TextReport
+    driver: Optional['webdriver.Remote'] = None
+
+@dataclass
+class LoadedCase:
+    """
+    読み込み済みのテストケーススクリプトを保持するクラス。
+
+    Attributes:
+        script_path (Path): テストケーススクリプトのパス。
+        code (CodeType): コンパイル済みのコード。
+        main (Optional[Callable[[CaseContext], Any]]): エントリーポイント（main(ctx)）。
+            従来形式（読み込み時に本体が走る）のスクリプトの場合は None。
+    """
+    script_path: Path
+    code: CodeType
+    main: Optional[Callable[[CaseContext], Any]] = None
+
+class CaseLoader:
+    """
+    テストケーススクリプトを読み込み、コンパイル結果とエントリーポイントをキャッシュするクラス。
+
+    トップレベルに第1引数が 'ctx' の main 関数を持つスクリプトをエントリーポイント形式とみなす。
+    エントリーポイント形式のスクリプトはモジュールとして1度だけ実行し、main を繰り返し呼び出せるようにする。
+    従来形式のスクリプトはコンパイル結果のみをキャッシュし、実行のたびに '__main__' として実行する。
+    スクリプトが更新された場合（更新時刻が変わった場合）は読み込み直す。
+    """
+    def __init__(self):
+        self._cache: dict[Path, tuple[int, LoadedCase]] = {}
+        self._lock = threading.Lock()
+
+    def load(self, script_path: Path) -> LoadedCase:
+        """
+        テストケーススクリプトを読み込む。未更新であればキャッシュを返す。
+
+        Args:
+            script_path (Path): テストケーススクリプトのパス。
+
+        Returns:
+            LoadedCase: 読み込み済みのテストケーススクリプト。
+        """
+        script_path = script_path.resolve()
+        mtime_ns = os.stat(script_path).st_mtime_ns
+        with self._lock:
+            cached = self._cache.get(script_path)
+            if cached is not None and cached[0] == mtime_ns:
+                return cached[1]
+
+            source = script_path.read_bytes()
+            tree = ast.parse(source, filename=str(script_path))
+            code = compile(tree, str(script_path), 'exec')
+            loaded = LoadedCase(script_path=script_path, code=code)
+            if self.is_entry_point(tree):
+                namespace = self.new_globals(script_path, CASE_MODULE_NAME)
+                exec(code, namespace)
+                loaded.main = namespace['main']
+            self._cache[script_path] = (mtime_ns, loaded)
+            return loaded
+
+    def run_legacy(self, loaded: LoadedCase) -> dict[str, Any]:
+        """
+        従来形式のスクリプトを '__main__' として実行する。
+
+        Args:
+            loaded (LoadedCase): 読み込み済みのテストケーススクリプト。
+
+        Returns:
+            dict[str, Any]: 実行後のグローバル変数。
+        """
+        namespace = self.new_globals(loaded.script_path, '__main__')
+        exec(loaded.code, namespace)
+        return namespace
+
+    @staticmethod
+    def is_entry_point(tree: ast.Module) -> bool:
+        """
+        スクリプトがエントリーポイント形式（トップレベルに main(ctx) または async def main(ctx) を持つ）か判定する。
+
+        Args:
+            tree (ast.Module): スクリプトの構文木。
+
+        Returns:
+            bool: エントリーポイント形式であれば True。
+        """
+        for node in tree.body:
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) and node.name == 'main':
+                args = node.args.posonlyargs + node.args.args
+                return bool(args) and args[0].arg == 'ctx'
+        return False
+
+    @staticmethod
+    def new_globals(script_path: Path, module_name: str) -> dict[str, Any]:
+        """
+        スクリプトを実行するためのグローバル変数を生成する。
+
+        Args:
+            script_path (Path): テストケーススクリプトのパス。
+            module_name (str): モジュール名（__name__ の値）。
+
+        Returns:
+            dict[str, Any]: グローバル変数。
+        """
+        return {'__name__': module_name, '__file__': str(script_path), '__builtins__': __builtins__}
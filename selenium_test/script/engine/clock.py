@@ -0,0 +1,196 @@
+# Python
+import threading
+import time
+from datetime import datetime
+from typing import Optional, Union
+from zoneinfo import ZoneInfo
+
+class Clock:
+    """
+    日時の取得と整形を一元的に行うクラス。
+
+    タイムゾーンはクラスで1つだけ保持し、呼び出しごとに生成しない。
+    秒単位の書式（'%f' を含まない書式）は、書式ごとに直近の1秒分の整形結果を保持し、
+    同じ秒の間は strftime を再実行しない。
+    ファイル名に付加する日時は、同じ名前に対して同じ日時が重なった場合に連番を付けて衝突を避ける。
+
+    Attributes:
+        timezone (ZoneInfo): 日時のタイムゾーン。
+    """
+    TIMEZONE = ZoneInfo('Asia/Tokyo')
+    REPORT_FORMAT = '%Y-%m-%d %H:%M:%S'
+    FILE_STAMP_FORMAT = '%Y%m%d_%H%M%S'
+
+    # 連番の管理対象とする名前の上限（超えた場合は古い日時の記録を破棄する）
+    MAX_STAMP_KEYS = 1024
+
+    def __init__(self, timezone: Optional[ZoneInfo]=None):
+        """
+        Args:
+            timezone (Optional[ZoneInfo]): 日時のタイムゾーン。Noneの場合は日本時間。
+        """
+        self.timezone = timezone or self.TIMEZONE
+        self._format_cache: dict[str, tuple[int, str]] = {}
+        self._stamps: dict[str, tuple[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def time(self) -> float:
+        """
+        現在の時刻をエポック秒で取得する。
+
+        Returns:
+            float: エポック秒。
+        """
+        return time.time()
+
+    def monotonic(self) -> float:
+        """
+        経過時間の計測に使用する単調増加の時刻を取得する。
+
+        Returns:
+            float: 秒。
+        """
+        return time.perf_counter()
+
+    def now(self) -> datetime:
+        """
+        現在の日時を取得する。
+
+        Returns:
+            datetime: タイムゾーン付きの日時。
+        """
+        return datetime.fromtimestamp(self.time(), self.timezone)
+
+    def format(self, datetime_format: str=REPORT_FORMAT) -> str:
+        """
+        現在の日時を整形する。秒単位の書式は同じ秒の間は前回の整形結果を返す。
+
+        Args:
+            datetime_format (str): 日付と時刻のフォーマット。Default to 'YYYY-MM-DD HH:MM:SS'.
+
+        Returns:
+            str: 整形した日時。
+        """
+        timestamp = self.time()
+        if '%f' in datetime_format:
+            return datetime.fromtimestamp(timestamp, self.timezone).strftime(datetime_format)
+
+        second = int(timestamp // 1)
+        cached = self._format_cache.get(datetime_format)
+        if cached is not None and cached[0] == second:
+            return cached[1]
+        text = datetime.fromtimestamp(second, self.timezone).strftime(datetime_format)
+        self._format_cache[datetime_format] = (second, text)
+        return text
+
+    def isoformat(self, timespec: str='seconds') -> str:
+        """
+        現在の日時をISO 8601形式で取得する。
+
+        Args:
+            timespec (str): 時刻の精度（'seconds' / 'milliseconds' など）。Default to 'seconds'.
+
+        Returns:
+            str: ISO 8601形式の日時（例: '2025-08-01T09:00:00+09:00'）。
+        """
+        return self.now().isoformat(timespec=timespec)
+
+    def file_stamp(self, key: str, datetime_format: str=FILE_STAMP_FORMAT) -> str:
+        """
+        ファイル名に付加する日時を取得する。
+        同じ key に対して前回と同じ日時になった場合は、'_2'、'_3' … の連番を付けて重複を避ける。
+        秒未満まで区別したい場合は、書式に '%f'（マイクロ秒）を含める。
+
+        Args:
+            key (str): 重複を判定する名前（例: 保存先のパス）。
+            datetime_format (str): 日付と時刻のフォーマット。Default to 'YYYYMMDD_HHMMSS'.
+
+        Returns:
+            str: 日時（重複した場合は連番付き）。
+        """
+        stamp = self.format(datetime_format)
+        with self._lock:
+            last = self._stamps.get(key)
+            count = last[1] + 1 if last is not None and last[0] == stamp else 1
+            if last is None and len(self._stamps) >= self.MAX_STAMP_KEYS:
+                self._stamps = {name: value for name, value in self._stamps.items() if value[0] == stamp}
+            self._stamps[key] = (stamp, count)
+        return stamp if count == 1 else f'{stamp}_{count}'
+
+class FakeClock(Clock):
+    """
+    任意の時刻を返す試験用の Clock。
+    時刻は advance で進めるか、tick を指定して取得のたびに自動で進める。
+
+    Attributes:
+        timestamp (float): 現在の時刻（エポック秒）。
+        tick (float): 時刻を取得するたびに進める秒数。
+    """
+
+    def __init__(self, start: Union[datetime, float]=0.0, tick: float=0.0, timezone: Optional[ZoneInfo]=None):
+        """
+        Args:
+            start (Union[datetime, float]): 開始時刻（日時またはエポック秒）。Default to 0.0.
+            tick (float): 時刻を取得するたびに進める秒数。Default to 0.0.
+            timezone (Optional[ZoneInfo]): 日時のタイムゾーン。Noneの場合は日本時間。
+        """
+        super().__init__(timezone)
+        if isinstance(start, datetime):
+            start = (start if start.tzinfo is not None else start.replace(tzinfo=self.timezone)).timestamp()
+        self.timestamp = float(start)
+        self.tick = tick
+
+    def time(self) -> float:
+        """
+        現在の時刻を取得し、tick 秒進める。
+
+        Returns:
+            float: エポック秒。
+        """
+        timestamp = self.timestamp
+        self.timestamp += self.tick
+        return timestamp
+
+    def monotonic(self) -> float:
+        """
+        現在の時刻を単調増加の時刻として返す（時刻は進めない）。
+
+        Returns:
+            float: 秒。
+        """
+        return self.timestamp
+
+    def advance(self, seconds: float):
+        """
+        時刻を進める。
+
+        Args:
+            seconds (float): 進める秒数。
+        """
+        self.timestamp += seconds
+
+# プロセス全体で共有する Clock
+_clock = Clock()
+
+def get_clock() -> Clock:
+    """
+    共有の Clock を取得する。
+
+    Returns:
+        Clock: Clockインスタンス。
+    """
+    return _clock
+
+def set_clock(clock: Clock) -> Clock:
+    """
+    共有の Clock を差し替える（試験で FakeClock を使用する場合など）。
+
+    Args:
+        clock (Clock): 新しい Clockインスタンス。
+
+    Returns:
+        Clock: 差し替え前の Clockインスタンス。
+    """
+    global _clock
+    previous, _clock = _clock, clock
+    return previous
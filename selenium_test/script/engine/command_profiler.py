@@ -0,0 +1,273 @@
+# Python
+import json
+import math
+import sys
+import threading
+import time
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Optional
+from pathlib import Path
+
+# Selenium
+from selenium import webdriver
+
+# 呼び出し元の関数として扱うモジュール（この中の公開関数を呼び出し元として記録する）
+HELPER_MODULE = 'script.lib.functions'
+
+# ヒストグラムの区間の上限（ミリ秒）
+HISTOGRAM_BOUNDS_MS = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000]
+
+@dataclass
+class CommandRecord:
+    """
+    WebDriverコマンド1回分の計測結果を保持するクラス。
+
+    Attributes:
+        command (str): コマンド名（例: 'getTitle'）。
+        helper (str): コマンドを発行した関数名。
+        latency (float): 往復の所要時間（秒）。
+        request_bytes (int): リクエストのペイロードのバイト数。
+        response_bytes (int): レスポンスの値のバイト数。
+    """
+    command: str
+    helper: str
+    latency: float
+    request_bytes: int
+    response_bytes: int
+
+class CommandProfiler:
+    """
+    WebDriverのコマンド実行（リモート接続の往復）を計測するクラス。
+
+    install でドライバーのコマンド実行部（command_executor）をラップし、activate 中の
+    インスタンスにコマンド名・往復時間・ペイロードサイズ・発行元の関数を記録する。
+    計測結果はヒストグラムと「所要時間の大きいコマンド上位N件」のレポートとして出力する。
+
+    Attributes:
+        name (str): プロファイル名（テストケースの結果ディレクトリ名など）。
+    """
+    _current: ContextVar[Optional['CommandProfiler']] = ContextVar('current_command_profiler', default=None)
+
+    def __init__(self, name: str):
+        """
+        Args:
+            name (str): プロファイル名。
+        """
+        self.name = name
+        self._records = []
+        self._lock = threading.Lock()
+
+    @classmethod
+    def current(cls) -> Optional['CommandProfiler']:
+        """
+        使用中の CommandProfiler を取得する。
+
+        Returns:
+            Optional[CommandProfiler]: CommandProfilerインスタンス。設定されていない場合は None。
+        """
+        return cls._current.get()
+
+    def activate(self):
+        """
+        このインスタンスを使用中の CommandProfiler として設定する。
+        """
+        self._current.set(self)
+
+    def deactivate(self):
+        """
+        このインスタンスが使用中であれば、設定を解除する。
+        """
+        if self._current.get() is self:
+            self._current.set(None)
+
+    @classmethod
+    def install(cls, driver: webdriver.Remote):
+        """
+        ドライバーのコマンド実行部をラップし、使用中の CommandProfiler に計測結果を記録させる。
+        同じドライバーに対して複数回呼び出しても、ラップは1度だけ行う。
+
+        Args:
+            driver (webdriver.Remote): webdriver.Remoteインスタンス。
+        """
+        executor = driver.command_executor
+        if getattr(executor, '_is_profiled', False):
+            return
+        original_execute = executor.execute
+
+        def execute(command: str, params: dict) -> Any:
+            profiler = cls._current.get()
+            if profiler is None:
+                return original_execute(command, params)
+            return profiler.record(command, params, original_execute)
+
+        executor.execute = execute
+        executor._is_profiled = True
+
+    def record(self, command: str, params: dict, execute: Callable[[str, dict], Any]) -> Any:
+        """
+        コマンドを実行し、計測結果を記録する。
+
+        Args:
+            command (str): コマンド名。
+            params (dict): コマンドのパラメータ。
+            execute (Callable[[str, dict], Any]): 元のコマンド実行関数。
+
+        Returns:
+            Any: コマンドのレスポンス。
+        """
+        helper = self.find_helper()
+        start = time.perf_counter()
+        response = execute(command, params)
+        latency = time.perf_counter() - start
+        value = response.get('value') if isinstance(response, dict) else response
+        record = CommandRecord(command=command,
+                               helper=helper,
+                               latency=latency,
+                               request_bytes=len(json.dumps(params, ensure_ascii=False).encode('utf-8')),
+                               response_bytes=len(json.dumps(value, ensure_ascii=False, default=str).encode('utf-8')))
+        with self._lock:
+            self._records.append(record)
+        return response
+
+    @staticmethod
+    def find_helper() -> str:
+        """
+        呼び出し履歴を遡り、コマンドを発行した関数を特定する。
+        functions モジュールの公開関数を優先し、なければSelenium外の最初の呼び出し元とする。
+
+        Returns:
+            str: 関数名（functions モジュール外の場合は 'ファイル名:関数名'）。
+        """
+        frame = sys._getframe(1)
+        helper = None
+        fallback = None
+        while frame is not None:
+            module = frame.f_globals.get('__name__', '')
+            name = frame.f_code.co_name
+            if module == HELPER_MODULE:
+                if not name.startswith(('_', '<')) and name != 'wrapper':
+                    helper = name
+            elif not module.startswith(('selenium', 'urllib3', __name__, 'script.engine')):
+                if fallback is None:
+                    fallback = f'{Path(frame.f_code.co_filename).stem}:{name}'
+                if helper is not None:
+                    break
+            frame = frame.f_back
+        return helper or fallback or '(不明)'
+
+    @property
+    def records(self) -> list[CommandRecord]:
+        """
+        記録済みの計測結果の一覧を取得する。
+
+        Returns:
+            list[CommandRecord]: 計測結果の一覧（記録順）。
+        """
+        with self._lock:
+            return list(self._records)
+
+    def report_lines(self, top_n: int=10) -> list[str]:
+        """
+        コマンド別の集計、発行元の関数別の集計、ヒストグラム、上位N件のレポートを生成する。
+
+        Args:
+            top_n (int): 所要時間の大きいコマンドの表示件数。Default to 10.
+
+        Returns:
+            list[str]: レポートの各行。
+        """
+        records = self.records
+        total = sum(record.latency for record in records)
+        lines = [f'===== WebDriverコマンドプロファイル: {self.name} =====',
+                 f'コマンド数: {len(records)}  合計: {total:.3f}秒',
+                 '',
+                 '--- コマンド別 ---',
+                 '回数  合計(秒)  平均(ms)  p50(ms)  p95(ms)  最大(ms)  送信(B)  受信(B)  コマンド']
+        for command, group in self._group_by(records, lambda record: record.command):
+            latencies = sorted(record.latency * 1000 for record in group)
+            lines.append(f'{len(group)}  {sum(latencies) / 1000:.3f}  {sum(latencies) / len(latencies):.1f}  '
+                         f'{self._percentile(latencies, 50):.1f}  {self._percentile(latencies, 95):.1f}  '
+                         f'{latencies[-1]:.1f}  {sum(record.request_bytes for record in group)}  '
+                         f'{sum(record.response_bytes for record in group)}  {command}')
+
+        lines += ['', '--- 発行元の関数別 ---', '回数  合計(秒)  関数']
+        for helper, group in self._group_by(records, lambda record: record.helper):
+            lines.append(f'{len(group)}  {sum(record.latency for record in group):.3f}  {helper}')
+
+        lines += ['', '--- 往復時間のヒストグラム ---']
+        counts = [0] * (len(HISTOGRAM_BOUNDS_MS) + 1)
+        for record in records:
+            counts[self._bucket(record.latency * 1000)] += 1
+        max_count = max(counts) if records else 0
+        for i, count in enumerate(counts):
+            label = f'< {HISTOGRAM_BOUNDS_MS[i]}ms' if i < len(HISTOGRAM_BOUNDS_MS) else f'>= {HISTOGRAM_BOUNDS_MS[-1]}ms'
+            bar = '#' * math.ceil(count / max_count * 40) if count else ''
+            lines.append(f'{label:>10}  {count:5d}  {bar}')
+
+        lines += ['', f'--- 所要時間の大きいコマンド 上位{top_n}件 ---', '所要(ms)  コマンド  関数']
+        for record in sorted(records, key=lambda record: record.latency, reverse=True)[:top_n]:
+            lines.append(f'{record.latency * 1000:.1f}  {record.command}  {record.helper}')
+        return lines
+
+    def export(self, report_dir_path: Path, top_n: int=10):
+        """
+        レポート（command_profile.txt）と計測結果（command_profile.json）を出力する。
+
+        Args:
+            report_dir_path (Path): 出力先ディレクトリのパス。
+            top_n (int): 所要時間の大きいコマンドの表示件数。Default to 10.
+        """
+        report_dir_path.mkdir(parents=True, exist_ok=True)
+        (report_dir_path / 'command_profile.txt').write_text('\n'.join(self.report_lines(top_n)) + '\n',
+                                                             encoding='utf-8')
+        with (report_dir_path / 'command_profile.json').open(mode='w', encoding='utf-8') as f:
+            json.dump([asdict(record) for record in self.records], f, ensure_ascii=False)
+
+    @staticmethod
+    def _group_by(records: list[CommandRecord], key: Callable[[CommandRecord], str]) -> list[tuple[str, list[CommandRecord]]]:
+        """
+        計測結果をキーごとにまとめ、合計所要時間の大きい順に並べる。
+
+        Args:
+            records (list[CommandRecord]): 計測結果の一覧。
+            key (Callable[[CommandRecord], str]): まとめる際のキーを返す関数。
+
+        Returns:
+            list[tuple[str, list[CommandRecord]]]: キーと計測結果の一覧の組。
+        """
+        groups = {}
+        for record in records:
+            groups.setdefault(key(record), []).append(record)
+        return sorted(groups.items(), key=lambda item: sum(record.latency for record in item[1]), reverse=True)
+
+    @staticmethod
+    def _percentile(sorted_values: list[float], percent: float) -> float:
+        """
+        昇順に並べた値からパーセンタイル値（最近傍法）を取得する。
+
+        Args:
+            sorted_values (list[float]): 昇順に並べた値。
+            percent (float): パーセント（0〜100）。
+
+        Returns:
+            float: パーセンタイル値。
+        """
+        index = max(0, math.ceil(len(sorted_values) * percent / 100) - 1)
+        return sorted_values[index]
+
+    @staticmethod
+    def _bucket(latency_ms: float) -> int:
+        """
+        往復時間に対応するヒストグラムの区間番号を取得する。
+
+        Args:
+            latency_ms (float): 往復時間（ミリ秒）。
+
+        Returns:
+            int: 区間番号。
+        """
+        for i, bound in enumerate(HISTOGRAM_BOUNDS_MS):
+            if latency_ms < bound:
+                return i
+        return len(HISTOGRAM_BOUNDS_MS)
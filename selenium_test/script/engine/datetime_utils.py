@@ -1,10 +1,10 @@
 # Python
 import traceback
-from datetime import datetime
+from typing import Optional
 from pathlib import Path
-from zoneinfo import ZoneInfo
 
 # engine
+from script.engine.clock import Clock, get_clock
 from script.engine.text_report import TextReport 
 
 class DatetimeUtils:
@@ -22,13 +22,15 @@ class DatetimeUtils:
         pass
 
     @classmethod
-    def get_now_datetime(cls, text_report: TextReport, is_comment: bool=True) -> tuple[str, str, str, str, str, str, str]:
+    def get_now_datetime(cls, text_report: TextReport, is_comment: bool=True,
+                         clock: Optional[Clock]=None) -> tuple[str, str, str, str, str, str, str]:
         """
         現在の年月日時刻を取得する。
 
         Args:
             text_report (TextReport): TextReportインスタンス。
             is_comment (bool): 「現在の日付時刻」コメント出力判定フラグ. Default to True.
+            clock (Optional[Clock]): 日時の取得に使用するインスタンス。Noneの場合は共有の Clock。
 
         Returns:
             tuple[str, str, str, str, str, str, str]: 以下の7つの文字列を含むタプル。
@@ -41,7 +43,7 @@ class DatetimeUtils:
                 - second: 秒（例: '00'）
         """
 
-        now = datetime.now(ZoneInfo('Asia/Tokyo')).strftime('%Y-%m-%d %H:%M:%S')
+        now = (clock or get_clock()).format(Clock.REPORT_FORMAT)
         year, month, date = now.split(' ')[0].split('-')
         hour, minute, second = now.split(' ')[1].split(':')
         if is_comment: text_report.comment(f'現在の日付時刻: {now}')
@@ -0,0 +1,212 @@
+# Python
+import heapq
+import json
+import os
+import statistics
+import tempfile
+from datetime import datetime
+from typing import Optional
+from pathlib import Path
+
+# engine
+from script.engine.clock import get_clock
+from script.engine.results_retention import ResultsRetention
+
+class DurationHistory:
+    """
+    テストケースごとの過去の所要時間を記録し、次回の所要時間を予測するクラス。
+
+    所要時間は指数移動平均（EWMA）で保持し、直近の実行ほど重く反映する。
+    記録は 'results/.run_index/durations.json' に保存し、実行をまたいで引き継ぐ。
+    記録がない場合は、過去の結果ディレクトリ（trace.json またはテキストレポートの時刻）から再構築できる。
+    予測値を用いて、所要時間の長いテストケースから順に実行する順序（longest-job-first）の決定と、
+    ワーカー・ノード間で予測所要時間が均等になるような分割（シャーディング）を行う。
+
+    Attributes:
+        results_dir_path (Path): 'results'ディレクトリのパス。
+        history_path (Path): 記録ファイルのパス。
+        alpha (float): 指数移動平均の平滑化係数（0〜1、大きいほど直近の実行を重視する）。
+        default_duration (float): 記録が1件もない場合に使用する予測所要時間（秒）。
+    """
+    HISTORY_FILE_NAME = 'durations.json'
+
+    def __init__(self, results_dir_path: Path, alpha: float=0.3, default_duration: float=60.0):
+        """
+        Args:
+            results_dir_path (Path): 'results'ディレクトリのパス。
+            alpha (float): 指数移動平均の平滑化係数。Default to 0.3.
+            default_duration (float): 記録が1件もない場合に使用する予測所要時間（秒）。Default to 60.0.
+        """
+        self.results_dir_path = results_dir_path
+        self.history_path = results_dir_path / '.run_index' / self.HISTORY_FILE_NAME
+        self.alpha = alpha
+        self.default_duration = default_duration
+        self._entries = self._load()
+
+    def _load(self) -> dict[str, dict]:
+        """
+        記録ファイルを読み込む。存在しない、または壊れている場合は空とする。
+
+        Returns:
+            dict[str, dict]: テストケース名と記録の辞書。
+        """
+        try:
+            with self.history_path.open(encoding='utf-8') as f:
+                entries = json.load(f)
+            return entries if isinstance(entries, dict) else {}
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def save(self):
+        """
+        記録ファイルを一時ファイル経由で置き換え、途中まで書き込まれた状態を残さない。
+        """
+        self.history_path.parent.mkdir(parents=True, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=self.history_path.parent, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(self._entries, f, ensure_ascii=False, indent=2, sort_keys=True)
+            os.replace(temp_path, self.history_path)
+        except BaseException:
+            Path(temp_path).unlink(missing_ok=True)
+            raise
+
+    def record(self, test_case: str, elapsed: float):
+        """
+        テストケースの所要時間を記録する（保存は save で行う）。
+
+        Args:
+            test_case (str): テストケース名。
+            elapsed (float): 所要時間（秒）。
+        """
+        entry = self._entries.get(test_case)
+        if entry is None:
+            entry = {'ewma': elapsed, 'count': 0}
+        else:
+            entry['ewma'] = self.alpha * elapsed + (1 - self.alpha) * entry['ewma']
+        entry['count'] += 1
+        entry['last'] = elapsed
+        entry['updated_at'] = get_clock().isoformat(timespec='seconds')
+        self._entries[test_case] = entry
+
+    def rebuild(self) -> int:
+        """
+        過去の結果ディレクトリから所要時間を読み取り、記録を作り直す。
+        OKで終了した実行のみを、連番の古い順に記録する。
+
+        Returns:
+            int: 記録した実行数。
+        """
+        self._entries = {}
+        runs = sorted(ResultsRetention(self.results_dir_path).iter_runs(), key=lambda run: (run.test_case, run.num))
+        count = 0
+        for run in runs:
+            if run.result != 'OK':
+                continue
+            elapsed = self.read_elapsed(run.path)
+            if elapsed is not None:
+                self.record(run.test_case, elapsed)
+                count += 1
+        return count
+
+    @staticmethod
+    def read_elapsed(run_dir_path: Path) -> Optional[float]:
+        """
+        結果ディレクトリから実行の所要時間を読み取る。
+        trace.json があれば最後の区間の終了時刻を、なければテキストレポートの最初と最後の行の時刻差を使用する。
+
+        Args:
+            run_dir_path (Path): 結果ディレクトリのパス。
+
+        Returns:
+            Optional[float]: 所要時間（秒）。読み取れない場合は None。
+        """
+        trace_path = run_dir_path / 'trace.json'
+        try:
+            with trace_path.open(encoding='utf-8') as f:
+                events = json.load(f).get('traceEvents', [])
+            if events:
+                return max(event['ts'] + event['dur'] for event in events) / 1e6
+        except (FileNotFoundError, ValueError, KeyError, TypeError):
+            pass
+
+        text_report_path = run_dir_path / f'{run_dir_path.name}.txt'
+        first = last = None
+        try:
+            with text_report_path.open(encoding='utf-8', errors='replace') as f:
+                for line in f:
+                    try:
+                        timestamp = datetime.strptime(line[:19], '%Y-%m-%d %H:%M:%S')
+                    except ValueError:
+                        # エラー内容（トレースバック）の行など、時刻で始まらない行は読み飛ばす
+                        continue
+                    first = first or timestamp
+                    last = timestamp
+        except FileNotFoundError:
+            return None
+        return (last - first).total_seconds() if first is not None else None
+
+    def predict(self, test_case: str) -> float:
+        """
+        テストケースの所要時間を予測する。
+        記録がない場合は、記録済みのテストケースの予測値の中央値（記録が1件もなければ default_duration）とする。
+
+        Args:
+            test_case (str): テストケース名。
+
+        Returns:
+            float: 予測所要時間（秒）。
+        """
+        entry = self._entries.get(test_case)
+        if entry is not None:
+            return entry['ewma']
+        if self._entries:
+            return statistics.median(entry['ewma'] for entry in self._entries.values())
+        return self.default_duration
+
+    def schedule(self, script_paths: list[Path]) -> list[Path]:
+        """
+        予測所要時間の長い順（同じ場合はファイル名順）に並べ替える。
+
+        Args:
+            script_paths (list[Path]): テストケーススクリプトのパス一覧。
+
+        Returns:
+            list[Path]: 並べ替えたパス一覧。
+        """
+        return sorted(script_paths, key=lambda path: (-self.predict(path.stem), path.name))
+
+    def shard(self, script_paths: list[Path], shard_count: int) -> list[list[Path]]:
+        """
+        予測所要時間の合計が均等になるよう、テストケースを shard_count 個に分割する。
+        長いテストケースから順に、その時点で合計が最小の分割先へ割り当てる（LPT法）。
+        記録ファイルが同じであれば、どのノードで実行しても同じ分割結果となる。
+
+        Args:
+            script_paths (list[Path]): テストケーススクリプトのパス一覧。
+            shard_count (int): 分割数。
+
+        Returns:
+            list[list[Path]]: 分割ごとのパス一覧（各分割内は予測所要時間の長い順）。
+        """
+        shards = [[] for _ in range(shard_count)]
+        heap = [(0.0, index) for index in range(shard_count)]
+        for path in self.schedule(script_paths):
+            total, index = heapq.heappop(heap)
+            shards[index].append(path)
+            heapq.heappush(heap, (total + self.predict(path.stem), index))
+        return shards
+
+    def estimate_makespan(self, script_paths: list[Path], workers: int) -> float:
+        """
+        schedule の順に、空いたワーカーへ順次割り当てた場合の全体の所要時間を見積もる。
+
+        Args:
+            script_paths (list[Path]): テストケーススクリプトのパス一覧。
+            workers (int): ワーカー数。
+
+        Returns:
+            float: 予測所要時間（秒）。
+        """
+        shards = self.shard(script_paths, max(1, workers))
+        return max((sum(self.predict(path.stem) for path in shard) for shard in shards), default=0.0)
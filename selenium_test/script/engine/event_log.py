@@ -0,0 +1,269 @@
+# Python
+import json
+import os
+import threading
+from concurrent.futures import Future
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Iterable, Iterator, Optional
+from pathlib import Path
+
+# engine
+from script.engine.buffered_line_writer import BufferedLineWriter
+from script.engine.clock import Clock, get_clock
+from script.engine.screenshot_transcoder import ScreenshotTranscoder
+
+# イベントの種類
+EVENT_RUN_START = 'run_start'
+EVENT_PROCEDURE = 'procedure'
+EVENT_EXPECTED_RESULT = 'expected_result'
+EVENT_COMMENT = 'comment'
+EVENT_SCREENSHOT = 'screenshot'
+EVENT_TIMING = 'timing'
+EVENT_PAGE_TIMING = 'page_timing'
+EVENT_RESULT = 'result'
+EVENT_ERROR = 'error'
+
+class EventLog:
+    """
+    1回分の実行の出来事を、種類付きのレコードとして追記専用のJSON Lines形式で記録するクラス。
+
+    テキストレポート（.txt）と並行して、結果ディレクトリに 'events.jsonl' を出力する。
+    各レコードは1行のJSONで、共通の項目（seq: 連番、ts: 日時、elapsed: 記録開始からの経過秒数、type: 種類）と
+    種類ごとの項目を持つ。追記のみを行うため、途中で異常終了しても記録済みの行は読み取れる。
+    バッファリングモードでは BufferedLineWriter でまとめて書き込む。
+
+    Attributes:
+        path (Path): 記録ファイルのパス。
+        run_name (str): 実行名（結果ディレクトリ名）。
+        clock (Clock): 日時・経過秒数の取得に使用するインスタンス。
+    """
+    FILE_NAME = 'events.jsonl'
+
+    # 現在のテストケースで使用中のインスタンス（スクリーンショット保存などから参照する）
+    _current: ContextVar[Optional['EventLog']] = ContextVar('current_event_log', default=None)
+
+    def __init__(self, path: Path, run_name: str, is_buffered: bool=False,
+                 flush_lines: int=100, flush_interval: float=1.0, clock: Optional[Clock]=None):
+        """
+        Args:
+            path (Path): 記録ファイルのパス。
+            run_name (str): 実行名（結果ディレクトリ名）。
+            is_buffered (bool): バッファリングモードで書き込むか否かを判定するフラグ。Default to False.
+            flush_lines (int): バッファリングモードで書き込みを行う行数のしきい値。Default to 100.
+            flush_interval (float): バッファリングモードで書き込みを行う経過時間のしきい値（秒）。Default to 1.0.
+            clock (Optional[Clock]): 日時・経過秒数の取得に使用するインスタンス。Noneの場合は共有の Clock。
+        """
+        self.path = path
+        self.run_name = run_name
+        self.clock = clock or get_clock()
+        self._writer = BufferedLineWriter(path, flush_lines, flush_interval) if is_buffered else None
+        self._origin = self.clock.monotonic()
+        self._seq = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def current(cls) -> Optional['EventLog']:
+        """
+        使用中の EventLog を取得する。
+
+        Returns:
+            Optional[EventLog]: EventLogインスタンス。設定されていない場合は None。
+        """
+        return cls._current.get()
+
+    def activate(self):
+        """
+        このインスタンスを使用中の EventLog として設定する。
+        """
+        self._current.set(self)
+
+    @classmethod
+    def record(cls, event_type: str, **fields: Any):
+        """
+        使用中の EventLog にレコードを追記する。設定されていない場合は何もしない。
+
+        Args:
+            event_type (str): イベントの種類。
+            **fields (Any): 種類ごとの項目。
+        """
+        event_log = cls._current.get()
+        if event_log is not None:
+            event_log.emit(event_type, **fields)
+
+    def emit(self, event_type: str, **fields: Any) -> dict[str, Any]:
+        """
+        レコードを1件追記する。スクリーンショットの非同期書き込みの完了時など、別スレッドから呼び出してもよい。
+
+        Args:
+            event_type (str): イベントの種類。
+            **fields (Any): 種類ごとの項目（JSONに変換できる値）。
+
+        Returns:
+            dict[str, Any]: 追記したレコード。
+        """
+        with self._lock:
+            self._seq += 1
+            event = {'seq': self._seq,
+                     'ts': self.clock.isoformat(timespec='milliseconds'),
+                     'elapsed': round(self.clock.monotonic() - self._origin, 6),
+                     'type': event_type,
+                     **fields}
+            line = json.dumps(event, ensure_ascii=False, separators=(',', ':'))
+            if self._writer is not None:
+                self._writer.write(line)
+            else:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                with self.path.open(mode='a', encoding='utf-8') as f:
+                    f.write(line + '\n')
+        return event
+
+    def flush(self):
+        """
+        バッファリングモードの場合、未書き込みのレコードを書き込む。
+        """
+        if self._writer is not None:
+            self._writer.flush()
+
+    def close(self):
+        """
+        バッファリングモードの場合、未書き込みのレコードを書き込んだ上でバックグラウンドスレッドを停止する。
+        """
+        if self._writer is not None:
+            self._writer.close()
+
+def record_screenshot(event_log: Optional[EventLog], path: Path, base_dir: Path,
+                      transcoder: Optional[ScreenshotTranscoder]=None, **fields: Any):
+    """
+    書き込みが完了したスクリーンショットを記録し、変換を投入する。
+    変換する場合は変換元の画像が削除されるため、変換の完了後に変換後の画像のパスを記録する
+    （変換に失敗した場合は変換元の画像が残るため、変換元のパスを記録する）。
+
+    Args:
+        event_log (Optional[EventLog]): 記録先の EventLog。Noneの場合は使用中の EventLog。
+        path (Path): 書き込んだ画像のパス。
+        base_dir (Path): 記録するパスの基準となるディレクトリのパス。
+        transcoder (Optional[ScreenshotTranscoder]): 書き込み後に変換を行うインスタンス。Default to None.
+        **fields (Any): 'path' 以外に記録する項目。
+    """
+    if event_log is None:
+        event_log = EventLog.current()
+    if transcoder is None:
+        if event_log is not None:
+            event_log.emit(EVENT_SCREENSHOT, path=os.path.relpath(path, base_dir), **fields)
+        return
+    if event_log is None:
+        transcoder.submit(path)
+        return
+
+    def on_transcoded(future: Future):
+        if future.cancelled() or future.exception() is not None:
+            event_log.emit(EVENT_SCREENSHOT, path=os.path.relpath(path, base_dir), **fields)
+            return
+        result = future.result()
+        thumbnail = {}
+        if result.thumbnail_path is not None:
+            thumbnail['thumbnail'] = os.path.relpath(result.thumbnail_path, base_dir)
+        event_log.emit(EVENT_SCREENSHOT, path=os.path.relpath(result.output_path, base_dir), **fields, **thumbnail)
+
+    transcoder.submit(path, on_transcoded)
+
+@dataclass
+class RunSummary:
+    """
+    1回分の実行の記録を集計した結果を保持するクラス。
+
+    Attributes:
+        run_name (str): 実行名（結果ディレクトリ名）。
+        path (Path): 記録ファイルのパス。
+        result (Optional[str]): 試験結果（'OK' / 'NG'）。記入されていない場合は None。
+        started_at (Optional[str]): 最初のレコードの日時。
+        ended_at (Optional[str]): 最後のレコードの日時。
+        elapsed (float): 最後のレコードまでの経過秒数。
+        steps (int): 試験手順・期待結果の数。
+        screenshots (int): スクリーンショットの数。
+        errors (int): エラーの数。
+        first_error (Optional[str]): 最初のエラーの内容。
+    """
+    run_name: str
+    path: Path
+    result: Optional[str] = None
+    started_at: Optional[str] = None
+    ended_at: Optional[str] = None
+    elapsed: float = 0.0
+    steps: int = 0
+    screenshots: int = 0
+    errors: int = 0
+    first_error: Optional[str] = None
+
+def iter_events(path: Path, types: Optional[Iterable[str]]=None) -> Iterator[dict[str, Any]]:
+    """
+    記録ファイルのレコードを1件ずつ読み出す。ファイル全体をメモリに読み込まない。
+    書き込み途中で終了した場合などの、JSONとして読み取れない行は読み飛ばす。
+
+    Args:
+        path (Path): 記録ファイルのパス。
+        types (Optional[Iterable[str]]): 読み出すイベントの種類。Noneの場合は全て。
+
+    Yields:
+        dict[str, Any]: レコード。
+    """
+    types = set(types) if types is not None else None
+    with path.open(encoding='utf-8', errors='replace') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                event = json.loads(line)
+            except ValueError:
+                continue
+            if types is None or event.get('type') in types:
+                yield event
+
+def iter_event_log_paths(results_dir_path: Path) -> Iterator[Path]:
+    """
+    'results' ディレクトリ内の結果ディレクトリから記録ファイルを列挙する。
+    一覧をメモリに溜めず、ディレクトリの走査順に返す。
+
+    Args:
+        results_dir_path (Path): 'results'ディレクトリのパス。
+
+    Yields:
+        Path: 記録ファイルのパス。
+    """
+    with os.scandir(results_dir_path) as entries:
+        for entry in entries:
+            if entry.name.startswith('.') or not entry.is_dir():
+                continue
+            path = Path(entry.path) / EventLog.FILE_NAME
+            if path.is_file():
+                yield path
+
+def summarize_run(path: Path) -> RunSummary:
+    """
+    記録ファイルを先頭から読み、1回分の実行を集計する。レコードは1件ずつ処理し、保持しない。
+
+    Args:
+        path (Path): 記録ファイルのパス。
+
+    Returns:
+        RunSummary: 集計結果。
+    """
+    summary = RunSummary(run_name=path.parent.name, path=path)
+    for event in iter_events(path):
+        event_type = event.get('type')
+        if summary.started_at is None:
+            summary.started_at = event.get('ts')
+        summary.ended_at = event.get('ts', summary.ended_at)
+        summary.elapsed = event.get('elapsed', summary.elapsed)
+        if event_type in (EVENT_PROCEDURE, EVENT_EXPECTED_RESULT):
+            summary.steps += 1
+        elif event_type == EVENT_SCREENSHOT:
+            summary.screenshots += 1
+        elif event_type == EVENT_RESULT:
+            summary.result = event.get('result')
+        elif event_type == EVENT_ERROR:
+            summary.errors += 1
+            if summary.first_error is None:
+                summary.first_error = event.get('message')
+    return summary
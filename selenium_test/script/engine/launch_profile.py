@@ -0,0 +1,102 @@
+# Python
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    # Selenium（プロファイル名の参照のみで Selenium を読み込まないよう、実行時は to_options 内で読み込む）
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options
+
+@dataclass(frozen=True)
+class LaunchProfile:
+    """
+    ブラウザ起動時の設定（起動プロファイル）を保持するクラス。
+
+    Attributes:
+        name (str): プロファイル名。
+        is_headless (bool): ヘッドレスモードで起動するか否かを判定するフラグ。
+        window_size (Optional[tuple[int, int]]): ウィンドウサイズ（幅, 高さ）。Noneの場合は最大化する。
+        page_load_strategy (str): ページ読み込み戦略（'normal' / 'eager' / 'none'）。
+        is_disable_images (bool): 画像の読み込みを無効化するか否かを判定するフラグ。
+        is_disable_extensions (bool): 拡張機能を無効化するか否かを判定するフラグ。
+        arguments (tuple[str, ...]): 追加のコマンドライン引数。
+    """
+    name: str
+    is_headless: bool = False
+    window_size: Optional[tuple[int, int]] = None
+    page_load_strategy: str = 'normal'
+    is_disable_images: bool = False
+    is_disable_extensions: bool = False
+    arguments: tuple[str, ...] = field(default=())
+
+    def to_options(self) -> 'Options':
+        """
+        プロファイルに対応するChromeのオプションを生成する。
+
+        Returns:
+            Options: Chromeのオプション。
+        """
+        # Selenium
+        from selenium.webdriver.chrome.options import Options
+        options = Options()
+        # chromeのSandBox機能無効化
+        options.add_argument('--no-sandbox')
+        # chromeが共有メモリを使わないようにする（仮想環境のクラッシュ予防）
+        options.add_argument('--disable-dev-shm-usage')
+        if self.is_headless:
+            # ヘッドレスモードの場合はブラウザを起動せずに実施する
+            options.add_argument('--headless=new')
+        if self.window_size is not None:
+            # 起動後の maximize_window（1往復）を省き、起動時にウィンドウサイズを固定する
+            options.add_argument(f'--window-size={self.window_size[0]},{self.window_size[1]}')
+        if self.is_disable_images:
+            options.add_argument('--blink-settings=imagesEnabled=false')
+            options.add_experimental_option('prefs', {'profile.managed_default_content_settings.images': 2})
+        if self.is_disable_extensions:
+            options.add_argument('--disable-extensions')
+        for argument in self.arguments:
+            options.add_argument(argument)
+        options.page_load_strategy = self.page_load_strategy
+        return options
+
+    def setup_window(self, driver: 'webdriver.Remote'):
+        """
+        起動後のウィンドウを設定する。ウィンドウサイズを固定しない場合のみ最大化する。
+
+        Args:
+            driver (webdriver.Remote): webdriver.Remoteインスタンス。
+        """
+        if self.window_size is None:
+            driver.maximize_window()
+
+# 定義済みの起動プロファイル
+PROFILES = {
+    # 従来どおりの設定（画面表示あり、最大化、ページの読み込み完了まで待機）
+    'default': LaunchProfile(name='default'),
+    # CI向け（ヘッドレス、固定サイズ、DOM構築完了で制御を返す、画像・拡張機能なし）
+    'fast': LaunchProfile(name='fast',
+                          is_headless=True,
+                          window_size=(1920, 1080),
+                          page_load_strategy='eager',
+                          is_disable_images=True,
+                          is_disable_extensions=True),
+    # noVNC（http://localhost:7900）での目視確認向け（画面表示あり、固定サイズ）
+    'debug': LaunchProfile(name='debug', window_size=(1920, 1080)),
+}
+
+def get_launch_profile(name: str) -> LaunchProfile:
+    """
+    プロファイル名に対応する起動プロファイルを取得する。
+
+    Args:
+        name (str): プロファイル名（'default' / 'fast' / 'debug'）。
+
+    Returns:
+        LaunchProfile: 起動プロファイル。
+
+    Raises:
+        ValueError: 定義されていないプロファイル名の場合。
+    """
+    if name not in PROFILES:
+        raise ValueError(f'未定義の起動プロファイル: {name}（{" / ".join(PROFILES)} のいずれかを指定する）')
+    return PROFILES[name]
@@ -0,0 +1,156 @@
+# Python
+from dataclasses import dataclass
+from typing import Optional, Sequence
+
+# Selenium
+from selenium import webdriver
+
+# ページ状態を1回のスクリプト実行で収集するスクリプト
+SNAPSHOT_SCRIPT = '''
+var locators = arguments[0], attributeNames = arguments[1];
+function find(by, value) {
+    switch (by) {
+        case 'id':
+            return document.getElementById(value);
+        case 'css selector':
+            return document.querySelector(value);
+        case 'xpath':
+            return document.evaluate(value, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+        case 'tag name':
+            return document.getElementsByTagName(value)[0] || null;
+        case 'class name':
+            return document.getElementsByClassName(value)[0] || null;
+        case 'name':
+            return document.getElementsByName(value)[0] || null;
+        case 'link text':
+        case 'partial link text':
+            var links = document.getElementsByTagName('a');
+            for (var i = 0; i < links.length; i++) {
+                var text = links[i].innerText.trim();
+                if (by === 'link text' ? text === value : text.indexOf(value) >= 0) return links[i];
+            }
+            return null;
+    }
+    return null;
+}
+return {
+    title: document.title,
+    url: window.location.href,
+    readyState: document.readyState,
+    elements: locators.map(function (locator) {
+        var element = find(locator[0], locator[1]);
+        if (!element) return null;
+        var attributes = {};
+        attributeNames.forEach(function (name) { attributes[name] = element.getAttribute(name); });
+        return {text: element.innerText, attributes: attributes};
+    })
+};
+'''
+
+@dataclass(frozen=True)
+class ElementSnapshot:
+    """
+    ページ状態の取得時点における1要素の状態を保持するクラス（変更不可）。
+
+    Attributes:
+        locator (tuple[str, str]): 要素のロケータ（例: (By.TAG_NAME, 'caption')）。
+        is_found (bool): 要素が見つかったか否か。
+        text (str): 要素の表示テキスト（innerText）。見つからない場合は空文字。
+        attributes (tuple[tuple[str, Optional[str]], ...]): 取得した属性名と値の組。
+    """
+    locator: tuple[str, str]
+    is_found: bool
+    text: str = ''
+    attributes: tuple[tuple[str, Optional[str]], ...] = ()
+
+    def get_attribute(self, name: str) -> Optional[str]:
+        """
+        取得済みの属性値を取得する。
+
+        Args:
+            name (str): 属性名。
+
+        Returns:
+            Optional[str]: 属性値。取得していない、または属性が存在しない場合は None。
+        """
+        return dict(self.attributes).get(name)
+
+@dataclass(frozen=True)
+class PageSnapshot:
+    """
+    ある時点のページ状態（タイトル、URL、読み込み状態、指定要素のテキスト・属性）を保持するクラス（変更不可）。
+
+    driver.title・driver.current_url・要素の text など、個別に取得すると1回ずつ
+    リモートへの往復が発生する値を、1回のスクリプト実行でまとめて取得する。
+
+    Attributes:
+        title (str): ページタイトル。
+        url (str): URL。
+        ready_state (str): document.readyState の値。
+        elements (tuple[ElementSnapshot, ...]): 指定した要素の状態（指定順）。
+    """
+    title: str
+    url: str
+    ready_state: str
+    elements: tuple[ElementSnapshot, ...] = ()
+
+    @classmethod
+    def take(cls, driver: webdriver.Remote, locators: Sequence[tuple[str, str]]=(),
+             attribute_names: Sequence[str]=()) -> 'PageSnapshot':
+        """
+        1回のスクリプト実行でページ状態を取得する。
+
+        Args:
+            driver (webdriver.Remote): webdriver.Remoteインスタンス。
+            locators (Sequence[tuple[str, str]]): 状態を取得する要素のロケータ一覧。Default to ().
+            attribute_names (Sequence[str]): 各要素から取得する属性名の一覧。Default to ().
+
+        Returns:
+            PageSnapshot: ページ状態。
+        """
+        value = driver.execute_script(SNAPSHOT_SCRIPT, [list(locator) for locator in locators], list(attribute_names))
+        return cls.from_value(value, locators, attribute_names)
+
+    @classmethod
+    def from_value(cls, value: dict, locators: Sequence[tuple[str, str]]=(),
+                   attribute_names: Sequence[str]=()) -> 'PageSnapshot':
+        """
+        SNAPSHOT_SCRIPT の戻り値からページ状態を生成する（非同期のクライアントで取得した場合など）。
+
+        Args:
+            value (dict): SNAPSHOT_SCRIPT の戻り値。
+            locators (Sequence[tuple[str, str]]): スクリプトに渡したロケータ一覧。Default to ().
+            attribute_names (Sequence[str]): スクリプトに渡した属性名の一覧。Default to ().
+
+        Returns:
+            PageSnapshot: ページ状態。
+        """
+        locators = [tuple(locator) for locator in locators]
+        elements = []
+        for locator, element in zip(locators, value['elements']):
+            if element is None:
+                elements.append(ElementSnapshot(locator=locator, is_found=False))
+            else:
+                attributes = tuple((name, element['attributes'].get(name)) for name in attribute_names)
+                elements.append(ElementSnapshot(locator=locator, is_found=True,
+                                                text=element['text'] or '', attributes=attributes))
+        return cls(title=value['title'], url=value['url'], ready_state=value['readyState'], elements=tuple(elements))
+
+    def element(self, by: str, value: str) -> ElementSnapshot:
+        """
+        ロケータに対応する要素の状態を取得する。
+
+        Args:
+            by (str): ロケータの種類（例: By.TAG_NAME）。
+            value (str): ロケータの値。
+
+        Returns:
+            ElementSnapshot: 要素の状態。
+
+        Raises:
+            KeyError: 取得時に指定していないロケータの場合。
+        """
+        for element in self.elements:
+            if element.locator == (by, value):
+                return element
+        raise KeyError(f'スナップショットに含まれない要素: {by}={value}')
@@ -0,0 +1,208 @@
+# Python
+from dataclasses import dataclass
+from typing import Any, Optional
+
+# Selenium
+from selenium import webdriver
+
+# Navigation Timing と Resource Timing を1回のスクリプト実行で収集するスクリプト
+# Navigation Timing Level 2 に対応していないブラウザでは performance.timing（Level 1）から求める
+TIMING_SCRIPT = '''
+var maxResources = arguments[0];
+var navigation = null;
+var navigations = performance.getEntriesByType ? performance.getEntriesByType('navigation') : [];
+if (navigations.length) {
+    var n = navigations[0];
+    navigation = {
+        ttfb: n.responseStart - n.startTime,
+        domInteractive: n.domInteractive,
+        domContentLoaded: n.domContentLoadedEventEnd,
+        load: n.loadEventEnd,
+        transferSize: n.transferSize || 0
+    };
+} else if (performance.timing) {
+    var t = performance.timing;
+    var since = function (value) { return value ? value - t.navigationStart : 0; };
+    navigation = {
+        ttfb: since(t.responseStart),
+        domInteractive: since(t.domInteractive),
+        domContentLoaded: since(t.domContentLoadedEventEnd),
+        load: since(t.loadEventEnd),
+        transferSize: 0
+    };
+}
+var resources = performance.getEntriesByType ? performance.getEntriesByType('resource') : [];
+var resourceTransferSize = 0;
+resources.forEach(function (r) { resourceTransferSize += r.transferSize || 0; });
+return {
+    url: window.location.href,
+    timeOrigin: performance.timeOrigin || (performance.timing ? performance.timing.navigationStart : 0),
+    navigation: navigation,
+    resourceCount: resources.length,
+    resourceTransferSize: resourceTransferSize,
+    resources: resources.slice().sort(function (a, b) { return b.duration - a.duration; })
+        .slice(0, maxResources).map(function (r) {
+            return {name: r.name, initiatorType: r.initiatorType, startTime: r.startTime,
+                    duration: r.duration, transferSize: r.transferSize || 0};
+        })
+};
+'''
+
+# 時間の指標（ミリ秒、ナビゲーション開始からの経過時間）
+TIME_METRICS = ('ttfb', 'dom_interactive', 'dom_content_loaded', 'load')
+# サイズの指標（バイト）と件数の指標
+SIZE_METRICS = ('transfer_size', 'resource_transfer_size', 'total_transfer_size')
+COUNT_METRICS = ('resource_count',)
+
+def _milliseconds(value: Optional[float]) -> Optional[float]:
+    """
+    スクリプトの戻り値の時間をミリ秒（小数第1位まで）に丸める。
+
+    Args:
+        value (Optional[float]): 時間（ミリ秒）。
+
+    Returns:
+        Optional[float]: 丸めた時間。未到達（0以下）または取得できない場合は None。
+    """
+    return round(float(value), 1) if value is not None and value > 0 else None
+
+@dataclass(frozen=True)
+class ResourceTiming:
+    """
+    ページが読み込んだ1つのリソース（画像・CSS・スクリプトなど）の読み込み時間を保持するクラス（変更不可）。
+
+    Attributes:
+        name (str): リソースのURL。
+        initiator_type (str): 読み込みの起点（例: 'img', 'script', 'link'）。
+        start_time (float): 読み込み開始時刻（ナビゲーション開始からのミリ秒）。
+        duration (float): 読み込み時間（ミリ秒）。
+        transfer_size (int): 転送量（バイト、キャッシュから読み込んだ場合やクロスオリジンの場合は 0）。
+    """
+    name: str
+    initiator_type: str
+    start_time: float
+    duration: float
+    transfer_size: int = 0
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        記録用の辞書に変換する。
+
+        Returns:
+            dict[str, Any]: 項目名と値の辞書。
+        """
+        return {'name': self.name, 'initiator_type': self.initiator_type, 'start_time': self.start_time,
+                'duration': self.duration, 'transfer_size': self.transfer_size}
+
+@dataclass(frozen=True)
+class PageTiming:
+    """
+    1回のナビゲーション（ページの読み込み）について、ブラウザが計測した読み込み時間を保持するクラス（変更不可）。
+
+    Navigation Timing の主要な指標と、Resource Timing の集計値・読み込み時間の長いリソースを
+    1回のスクリプト実行でまとめて取得する。時間はナビゲーション開始からのミリ秒で、
+    読み込みが完了していない（イベントが未到達の）指標は None とする。
+
+    Attributes:
+        url (str): URL。
+        time_origin (float): ナビゲーション開始時刻（UNIX時間のミリ秒）。同じナビゲーションか否かの判定に使用する。
+        ttfb (Optional[float]): 最初の1バイトを受信するまでの時間（Time To First Byte）。
+        dom_interactive (Optional[float]): DOMの構築が完了するまでの時間。
+        dom_content_loaded (Optional[float]): DOMContentLoaded イベントの処理が完了するまでの時間。
+        load (Optional[float]): load イベントの処理が完了するまでの時間。
+        transfer_size (int): ドキュメント本体の転送量（バイト）。
+        resource_count (int): 読み込んだリソースの数。
+        resource_transfer_size (int): リソースの転送量の合計（バイト）。
+        slowest_resources (tuple[ResourceTiming, ...]): 読み込み時間の長い順のリソース。
+    """
+    url: str
+    time_origin: float
+    ttfb: Optional[float] = None
+    dom_interactive: Optional[float] = None
+    dom_content_loaded: Optional[float] = None
+    load: Optional[float] = None
+    transfer_size: int = 0
+    resource_count: int = 0
+    resource_transfer_size: int = 0
+    slowest_resources: tuple[ResourceTiming, ...] = ()
+
+    @property
+    def total_transfer_size(self) -> int:
+        """
+        ドキュメント本体とリソースの転送量の合計（バイト）。
+        """
+        return self.transfer_size + self.resource_transfer_size
+
+    @classmethod
+    def take(cls, driver: webdriver.Remote, max_resources: int=10) -> 'PageTiming':
+        """
+        1回のスクリプト実行で読み込み時間を取得する。
+
+        Args:
+            driver (webdriver.Remote): webdriver.Remoteインスタンス。
+            max_resources (int): 取得するリソースの数の上限（読み込み時間の長い順）。Default to 10.
+
+        Returns:
+            PageTiming: 読み込み時間。
+        """
+        return cls.from_value(driver.execute_script(TIMING_SCRIPT, max_resources))
+
+    @classmethod
+    def from_value(cls, value: dict) -> 'PageTiming':
+        """
+        TIMING_SCRIPT の戻り値から読み込み時間を生成する（非同期のクライアントで取得した場合など）。
+
+        Args:
+            value (dict): TIMING_SCRIPT の戻り値。
+
+        Returns:
+            PageTiming: 読み込み時間。
+        """
+        navigation = value.get('navigation') or {}
+        resources = tuple(ResourceTiming(name=resource['name'], initiator_type=resource.get('initiatorType', ''),
+                                         start_time=round(float(resource.get('startTime') or 0), 1),
+                                         duration=round(float(resource.get('duration') or 0), 1),
+                                         transfer_size=int(resource.get('transferSize') or 0))
+                          for resource in value.get('resources') or ())
+        return cls(url=value.get('url', ''), time_origin=float(value.get('timeOrigin') or 0),
+                   ttfb=_milliseconds(navigation.get('ttfb')),
+                   dom_interactive=_milliseconds(navigation.get('domInteractive')),
+                   dom_content_loaded=_milliseconds(navigation.get('domContentLoaded')),
+                   load=_milliseconds(navigation.get('load')),
+                   transfer_size=int(navigation.get('transferSize') or 0),
+                   resource_count=int(value.get('resourceCount') or 0),
+                   resource_transfer_size=int(value.get('resourceTransferSize') or 0),
+                   slowest_resources=resources)
+
+    def metrics(self) -> dict[str, float]:
+        """
+        比較に使用する指標を取得する。取得できなかった指標は含めない。
+
+        Returns:
+            dict[str, float]: 指標名（TIME_METRICS / SIZE_METRICS / COUNT_METRICS）と値の辞書。
+        """
+        values = {name: getattr(self, name) for name in TIME_METRICS + SIZE_METRICS + COUNT_METRICS}
+        return {name: value for name, value in values.items() if value is not None}
+
+    def to_event_fields(self) -> dict[str, Any]:
+        """
+        EventLog に記録する項目に変換する。
+
+        Returns:
+            dict[str, Any]: 項目名と値の辞書。
+        """
+        return {'url': self.url, 'time_origin': self.time_origin, 'metrics': self.metrics(),
+                'resources': [resource.to_dict() for resource in self.slowest_resources]}
+
+    def summary(self) -> str:
+        """
+        テキストレポートなどに出力する1行の要約を生成する。
+
+        Returns:
+            str: 要約。
+        """
+        def ms(value: Optional[float]) -> str:
+            return f'{value:.0f}ms' if value is not None else '-'
+
+        return (f'TTFB {ms(self.ttfb)} / DOMContentLoaded {ms(self.dom_content_loaded)} / load {ms(self.load)} / '
+                f'転送量 {self.total_transfer_size / 1024:.1f}KB（リソース {self.resource_count}件）')
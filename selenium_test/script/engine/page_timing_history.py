@@ -0,0 +1,278 @@
+# Python
+import math
+import statistics
+from dataclasses import dataclass
+from typing import Optional
+from pathlib import Path
+
+# engine
+from script.engine.event_log import EVENT_PAGE_TIMING, EventLog, iter_events
+from script.engine.page_timing import SIZE_METRICS, TIME_METRICS
+from script.engine.results_retention import ResultsRetention, RunInfo
+
+def _incomplete_beta(x: float, a: float, b: float) -> float:
+    """
+    正則化された不完全ベータ関数 I_x(a, b) を連分数展開で求める。
+
+    Args:
+        x (float): 0〜1 の値。
+        a (float): パラメータ a。
+        b (float): パラメータ b。
+
+    Returns:
+        float: I_x(a, b) の値。
+    """
+    if x <= 0:
+        return 0.0
+    if x >= 1:
+        return 1.0
+    if x > (a + 1) / (a + b + 2):
+        # 連分数が収束しやすい側で求める
+        return 1.0 - _incomplete_beta(1 - x, b, a)
+    front = math.exp(math.lgamma(a + b) - math.lgamma(a) - math.lgamma(b) + a * math.log(x) + b * math.log(1 - x)) / a
+    tiny = 1e-300
+    c, d = 1.0, 1.0 - (a + b) * x / (a + 1)
+    d = 1.0 / (d if abs(d) > tiny else tiny)
+    result = d
+    for m in range(1, 201):
+        for numerator in (m * (b - m) * x / ((a + 2 * m - 1) * (a + 2 * m)),
+                          -(a + m) * (a + b + m) * x / ((a + 2 * m) * (a + 2 * m + 1))):
+            d = 1.0 + numerator * d
+            d = 1.0 / (d if abs(d) > tiny else tiny)
+            c = 1.0 + numerator / c
+            c = c if abs(c) > tiny else tiny
+            result *= c * d
+        if abs(c * d - 1.0) < 1e-12:
+            break
+    return front * result
+
+def student_t_sf(t: float, df: int) -> float:
+    """
+    自由度 df のt分布で、t 以上の値となる確率（上側確率）を求める。
+
+    Args:
+        t (float): t値。
+        df (int): 自由度。
+
+    Returns:
+        float: 上側確率。
+    """
+    tail = 0.5 * _incomplete_beta(df / (df + t * t), df / 2, 0.5)
+    return tail if t >= 0 else 1.0 - tail
+
+@dataclass(frozen=True)
+class RegressionOptions:
+    """
+    読み込み時間の劣化判定の設定を保持するクラス。
+
+    Attributes:
+        history (int): 比較対象とする過去の実行数（OKの実行のみ、新しい順）。
+        alpha (float): 有意水準。劣化がないと仮定した場合に、今回以上の値となる確率がこれを下回れば有意とする。
+        min_change (float): 劣化とみなす変化率の下限（0.1 = 過去の平均値から10%増）。
+        min_delta_ms (float): 時間の指標で劣化とみなす増加量の下限（ミリ秒）。
+        min_delta_bytes (int): サイズの指標で劣化とみなす増加量の下限（バイト）。
+        min_samples (int): 判定に必要な過去の実行数。これに満たない指標は判定しない。
+        metrics (tuple[str, ...]): 判定する指標名。
+    """
+    history: int = 10
+    alpha: float = 0.01
+    min_change: float = 0.1
+    min_delta_ms: float = 20.0
+    min_delta_bytes: int = 1024
+    min_samples: int = 3
+    metrics: tuple[str, ...] = ('ttfb', 'dom_content_loaded', 'load', 'total_transfer_size')
+
+@dataclass
+class MetricComparison:
+    """
+    1つの手順の1つの指標について、今回の実行と過去の実行を比較した結果を保持するクラス。
+
+    Attributes:
+        step (str): 手順のキー（例: '手順1 http://example.com/'）。
+        metric (str): 指標名。
+        current (float): 今回の値。
+        baseline (float): 過去の実行の平均値。
+        spread (float): 過去の実行の標準偏差。
+        samples (int): 比較した過去の実行数。
+        change (float): 平均値からの変化率。
+        t_score (float): 平均値からの差を、予測区間の標準誤差で割った値。
+        p_value (float): 劣化がないと仮定した場合に、今回以上の値となる確率（片側）。
+        is_regression (bool): 有意な劣化と判定したか否か。
+    """
+    step: str
+    metric: str
+    current: float
+    baseline: float
+    spread: float
+    samples: int
+    change: float
+    t_score: float
+    p_value: float
+    is_regression: bool
+
+def read_page_timings(run_dir_path: Path) -> dict[str, dict[str, float]]:
+    """
+    結果ディレクトリの記録ファイルから、手順ごとの読み込み時間の指標を読み取る。
+    手順のキーは手順の番号とURLとし、同じ手順で同じURLを複数回読み込んだ場合は 2回目以降に '(n)' を付加する。
+    同じナビゲーション（開始時刻が同じ）を記録し直している場合は、後の記録で置き換える。
+
+    Args:
+        run_dir_path (Path): 結果ディレクトリのパス。
+
+    Returns:
+        dict[str, dict[str, float]]: 手順のキーと指標の辞書（記録順）。記録ファイルがない場合は空。
+    """
+    path = run_dir_path / EventLog.FILE_NAME
+    if not path.is_file():
+        return {}
+    timings = {}
+    keys_by_origin = {}
+    for event in iter_events(path, [EVENT_PAGE_TIMING]):
+        origin = event.get('time_origin')
+        if origin and origin in keys_by_origin:
+            timings[keys_by_origin[origin]] = event.get('metrics', {})
+            continue
+        key = step = f'手順{event.get("step_index", 0)} {event.get("url", "")}'
+        count = 1
+        while key in timings:
+            count += 1
+            key = f'{step} ({count})'
+        timings[key] = event.get('metrics', {})
+        if origin:
+            keys_by_origin[origin] = key
+    return timings
+
+class PageTimingHistory:
+    """
+    同じテストケースの過去の実行と比較して、ページの読み込み時間の有意な劣化を検出するクラス。
+
+    過去の実行（OKの実行のみ、新しい順に最大 history 件）の値の分布から、今回の値が劣化していないと仮定した場合の
+    予測区間を求め、今回の値が上側に外れる確率（t分布による片側のp値）で判定する。
+    過去の実行数が少ないほど予測区間は広くなり、少数の実行でばらつきを過小評価して誤検出することを防ぐ。
+    ネットワークの揺らぎ程度の小さな増加を除外するため、p値に加えて変化率と増加量の下限も満たした場合のみ劣化とする。
+
+    Attributes:
+        results_dir_path (Path): 'results'ディレクトリのパス。
+        options (RegressionOptions): 劣化判定の設定。
+    """
+    def __init__(self, results_dir_path: Path, options: Optional[RegressionOptions]=None):
+        """
+        Args:
+            results_dir_path (Path): 'results'ディレクトリのパス。
+            options (Optional[RegressionOptions]): 劣化判定の設定。Noneの場合は既定値。
+        """
+        self.results_dir_path = results_dir_path
+        self.options = options or RegressionOptions()
+
+    def list_runs(self, test_cases: Optional[list[str]]=None) -> dict[str, list[RunInfo]]:
+        """
+        結果ディレクトリをテストケースごとに連番の古い順で列挙する。
+
+        Args:
+            test_cases (Optional[list[str]]): 対象のテストケース名。Noneの場合は全て。
+
+        Returns:
+            dict[str, list[RunInfo]]: テストケース名と結果ディレクトリの一覧の辞書。
+        """
+        runs_by_test_case = {}
+        for run in ResultsRetention(self.results_dir_path).iter_runs():
+            if test_cases is None or run.test_case in test_cases:
+                runs_by_test_case.setdefault(run.test_case, []).append(run)
+        for runs in runs_by_test_case.values():
+            runs.sort(key=lambda run: run.num)
+        return dict(sorted(runs_by_test_case.items()))
+
+    def select_baseline(self, runs: list[RunInfo], current: RunInfo) -> list[RunInfo]:
+        """
+        比較対象とする過去の実行を選ぶ。
+
+        Args:
+            runs (list[RunInfo]): 同じテストケースの結果ディレクトリの一覧（連番の古い順）。
+            current (RunInfo): 今回の実行。
+
+        Returns:
+            list[RunInfo]: 今回より前のOKの実行のうち、新しいものから最大 history 件（新しい順）。
+        """
+        previous = [run for run in runs if run.num < current.num and run.result == 'OK']
+        return previous[::-1][:self.options.history]
+
+    def compare(self, current: RunInfo, baseline_runs: list[RunInfo]) -> list[MetricComparison]:
+        """
+        今回の実行の読み込み時間を過去の実行と比較する。
+
+        Args:
+            current (RunInfo): 今回の実行。
+            baseline_runs (list[RunInfo]): 比較対象の過去の実行。
+
+        Returns:
+            list[MetricComparison]: 手順・指標ごとの比較結果（過去の記録がない手順・指標は含めない）。
+        """
+        baselines = [read_page_timings(run.path) for run in baseline_runs]
+        comparisons = []
+        for step, metrics in read_page_timings(current.path).items():
+            for metric in self.options.metrics:
+                if metric not in metrics:
+                    continue
+                values = [timings[step][metric] for timings in baselines
+                          if metric in timings.get(step, {})]
+                if values:
+                    comparisons.append(self._compare_metric(step, metric, metrics[metric], values))
+        return comparisons
+
+    def compare_latest(self, runs: list[RunInfo], run_num: Optional[int]=None
+                       ) -> tuple[Optional[RunInfo], list[RunInfo], list[MetricComparison]]:
+        """
+        最新（または指定した連番）の実行を、それより前の実行と比較する。
+
+        Args:
+            runs (list[RunInfo]): 同じテストケースの結果ディレクトリの一覧（連番の古い順）。
+            run_num (Optional[int]): 比較する実行の連番。Noneの場合は最新の実行。
+
+        Returns:
+            tuple[Optional[RunInfo], list[RunInfo], list[MetricComparison]]:
+                今回の実行（見つからない場合は None）、比較対象の過去の実行、比較結果。
+        """
+        candidates = [run for run in runs if run_num is None or run.num == run_num]
+        if not candidates:
+            return None, [], []
+        current = candidates[-1]
+        baseline_runs = self.select_baseline(runs, current)
+        return current, baseline_runs, self.compare(current, baseline_runs)
+
+    def _compare_metric(self, step: str, metric: str, current: float, values: list[float]) -> MetricComparison:
+        """
+        1つの指標を過去の値と比較し、有意な劣化か否かを判定する。
+
+        Args:
+            step (str): 手順のキー。
+            metric (str): 指標名。
+            current (float): 今回の値。
+            values (list[float]): 過去の値。
+
+        Returns:
+            MetricComparison: 比較結果。
+        """
+        options = self.options
+        baseline = statistics.fmean(values)
+        spread = statistics.stdev(values) if len(values) > 1 else 0.0
+        delta = current - baseline
+        if spread > 0:
+            # 今回の値の予測区間の標準誤差は s * sqrt(1 + 1/n)、自由度は n - 1
+            t_score = delta / (spread * math.sqrt(1 + 1 / len(values)))
+            p_value = student_t_sf(t_score, len(values) - 1)
+        else:
+            # 過去の値が全て同じ場合は、増加していれば有意とする
+            t_score = math.inf if delta > 0 else 0.0
+            p_value = 0.0 if delta > 0 else 1.0
+        change = delta / baseline if baseline else (math.inf if delta > 0 else 0.0)
+        if metric in TIME_METRICS:
+            min_delta = options.min_delta_ms
+        elif metric in SIZE_METRICS:
+            min_delta = options.min_delta_bytes
+        else:
+            min_delta = 1
+        is_regression = (len(values) >= options.min_samples and p_value < options.alpha
+                         and change >= options.min_change and delta >= min_delta)
+        return MetricComparison(step=step, metric=metric, current=current, baseline=baseline, spread=spread,
+                                samples=len(values), change=change, t_score=t_score, p_value=p_value,
+                                is_regression=is_regression)
@@ -1,21 +1,29 @@
-from datetime import datetime
+# Python
 from typing import Optional
 from pathlib import Path
 
+# engine
+from script.engine.clock import Clock, get_clock
+
 class PathManager:
     """
     テキスト、画像に共通するパス生成を担当するクラス。
 
+    ファイル名に付加する日時は Clock で生成し、同じファイル名で日時が重なった場合は連番を付けて上書きを防ぐ。
+
     Attributes:
         base_dir (Path): 保存先のベースディレクトリ。
+        clock (Clock): 日時の取得に使用するインスタンス。
     """
 
-    def __init__(self, base_dir: Path):
+    def __init__(self, base_dir: Path, clock: Optional[Clock]=None):
         """
         Args:
             base_dir (Path): 保存先のベースディレクトリ。
+            clock (Optional[Clock]): 日時の取得に使用するインスタンス。Noneの場合は共有の Clock。
         """
         self.base_dir = base_dir
+        self.clock = clock or get_clock()
 
     def get_path(self, file_name: str, extension: Optional[str]=None,
                  is_add_datetime: bool=False, datetime_format: str="%Y%m%d_%H%M%S") -> Path:
@@ -26,17 +34,18 @@ class PathManager:
             file_name (str): ベースとなるファイル名（拡張子なしでも可）。
             extension (Optional[str]): 拡張子（例: 'png', 'txt'）。Noneの場合はfile_nameをそのまま使用。
             is_add_datetime (bool): ファイル名に日時を付加するか否かを判定するフラグ。Default to True.
-            datetime_format (str): 日付と時刻のフォーマット。Default to 'YYYYMMDD_HHMMSS'
+            datetime_format (str): 日付と時刻のフォーマット。秒未満まで付加する場合は '%f' を含める。
+                Default to 'YYYYMMDD_HHMMSS'
 
         Returns:
             Path: 保存先の完全なパス。
         """
+        suffix = f".{extension.lstrip('.')}" if extension else ''
         if is_add_datetime:
-            timestamp = datetime.now().strftime(datetime_format)
+            timestamp = self.clock.file_stamp(str(self.base_dir / f"{file_name}{suffix}"), datetime_format)
             file_name = f"{timestamp}_{file_name}"
 
-        if extension:
-            file_name = f"{file_name}.{extension.lstrip('.')}"
+        file_name = f"{file_name}{suffix}"
 
         return self.base_dir / file_name
 
@@ -2,6 +2,9 @@
 import re
 from pathlib import Path
 
+# engine
+from script.engine.run_number_allocator import RunNumberAllocator
+
 class ReportDirectory:
     """
     テストスクリプトのパスをもとに、対応する結果ディレクトリを取り扱うクラス。
@@ -9,6 +12,7 @@ class ReportDirectory:
     指定されたスクリプトファイルのパスに基づいて、
     'results' ディレクトリ内にテスト結果を保存するための結果ディレクトリを作成する。
     結果ディレクトリ名にはスクリプト名と連番を付与し、既存の結果ディレクトリ名と重複しないようにする。
+    連番は RunNumberAllocator により払い出す。
 
     Attributes:
         results_dir_path (Path): 'results'ディレクトリのパス。
@@ -22,7 +26,9 @@ class ReportDirectory:
             script_path (Path): 実行スクリプトのファイルパス。
         """
         self.results_dir_path = script_path.parent / 'results'
-        self.test_case = script_path.stem # 正規表現パターンとして使用
+        self.test_case = script_path.stem
+        # 'test_case_1' が 'test_case_10_1' に一致しないよう、連番部分まで含めて完全一致させる
+        self._pattern = re.compile(rf'^{re.escape(self.test_case)}_(\d+)$')
     
     def confirm_existance_of_directory(self) -> bool:
         """
@@ -32,7 +38,7 @@ class ReportDirectory:
             bool: 対応する結果ディレクトリが存在すれば True、存在しなければ False。
         """
         for subdir in self.results_dir_path.iterdir():
-            if subdir.is_dir() and re.search(self.test_case, f'{subdir.name}'):
+            if subdir.is_dir() and self._pattern.match(subdir.name):
                 return True
         return False
     
@@ -47,8 +53,9 @@ class ReportDirectory:
         num_list = []
         for subdir in self.results_dir_path.iterdir():
             # 実施中のテストケースフォルダーを抽出（全テストケースの結果がresults配下に格納されるため）
-            if self.test_case in subdir.name:
-                num_list.append(int(subdir.name.split('_')[-1]))
+            match = self._pattern.match(subdir.name)
+            if match:
+                num_list.append(int(match.group(1)))
         return max(num_list)
 
     def make_result_directory(self) -> Path:
@@ -57,13 +64,9 @@ class ReportDirectory:
 
         既存のディレクトリがあれば最大の連番に +1 した名前で作成し、
         なければ 'test_case_1' として作成する。
+        連番はカウンタファイルから払い出すため、'results' ディレクトリの走査は行わない。
 
         Returns:
             Path: 作成された新しい結果ディレクトリのパス。
         """
-        num = 0
-        if self.confirm_existance_of_directory():
-            num = self.get_directory_max_num()
-        new_dir = self.results_dir_path / f'{self.test_case}_{num + 1}'
-        new_dir.mkdir(exist_ok=True)
-        return new_dir
\ No newline at end of file
+        return RunNumberAllocator(self.results_dir_path, self.test_case).allocate()
\ No newline at end of file
@@ -0,0 +1,409 @@
+# Python
+import json
+import re
+import sqlite3
+from contextlib import closing
+from datetime import datetime
+from typing import Any, Optional
+from pathlib import Path
+
+# engine
+from script.engine.clock import Clock, get_clock
+from script.engine.event_log import EventLog, summarize_run
+from script.engine.results_retention import ResultsRetention
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_name TEXT PRIMARY KEY,
+    test_case TEXT NOT NULL,
+    run_num INTEGER NOT NULL,
+    started_at TEXT,
+    ended_at TEXT,
+    result TEXT,
+    error_summary TEXT,
+    report_dir_path TEXT NOT NULL,
+    artifacts TEXT NOT NULL DEFAULT '[]',
+    archived_to TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_runs_test_case ON runs (test_case, started_at);
+CREATE INDEX IF NOT EXISTS idx_runs_started_at ON runs (started_at);
+CREATE INDEX IF NOT EXISTS idx_runs_result ON runs (result, started_at);
+"""
+
+# 既存のカタログに追加する列（列名, 定義）
+ADDED_COLUMNS = [('archived_to', 'TEXT')]
+
+class ResultsCatalog:
+    """
+    実行ごとの試験結果をSQLiteのデータベース（カタログ）に登録し、実行をまたいだ検索を行うクラス。
+
+    カタログは 'results/.run_index/catalog.sqlite3' に保存する。各実行は開始時と試験結果の記入時に自身を登録し、
+    テストケース名・連番・開始/終了日時・試験結果・エラー概要・成果物（結果ディレクトリ内のファイル）のパスを保持する。
+    テストケース・日時・試験結果には索引を張り、結果ディレクトリを走査せずに検索できるようにする。
+    ResultsRetention でアーカイブした実行は行を残し、格納先のアーカイブのパスを archived_to に保持する。
+    複数のワーカープロセスから同時に書き込めるよう、WALモードで開き、ロック中は待機する。
+    日時は日本時間のISO 8601形式の文字列で保持し、文字列の大小で比較する。
+
+    Attributes:
+        db_path (Path): カタログのパス。
+        timeout (float): ロック解除を待機する最大秒数。
+    """
+    DB_FILE_NAME = 'catalog.sqlite3'
+    TIMEZONE = Clock.TIMEZONE
+    TIMESTAMP_PATTERN = re.compile(r'^(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})  ')
+
+    def __init__(self, db_path: Path, timeout: float=30.0):
+        """
+        Args:
+            db_path (Path): カタログのパス。
+            timeout (float): ロック解除を待機する最大秒数。Default to 30.0.
+        """
+        self.db_path = db_path
+        self.timeout = timeout
+        self._is_initialized = False
+
+    @classmethod
+    def for_results_dir(cls, results_dir_path: Path) -> 'ResultsCatalog':
+        """
+        'results' ディレクトリに対応するカタログを取得する。
+
+        Args:
+            results_dir_path (Path): 'results'ディレクトリのパス。
+
+        Returns:
+            ResultsCatalog: ResultsCatalogインスタンス。
+        """
+        return cls(results_dir_path / '.run_index' / cls.DB_FILE_NAME)
+
+    @classmethod
+    def now(cls) -> str:
+        """
+        現在の日時をカタログの形式で取得する。
+
+        Returns:
+            str: 日本時間のISO 8601形式の日時（例: '2025-08-01T09:00:00+09:00'）。
+        """
+        return get_clock().isoformat(timespec='seconds')
+
+    def connect(self) -> sqlite3.Connection:
+        """
+        カタログに接続する。初回の接続時にテーブルと索引を作成し、以前のカタログには不足している列を追加する。
+
+        Returns:
+            sqlite3.Connection: 接続。行は列名で参照できる。
+        """
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(self.db_path, timeout=self.timeout)
+        connection.row_factory = sqlite3.Row
+        if not self._is_initialized:
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.executescript(SCHEMA)
+            self._add_columns(connection)
+            self._is_initialized = True
+        return connection
+
+    @staticmethod
+    def _add_columns(connection: sqlite3.Connection):
+        """
+        以前のカタログに不足している列を追加する。
+
+        Args:
+            connection (sqlite3.Connection): 接続。
+        """
+        for name, definition in ADDED_COLUMNS:
+            columns = {row['name'] for row in connection.execute('PRAGMA table_info(runs)')}
+            if name in columns:
+                continue
+            try:
+                connection.execute(f'ALTER TABLE runs ADD COLUMN {name} {definition}')
+            except sqlite3.OperationalError:
+                # 他のプロセスが同時に追加した場合は成功とみなす
+                columns = {row['name'] for row in connection.execute('PRAGMA table_info(runs)')}
+                if name not in columns:
+                    raise
+
+    def register_start(self, report_dir_path: Path, started_at: Optional[str]=None):
+        """
+        実行の開始を登録する。同じ実行が登録済みの場合は開始日時のみ更新する。
+
+        Args:
+            report_dir_path (Path): 結果ディレクトリのパス（例: results/test_case_01_3）。
+            started_at (Optional[str]): 開始日時。Noneの場合は現在の日時。
+        """
+        test_case, run_num = self.parse_run_name(report_dir_path.name)
+        with closing(self.connect()) as connection, connection:
+            connection.execute(
+                'INSERT INTO runs (run_name, test_case, run_num, started_at, report_dir_path) VALUES (?, ?, ?, ?, ?) '
+                'ON CONFLICT (run_name) DO UPDATE SET started_at = excluded.started_at',
+                (report_dir_path.name, test_case, run_num, started_at or self.now(), str(report_dir_path)))
+
+    def register_result(self, report_dir_path: Path, result: str, ended_at: Optional[str]=None,
+                        error_summary: Optional[str]=None, artifacts: Optional[list[str]]=None):
+        """
+        実行の試験結果・終了日時・成果物を登録する。開始が未登録の場合は併せて登録する。
+
+        Args:
+            report_dir_path (Path): 結果ディレクトリのパス。
+            result (str): 試験結果（'OK' / 'NG'）。
+            ended_at (Optional[str]): 終了日時。Noneの場合は現在の日時。
+            error_summary (Optional[str]): エラー概要。Noneの場合は登録済みの値を残す。
+            artifacts (Optional[list[str]]): 成果物（結果ディレクトリからの相対パス）。Noneの場合は結果ディレクトリを走査する。
+        """
+        test_case, run_num = self.parse_run_name(report_dir_path.name)
+        if artifacts is None:
+            artifacts = self.list_artifacts(report_dir_path)
+        with closing(self.connect()) as connection, connection:
+            connection.execute(
+                'INSERT INTO runs (run_name, test_case, run_num, ended_at, result, error_summary, report_dir_path, '
+                'artifacts) VALUES (?, ?, ?, ?, ?, ?, ?, ?) '
+                'ON CONFLICT (run_name) DO UPDATE SET ended_at = excluded.ended_at, result = excluded.result, '
+                'error_summary = COALESCE(excluded.error_summary, runs.error_summary), '
+                'artifacts = excluded.artifacts',
+                (report_dir_path.name, test_case, run_num, ended_at or self.now(), result, error_summary,
+                 str(report_dir_path), json.dumps(artifacts, ensure_ascii=False)))
+
+    def mark_archived(self, run_dir_paths: list[Path], archive_path: Path):
+        """
+        実行をアーカイブ済みとして登録する。未登録の実行は、テストケース名と連番のみで登録する。
+
+        Args:
+            run_dir_paths (list[Path]): アーカイブした結果ディレクトリのパス一覧。
+            archive_path (Path): 格納先のアーカイブのパス。
+        """
+        with closing(self.connect()) as connection, connection:
+            self._upsert_archived(connection, [(run_dir_path, archive_path) for run_dir_path in run_dir_paths])
+
+    @classmethod
+    def _upsert_archived(cls, connection: sqlite3.Connection, runs: list[tuple[Path, Path]]):
+        """
+        実行の格納先のアーカイブを登録する。
+
+        Args:
+            connection (sqlite3.Connection): 接続。
+            runs (list[tuple[Path, Path]]): 結果ディレクトリのパスと格納先のアーカイブのパスの組の一覧。
+        """
+        rows = []
+        for run_dir_path, archive_path in runs:
+            test_case, run_num = cls.parse_run_name(run_dir_path.name)
+            rows.append((run_dir_path.name, test_case, run_num, str(run_dir_path), str(archive_path)))
+        connection.executemany(
+            'INSERT INTO runs (run_name, test_case, run_num, report_dir_path, archived_to) VALUES (?, ?, ?, ?, ?) '
+            'ON CONFLICT (run_name) DO UPDATE SET archived_to = excluded.archived_to', rows)
+
+    def register_error(self, report_dir_path: Path, error_summary: str):
+        """
+        実行のエラー概要を登録する。既に登録されている場合は最初のエラーを残す。
+
+        Args:
+            report_dir_path (Path): 結果ディレクトリのパス。
+            error_summary (str): エラー概要。
+        """
+        with closing(self.connect()) as connection, connection:
+            connection.execute('UPDATE runs SET error_summary = COALESCE(error_summary, ?) WHERE run_name = ?',
+                               (error_summary, report_dir_path.name))
+
+    def query(self, test_case: Optional[str]=None, result: Optional[str]=None, since: Optional[str]=None,
+              until: Optional[str]=None, error_like: Optional[str]=None, limit: Optional[int]=None) -> list[sqlite3.Row]:
+        """
+        条件に一致する実行を、開始日時の新しい順に検索する。
+
+        Args:
+            test_case (Optional[str]): テストケース名。
+            result (Optional[str]): 試験結果（'OK' / 'NG'）。
+            since (Optional[str]): この日時以降に開始した実行（ISO 8601形式、日付のみも可）。
+            until (Optional[str]): この日時より前に開始した実行（ISO 8601形式、日付のみも可）。
+            error_like (Optional[str]): エラー概要に含まれる文字列。
+            limit (Optional[int]): 最大件数。
+
+        Returns:
+            list[sqlite3.Row]: 実行の一覧。
+        """
+        where, params = self._where(test_case, since, until)
+        if result is not None:
+            where.append('result = ?')
+            params.append(result)
+        if error_like is not None:
+            where.append("error_summary LIKE ? ESCAPE '\\'")
+            params.append('%' + re.sub(r'([%_\\])', r'\\\1', error_like) + '%')
+        sql = 'SELECT * FROM runs'
+        if where:
+            sql += ' WHERE ' + ' AND '.join(where)
+        sql += ' ORDER BY started_at DESC, run_num DESC'
+        if limit is not None:
+            sql += ' LIMIT ?'
+            params.append(limit)
+        with closing(self.connect()) as connection:
+            return connection.execute(sql, params).fetchall()
+
+    def pass_rates(self, test_case: Optional[str]=None, since: Optional[str]=None,
+                   until: Optional[str]=None) -> list[sqlite3.Row]:
+        """
+        テストケースごとの実行数・OK数・NG数・合格率を集計する。試験結果が未記入の実行は除く。
+
+        Args:
+            test_case (Optional[str]): テストケース名。Noneの場合は全テストケース。
+            since (Optional[str]): この日時以降に開始した実行。
+            until (Optional[str]): この日時より前に開始した実行。
+
+        Returns:
+            list[sqlite3.Row]: テストケース名順の集計結果（test_case, total, ok, ng, pass_rate）。
+        """
+        where, params = self._where(test_case, since, until)
+        where.append('result IS NOT NULL')
+        sql = ('SELECT test_case, COUNT(*) AS total, SUM(result = \'OK\') AS ok, SUM(result != \'OK\') AS ng, '
+               'AVG(result = \'OK\') AS pass_rate FROM runs WHERE ' + ' AND '.join(where) +
+               ' GROUP BY test_case ORDER BY test_case')
+        with closing(self.connect()) as connection:
+            return connection.execute(sql, params).fetchall()
+
+    def rebuild(self, results_dir_path: Path) -> int:
+        """
+        'results' ディレクトリの結果ディレクトリとアーカイブの内容をカタログに登録し直す。
+        結果ディレクトリは記録ファイル（events.jsonl）があればそこから、なければテキストレポートから読み取る。
+        登録済みの行は上書きし、結果ディレクトリが存在しない実行（アーカイブ済みの実行など）の行も残す。
+        アーカイブ内の実行は、格納先のアーカイブのパスを登録する。
+
+        Args:
+            results_dir_path (Path): 'results'ディレクトリのパス。
+
+        Returns:
+            int: 登録した実行数。
+        """
+        retention = ResultsRetention(results_dir_path)
+        rows = []
+        for run in retention.iter_runs():
+            started_at, ended_at, error_summary = self.read_run(run.path)
+            rows.append((run.path.name, run.test_case, run.num, started_at, ended_at, run.result, error_summary,
+                         str(run.path), json.dumps(self.list_artifacts(run.path), ensure_ascii=False)))
+        archived = []
+        for archive_path in sorted(retention.archive_dir_path.glob('*.zip')):
+            archived.extend((results_dir_path / run_name, archive_path)
+                            for run_name in retention.list_archived_runs(archive_path.stem))
+        with closing(self.connect()) as connection, connection:
+            connection.executemany(
+                'INSERT INTO runs (run_name, test_case, run_num, started_at, ended_at, result, error_summary, '
+                'report_dir_path, artifacts) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) '
+                'ON CONFLICT (run_name) DO UPDATE SET test_case = excluded.test_case, run_num = excluded.run_num, '
+                'started_at = COALESCE(excluded.started_at, runs.started_at), '
+                'ended_at = COALESCE(excluded.ended_at, runs.ended_at), '
+                'result = COALESCE(excluded.result, runs.result), '
+                'error_summary = COALESCE(excluded.error_summary, runs.error_summary), '
+                'report_dir_path = excluded.report_dir_path, artifacts = excluded.artifacts',
+                rows)
+            self._upsert_archived(connection, archived)
+        return len({row[0] for row in rows} | {run_dir_path.name for run_dir_path, _ in archived})
+
+    @classmethod
+    def read_run(cls, run_dir_path: Path) -> tuple[Optional[str], Optional[str], Optional[str]]:
+        """
+        結果ディレクトリから開始日時・終了日時・エラー概要を読み取る。
+
+        Args:
+            run_dir_path (Path): 結果ディレクトリのパス。
+
+        Returns:
+            tuple[Optional[str], Optional[str], Optional[str]]: 開始日時・終了日時・エラー概要。読み取れない項目は None。
+        """
+        event_log_path = run_dir_path / EventLog.FILE_NAME
+        if event_log_path.is_file():
+            summary = summarize_run(event_log_path)
+            if summary.started_at is not None:
+                error_summary = summary.first_error.splitlines()[0] if summary.first_error else None
+                return cls._normalize(summary.started_at), cls._normalize(summary.ended_at), error_summary
+
+        text_report_path = run_dir_path / f'{run_dir_path.name}.txt'
+        first = last = error_summary = None
+        is_error_block = False
+        last_error_line = None
+        try:
+            with text_report_path.open(encoding='utf-8', errors='replace') as f:
+                for line in f:
+                    match = cls.TIMESTAMP_PATTERN.match(line)
+                    if match is None:
+                        # エラー内容（トレースバック）の最終行が例外のメッセージとなる
+                        if is_error_block and line.strip():
+                            last_error_line = line.strip()
+                        continue
+                    if is_error_block and error_summary is None:
+                        error_summary = last_error_line
+                    is_error_block = line[match.end():].startswith('エラー内容:')
+                    timestamp = datetime.strptime(match.group(1), '%Y-%m-%d %H:%M:%S').replace(tzinfo=cls.TIMEZONE)
+                    first = first or timestamp
+                    last = timestamp
+        except FileNotFoundError:
+            return None, None, None
+        if is_error_block and error_summary is None:
+            error_summary = last_error_line
+        return (first.isoformat(timespec='seconds') if first else None,
+                last.isoformat(timespec='seconds') if last else None,
+                error_summary)
+
+    @classmethod
+    def parse_run_name(cls, run_name: str) -> tuple[str, int]:
+        """
+        結果ディレクトリ名をテストケース名と連番に分ける。
+
+        Args:
+            run_name (str): 結果ディレクトリ名（例: 'test_case_01_3'）。
+
+        Returns:
+            tuple[str, int]: テストケース名と連番。連番がない場合は 0。
+        """
+        match = ResultsRetention.RUN_DIR_PATTERN.match(run_name)
+        return (match.group(1), int(match.group(2))) if match else (run_name, 0)
+
+    @staticmethod
+    def list_artifacts(report_dir_path: Path) -> list[str]:
+        """
+        結果ディレクトリ内のファイル（成果物）を列挙する。
+
+        Args:
+            report_dir_path (Path): 結果ディレクトリのパス。
+
+        Returns:
+            list[str]: 結果ディレクトリからの相対パス（'/' 区切り、名前順）。
+        """
+        if not report_dir_path.is_dir():
+            return []
+        return sorted(path.relative_to(report_dir_path).as_posix()
+                      for path in report_dir_path.rglob('*') if path.is_file())
+
+    @staticmethod
+    def _normalize(timestamp: Optional[str]) -> Optional[str]:
+        """
+        ミリ秒付きの日時を秒単位に揃える。
+
+        Args:
+            timestamp (Optional[str]): ISO 8601形式の日時。
+
+        Returns:
+            Optional[str]: 秒単位のISO 8601形式の日時。
+        """
+        if timestamp is None:
+            return None
+        return datetime.fromisoformat(timestamp).isoformat(timespec='seconds')
+
+    @staticmethod
+    def _where(test_case: Optional[str], since: Optional[str], until: Optional[str]) -> tuple[list[str], list[Any]]:
+        """
+        テストケース・開始日時の検索条件を生成する。
+
+        Args:
+            test_case (Optional[str]): テストケース名。
+            since (Optional[str]): この日時以降に開始した実行。
+            until (Optional[str]): この日時より前に開始した実行。
+
+        Returns:
+            tuple[list[str], list[Any]]: WHERE句の条件とパラメータ。
+        """
+        where, params = [], []
+        if test_case is not None:
+            where.append('test_case = ?')
+            params.append(test_case)
+        if since is not None:
+            where.append('started_at >= ?')
+            params.append(since)
+        if until is not None:
+            where.append('started_at < ?')
+            params.append(until)
+        return where, params
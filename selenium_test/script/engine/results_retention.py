@@ -0,0 +1,349 @@
+# Python
+import json
+import os
+import re
+import shutil
+import time
+import zipfile
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Iterator, Optional
+from pathlib import Path
+
+# engine
+from script.engine.screenshot_store import ScreenshotStore
+
+if TYPE_CHECKING:
+    # engine（results_catalog が本モジュールを読み込むため、実行時は読み込まない）
+    from script.engine.results_catalog import ResultsCatalog
+
+# 圧縮済みのため再圧縮しない拡張子
+STORED_EXTENSIONS = {'.png', '.webp', '.jpg', '.zip', '.gz'}
+
+@dataclass
+class RetentionPolicy:
+    """
+    結果ディレクトリの保持ポリシーを表すクラス。
+    いずれかの条件に該当する結果ディレクトリは保持し、どれにも該当しないものをアーカイブ対象とする。
+
+    Attributes:
+        keep_last (Optional[int]): テストケースごとに保持する最新の結果ディレクトリ数。Noneの場合は条件としない。
+        keep_days (Optional[float]): 保持する経過日数。これより新しい結果ディレクトリは保持する。Noneの場合は条件としない。
+        keep_ng (bool): 試験結果がNGの結果ディレクトリを常に保持するか否かを判定するフラグ。
+    """
+    keep_last: Optional[int] = None
+    keep_days: Optional[float] = None
+    keep_ng: bool = True
+
+@dataclass
+class RunInfo:
+    """
+    1回分の実行の結果ディレクトリの情報を保持するクラス。
+
+    Attributes:
+        test_case (str): テストケース名。
+        num (int): 結果ディレクトリの連番。
+        path (Path): 結果ディレクトリのパス。
+        mtime (float): 結果ディレクトリの最終更新時刻（UNIX時間）。
+        result (Optional[str]): 試験結果（'OK' / 'NG'）。記入されていない場合は None。
+    """
+    test_case: str
+    num: int
+    path: Path
+    mtime: float
+    result: Optional[str]
+
+class ResultsRetention:
+    """
+    'results' ディレクトリの保持ポリシーを適用し、期限切れの結果ディレクトリをアーカイブするクラス。
+
+    アーカイブはテストケースごとの zip ファイルとし、ファイル単位でストリーミング書き込みするため
+    結果ディレクトリ全体をメモリに読み込まない。zip は中央ディレクトリを持つため、
+    アーカイブ全体を展開せずに過去の実行の一覧取得・個別展開ができる。
+    スクリーンショットをマニフェストで参照している実行は、参照先の画像の実体もアーカイブに含め、
+    ScreenshotStore から実体を削除した後も展開できるようにする。
+
+    Attributes:
+        results_dir_path (Path): 'results'ディレクトリのパス。
+        archive_dir_path (Path): アーカイブを格納するディレクトリのパス。
+        store_dir_path (Path): スクリーンショットの実体（ScreenshotStore）を格納するディレクトリのパス。
+        catalog (Optional[ResultsCatalog]): アーカイブした実行を登録するカタログ。Noneの場合は登録しない。
+    """
+    RUN_DIR_PATTERN = re.compile(r'^(.+)_(\d+)$')
+
+    def __init__(self, results_dir_path: Path, archive_dir_path: Optional[Path]=None,
+                 store_dir_path: Optional[Path]=None, catalog: Optional['ResultsCatalog']=None):
+        """
+        Args:
+            results_dir_path (Path): 'results'ディレクトリのパス。
+            archive_dir_path (Optional[Path]): アーカイブを格納するディレクトリのパス。
+                Noneの場合は 'results/.archive' とする。
+            store_dir_path (Optional[Path]): スクリーンショットの実体を格納するディレクトリのパス。
+                Noneの場合は 'results/.screenshot_store' とする。
+            catalog (Optional[ResultsCatalog]): アーカイブした実行を登録するカタログ。Default to None.
+        """
+        self.results_dir_path = results_dir_path
+        self.archive_dir_path = archive_dir_path if archive_dir_path is not None else results_dir_path / '.archive'
+        self.store_dir_path = store_dir_path if store_dir_path is not None \
+            else results_dir_path / '.screenshot_store'
+        self.catalog = catalog
+
+    def iter_runs(self) -> Iterator[RunInfo]:
+        """
+        'results' ディレクトリ内の結果ディレクトリを列挙する。
+
+        Yields:
+            RunInfo: 結果ディレクトリの情報。
+        """
+        with os.scandir(self.results_dir_path) as entries:
+            for entry in entries:
+                match = self.RUN_DIR_PATTERN.match(entry.name)
+                if entry.name.startswith('.') or not match or not entry.is_dir():
+                    continue
+                path = Path(entry.path)
+                yield RunInfo(test_case=match.group(1),
+                              num=int(match.group(2)),
+                              path=path,
+                              mtime=entry.stat().st_mtime,
+                              result=self.read_result(path))
+
+    @staticmethod
+    def read_result(run_dir_path: Path) -> Optional[str]:
+        """
+        結果ディレクトリのテキストレポートから試験結果を読み取る。1行ずつ読み込むためメモリ使用量は一定。
+
+        Args:
+            run_dir_path (Path): 結果ディレクトリのパス。
+
+        Returns:
+            Optional[str]: 最後に記入された試験結果（'OK' / 'NG'）。記入されていない場合は None。
+        """
+        text_report_path = run_dir_path / f'{run_dir_path.name}.txt'
+        if not text_report_path.is_file():
+            return None
+        result = None
+        with text_report_path.open(encoding='utf-8', errors='replace') as f:
+            for line in f:
+                index = line.find('試験結果_')
+                if index >= 0:
+                    result = line[index + len('試験結果_'):].strip()
+        return result
+
+    def select_expired(self, policy: RetentionPolicy, now: Optional[float]=None) -> list[RunInfo]:
+        """
+        保持ポリシーのいずれの条件にも該当しない結果ディレクトリを抽出する。
+        keep_last と keep_days がどちらも未指定の場合は、何も抽出しない。
+
+        Args:
+            policy (RetentionPolicy): 保持ポリシー。
+            now (Optional[float]): 基準時刻（UNIX時間）。Noneの場合は現在時刻。
+
+        Returns:
+            list[RunInfo]: アーカイブ対象の結果ディレクトリの一覧。
+        """
+        if policy.keep_last is None and policy.keep_days is None:
+            return []
+        now = time.time() if now is None else now
+        runs_by_test_case = {}
+        for run in self.iter_runs():
+            runs_by_test_case.setdefault(run.test_case, []).append(run)
+
+        expired = []
+        for runs in runs_by_test_case.values():
+            runs.sort(key=lambda run: run.num, reverse=True)
+            for rank, run in enumerate(runs):
+                if policy.keep_last is not None and rank < policy.keep_last:
+                    continue
+                if policy.keep_days is not None and now - run.mtime < policy.keep_days * 86400:
+                    continue
+                if policy.keep_ng and run.result == 'NG':
+                    continue
+                expired.append(run)
+        return sorted(expired, key=lambda run: (run.test_case, run.num))
+
+    def get_archive_path(self, test_case: str) -> Path:
+        """
+        テストケースに対応するアーカイブのパスを生成する。
+
+        Args:
+            test_case (str): テストケース名。
+
+        Returns:
+            Path: アーカイブのパス。
+        """
+        return self.archive_dir_path / f'{test_case}.zip'
+
+    def archive(self, runs: list[RunInfo]) -> list[Path]:
+        """
+        結果ディレクトリをアーカイブへ追記し、元の結果ディレクトリを削除する。
+        ファイルは1つずつストリーミングで書き込み、アーカイブのクローズが完了してから削除する。
+        既にアーカイブ済みの実行は、アーカイブ内のファイルと一致する場合のみ結果ディレクトリを削除する。
+        アーカイブ内のファイルが結果ディレクトリの一部のみの場合は、アーカイブ内の実行を置き換える
+        （連番が再利用された別の実行は上書きも削除もしない）。
+        catalog が設定されている場合は、結果ディレクトリの削除前にアーカイブした実行をカタログに登録する。
+
+        Args:
+            runs (list[RunInfo]): アーカイブ対象の結果ディレクトリの一覧。
+
+        Returns:
+            list[Path]: アーカイブした（またはアーカイブ済みのため削除した）結果ディレクトリのパス一覧。
+        """
+        self.archive_dir_path.mkdir(parents=True, exist_ok=True)
+        runs_by_test_case = {}
+        for run in runs:
+            runs_by_test_case.setdefault(run.test_case, []).append(run)
+
+        archived = []
+        for test_case, test_case_runs in runs_by_test_case.items():
+            archive_path = self.get_archive_path(test_case)
+            archived_sizes = {}
+            if archive_path.is_file():
+                with zipfile.ZipFile(archive_path) as zf:
+                    for info in zf.infolist():
+                        run_name = info.filename.split('/', 1)[0]
+                        archived_sizes.setdefault(run_name, {})[info.filename] = info.file_size
+
+            written, pending, replaced = [], [], set()
+            for run in test_case_runs:
+                members = list(self._iter_members(run.path))
+                if run.path.name in archived_sizes:
+                    sizes = {arcname: file_path.stat().st_size for arcname, file_path in members}
+                    if archived_sizes[run.path.name] == sizes:
+                        written.append(run.path)
+                        continue
+                    if not archived_sizes[run.path.name].items() <= sizes.items():
+                        continue
+                    # 途中までしか書き込まれていない実行は、アーカイブ内の実行を置き換える
+                    replaced.add(run.path.name)
+                pending.append((run.path, members))
+            if pending:
+                self._write_archive(archive_path, pending, replaced)
+                written.extend(run_dir_path for run_dir_path, _ in pending)
+            if written and self.catalog is not None:
+                self.catalog.mark_archived(written, archive_path)
+            for run_dir_path in written:
+                shutil.rmtree(run_dir_path)
+            archived.extend(written)
+        return archived
+
+    def _write_archive(self, archive_path: Path, pending: list[tuple[Path, list[tuple[str, Path]]]],
+                       replaced: set[str]):
+        """
+        アーカイブに結果ディレクトリを追加する。
+        既存のアーカイブを直接書き換えず、同じディレクトリの一時ファイルに書き込んでクローズが完了してから置き換える。
+        書き込みの途中でプロセスが終了しても、既存のアーカイブ（アーカイブ済みの実行）は壊れない。
+
+        Args:
+            archive_path (Path): アーカイブのパス。
+            pending (list[tuple[Path, list[tuple[str, Path]]]]): 結果ディレクトリのパスと、含めるファイルの組の一覧。
+            replaced (set[str]): アーカイブから除いて置き換える実行（結果ディレクトリ名）。
+        """
+        temp_path = archive_path.with_name(f'.{archive_path.name}.{os.getpid()}.tmp')
+        is_append = archive_path.is_file() and not replaced
+        try:
+            if is_append:
+                shutil.copyfile(archive_path, temp_path)
+            with zipfile.ZipFile(temp_path, mode='a' if is_append else 'w', compression=zipfile.ZIP_DEFLATED) as zf:
+                if replaced and archive_path.is_file():
+                    with zipfile.ZipFile(archive_path) as source:
+                        for info in source.infolist():
+                            if info.filename.split('/', 1)[0] in replaced:
+                                continue
+                            with source.open(info) as src, zf.open(info, mode='w') as dst:
+                                shutil.copyfileobj(src, dst)
+                for _, members in pending:
+                    for arcname, file_path in members:
+                        compress_type = zipfile.ZIP_STORED if file_path.suffix.lower() in STORED_EXTENSIONS \
+                            else zipfile.ZIP_DEFLATED
+                        zf.write(file_path, arcname, compress_type=compress_type)
+            os.replace(temp_path, archive_path)
+        except BaseException:
+            temp_path.unlink(missing_ok=True)
+            raise
+
+    def _iter_members(self, run_dir_path: Path) -> Iterator[tuple[str, Path]]:
+        """
+        結果ディレクトリのアーカイブに含めるファイルを列挙する。
+        マニフェストで参照しているスクリーンショットは、画像の実体を本来のファイル名で含める。
+
+        Args:
+            run_dir_path (Path): 結果ディレクトリのパス。
+
+        Yields:
+            tuple[str, Path]: アーカイブ内の名前と、書き込むファイルのパスの組。
+        """
+        for file_path in sorted(run_dir_path.rglob('*')):
+            if file_path.is_file():
+                yield f'{run_dir_path.name}/{file_path.relative_to(run_dir_path).as_posix()}', file_path
+        store = ScreenshotStore(self.store_dir_path)
+        for manifest_path in sorted(run_dir_path.rglob(ScreenshotStore.MANIFEST_NAME)):
+            names = set()
+            with manifest_path.open(encoding='utf-8') as f:
+                names.update(json.loads(line)['name'] for line in f)
+            for name in sorted(names):
+                path = manifest_path.parent / name
+                blob_path = store.resolve(path)
+                if path.is_file() or blob_path is None or not blob_path.is_file():
+                    continue
+                yield f'{run_dir_path.name}/{path.relative_to(run_dir_path).as_posix()}', blob_path
+
+    def list_archived_runs(self, test_case: Optional[str]=None) -> list[str]:
+        """
+        アーカイブ済みの実行（結果ディレクトリ名）の一覧を取得する。
+
+        Args:
+            test_case (Optional[str]): テストケース名。Noneの場合は全テストケース。
+
+        Returns:
+            list[str]: 結果ディレクトリ名の一覧。
+        """
+        if test_case is not None:
+            archive_paths = [self.get_archive_path(test_case)]
+        else:
+            archive_paths = sorted(self.archive_dir_path.glob('*.zip'))
+        run_names = []
+        for archive_path in archive_paths:
+            if not archive_path.is_file():
+                continue
+            with zipfile.ZipFile(archive_path) as zf:
+                names = {name.split('/', 1)[0] for name in zf.namelist()}
+            run_names.extend(sorted(names, key=self._sort_key))
+        return run_names
+
+    def extract_run(self, run_name: str, dest_dir_path: Path) -> Path:
+        """
+        アーカイブから1回分の実行のみを展開する。
+
+        Args:
+            run_name (str): 結果ディレクトリ名（例: 'test_case_01_3'）。
+            dest_dir_path (Path): 展開先ディレクトリのパス。
+
+        Returns:
+            Path: 展開された結果ディレクトリのパス。
+
+        Raises:
+            FileNotFoundError: 指定の実行がアーカイブに存在しない場合。
+        """
+        match = self.RUN_DIR_PATTERN.match(run_name)
+        archive_path = self.get_archive_path(match.group(1)) if match else None
+        if archive_path is None or not archive_path.is_file():
+            raise FileNotFoundError(f'アーカイブが存在しない: {run_name}')
+        with zipfile.ZipFile(archive_path) as zf:
+            members = [name for name in zf.namelist() if name.startswith(f'{run_name}/')]
+            if not members:
+                raise FileNotFoundError(f'アーカイブに実行が存在しない: {run_name}')
+            zf.extractall(dest_dir_path, members=members)
+        return dest_dir_path / run_name
+
+    @classmethod
+    def _sort_key(cls, run_name: str) -> tuple[str, int]:
+        """
+        結果ディレクトリ名を連番の数値順に並べるためのキーを生成する。
+
+        Args:
+            run_name (str): 結果ディレクトリ名。
+
+        Returns:
+            tuple[str, int]: テストケース名と連番の組。
+        """
+        match = cls.RUN_DIR_PATTERN.match(run_name)
+        return (match.group(1), int(match.group(2))) if match else (run_name, 0)
@@ -0,0 +1,246 @@
+# Python
+import ast
+import hashlib
+import json
+import os
+import tempfile
+from typing import Optional
+from pathlib import Path
+
+# engine
+from script.engine.clock import get_clock
+
+class RunManifest:
+    """
+    テストケースごとの前回の試験結果と入力（スクリプト・依存モジュール）のハッシュを記録するクラス。
+
+    記録は 'results/.run_index/manifest.json' に保存し、実行をまたいで引き継ぐ。
+    依存モジュールはテストケーススクリプトの import 文を静的に解析し、
+    プロジェクトのパッケージ（'script.'）配下のモジュールを再帰的にたどって求める。
+    前回の試験結果（last_result）と、前回から変わった入力（changes）をもとに、再実行するテストケースを選び出せる。
+
+    Attributes:
+        results_dir_path (Path): 'results'ディレクトリのパス。
+        root_dir_path (Path): プロジェクトのパッケージ（'script'）を含むディレクトリのパス。
+        manifest_path (Path): 記録ファイルのパス。
+    """
+    MANIFEST_FILE_NAME = 'manifest.json'
+    PACKAGE_NAME = 'script'
+
+    def __init__(self, results_dir_path: Path, root_dir_path: Path):
+        """
+        Args:
+            results_dir_path (Path): 'results'ディレクトリのパス。
+            root_dir_path (Path): プロジェクトのパッケージ（'script'）を含むディレクトリのパス。
+        """
+        self.results_dir_path = results_dir_path
+        self.root_dir_path = root_dir_path.resolve()
+        self.manifest_path = results_dir_path / '.run_index' / self.MANIFEST_FILE_NAME
+        self._entries = self._load()
+        # 1回の実行中はファイルが変わらない前提で、ハッシュと import の解析結果を使い回す
+        self._file_hashes: dict[Path, str] = {}
+        self._imports: dict[Path, set[Path]] = {}
+
+    def _load(self) -> dict[str, dict]:
+        """
+        記録ファイルを読み込む。存在しない、または壊れている場合は空とする。
+
+        Returns:
+            dict[str, dict]: テストケース名と記録の辞書。
+        """
+        try:
+            with self.manifest_path.open(encoding='utf-8') as f:
+                entries = json.load(f)
+            return entries if isinstance(entries, dict) else {}
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def save(self):
+        """
+        記録ファイルを一時ファイル経由で置き換え、途中まで書き込まれた状態を残さない。
+        """
+        self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=self.manifest_path.parent, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(self._entries, f, ensure_ascii=False, indent=2, sort_keys=True)
+            os.replace(temp_path, self.manifest_path)
+        except BaseException:
+            Path(temp_path).unlink(missing_ok=True)
+            raise
+
+    def fingerprint(self, script_path: Path) -> dict:
+        """
+        テストケーススクリプトと依存モジュールのハッシュを求める。
+
+        Args:
+            script_path (Path): テストケーススクリプトのパス。
+
+        Returns:
+            dict: 'source'（スクリプトのハッシュ）と 'dependencies'（依存モジュールの相対パスとハッシュの辞書）。
+        """
+        script_path = script_path.resolve()
+        dependencies = {self._relative(path): self._hash_file(path)
+                        for path in sorted(self.dependencies(script_path))}
+        return {'source': self._hash_file(script_path), 'dependencies': dependencies}
+
+    def dependencies(self, script_path: Path) -> set[Path]:
+        """
+        テストケーススクリプトが直接・間接に import するプロジェクト内のモジュールを求める。
+
+        Args:
+            script_path (Path): テストケーススクリプトのパス。
+
+        Returns:
+            set[Path]: 依存モジュールのパス（スクリプト自身は含まない）。
+        """
+        script_path = script_path.resolve()
+        found = set()
+        pending = [script_path]
+        while pending:
+            for module_path in self._module_imports(pending.pop()):
+                if module_path not in found and module_path != script_path:
+                    found.add(module_path)
+                    pending.append(module_path)
+        return found
+
+    def record(self, test_case: str, result: str, fingerprint: dict,
+               report_dir_path: Optional[Path]=None):
+        """
+        テストケースの試験結果と入力のハッシュを記録する（保存は save で行う）。
+
+        Args:
+            test_case (str): テストケース名。
+            result (str): 試験結果（'OK' / 'NG'）。
+            fingerprint (dict): 実行前に fingerprint で求めたハッシュ。
+            report_dir_path (Optional[Path]): 結果ディレクトリのパス。Default to None.
+        """
+        self._entries[test_case] = {
+            'result': result,
+            'source': fingerprint['source'],
+            'dependencies': fingerprint['dependencies'],
+            'report_dir_path': str(report_dir_path) if report_dir_path else None,
+            'updated_at': get_clock().isoformat(timespec='seconds'),
+        }
+
+    def last_result(self, test_case: str) -> Optional[str]:
+        """
+        テストケースの前回の試験結果を取得する。
+
+        Args:
+            test_case (str): テストケース名。
+
+        Returns:
+            Optional[str]: 前回の試験結果。記録がない場合は None。
+        """
+        entry = self._entries.get(test_case)
+        return entry['result'] if entry is not None else None
+
+    def changes(self, script_path: Path) -> list[str]:
+        """
+        前回の実行から変わった入力を求める。
+
+        Args:
+            script_path (Path): テストケーススクリプトのパス。
+
+        Returns:
+            list[str]: 変わった入力（スクリプト・依存モジュールの相対パス）。記録がない場合は ['（記録なし）']。
+        """
+        entry = self._entries.get(script_path.stem)
+        if entry is None:
+            return ['（記録なし）']
+        current = self.fingerprint(script_path)
+        changed = []
+        if current['source'] != entry.get('source'):
+            changed.append(self._relative(script_path.resolve()))
+        previous_dependencies = entry.get('dependencies', {})
+        for name in sorted(current['dependencies'].keys() | previous_dependencies.keys()):
+            if current['dependencies'].get(name) != previous_dependencies.get(name):
+                changed.append(name)
+        return changed
+
+    def _module_imports(self, path: Path) -> set[Path]:
+        """
+        ファイル内の import 文（関数内での遅延 import を含む）から、プロジェクト内のモジュールのパスを求める。
+
+        Args:
+            path (Path): 解析するファイルのパス。
+
+        Returns:
+            set[Path]: import しているプロジェクト内のモジュールのパス。
+        """
+        cached = self._imports.get(path)
+        if cached is not None:
+            return cached
+        try:
+            tree = ast.parse(path.read_bytes(), filename=str(path))
+        except (OSError, SyntaxError):
+            tree = ast.Module(body=[], type_ignores=[])
+        module_paths = set()
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                for alias in node.names:
+                    module_paths.update(self._resolve_module(alias.name))
+            elif isinstance(node, ast.ImportFrom) and node.level == 0 and node.module:
+                module_paths.update(self._resolve_module(node.module))
+                # 'from script.lib import functions' のようにモジュールを import している場合
+                for alias in node.names:
+                    module_paths.update(self._resolve_module(f'{node.module}.{alias.name}'))
+        self._imports[path] = module_paths
+        return module_paths
+
+    def _resolve_module(self, module_name: str) -> list[Path]:
+        """
+        モジュール名に対応するプロジェクト内のファイル（親パッケージの __init__.py を含む）を求める。
+
+        Args:
+            module_name (str): モジュール名（例: 'script.lib.functions'）。
+
+        Returns:
+            list[Path]: 対応するファイルのパス。プロジェクト外のモジュールの場合は空。
+        """
+        parts = module_name.split('.')
+        if parts[0] != self.PACKAGE_NAME:
+            return []
+        paths = []
+        for depth in range(1, len(parts) + 1):
+            base_path = self.root_dir_path.joinpath(*parts[:depth])
+            if (base_path / '__init__.py').is_file():
+                paths.append(base_path / '__init__.py')
+            elif depth == len(parts) and base_path.with_suffix('.py').is_file():
+                paths.append(base_path.with_suffix('.py'))
+        return paths
+
+    def _hash_file(self, path: Path) -> str:
+        """
+        ファイルのハッシュ（SHA-256）を求める。
+
+        Args:
+            path (Path): ファイルのパス。
+
+        Returns:
+            str: 16進数のハッシュ。ファイルが存在しない場合は空文字列。
+        """
+        digest = self._file_hashes.get(path)
+        if digest is None:
+            try:
+                digest = hashlib.sha256(path.read_bytes()).hexdigest()
+            except FileNotFoundError:
+                digest = ''
+            self._file_hashes[path] = digest
+        return digest
+
+    def _relative(self, path: Path) -> str:
+        """
+        記録に使用するパス（root_dir_path からの相対パス）を求める。
+
+        Args:
+            path (Path): ファイルのパス。
+
+        Returns:
+            str: '/' 区切りの相対パス。root_dir_path 外の場合は絶対パス。
+        """
+        try:
+            return path.relative_to(self.root_dir_path).as_posix()
+        except ValueError:
+            return path.as_posix()
@@ -0,0 +1,121 @@
+# Python
+import os
+import re
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:
+    # fcntl が使えない環境（Windows）では、ディレクトリ作成の排他性のみで重複を防ぐ
+    fcntl = None
+
+class RunNumberAllocator:
+    """
+    テストケースの結果ディレクトリに付与する連番を払い出すクラス。
+
+    テストケースごとに最後に払い出した連番をカウンタファイルに保持し、
+    'results' ディレクトリを走査せずに O(1) で次の連番を払い出す。
+    カウンタファイルの更新はファイルロックで排他し、結果ディレクトリは既存の場合に失敗する
+    mkdir で作成するため、複数プロセスから同時に実行しても同じ連番は払い出されない。
+    カウンタファイルが存在しない場合は、'results' ディレクトリを走査して再構築する。
+
+    Attributes:
+        results_dir_path (Path): 'results'ディレクトリのパス。
+        test_case (str): テストケース名。
+        index_dir_path (Path): カウンタファイルを格納するディレクトリのパス。
+    """
+    INDEX_DIR_NAME = '.run_index'
+
+    def __init__(self, results_dir_path: Path, test_case: str):
+        """
+        Args:
+            results_dir_path (Path): 'results'ディレクトリのパス。
+            test_case (str): テストケース名。
+        """
+        self.results_dir_path = results_dir_path
+        self.test_case = test_case
+        self.index_dir_path = results_dir_path / self.INDEX_DIR_NAME
+        self._counter_path = self.index_dir_path / f'{test_case}.counter'
+        self._lock_path = self.index_dir_path / f'{test_case}.lock'
+        self._pattern = re.compile(rf'^{re.escape(test_case)}_(\d+)$')
+
+    def allocate(self) -> Path:
+        """
+        次の連番の結果ディレクトリを作成する。
+
+        Returns:
+            Path: 作成された結果ディレクトリのパス。
+        """
+        self.index_dir_path.mkdir(parents=True, exist_ok=True)
+        with self._lock():
+            num = self._read_counter() + 1
+            while True:
+                new_dir = self.results_dir_path / f'{self.test_case}_{num}'
+                try:
+                    new_dir.mkdir()
+                    break
+                except FileExistsError:
+                    # カウンタ導入前に作成された結果ディレクトリなどと衝突した場合は次の連番を試す
+                    num += 1
+            self._write_counter(num)
+        return new_dir
+
+    def rebuild(self) -> int:
+        """
+        'results' ディレクトリを走査し、既存の結果ディレクトリの連番の最大値を取得する。
+
+        Returns:
+            int: 連番の最大値。結果ディレクトリが存在しない場合は 0。
+        """
+        max_num = 0
+        with os.scandir(self.results_dir_path) as entries:
+            for entry in entries:
+                match = self._pattern.match(entry.name)
+                if match and entry.is_dir():
+                    max_num = max(max_num, int(match.group(1)))
+        return max_num
+
+    def _read_counter(self) -> int:
+        """
+        カウンタファイルから最後に払い出した連番を読み込む。存在しない、または壊れている場合は再構築する。
+
+        Returns:
+            int: 最後に払い出した連番。
+        """
+        try:
+            return int(self._counter_path.read_text(encoding='utf-8'))
+        except (FileNotFoundError, ValueError):
+            return self.rebuild()
+
+    def _write_counter(self, num: int):
+        """
+        カウンタファイルを一時ファイル経由で置き換え、途中まで書き込まれた状態を残さない。
+
+        Args:
+            num (int): 最後に払い出した連番。
+        """
+        fd, temp_path = tempfile.mkstemp(dir=self.index_dir_path, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(str(num))
+            os.replace(temp_path, self._counter_path)
+        except BaseException:
+            Path(temp_path).unlink(missing_ok=True)
+            raise
+
+    @contextmanager
+    def _lock(self):
+        """
+        テストケース単位のファイルロックを取得する。fcntl が使えない環境では何もしない。
+        """
+        if fcntl is None:
+            yield
+            return
+        with self._lock_path.open(mode='a') as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
@@ -1,5 +1,8 @@
 # Python
+import base64
+import functools
 import traceback
+from concurrent.futures import Future
 from datetime import datetime
 from typing import Optional
 from pathlib import Path
@@ -9,30 +12,58 @@ from zoneinfo import ZoneInfo
 from selenium import webdriver
 
 # engine
+from script.engine.event_log import EventLog, record_screenshot
 from script.engine.path_manager import PathManager 
+from script.engine.screenshot_buffer import ScreenshotBuffer
+from script.engine.screenshot_pipeline import ScreenshotPipeline
+from script.engine.screenshot_store import ScreenshotStore, write_png
+from script.engine.screenshot_transcoder import ScreenshotTranscoder
+from script.engine.step_tracer import StepTracer
 from script.engine.text_report import TextReport 
 from script.engine.datetime_utils import DatetimeUtils 
 
 class SaveScreenshot:
     """
     スクリーンショットを保存するクラス。
+    記録ファイル（EventLog）への記録は書き込みが完了した時点で行い、保存に失敗した画像や、
+    メモリ上に保持したまま書き込まずに破棄した画像は記録しない（buffer の場合は buffer.persist の書き込み時に記録する）。
+    transcoder で変換する場合は変換元の画像が削除されるため、変換の完了時に変換後の画像のパスを記録する。
 
     Attributes:
         path_manager (PathManager): パス生成に使用するインスタンス。
+        pipeline (Optional[ScreenshotPipeline]): 非同期書き込みに使用するインスタンス。Noneの場合は同期的に保存する。
+        store (Optional[ScreenshotStore]): 同期的に保存する際、重複を排除して保存するためのインスタンス。
+            非同期書き込みの場合は pipeline 側の設定に従う。
+        transcoder (Optional[ScreenshotTranscoder]): 保存後に再エンコード・サムネイル生成を行うインスタンス。
+        buffer (Optional[ScreenshotBuffer]): ディスクに書き込まずメモリ上に保持するためのインスタンス。
+            設定されている場合は pipeline・store より優先し、書き込みは buffer.persist の呼び出し時に行う。
     """
 
-    def __init__(self, path_manager: PathManager):
+    def __init__(self, path_manager: PathManager, pipeline: Optional[ScreenshotPipeline]=None,
+                 store: Optional[ScreenshotStore]=None, transcoder: Optional[ScreenshotTranscoder]=None,
+                 buffer: Optional[ScreenshotBuffer]=None):
         """
         Args:
             path (Path): スクリーンショットを保存するディレクトリ。
+            pipeline (Optional[ScreenshotPipeline]): 非同期書き込みに使用するインスタンス。Default to None.
+            store (Optional[ScreenshotStore]): 重複を排除して保存するためのインスタンス。Default to None.
+            transcoder (Optional[ScreenshotTranscoder]): 保存後に変換を行うインスタンス。Default to None.
+            buffer (Optional[ScreenshotBuffer]): メモリ上に保持するためのインスタンス。Default to None.
         """
         self.path_manager = path_manager
+        self.pipeline = pipeline
+        self.store = store
+        self.transcoder = transcoder
+        self.buffer = buffer
 
     def save(self, driver: webdriver.Remote, screenshot_name: str='',
              extension: Optional[str]='png', is_add_datetime: bool=True,
              datetime_format: str = "%Y%m%d_%H%M%S"):
         """
         スクリーンショット画像を指定パスに保存する。
+        pipeline が設定されている場合は画像データの取得のみを行い、デコードと書き込みは非同期に行う。
+        buffer が設定されている場合は画像データをメモリ上に保持するのみで、書き込みは行わない。
+        transcoder が設定されている場合は、保存完了後に変換を投入する。
 
         Args:
             driver (webdriver.Remote): webdriver.Remoteインスタンス。
@@ -42,9 +73,98 @@ class SaveScreenshot:
             datetime_format (str): 日付と時刻のフォーマット。Default to 'YYYYMMDD_HHMMSS'
         """
         path = self.path_manager.get_path(screenshot_name, extension, is_add_datetime, datetime_format)
-        driver.save_screenshot(str(path))
+        with StepTracer.trace(screenshot_name, 'screenshot'):
+            self._save(driver, screenshot_name, path)
 
-def create_save_screenshot(report_dir_path: Path):
+    def _save(self, driver: webdriver.Remote, screenshot_name: str, path: Path):
+        """
+        スクリーンショット画像を取得し、保存（または非同期書き込みへの投入）を行う。
+
+        Args:
+            driver (webdriver.Remote): webdriver.Remoteインスタンス。
+            screenshot_name (str): スクリーンショットファイル名。
+            path (Path): 保存先のパス。
+        """
+        if self.buffer is not None:
+            self.buffer.add(path, driver.get_screenshot_as_base64(), screenshot_name)
+            return
+        if self.pipeline is not None:
+            self._submit(screenshot_name, path, driver.get_screenshot_as_base64())
+            return
+        if self.store is not None:
+            is_saved = write_png(driver.get_screenshot_as_png(), path, self.store) is not None
+        else:
+            is_saved = driver.save_screenshot(str(path))
+        if is_saved:
+            self._on_saved(screenshot_name, path)
+
+    def save_png_base64(self, png_base64: str, screenshot_name: str='',
+                        extension: Optional[str]='png', is_add_datetime: bool=True,
+                        datetime_format: str = "%Y%m%d_%H%M%S") -> Path:
+        """
+        取得済みのスクリーンショット（Base64文字列）を保存する。
+        ドライバーを介さずに画像データを受け取る（非同期のクライアントで取得した場合など）以外は save と同じ。
+
+        Args:
+            png_base64 (str): PNG画像のBase64文字列。
+            screenshot_name (str): スクリーンショットファイル名。
+            extension (Optional[str]): 拡張子（例: 'png', 'txt'）。Noneの場合はfile_nameをそのまま使用。Default to '.png'
+            is_add_datetime (bool): ファイル名に日時を付加するか否かを判定するフラグ。Default to True.
+            datetime_format (str): 日付と時刻のフォーマット。Default to 'YYYYMMDD_HHMMSS'
+
+        Returns:
+            Path: 保存先のパス。
+        """
+        path = self.path_manager.get_path(screenshot_name, extension, is_add_datetime, datetime_format)
+        with StepTracer.trace(screenshot_name, 'screenshot'):
+            if self.buffer is not None:
+                self.buffer.add(path, png_base64, screenshot_name)
+            elif self.pipeline is not None:
+                self._submit(screenshot_name, path, png_base64)
+            elif write_png(base64.b64decode(png_base64), path, self.store) is not None:
+                self._on_saved(screenshot_name, path)
+        return path
+
+    def _submit(self, screenshot_name: str, path: Path, png_base64: str):
+        """
+        非同期書き込みへ投入する。書き込みの完了後に記録と変換の投入を行う。
+
+        Args:
+            screenshot_name (str): スクリーンショットファイル名。
+            path (Path): 保存先のパス。
+            png_base64 (str): PNG画像のBase64文字列。
+        """
+        # 書き込みの完了はパイプラインのスレッドで通知されるため、記録先は投入時に取得しておく
+        future = self.pipeline.submit(path, png_base64)
+        future.add_done_callback(functools.partial(self._on_written, screenshot_name, EventLog.current()))
+
+    def _on_written(self, screenshot_name: str, event_log: Optional[EventLog], future: Future):
+        """
+        非同期書き込みの完了後に記録と変換の投入を行う。書き込みに失敗した場合は何もしない。
+
+        Args:
+            screenshot_name (str): スクリーンショットファイル名。
+            event_log (Optional[EventLog]): 記録先の EventLog。Noneの場合は記録しない。
+            future (Future): ScreenshotPipeline の書き込み完了を表すFuture。
+        """
+        if future.exception() is not None or future.result() is None:
+            return
+        self._on_saved(screenshot_name, future.result(), event_log)
+
+    def _on_saved(self, screenshot_name: str, path: Path, event_log: Optional[EventLog]=None):
+        """
+        書き込みが完了したスクリーンショットを記録ファイルに記録し、変換を投入する。
+        変換する場合は、変換の完了後に変換後の画像のパスを記録する。
+
+        Args:
+            screenshot_name (str): スクリーンショットファイル名。
+            path (Path): 保存先のパス。
+            event_log (Optional[EventLog]): 記録先の EventLog。Noneの場合は使用中の EventLog。Default to None.
+        """
+        record_screenshot(event_log, path, self.path_manager.base_dir, self.transcoder, name=screenshot_name)
+
+def create_save_screenshot(report_dir_path: Path, pipeline: Optional[ScreenshotPipeline]=None,
+                           store: Optional[ScreenshotStore]=None):
     """
     スクリーンショット画像を保存する関数を生成するファクトリ関数。
     内部でPathManagerとSaveImageのインスタンスを生成し、画像を保存する関数を返す。
@@ -52,12 +172,14 @@ def create_save_screenshot(report_dir_path: Path):
 
     Args:
         report_dir_path (Path): スクリーンショットを保存するディレクトリ。
+        pipeline (Optional[ScreenshotPipeline]): 非同期書き込みに使用するインスタンス。Default to None.
+        store (Optional[ScreenshotStore]): 重複を排除して保存するためのインスタンス。Default to None.
 
     Returns:
         Callable[webdriver.Remote, str]: スクリーンショット画像を保存する関数。
     """
     path_manager = PathManager(report_dir_path)
-    save_image = SaveScreenshot(path_manager)
+    save_image = SaveScreenshot(path_manager, pipeline, store)
 
     def save(driver: webdriver.Remote, screenshot_name: str='',
              extension: Optional[str]='png', is_add_datetime: bool=True,
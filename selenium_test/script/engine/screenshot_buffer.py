@@ -0,0 +1,135 @@
+# Python
+import base64
+import threading
+from collections import deque
+from dataclasses import dataclass
+from typing import Optional
+from pathlib import Path
+
+# engine
+from script.engine.event_log import record_screenshot
+from script.engine.screenshot_store import ScreenshotStore, write_png
+from script.engine.screenshot_transcoder import ScreenshotTranscoder
+
+@dataclass(frozen=True)
+class BufferedScreenshot:
+    """
+    バッファ内の1枚のスクリーンショットを保持するクラス（変更不可）。
+
+    Attributes:
+        path (Path): 保存する場合の保存先のパス。
+        png_base64 (str): WebDriverから取得したPNG画像のBase64文字列（保存するまでデコードしない）。
+        name (str): スクリーンショット名（記録ファイルへの記録用）。
+    """
+    path: Path
+    png_base64: str
+    name: str = ''
+
+    @property
+    def size(self) -> int:
+        """
+        バッファ上で占めるバイト数（Base64文字列の長さ）を取得する。
+
+        Returns:
+            int: バイト数。
+        """
+        return len(self.png_base64)
+
+class ScreenshotBuffer:
+    """
+    1テストケース分のスクリーンショットを、ディスクに書き込まずメモリ上に保持するリングバッファ。
+
+    直近の max_count 枚、かつ合計 max_bytes バイト以内を保持し、超えた場合は古いものから破棄する
+    （1枚で max_bytes を超える場合も、最新の1枚は保持する）。
+    NGの記録時など、画像が必要になった時点で persist により結果ディレクトリへ書き込む。
+
+    Attributes:
+        max_count (int): 保持する枚数の上限。
+        max_bytes (int): 保持する合計バイト数の上限（Base64文字列の長さで数える）。
+        dropped (int): 上限を超えて破棄した枚数。
+    """
+    def __init__(self, max_count: int=20, max_bytes: int=64 * 1024 * 1024):
+        """
+        Args:
+            max_count (int): 保持する枚数の上限。Default to 20.
+            max_bytes (int): 保持する合計バイト数の上限。Default to 64MB.
+        """
+        self.max_count = max_count
+        self.max_bytes = max_bytes
+        self.dropped = 0
+        self._items: deque[BufferedScreenshot] = deque()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._items)
+
+    @property
+    def size(self) -> int:
+        """
+        保持しているスクリーンショットの合計バイト数を取得する。
+
+        Returns:
+            int: バイト数。
+        """
+        with self._lock:
+            return self._size
+
+    def add(self, path: Path, png_base64: str, name: str=''):
+        """
+        スクリーンショットを追加する。上限を超えた場合は古いものから破棄する。
+
+        Args:
+            path (Path): 保存する場合の保存先のパス。
+            png_base64 (str): PNG画像のBase64文字列。
+            name (str): スクリーンショット名（記録ファイルへの記録用）。Default to ''.
+        """
+        item = BufferedScreenshot(path, png_base64, name)
+        with self._lock:
+            self._items.append(item)
+            self._size += item.size
+            while len(self._items) > 1 and (len(self._items) > self.max_count or self._size > self.max_bytes):
+                self._size -= self._items.popleft().size
+                self.dropped += 1
+
+    def drain(self) -> list[BufferedScreenshot]:
+        """
+        保持しているスクリーンショットを古い順に全て取り出し、バッファを空にする。
+
+        Returns:
+            list[BufferedScreenshot]: 取り出したスクリーンショット。
+        """
+        with self._lock:
+            items = list(self._items)
+            self._items.clear()
+            self._size = 0
+        return items
+
+    def clear(self):
+        """
+        保持しているスクリーンショットを書き込まずに破棄する。
+        """
+        self.drain()
+
+    def persist(self, store: Optional[ScreenshotStore]=None,
+                transcoder: Optional[ScreenshotTranscoder]=None) -> list[Path]:
+        """
+        保持しているスクリーンショットを全て書き込み、バッファを空にする。
+        書き込んだスクリーンショットは、使用中の EventLog に保存先のパス（変換する場合は変換後のパス）とともに記録する。
+
+        Args:
+            store (Optional[ScreenshotStore]): 重複を排除して保存するためのインスタンス。Default to None.
+            transcoder (Optional[ScreenshotTranscoder]): 保存後に変換を行うインスタンス。Default to None.
+
+        Returns:
+            list[Path]: 書き込んだファイルのパス一覧。
+        """
+        paths = []
+        for item in self.drain():
+            path = write_png(base64.b64decode(item.png_base64), item.path, store)
+            if path is None:
+                continue
+            paths.append(path)
+            record_screenshot(None, path, item.path.parent, transcoder, name=item.name, buffered=True)
+        return paths
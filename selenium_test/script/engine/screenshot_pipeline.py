@@ -0,0 +1,109 @@
+# Python
+import base64
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Optional
+from pathlib import Path
+
+# engine
+from script.engine.screenshot_store import ScreenshotStore, write_png
+
+class ScreenshotPipeline:
+    """
+    スクリーンショットのデコードとファイル書き込みをスレッドプールで非同期に行うクラス。
+
+    テストスレッドはWebDriverから画像データ（Base64文字列）を取得するだけで次の手順へ進み、
+    デコードと書き込みはワーカースレッドが担当する。未完了の書き込みが上限に達した場合は、
+    空きができるまで submit をブロックする（バックプレッシャー）。
+
+    Attributes:
+        max_workers (int): 書き込みを行うワーカースレッド数。
+        max_pending (int): 未完了の書き込みの上限数。
+        store (Optional[ScreenshotStore]): 重複を排除して保存する場合の ScreenshotStore インスタンス。
+    """
+    def __init__(self, max_workers: int=2, max_pending: int=8, store: Optional[ScreenshotStore]=None):
+        """
+        Args:
+            max_workers (int): 書き込みを行うワーカースレッド数。Default to 2.
+            max_pending (int): 未完了の書き込みの上限数。Default to 8.
+            store (Optional[ScreenshotStore]): ScreenshotStoreインスタンス。Default to None.
+        """
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.store = store
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='ScreenshotPipeline')
+        self._semaphore = threading.BoundedSemaphore(max_pending)
+        self._futures = []
+        self._lock = threading.Lock()
+
+    def submit(self, path: Path, png_base64: str) -> Future:
+        """
+        スクリーンショットの書き込みを投入する。未完了の書き込みが上限に達している場合はブロックする。
+
+        Args:
+            path (Path): 保存先のパス。
+            png_base64 (str): WebDriverから取得したPNG画像のBase64文字列。
+
+        Returns:
+            Future: 書き込み完了を表すFuture。
+        """
+        self._semaphore.acquire()
+        try:
+            future = self._executor.submit(self._write, path, png_base64)
+        except BaseException:
+            self._semaphore.release()
+            raise
+        future.add_done_callback(lambda _: self._semaphore.release())
+        with self._lock:
+            self._futures.append(future)
+        return future
+
+    def join(self) -> list[Path]:
+        """
+        投入済みの全ての書き込みが完了するまで待機する。
+
+        Returns:
+            list[Path]: 書き込みが完了したファイルのパス一覧（投入順）。ファイルを開けなかったものは含まない。
+
+        Raises:
+            Exception: 書き込みに失敗したものがあれば、最初に失敗した書き込みの例外を送出する。
+        """
+        with self._lock:
+            futures, self._futures = self._futures, []
+        paths = []
+        error = None
+        for future in futures:
+            try:
+                path = future.result()
+                if path is not None: paths.append(path)
+            except Exception as e:
+                if error is None: error = e
+        if error is not None:
+            raise error
+        return paths
+
+    def close(self) -> list[Path]:
+        """
+        全ての書き込みの完了を待機し、ワーカースレッドを停止する。
+
+        Returns:
+            list[Path]: 書き込みが完了したファイルのパス一覧（投入順）。
+        """
+        try:
+            return self.join()
+        finally:
+            self._executor.shutdown(wait=True)
+
+    def _write(self, path: Path, png_base64: str) -> Optional[Path]:
+        """
+        Base64文字列をデコードしてファイルへ書き込む。ワーカースレッドで実行される。
+        driver.save_screenshot と同様に、ファイルを開けない場合は書き込みを行わない。
+
+        Args:
+            path (Path): 保存先のパス。
+            png_base64 (str): PNG画像のBase64文字列。
+
+        Returns:
+            Optional[Path]: 保存先のパス。ファイルを開けなかった場合は None。
+        """
+        return write_png(base64.b64decode(png_base64.encode('ascii')), path, self.store)
@@ -0,0 +1,189 @@
+# Python
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from typing import Optional
+from pathlib import Path
+
+def _get_umask() -> int:
+    """
+    プロセスの umask を取得する。
+    os.umask は設定と同時にしか取得できないため、書き込み用のスレッドが動き出す前（インポート時）に1度だけ呼び出す。
+
+    Returns:
+        int: umask の値。
+    """
+    umask = os.umask(0)
+    os.umask(umask)
+    return umask
+
+# blob のパーミッション（mkstemp は所有者のみ読み書きできる 0600 で作成するため、通常のファイル作成と同じ値に揃える）
+BLOB_MODE = 0o666 & ~_get_umask()
+
+class ScreenshotStore:
+    """
+    スクリーンショット画像を内容のハッシュ値で管理し、重複を排除して保存するクラス。
+
+    画像の実体（blob）はハッシュ値をファイル名として store_dir 配下に1度だけ書き込み、
+    結果ディレクトリ内の人が読めるファイル名からはハードリンクで参照する。
+    ハードリンクを作成できないファイルシステムでは、結果ディレクトリ内のマニフェストに
+    ファイル名と blob の対応を記録する。
+
+    Attributes:
+        store_dir (Path): blob を格納するディレクトリのパス。
+        is_hardlink (bool): ハードリンクで参照するか否かを判定するフラグ。False の場合は常にマニフェストに記録する。
+    """
+    MANIFEST_NAME = 'screenshot_manifest.jsonl'
+
+    def __init__(self, store_dir: Path, is_hardlink: bool=True):
+        """
+        Args:
+            store_dir (Path): blob を格納するディレクトリのパス。
+            is_hardlink (bool): ハードリンクで参照するか否かを判定するフラグ。Default to True.
+        """
+        self.store_dir = store_dir
+        self.is_hardlink = is_hardlink
+        self._manifest_lock = threading.Lock()
+
+    def get_blob_path(self, digest: str) -> Path:
+        """
+        ハッシュ値に対応する blob のパスを生成する。
+
+        Args:
+            digest (str): 画像データのハッシュ値（16進数文字列）。
+
+        Returns:
+            Path: blob のパス。
+        """
+        return self.store_dir / digest[:2] / f'{digest}.png'
+
+    def put(self, png: bytes, path: Path) -> Path:
+        """
+        画像データを保存し、path から参照できるようにする。
+        同じ内容の blob が既に存在する場合は書き込みを行わない。
+
+        Args:
+            png (bytes): PNG画像データ。
+            path (Path): 結果ディレクトリ内の保存先のパス。
+
+        Returns:
+            Path: blob のパス。
+        """
+        digest = hashlib.sha256(png).hexdigest()
+        blob_path = self.get_blob_path(digest)
+        if not blob_path.is_file():
+            self._write_blob(blob_path, png)
+
+        if self.is_hardlink:
+            try:
+                if path.exists(): path.unlink()
+                os.link(blob_path, path)
+                return blob_path
+            except OSError:
+                pass
+        self._add_manifest_entry(path, blob_path)
+        return blob_path
+
+    def resolve(self, path: Path) -> Optional[Path]:
+        """
+        結果ディレクトリ内のファイル名から、画像の実体のパスを取得する。
+
+        Args:
+            path (Path): 結果ディレクトリ内のファイルのパス。
+
+        Returns:
+            Optional[Path]: 画像の実体のパス。見つからない場合は None。
+        """
+        if path.is_file():
+            return path
+        manifest_path = path.parent / self.MANIFEST_NAME
+        if not manifest_path.is_file():
+            return None
+        blob_path = None
+        with manifest_path.open(encoding='utf-8') as f:
+            for line in f:
+                entry = json.loads(line)
+                if entry['name'] == path.name:
+                    blob_path = self.store_dir / entry['blob']
+        return blob_path
+
+    def collect_garbage(self, results_dir_path: Path) -> int:
+        """
+        どの結果ディレクトリからも参照されなくなった blob を削除する。
+
+        Args:
+            results_dir_path (Path): 'results' ディレクトリのパス。マニフェストの探索に使用する。
+
+        Returns:
+            int: 削除した blob の数。
+        """
+        referenced = set()
+        for manifest_path in results_dir_path.glob(f'*/{self.MANIFEST_NAME}'):
+            with manifest_path.open(encoding='utf-8') as f:
+                referenced.update(json.loads(line)['blob'] for line in f)
+
+        removed = 0
+        for blob_path in self.store_dir.glob('*/*.png'):
+            relative = blob_path.relative_to(self.store_dir).as_posix()
+            # ハードリンクが残っていればリンク数は2以上となる
+            if blob_path.stat().st_nlink <= 1 and relative not in referenced:
+                blob_path.unlink()
+                removed += 1
+        return removed
+
+    @staticmethod
+    def _write_blob(blob_path: Path, png: bytes):
+        """
+        blob を一時ファイル経由で書き込み、不完全な blob が参照されないようにする。
+
+        Args:
+            blob_path (Path): blob のパス。
+            png (bytes): PNG画像データ。
+        """
+        blob_path.parent.mkdir(parents=True, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=blob_path.parent, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(png)
+            os.chmod(temp_path, BLOB_MODE)
+            os.replace(temp_path, blob_path)
+        except BaseException:
+            Path(temp_path).unlink(missing_ok=True)
+            raise
+
+    def _add_manifest_entry(self, path: Path, blob_path: Path):
+        """
+        結果ディレクトリ内のマニフェストにファイル名と blob の対応を追記する。
+
+        Args:
+            path (Path): 結果ディレクトリ内の保存先のパス。
+            blob_path (Path): blob のパス。
+        """
+        entry = {'name': path.name, 'blob': blob_path.relative_to(self.store_dir).as_posix()}
+        with self._manifest_lock:
+            with (path.parent / self.MANIFEST_NAME).open(mode='a', encoding='utf-8') as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+
+def write_png(png: bytes, path: Path, store: Optional[ScreenshotStore]=None) -> Optional[Path]:
+    """
+    PNG画像データを保存する。store が指定されている場合は重複を排除して保存する。
+    driver.save_screenshot と同様に、ファイルを開けない場合は保存を行わない。
+
+    Args:
+        png (bytes): PNG画像データ。
+        path (Path): 保存先のパス。
+        store (Optional[ScreenshotStore]): ScreenshotStoreインスタンス。Default to None.
+
+    Returns:
+        Optional[Path]: 保存先のパス。ファイルを開けなかった場合は None。
+    """
+    try:
+        if store is not None:
+            store.put(png, path)
+        else:
+            path.write_bytes(png)
+    except OSError:
+        return None
+    return path
@@ -0,0 +1,220 @@
+# Python
+import importlib.util
+import os
+import threading
+import time
+from concurrent.futures import CancelledError, Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Optional
+from pathlib import Path
+
+# 形式ごとの拡張子
+EXTENSIONS = {'png': 'png', 'webp': 'webp', 'jpeg': 'jpg'}
+
+@dataclass
+class TranscodeResult:
+    """
+    1画像の変換結果を保持するクラス。
+
+    Attributes:
+        source_path (Path): 変換元の画像のパス。
+        output_path (Path): 変換後の画像のパス。
+        thumbnail_path (Optional[Path]): サムネイル画像のパス。生成しない場合は None。
+        source_bytes (int): 変換元の画像のバイト数。
+        output_bytes (int): 変換後の画像のバイト数。
+        elapsed (float): 変換に要した時間（秒）。
+    """
+    source_path: Path
+    output_path: Path
+    thumbnail_path: Optional[Path]
+    source_bytes: int
+    output_bytes: int
+    elapsed: float
+
+def transcode_image(source_path: Path, output_dir: Path, image_format: str, quality: int,
+                    is_lossless: bool, thumbnail_size: Optional[tuple[int, int]],
+                    is_keep_source: bool) -> TranscodeResult:
+    """
+    画像を指定形式に再エンコードし、サムネイルを生成する。ワーカープロセスで実行される。
+
+    Args:
+        source_path (Path): 変換元の画像のパス。
+        output_dir (Path): 変換後の画像の保存先ディレクトリ。
+        image_format (str): 変換後の形式（'png' / 'webp' / 'jpeg'）。
+        quality (int): 非可逆圧縮時の品質（1〜100）。
+        is_lossless (bool): 可逆圧縮とするか否かを判定するフラグ（webp のみ有効）。
+        thumbnail_size (Optional[tuple[int, int]]): サムネイルの最大サイズ（幅, 高さ）。Noneの場合は生成しない。
+        is_keep_source (bool): 変換元の画像を残すか否かを判定するフラグ。
+
+    Returns:
+        TranscodeResult: 変換結果。
+    """
+    # Pillow はワーカープロセス内でのみ読み込む
+    from PIL import Image
+
+    start = time.perf_counter()
+    source_bytes = source_path.stat().st_size
+    extension = EXTENSIONS[image_format]
+    output_path = output_dir / f'{source_path.stem}.{extension}'
+    thumbnail_path = None
+
+    with Image.open(source_path) as image:
+        image.load()
+        if image_format == 'jpeg' and image.mode != 'RGB':
+            image = image.convert('RGB')
+        options = {'optimize': True} if image_format != 'webp' else {'method': 4}
+        if image_format == 'webp':
+            options['lossless'] = is_lossless
+        if image_format != 'png':
+            options['quality'] = quality
+        output_dir.mkdir(parents=True, exist_ok=True)
+        # 変換元がハードリンク（ScreenshotStore）の場合に実体を書き換えないよう、一時ファイル経由で置き換える
+        temp_path = output_dir / f'.{output_path.name}.tmp'
+        image.save(temp_path, format=image_format.upper(), **options)
+        os.replace(temp_path, output_path)
+
+        if thumbnail_size is not None:
+            thumbnail_dir = output_dir / 'thumbnails'
+            thumbnail_dir.mkdir(exist_ok=True)
+            thumbnail_path = thumbnail_dir / f'{source_path.stem}.{extension}'
+            image.thumbnail(thumbnail_size)
+            image.save(thumbnail_path, format=image_format.upper(), **options)
+
+    output_bytes = output_path.stat().st_size
+    if not is_keep_source and output_path != source_path:
+        source_path.unlink()
+    return TranscodeResult(source_path=source_path,
+                           output_path=output_path,
+                           thumbnail_path=thumbnail_path,
+                           source_bytes=source_bytes,
+                           output_bytes=output_bytes,
+                           elapsed=time.perf_counter() - start)
+
+class ScreenshotTranscoder:
+    """
+    保存済みのスクリーンショットを再エンコードし、サムネイルを生成するクラス。
+
+    CPU負荷の高いエンコード処理はプロセスプールで実行し、テストスレッドを停止させない。
+    画像処理には Pillow を使用する（requirements.txt を参照）。
+
+    Attributes:
+        image_format (str): 変換後の形式（'png' / 'webp' / 'jpeg'）。
+        quality (int): 非可逆圧縮時の品質（1〜100）。
+        is_lossless (bool): 可逆圧縮とするか否かを判定するフラグ（webp のみ有効）。
+        thumbnail_size (Optional[tuple[int, int]]): サムネイルの最大サイズ（幅, 高さ）。
+        is_keep_source (bool): 変換元の画像を残すか否かを判定するフラグ。
+        output_dir (Optional[Path]): 変換後の画像の保存先ディレクトリ。Noneの場合は変換元と同じディレクトリ。
+    """
+    def __init__(self, image_format: str='webp', quality: int=80, is_lossless: bool=True,
+                 thumbnail_size: Optional[tuple[int, int]]=(320, 180), is_keep_source: bool=False,
+                 output_dir: Optional[Path]=None, max_workers: Optional[int]=None):
+        """
+        Args:
+            image_format (str): 変換後の形式（'png' / 'webp' / 'jpeg'）。Default to 'webp'.
+            quality (int): 非可逆圧縮時の品質（1〜100）。Default to 80.
+            is_lossless (bool): 可逆圧縮とするか否かを判定するフラグ（webp のみ有効）。Default to True.
+            thumbnail_size (Optional[tuple[int, int]]): サムネイルの最大サイズ（幅, 高さ）。Default to (320, 180).
+            is_keep_source (bool): 変換元の画像を残すか否かを判定するフラグ。Default to False.
+            output_dir (Optional[Path]): 変換後の画像の保存先ディレクトリ。Default to None.
+            max_workers (Optional[int]): ワーカープロセス数。Noneの場合はCPU数。
+        """
+        if image_format not in EXTENSIONS:
+            raise ValueError(f'未対応の画像形式: {image_format}')
+        if importlib.util.find_spec('PIL') is None:
+            raise ImportError('スクリーンショットの変換には Pillow が必要（pip install -r requirements.txt）')
+        self.image_format = image_format
+        self.quality = quality
+        self.is_lossless = is_lossless
+        self.thumbnail_size = thumbnail_size
+        self.is_keep_source = is_keep_source
+        self.output_dir = output_dir
+        self._executor = ProcessPoolExecutor(max_workers=max_workers)
+        self._futures = []
+        self._lock = threading.Lock()
+
+    def submit(self, source_path: Path, callback: Optional[Callable[[Future], None]]=None) -> Future:
+        """
+        画像の変換を投入する。
+
+        Args:
+            source_path (Path): 変換元の画像のパス。
+            callback (Optional[Callable[[Future], None]]): 変換の完了時（失敗時を含む）に変換のFutureを渡して呼び出す関数。
+                join() は呼び出しの完了まで待機する。Default to None.
+
+        Returns:
+            Future: 変換結果（TranscodeResult）を返すFuture。
+        """
+        output_dir = self.output_dir if self.output_dir is not None else source_path.parent
+        future = self._executor.submit(transcode_image, source_path, output_dir, self.image_format,
+                                       self.quality, self.is_lossless, self.thumbnail_size, self.is_keep_source)
+        if callback is not None:
+            future = self._chain(future, callback)
+        with self._lock:
+            self._futures.append(future)
+        return future
+
+    @staticmethod
+    def _chain(future: Future, callback: Callable[[Future], None]) -> Future:
+        """
+        変換の完了後に関数を呼び出し、呼び出しの完了後に変換結果を返すFutureを生成する。
+
+        Args:
+            future (Future): 変換のFuture。
+            callback (Callable[[Future], None]): 変換の完了時に呼び出す関数。
+
+        Returns:
+            Future: 関数の呼び出し後に変換結果を返すFuture。関数が例外を送出した場合はその例外を返す。
+        """
+        chained = Future()
+        chained.set_running_or_notify_cancel()
+
+        def on_done(done: Future):
+            try:
+                callback(done)
+            except Exception as e:
+                chained.set_exception(e)
+                return
+            if done.cancelled():
+                chained.set_exception(CancelledError())
+            elif done.exception() is not None:
+                chained.set_exception(done.exception())
+            else:
+                chained.set_result(done.result())
+
+        future.add_done_callback(on_done)
+        return chained
+
+    def join(self) -> list[TranscodeResult]:
+        """
+        投入済みの全ての変換が完了するまで待機する。
+
+        Returns:
+            list[TranscodeResult]: 変換結果の一覧（投入順）。
+
+        Raises:
+            Exception: 変換に失敗したものがあれば、最初に失敗した変換の例外を送出する。
+        """
+        with self._lock:
+            futures, self._futures = self._futures, []
+        results = []
+        error = None
+        for future in futures:
+            try:
+                results.append(future.result())
+            except Exception as e:
+                if error is None: error = e
+        if error is not None:
+            raise error
+        return results
+
+    def close(self) -> list[TranscodeResult]:
+        """
+        全ての変換の完了を待機し、ワーカープロセスを停止する。
+
+        Returns:
+            list[TranscodeResult]: 変換結果の一覧（投入順）。
+        """
+        try:
+            return self.join()
+        finally:
+            self._executor.shutdown(wait=True)
@@ -0,0 +1,212 @@
+# Python
+import threading
+from typing import Callable, Optional
+
+# Selenium
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+
+class SessionPool:
+    """
+    WebDriverセッションを使い回すためのプールクラス。
+
+    セッションの起動コストを削減するため、使用済みのセッションを初期化してプールに戻し、
+    次のテストケースへ払い出す。ヘルスチェックに失敗したセッションや、
+    最大再利用回数に達したセッションは破棄する。
+
+    Attributes:
+        factory (Callable[[], webdriver.Remote]): 新規セッションを生成する関数。
+        max_size (int): プールが保持するセッション数の上限。
+        max_reuse (int): 1セッションあたりの最大使用回数。
+    """
+    def __init__(self, factory: Callable[[], webdriver.Remote], max_size: int=1, max_reuse: int=20):
+        """
+        Args:
+            factory (Callable[[], webdriver.Remote]): 新規セッションを生成する関数。
+            max_size (int): プールが保持するセッション数の上限。Default to 1.
+            max_reuse (int): 1セッションあたりの最大使用回数。Default to 20.
+        """
+        self.factory = factory
+        self.max_size = max_size
+        self.max_reuse = max_reuse
+        self._idle = []
+        self._use_counts = {}
+        self._condition = threading.Condition()
+        self._is_closed = False
+
+    def prewarm(self, count: Optional[int]=None):
+        """
+        セッションを事前に生成してプールに格納する。
+
+        Args:
+            count (Optional[int]): 生成するセッション数。Noneの場合は max_size まで生成する。
+        """
+        count = self.max_size if count is None else count
+        for _ in range(count):
+            with self._condition:
+                if len(self._use_counts) >= self.max_size:
+                    return
+            driver = self._create()
+            with self._condition:
+                self._idle.append(driver)
+                self._condition.notify()
+
+    def acquire(self, timeout: Optional[float]=None) -> webdriver.Remote:
+        """
+        プールからセッションを払い出す。
+
+        アイドル中のセッションがあればヘルスチェックを行った上で払い出し、
+        なければ上限数に達するまで新規に生成する。上限に達している場合は返却を待つ。
+
+        Args:
+            timeout (Optional[float]): 返却を待つ最大秒数。Noneの場合は無期限に待つ。
+
+        Returns:
+            webdriver.Remote: webdriver.Remoteインスタンス。
+        """
+        while True:
+            with self._condition:
+                if self._is_closed:
+                    raise RuntimeError('SessionPool はクローズ済み')
+                if not self._idle and len(self._use_counts) >= self.max_size:
+                    if not self._condition.wait_for(
+                            lambda: self._idle or len(self._use_counts) < self.max_size or self._is_closed,
+                            timeout=timeout):
+                        raise TimeoutError('SessionPool からセッションを取得できない（タイムアウト）')
+                    continue
+                driver = self._idle.pop() if self._idle else None
+
+            if driver is None:
+                return self._create()
+            if self.is_healthy(driver):
+                return driver
+            self._discard(driver)
+
+    def release(self, driver: webdriver.Remote):
+        """
+        使用済みのセッションをプールに返却する。
+
+        最大使用回数に達したセッション、または初期化に失敗したセッションは破棄する。
+
+        Args:
+            driver (webdriver.Remote): webdriver.Remoteインスタンス。
+        """
+        with self._condition:
+            if driver not in self._use_counts:
+                # プール管理外のセッションはそのまま終了する
+                self._quit(driver)
+                return
+            self._use_counts[driver] += 1
+            is_expired = self._is_closed or self._use_counts[driver] >= self.max_reuse
+
+        if is_expired or not self.reset(driver):
+            self._discard(driver)
+            return
+        with self._condition:
+            self._idle.append(driver)
+            self._condition.notify()
+
+    def reset(self, driver: webdriver.Remote) -> bool:
+        """
+        セッションを初期状態に戻す。
+
+        余分なウィンドウを閉じ、Cookie・Web Storageを削除した上で about:blank に遷移する。
+
+        Args:
+            driver (webdriver.Remote): webdriver.Remoteインスタンス。
+
+        Returns:
+            bool: 初期化に成功すれば True、失敗すれば False。
+        """
+        try:
+            handles = driver.window_handles
+            for handle in handles[1:]:
+                driver.switch_to.window(handle)
+                driver.close()
+            driver.switch_to.window(handles[0])
+            try:
+                # 表示中のオリジンに限らず全てのCookieを削除する（Chromium系のみ）
+                driver.execute('executeCdpCommand', {'cmd': 'Network.clearBrowserCookies', 'params': {}})
+            except WebDriverException:
+                driver.delete_all_cookies()
+            driver.execute_script(
+                'try { window.localStorage.clear(); window.sessionStorage.clear(); } catch (e) {}')
+            driver.get('about:blank')
+            return True
+        except WebDriverException:
+            return False
+
+    def is_healthy(self, driver: webdriver.Remote) -> bool:
+        """
+        セッションが応答可能か確認する。
+
+        Args:
+            driver (webdriver.Remote): webdriver.Remoteインスタンス。
+
+        Returns:
+            bool: 応答可能であれば True、そうでなければ False。
+        """
+        try:
+            return driver.execute_script('return 1;') == 1
+        except WebDriverException:
+            return False
+
+    def close(self):
+        """
+        プールをクローズし、アイドル中の全セッションを終了する。
+        払い出し中のセッションは返却時に終了する。
+        """
+        with self._condition:
+            self._is_closed = True
+            idle, self._idle = self._idle, []
+            self._condition.notify_all()
+        for driver in idle:
+            self._discard(driver)
+
+    def _create(self) -> webdriver.Remote:
+        """
+        新規セッションを生成し、プールの管理対象に加える。
+
+        Returns:
+            webdriver.Remote: webdriver.Remoteインスタンス。
+        """
+        with self._condition:
+            # 生成中も上限数に含める
+            placeholder = object()
+            self._use_counts[placeholder] = 0
+        try:
+            driver = self.factory()
+        except BaseException:
+            with self._condition:
+                del self._use_counts[placeholder]
+                self._condition.notify()
+            raise
+        with self._condition:
+            del self._use_counts[placeholder]
+            self._use_counts[driver] = 0
+        return driver
+
+    def _discard(self, driver: webdriver.Remote):
+        """
+        セッションを終了し、プールの管理対象から外す。
+
+        Args:
+            driver (webdriver.Remote): webdriver.Remoteインスタンス。
+        """
+        self._quit(driver)
+        with self._condition:
+            self._use_counts.pop(driver, None)
+            self._condition.notify()
+
+    @staticmethod
+    def _quit(driver: webdriver.Remote):
+        """
+        セッションを終了する。終了時の例外は無視する。
+
+        Args:
+            driver (webdriver.Remote): webdriver.Remoteインスタンス。
+        """
+        try:
+            driver.quit()
+        except WebDriverException:
+            pass
@@ -0,0 +1,252 @@
+# Python
+import contextlib
+import json
+import os
+import threading
+import time
+from contextvars import ContextVar
+from typing import Any, Iterator, Optional
+from pathlib import Path
+
+# Selenium
+from selenium import webdriver
+
+class StepTracer:
+    """
+    試験手順ごとの所要時間を計測し、トレースイベント形式で出力するクラス。
+
+    procedure / expected_result の記入を区切りとして手順（step）を自動的に開始・終了し、
+    手順内で呼び出された関数の処理時間を区間（span）として記録する。時間計測には
+    単調増加する高分解能タイマー（time.perf_counter_ns）を使用する。
+    出力するJSONは Chrome のトレースビューア（chrome://tracing、Perfetto）で読み込める。
+    集計表では、待機・スクリーンショットの区間内で発行したWebDriverコマンドは外側の区間の種類として集計し、
+    同じ時間を複数の種類に重複して計上しない。
+
+    Attributes:
+        name (str): トレース名（テストケースの結果ディレクトリ名など）。
+    """
+    # 現在のテストケースで使用中のインスタンス（functions 内の関数から参照する）
+    _current: ContextVar[Optional['StepTracer']] = ContextVar('current_step_tracer', default=None)
+    # 実行中の区間のうち、集計表で集計する最も外側の区間の種類
+    _summary_category: ContextVar[Optional[str]] = ContextVar('current_summary_category', default=None)
+
+    # 集計表で個別に集計する区間の種類と表示名
+    SUMMARY_CATEGORIES = {'wait': '待機', 'screenshot': 'スクリーンショット', 'webdriver': 'WebDriver'}
+
+    def __init__(self, name: str, first_step: str='準備'):
+        """
+        Args:
+            name (str): トレース名。
+            first_step (str): 最初の procedure / expected_result が記入されるまでの手順名。Default to '準備'.
+        """
+        self.name = name
+        self._origin_ns = time.perf_counter_ns()
+        self._events = []
+        self._steps = []
+        self._step_name = first_step
+        self._step_index = 0
+        self._step_start_ns = self._origin_ns
+        self._category_totals = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def current(cls) -> Optional['StepTracer']:
+        """
+        使用中の StepTracer を取得する。
+
+        Returns:
+            Optional[StepTracer]: StepTracerインスタンス。設定されていない場合は None。
+        """
+        return cls._current.get()
+
+    @property
+    def step_index(self) -> int:
+        """
+        実行中の手順の番号（最初の procedure / expected_result の記入前は 0）。
+        """
+        return self._step_index
+
+    def activate(self):
+        """
+        このインスタンスを使用中の StepTracer として設定する。
+        """
+        self._current.set(self)
+
+    @classmethod
+    def install(cls, driver: webdriver.Remote):
+        """
+        ドライバーのコマンド実行部をラップし、使用中の StepTracer にWebDriverコマンドを区間（'webdriver'）として記録させる。
+        同じドライバーに対して複数回呼び出しても、ラップは1度だけ行う。
+
+        Args:
+            driver (webdriver.Remote): webdriver.Remoteインスタンス。
+        """
+        executor = driver.command_executor
+        if getattr(executor, '_is_traced', False):
+            return
+        original_execute = executor.execute
+
+        def execute(command: str, params: dict) -> Any:
+            with cls.trace(command, 'webdriver'):
+                return original_execute(command, params)
+
+        executor.execute = execute
+        executor._is_traced = True
+
+    @classmethod
+    @contextlib.contextmanager
+    def trace(cls, name: str, category: str='function', **args) -> Iterator[None]:
+        """
+        使用中の StepTracer に区間を記録する。設定されていない場合は何もしない。
+
+        Args:
+            name (str): 区間名。
+            category (str): 区間の種類（'function' / 'wait' / 'screenshot' / 'webdriver' など）。Default to 'function'.
+            **args: トレースイベントに付加する情報。
+        """
+        tracer = cls._current.get()
+        if tracer is None:
+            yield
+            return
+        with tracer.span(name, category, **args):
+            yield
+
+    @contextlib.contextmanager
+    def span(self, name: str, category: str='function', **args) -> Iterator[None]:
+        """
+        with ブロックの処理時間を区間として記録する。
+
+        Args:
+            name (str): 区間名。
+            category (str): 区間の種類。Default to 'function'.
+            **args: トレースイベントに付加する情報。
+        """
+        step_name, step_index = self._step_name, self._step_index
+        is_summary = category in self.SUMMARY_CATEGORIES and self._summary_category.get() is None
+        token = self._summary_category.set(category) if is_summary else None
+        start_ns = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            end_ns = time.perf_counter_ns()
+            if token is not None:
+                self._summary_category.reset(token)
+            self._add_event(name, category, start_ns, end_ns, step=step_name, step_index=step_index, **args)
+            if is_summary:
+                with self._lock:
+                    key = (step_index, category)
+                    self._category_totals[key] = self._category_totals.get(key, 0.0) + (end_ns - start_ns) / 1e9
+
+    def start_step(self, name: str):
+        """
+        実行中の手順を終了し、新しい手順を開始する。
+
+        Args:
+            name (str): 手順名。
+        """
+        now_ns = time.perf_counter_ns()
+        self._close_step(now_ns)
+        self._step_name = name
+        self._step_index += 1
+        self._step_start_ns = now_ns
+
+    def end(self):
+        """
+        実行中の手順を終了する。
+        """
+        self._close_step(time.perf_counter_ns())
+        self._step_name = None
+
+    def to_trace_events(self) -> dict:
+        """
+        記録した区間をトレースイベント形式（Trace Event Format）に変換する。
+
+        Returns:
+            dict: トレースイベント形式の辞書。
+        """
+        with self._lock:
+            events = list(self._events)
+        return {'traceEvents': events, 'displayTimeUnit': 'ms', 'otherData': {'name': self.name}}
+
+    def export(self, path: Path):
+        """
+        トレースイベント形式のJSONファイルを出力する。
+
+        Args:
+            path (Path): 出力先のパス。
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open(mode='w', encoding='utf-8') as f:
+            json.dump(self.to_trace_events(), f, ensure_ascii=False)
+
+    def summary_rows(self) -> list[dict]:
+        """
+        手順ごとの所要時間の内訳を取得する。
+
+        Returns:
+            list[dict]: 手順ごとの内訳（step_index, name, total, SUMMARY_CATEGORIES の各種類, other。時間は秒）。
+        """
+        with self._lock:
+            steps = list(self._steps)
+            category_totals = dict(self._category_totals)
+
+        rows = []
+        for index, name, duration in steps:
+            breakdown = {category: category_totals.get((index, category), 0.0) for category in self.SUMMARY_CATEGORIES}
+            rows.append({'step_index': index, 'name': name, 'total': duration, **breakdown,
+                         'other': duration - sum(breakdown.values())})
+        return rows
+
+    def summary_lines(self) -> list[str]:
+        """
+        手順ごとの所要時間の内訳を集計表の形式で取得する。
+
+        Returns:
+            list[str]: 集計表の各行。
+        """
+        rows = self.summary_rows()
+        header = '  '.join(['合計(秒)'] + [f'{label}(秒)' for label in self.SUMMARY_CATEGORIES.values()]
+                           + ['その他(秒)', '手順'])
+        lines = ['===== 手順別所要時間 =====', header]
+        for row in rows:
+            columns = [f'{row["total"]:.3f}'] + [f'{row[category]:.3f}' for category in self.SUMMARY_CATEGORIES]
+            lines.append('  '.join(columns + [f'{row["other"]:.3f}', row['name']]))
+        lines.append(f'合計: {sum(row["total"] for row in rows):.3f}秒')
+        return lines
+
+    def _close_step(self, end_ns: int):
+        """
+        実行中の手順を区間として記録する。
+
+        Args:
+            end_ns (int): 手順の終了時刻（ナノ秒）。
+        """
+        if self._step_name is None:
+            return
+        self._add_event(self._step_name, 'step', self._step_start_ns, end_ns,
+                        step=self._step_name, step_index=self._step_index)
+        with self._lock:
+            # 同名の手順が複数回記入された場合も、記入順に別の手順として扱う
+            self._steps.append((self._step_index, self._step_name, (end_ns - self._step_start_ns) / 1e9))
+
+    def _add_event(self, name: str, category: str, start_ns: int, end_ns: int, **args):
+        """
+        トレースイベント（完了イベント 'X'）を追加する。
+
+        Args:
+            name (str): 区間名。
+            category (str): 区間の種類。
+            start_ns (int): 開始時刻（ナノ秒）。
+            end_ns (int): 終了時刻（ナノ秒）。
+            **args: トレースイベントに付加する情報。
+        """
+        event = {'name': name,
+                 'cat': category,
+                 'ph': 'X',
+                 'ts': (start_ns - self._origin_ns) / 1000,
+                 'dur': (end_ns - start_ns) / 1000,
+                 'pid': os.getpid(),
+                 'tid': threading.get_ident(),
+                 'args': args}
+        with self._lock:
+            self._events.append(event)
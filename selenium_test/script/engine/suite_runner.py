@@ -0,0 +1,234 @@
+# Python
+import contextlib
+import importlib
+import io
+import os
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+# engine
+from script.engine.case_loader import CaseLoader
+from script.engine.duration_history import DurationHistory
+from script.engine.run_manifest import RunManifest
+
+# エントリーポイント形式のテストケースを実行する関数（engine から lib を参照しないよう文字列で指定する）
+DEFAULT_RUN_CASE = 'script.lib.functions:run_case'
+
+@dataclass
+class TestCaseResult:
+    """
+    1テストケースの実行結果を保持するクラス。
+
+    Attributes:
+        test_case (str): テストケース名（スクリプト名から拡張子を除いたもの）。
+        result (str): 試験結果（'OK' または 'NG'）。
+        elapsed (float): 実行に要した時間（秒）。
+        report_dir_path (Optional[Path]): 結果ディレクトリのパス。作成前に失敗した場合は None。
+        error (str): ランナー側で捕捉したエラー内容。
+    """
+    test_case: str
+    result: str
+    elapsed: float
+    report_dir_path: Optional[Path] = None
+    error: str = ''
+
+# ワーカープロセス内で共有するスクリプトの読み込みキャッシュ
+_case_loader = CaseLoader()
+
+def resolve_callable(path: str) -> Callable:
+    """
+    'モジュール名:関数名' 形式の文字列から関数を取得する。
+    ワーカープロセス内で import するため、呼び出し元のプロセスでは読み込まずに済む。
+
+    Args:
+        path (str): 'モジュール名:関数名' 形式の文字列（例: 'script.lib.functions:run_case'）。
+
+    Returns:
+        Callable: 関数。
+    """
+    module_name, _, attr = path.partition(':')
+    return getattr(importlib.import_module(module_name), attr)
+
+def run_test_case(script_path: Path, is_quiet: bool=False, run_case: str=DEFAULT_RUN_CASE,
+                  loader: Optional[CaseLoader]=None) -> TestCaseResult:
+    """
+    テストケーススクリプトを1本実行する。ワーカープロセス内で実行される。
+
+    エントリーポイント形式（main(ctx)）のスクリプトは、読み込み済みの main を run_case で実行する。
+    従来形式のスクリプトはモジュール読み込み時に本体が走るため、'__main__' として実行し、
+    実行後のグローバル変数から結果を取り出す。
+
+    Args:
+        script_path (Path): テストケーススクリプトのパス。
+        is_quiet (bool): テストケースの標準出力を抑止するか否かを判定するフラグ。Default to False.
+        run_case (str): エントリーポイント形式のテストケースを実行する関数（'モジュール名:関数名' 形式）。
+            Default to DEFAULT_RUN_CASE.
+        loader (Optional[CaseLoader]): スクリプトの読み込みに使用するインスタンス。Noneの場合はプロセス内で共有のもの。
+
+    Returns:
+        TestCaseResult: テストケースの実行結果。
+    """
+    loader = loader if loader is not None else _case_loader
+    start = time.perf_counter()
+    text_report = None
+    report_dir_path = None
+    error = ''
+    stdout = io.StringIO() if is_quiet else None
+    try:
+        with contextlib.redirect_stdout(stdout) if is_quiet else contextlib.nullcontext():
+            loaded = loader.load(script_path)
+            if loaded.main is not None:
+                ctx = resolve_callable(run_case)(loaded.main, loaded.script_path)
+                text_report, report_dir_path = ctx.text_report, ctx.report_dir_path
+            else:
+                script_globals = loader.run_legacy(loaded)
+                text_report, report_dir_path = script_globals.get('text_report'), script_globals.get('report_dir_path')
+                if text_report is not None:
+                    # 従来形式のスクリプトはテキストレポートをクローズしないため、ここで書き込みスレッドを停止する
+                    text_report.close()
+    except BaseException:
+        error = traceback.format_exc()
+    elapsed = time.perf_counter() - start
+
+    result = getattr(text_report, 'result', None)
+    if error or result is None:
+        result = 'NG'
+    return TestCaseResult(test_case=script_path.stem,
+                          result=result,
+                          elapsed=elapsed,
+                          report_dir_path=report_dir_path,
+                          error=error)
+
+class SuiteRunner:
+    """
+    テストケーススクリプトを探索し、プロセスプールで並列実行するクラス。
+
+    各ワーカープロセスはテストケースを1本ずつ実行し、テストケース内で
+    functions.generate_selenium_driver により自身のセッションを取得する。
+    initializer でセッションプールを設定した場合、セッションはワーカー内で使い回される。
+    history を設定した場合、予測所要時間の長いテストケースから順に投入し（longest-job-first）、
+    OKで終了したテストケースの所要時間を記録する。
+    manifest を設定した場合、各テストケースの試験結果と実行時点の入力（スクリプト・依存モジュール）のハッシュを記録する。
+
+    Attributes:
+        test_dir_path (Path): テストケーススクリプトを格納するディレクトリのパス。
+        pattern (str): テストケーススクリプトのファイル名パターン。
+        workers (int): ワーカープロセス数。
+        is_quiet (bool): テストケースの標準出力を抑止するか否かを判定するフラグ。
+        initializer (Optional[Callable[..., Any]]): 各ワーカープロセスの起動時に実行する関数。
+        initargs (tuple): initializer に渡す引数。
+        history (Optional[DurationHistory]): 所要時間の記録。Noneの場合は指定順に実行し、記録しない。
+        manifest (Optional[RunManifest]): 試験結果と入力のハッシュの記録。Noneの場合は記録しない。
+    """
+    def __init__(self, test_dir_path: Path, pattern: str='test_case_*.py',
+                 workers: Optional[int]=None, is_quiet: bool=False,
+                 initializer: Optional[Callable[..., Any]]=None, initargs: tuple=(),
+                 history: Optional[DurationHistory]=None, manifest: Optional[RunManifest]=None):
+        """
+        Args:
+            test_dir_path (Path): テストケーススクリプトを格納するディレクトリのパス。
+            pattern (str): テストケーススクリプトのファイル名パターン。Default to 'test_case_*.py'.
+            workers (Optional[int]): ワーカープロセス数。Noneの場合は環境変数 SELENIUM_TEST_WORKERS、
+                未設定であれば 4 とする。
+            is_quiet (bool): テストケースの標準出力を抑止するか否かを判定するフラグ。Default to False.
+            initializer (Optional[Callable[..., Any]]): 各ワーカープロセスの起動時に実行する関数。
+                セッションプールの設定などに使用する。Default to None.
+            initargs (tuple): initializer に渡す引数。Default to ().
+            history (Optional[DurationHistory]): 所要時間の記録。Default to None.
+            manifest (Optional[RunManifest]): 試験結果と入力のハッシュの記録。Default to None.
+        """
+        self.test_dir_path = test_dir_path
+        self.pattern = pattern
+        self.workers = workers or int(os.environ.get('SELENIUM_TEST_WORKERS', '4'))
+        self.is_quiet = is_quiet
+        self.initializer = initializer
+        self.initargs = initargs
+        self.history = history
+        self.manifest = manifest
+
+    def discover(self) -> list[Path]:
+        """
+        テストケーススクリプトを探索する。
+
+        Returns:
+            list[Path]: ファイル名順に並べたテストケーススクリプトのパス一覧。
+        """
+        return sorted(path.resolve() for path in self.test_dir_path.glob(self.pattern) if path.is_file())
+
+    def run(self, script_paths: Optional[list[Path]]=None) -> list[TestCaseResult]:
+        """
+        テストケーススクリプトをプロセスプールで並列実行する。
+
+        Args:
+            script_paths (Optional[list[Path]]): 実行するスクリプトのパス一覧。Noneの場合は discover の結果を使用する。
+
+        Returns:
+            list[TestCaseResult]: 完了順に並べた実行結果の一覧。
+        """
+        if script_paths is None:
+            script_paths = self.discover()
+        results = []
+        if not script_paths:
+            return results
+
+        workers = min(self.workers, len(script_paths))
+        if self.history is not None:
+            # 長いテストケースを先に投入し、終盤に1ワーカーだけが長いテストケースを実行する状態を避ける
+            script_paths = self.history.schedule(script_paths)
+            print(f'予測所要時間: {self.history.estimate_makespan(script_paths, workers):.1f}秒'
+                  f'（{len(script_paths)}件、ワーカー{workers}）')
+        fingerprints = {}
+        if self.manifest is not None:
+            # 実行中にスクリプトが編集されても、実行した時点の入力を記録する
+            fingerprints = {path.stem: self.manifest.fingerprint(path) for path in script_paths}
+        with ProcessPoolExecutor(max_workers=workers, initializer=self.initializer,
+                                 initargs=self.initargs) as executor:
+            futures = {executor.submit(run_test_case, path, self.is_quiet): path for path in script_paths}
+            for future in as_completed(futures):
+                try:
+                    result = future.result()
+                except Exception:
+                    # ワーカープロセス自体が異常終了した場合
+                    result = TestCaseResult(test_case=futures[future].stem, result='NG',
+                                            elapsed=0.0, error=traceback.format_exc())
+                print(f'[{result.result}] {result.test_case} ({result.elapsed:.1f}秒)')
+                results.append(result)
+        if self.history is not None:
+            # NGは途中で終了して所要時間が短くなりうるため、予測には使用しない
+            for result in results:
+                if result.result == 'OK':
+                    self.history.record(result.test_case, result.elapsed)
+            self.history.save()
+        if self.manifest is not None:
+            for result in results:
+                self.manifest.record(result.test_case, result.result, fingerprints[result.test_case],
+                                     report_dir_path=result.report_dir_path)
+            self.manifest.save()
+        return results
+
+    @staticmethod
+    def summarize(results: list[TestCaseResult], elapsed: float) -> str:
+        """
+        実行結果を集計したサマリ文字列を生成する。
+
+        Args:
+            results (list[TestCaseResult]): 実行結果の一覧。
+            elapsed (float): 全体の所要時間（秒）。
+
+        Returns:
+            str: サマリ文字列。
+        """
+        lines = ['===== 実行結果サマリ =====']
+        for result in sorted(results, key=lambda r: r.test_case):
+            report_dir = result.report_dir_path if result.report_dir_path else '-'
+            lines.append(f'{result.test_case}  {result.result}  {result.elapsed:.1f}秒  {report_dir}')
+            if result.error:
+                lines.append(result.error.rstrip())
+        ok_count = sum(1 for result in results if result.result == 'OK')
+        ng_count = len(results) - ok_count
+        lines.append(f'OK: {ok_count}  NG: {ng_count}  合計: {len(results)}  所要時間: {elapsed:.1f}秒')
+        return '\n'.join(lines)
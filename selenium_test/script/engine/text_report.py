@@ -1,11 +1,19 @@
 # Python
+import os
+import sqlite3
+import sys
 import traceback
-from datetime import datetime
+from typing import Callable, Optional
 from pathlib import Path
-from zoneinfo import ZoneInfo
 
 # engine
+from script.engine.buffered_line_writer import BufferedLineWriter
+from script.engine.clock import Clock, get_clock
+from script.engine.event_log import (EVENT_COMMENT, EVENT_ERROR, EVENT_EXPECTED_RESULT, EVENT_PROCEDURE,
+                                     EVENT_RESULT, EVENT_RUN_START, EVENT_TIMING, EventLog)
 from script.engine.path_manager import PathManager 
+from script.engine.results_catalog import ResultsCatalog
+from script.engine.step_tracer import StepTracer
 
 class TextReport:
     """
@@ -13,24 +21,56 @@ class TextReport:
 
     指定されたディレクトリに対して、レポートファイル（.txt）を作成・追記する機能を提供する。
     主にテスト結果やエラーの記録に使用される。
+    バッファリングモードでは、追記行をメモリ上に溜めてバックグラウンドスレッドでまとめて書き込む。
+    試験結果・エラー内容の記入時、およびインタプリタ終了時には必ずフラッシュする。
+    試験手順・期待結果の記入を区切りとして手順ごとの所要時間を計測し、試験結果の記入時に
+    集計表をレポートへ追記するとともに、トレースイベント形式のJSON（trace.json）を出力する。
+    集計ツール向けに、記入内容を種類付きのレコードとして 'events.jsonl' にも記録する（テキストレポートの内容は変えない）。
+    生成時と試験結果・エラー内容の記入時には、実行を 'results' ディレクトリのカタログ（ResultsCatalog）に登録する。
 
     Attributes:
         path_manager (Path): パス生成を司るインスタンス。
         text_report_name (str): レポートファイル名（ディレクトリ名に拡張子'.txt'を付与して生成）。
+        result (Optional[str]): 記入済みの試験結果（'OK' / 'NG'）。未記入の場合は None。
+        tracer (StepTracer): 手順ごとの所要時間を計測するインスタンス。
+        event_log (EventLog): 種類付きのレコードを記録するインスタンス。
+        catalog (ResultsCatalog): 実行を登録するカタログ。
+        clock (Clock): 行頭の日時の取得に使用するインスタンス。
     """
-    def __init__(self, path: Path, is_add_datetime: bool=True):
+
+    def __init__(self, path: Path, is_add_datetime: bool=True, is_buffered: Optional[bool]=None,
+                 flush_lines: int=100, flush_interval: float=1.0, clock: Optional[Clock]=None):
         """
         TextReport インスタンスを初期化する。
 
         Args:
             path_manager (Path): レポートファイルを保存するディレクトリのパス。
             text_report_name (str): レポートファイル名。
-            
-        """
-        self.path_manager = PathManager(path)
+            is_buffered (Optional[bool]): バッファリングモードで書き込むか否かを判定するフラグ。
+                Noneの場合は環境変数 SELENIUM_TEST_BUFFERED_REPORT が '1' のときに有効とする。
+            flush_lines (int): バッファリングモードで書き込みを行う行数のしきい値。Default to 100.
+            flush_interval (float): バッファリングモードで書き込みを行う経過時間のしきい値（秒）。Default to 1.0.
+            clock (Optional[Clock]): 日時の取得に使用するインスタンス。Noneの場合は共有の Clock。
+        """
+        self.clock = clock or get_clock()
+        self.path_manager = PathManager(path, self.clock)
         self.text_report_name = path.name # ファイル名はディレクトリ名を流用する
         self.text_report_path = self.path_manager.get_path(
             file_name=self.text_report_name, extension='txt', is_add_datetime=False)
+        self.result = None
+        if is_buffered is None:
+            is_buffered = os.environ.get('SELENIUM_TEST_BUFFERED_REPORT') == '1'
+        self._writer = BufferedLineWriter(self.text_report_path, flush_lines, flush_interval) if is_buffered else None
+        self._result_hooks = []
+        self._error_hooks = []
+        self.tracer = StepTracer(self.text_report_name)
+        self.tracer.activate()
+        self.event_log = EventLog(self.path_manager.get_path(file_name=EventLog.FILE_NAME, is_add_datetime=False),
+                                  self.text_report_name, is_buffered, flush_lines, flush_interval, self.clock)
+        self.event_log.activate()
+        self.event_log.emit(EVENT_RUN_START, run=self.text_report_name, pid=os.getpid())
+        self.catalog = ResultsCatalog.for_results_dir(path.parent)
+        self._register(self.catalog.register_start, path)
 
     def make_text_report(self):
         """
@@ -55,16 +95,69 @@ class TextReport:
             line (str): 書き込む文字列（改行なしでもOK）。
             is_terminal (bool): ターミナル出力判定フラグ。 Default to True.
         """
-        now = datetime.now(ZoneInfo('Asia/Tokyo')).strftime('%Y-%m-%d %H:%M:%S')
+        now = self.clock.format(Clock.REPORT_FORMAT)
 
-        if not self.text_report_path.is_file():
-            self.make_text_report()
-        
-        with self.text_report_path.open(mode='a', encoding='utf-8') as f:
-            f.write(f'{now}  {line}\n')
+        if self._writer is not None:
+            self._writer.write(f'{now}  {line}')
+        else:
+            if not self.text_report_path.is_file():
+                self.make_text_report()
+
+            with self.text_report_path.open(mode='a', encoding='utf-8') as f:
+                f.write(f'{now}  {line}\n')
         
         if is_terminal: print(f'{now}  {line}')
 
+    def flush(self):
+        """
+        バッファリングモードの場合、未書き込みの行をテキストレポートへ書き込む。
+        """
+        if self._writer is not None:
+            self._writer.flush()
+        self.event_log.flush()
+
+    def close(self):
+        """
+        バッファリングモードの場合、未書き込みの行を書き込んだ上でバックグラウンドスレッドを停止する。
+        クローズ後に追記された行は即座に書き込まれる。
+        """
+        if self._writer is not None:
+            self._writer.close()
+        self.event_log.close()
+
+    def _register(self, register: Callable, *args):
+        """
+        カタログへ登録する。カタログへの登録に失敗しても試験は継続する。
+
+        Args:
+            register (Callable): ResultsCatalog の登録メソッド。
+            *args: 登録メソッドに渡す引数。
+        """
+        try:
+            register(*args)
+        except sqlite3.Error as e:
+            print(f'カタログへの登録に失敗: {e}', file=sys.stderr)
+
+    def add_result_hook(self, hook: Callable[[str], None]):
+        """
+        試験結果を記入する直前に呼び出す関数を登録する。
+        スクリーンショットの書き込み完了待ちなど、試験結果の確定前に行うべき処理に使用する。
+
+        Args:
+            hook (Callable[[str], None]): 試験結果（'OK' / 'NG'）を引数に取る関数。
+        """
+        self._result_hooks.append(hook)
+
+    def add_error_hook(self, hook: Callable[[str], None]):
+        """
+        エラー内容を記入する直前に呼び出す関数を登録する。
+        メモリ上に保持したスクリーンショットの書き込みなど、エラー発生時に行うべき処理に使用する。
+
+        Args:
+            hook (Callable[[str], None]): エラー概要（例外がない場合は記入する文字列）を引数に取る関数。
+        """
+        self._error_hooks.append(hook)
+
     def procedure(self, line: str, is_terminal: bool=True):
         """
         試験手順を記入する関数。
@@ -75,6 +168,8 @@ class TextReport:
             line (str): 書き込む文字列（改行なしでもOK）。
             is_terminal (bool): ターミナル出力判定フラグ。 Default to True.
         """
+        self.tracer.start_step(line)
+        self.event_log.emit(EVENT_PROCEDURE, text=line, step_index=self.tracer.step_index)
         self.add_line_on_text_report(line, is_terminal)
 
     def expected_result(self, line: str, is_terminal: bool=True):
@@ -87,6 +182,8 @@ class TextReport:
             line (str): 書き込む文字列（改行なしでもOK）
             is_terminal (bool): ターミナル出力判定フラグ。 Default to True.
         """
+        self.tracer.start_step(line)
+        self.event_log.emit(EVENT_EXPECTED_RESULT, text=line, step_index=self.tracer.step_index)
         self.add_line_on_text_report(line, is_terminal)
 
     def comment(self, line: str, is_terminal: bool=True):
@@ -99,6 +196,7 @@ class TextReport:
             line (str): 書き込む文字列（改行なしでもOK）
             is_terminal (bool): ターミナル出力判定フラグ。 Default to True.
         """
+        self.event_log.emit(EVENT_COMMENT, text=line)
         self.add_line_on_text_report(line, is_terminal)
 
     def test_result(self, result: str='OK', is_terminal: bool=True):
@@ -111,7 +209,19 @@ class TextReport:
             result (str): 書き込む文字列（改行なしでもOK）。 Default to 'OK'.
             is_terminal (bool): ターミナル出力判定フラグ。 Default to True.
         """
+        for hook in self._result_hooks:
+            hook(result)
+        self.tracer.end()
+        for line in self.tracer.summary_lines():
+            self.add_line_on_text_report(line, is_terminal)
+        self.tracer.export(self.path_manager.get_path(file_name='trace', extension='json'))
+        rows = self.tracer.summary_rows()
+        self.event_log.emit(EVENT_TIMING, steps=rows, total=sum(row['total'] for row in rows))
+        self.result = result
+        self.event_log.emit(EVENT_RESULT, result=result)
         self.add_line_on_text_report(f'試験結果_{result}', is_terminal)
+        self.flush()
+        self._register(self.catalog.register_result, self.path_manager.base_dir, result)
 
     def error_details(self, line: str='', is_terminal: bool=True):
         """
@@ -123,7 +233,18 @@ class TextReport:
             line (str): 書き込む文字列（改行なしでもOK）。
             is_terminal (bool): ターミナル出力判定フラグ。 Default to True.
         """
-        if line == '': line = f'エラー内容:\n{traceback.format_exc()}'
+        error = sys.exc_info()[1]
+        fields = {'traceback': traceback.format_exc()} if error is not None else {}
+        if line == '':
+            line = f'エラー内容:\n{traceback.format_exc()}'
+            message = ''.join(traceback.format_exception_only(type(error), error)).strip() if error is not None else ''
+        else:
+            message = line
+        for hook in self._error_hooks:
+            hook(message)
+        self.event_log.emit(EVENT_ERROR, message=message, **fields)
         self.add_line_on_text_report(line, is_terminal)
+        self.flush()
+        self._register(self.catalog.register_error, self.path_manager.base_dir, message.splitlines()[0] if message else '')
     
         
\ No newline at end of file
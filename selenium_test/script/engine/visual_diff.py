@@ -0,0 +1,209 @@
+# Python
+import importlib.util
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Iterable, Optional
+from pathlib import Path
+
+# 比較結果の理由
+REASON_IDENTICAL = 'identical'                  # ファイルの内容が完全に一致
+REASON_WITHIN_TOLERANCE = 'within_tolerance'    # 差分が許容範囲内
+REASON_CHANGED = 'changed'                      # 差分が許容範囲を超えた
+REASON_SIZE_MISMATCH = 'size_mismatch'          # 画像サイズが異なる
+REASON_MISSING_BASELINE = 'missing_baseline'    # ベースライン画像が存在しない
+
+@dataclass(frozen=True)
+class VisualDiffOptions:
+    """
+    画像比較の設定を保持するクラス。
+
+    Attributes:
+        tolerance (int): 画素ごとの許容差（RGB各チャンネルの差の絶対値、0〜255）。これを超えたチャンネルがあれば差分とする。
+        max_diff_ratio (float): 許容する差分画素の割合（0〜1）。これを超えた場合に不一致とする。
+        tile_size (int): 差分を集計するタイルの一辺（画素）。行方向はタイル単位で比較し、超過した時点で打ち切る。
+        ignore_regions (tuple[tuple[int, int, int, int], ...]): 比較から除外する領域（x, y, 幅, 高さ）。
+    """
+    tolerance: int = 16
+    max_diff_ratio: float = 0.001
+    tile_size: int = 64
+    ignore_regions: tuple[tuple[int, int, int, int], ...] = field(default=())
+
+@dataclass
+class VisualDiffResult:
+    """
+    1組の画像の比較結果を保持するクラス。
+
+    Attributes:
+        baseline_path (Path): ベースライン画像のパス。
+        actual_path (Path): 比較対象の画像のパス。
+        is_match (bool): 差分が許容範囲内であるか否かを判定するフラグ。
+        reason (str): 判定理由（REASON_*）。
+        diff_pixels (int): 差分画素数（打ち切った場合はその時点までの数）。
+        diff_ratio (float): 差分画素の割合。
+        changed_tiles (list[tuple[int, int, int, int]]): 差分を含むタイル（x, y, 幅, 高さ）。
+        diff_path (Optional[Path]): 差分画像のパス。書き出していない場合は None。
+        elapsed (float): 比較に要した時間（秒）。
+    """
+    baseline_path: Path
+    actual_path: Path
+    is_match: bool
+    reason: str
+    diff_pixels: int = 0
+    diff_ratio: float = 0.0
+    changed_tiles: list[tuple[int, int, int, int]] = field(default_factory=list)
+    diff_path: Optional[Path] = None
+    elapsed: float = 0.0
+
+def compare_images(baseline_path: Path, actual_path: Path, options: VisualDiffOptions=VisualDiffOptions(),
+                   diff_path: Optional[Path]=None) -> VisualDiffResult:
+    """
+    2つの画像を比較する。ワーカープロセスでも呼び出し元のプロセスでも実行できる。
+
+    ファイルの内容が一致すれば読み込まずに一致とする。
+    知覚ハッシュは画面の一部の色の変化などを見落とすため、一致の判定には使用せず、常に画素単位で比較する。
+    画素単位の比較はタイルの行ごとに NumPy で一括して行い、差分が許容範囲を超えた時点で打ち切る
+    （差分画像を書き出す場合は、差分画像のために最後まで比較する）。
+    差分画像は不一致の場合のみ書き出す。
+
+    Args:
+        baseline_path (Path): ベースライン画像のパス。
+        actual_path (Path): 比較対象の画像のパス。
+        options (VisualDiffOptions): 比較の設定。Default to VisualDiffOptions().
+        diff_path (Optional[Path]): 差分画像の保存先。Noneの場合は書き出さない。
+
+    Returns:
+        VisualDiffResult: 比較結果。
+    """
+    # NumPy・Pillow は比較を行うプロセス内でのみ読み込む
+    import numpy as np
+    from PIL import Image
+
+    start = time.perf_counter()
+    result = VisualDiffResult(baseline_path=baseline_path, actual_path=actual_path, is_match=False,
+                              reason=REASON_CHANGED)
+    if not baseline_path.is_file():
+        result.reason = REASON_MISSING_BASELINE
+        result.elapsed = time.perf_counter() - start
+        return result
+    if baseline_path.read_bytes() == actual_path.read_bytes():
+        result.is_match, result.reason = True, REASON_IDENTICAL
+        result.elapsed = time.perf_counter() - start
+        return result
+
+    with Image.open(baseline_path) as image:
+        baseline = np.array(image.convert('RGB'))
+    with Image.open(actual_path) as image:
+        actual = np.array(image.convert('RGB'))
+    height, width = actual.shape[:2]
+    if baseline.shape != actual.shape:
+        result.reason = REASON_SIZE_MISMATCH
+        result.diff_pixels, result.diff_ratio = height * width, 1.0
+        result.elapsed = time.perf_counter() - start
+        return result
+
+    # 除外領域は両方の画像で塗りつぶし、差分に影響しないようにする
+    ignore_mask = np.zeros((height, width), dtype=bool)
+    for x, y, w, h in options.ignore_regions:
+        ignore_mask[max(y, 0):y + h, max(x, 0):x + w] = True
+    baseline[ignore_mask] = 0
+    actual[ignore_mask] = 0
+
+    allowed_pixels = int(options.max_diff_ratio * height * width)
+    tile_size = options.tile_size
+    tile_starts = np.arange(0, width, tile_size)
+    masks = []
+    for y in range(0, height, tile_size):
+        band = np.abs(baseline[y:y + tile_size].astype(np.int16) - actual[y:y + tile_size])
+        mask = (band > options.tolerance).any(axis=2)
+        masks.append(mask)
+        # 列方向の差分画素数をタイル幅ごとに合計し、差分を含むタイルを求める
+        tile_counts = np.add.reduceat(mask.sum(axis=0), tile_starts)
+        for index in np.flatnonzero(tile_counts):
+            x = int(tile_starts[index])
+            result.changed_tiles.append((x, y, min(tile_size, width - x), mask.shape[0]))
+        result.diff_pixels += int(tile_counts.sum())
+        if result.diff_pixels > allowed_pixels and diff_path is None:
+            break
+
+    result.diff_ratio = result.diff_pixels / (height * width)
+    if result.diff_pixels <= allowed_pixels:
+        result.is_match, result.reason = True, REASON_WITHIN_TOLERANCE
+    elif diff_path is not None:
+        write_diff_image(actual, np.concatenate(masks), ignore_mask, diff_path)
+        result.diff_path = diff_path
+    result.elapsed = time.perf_counter() - start
+    return result
+
+def write_diff_image(actual, mask, ignore_mask, diff_path: Path):
+    """
+    差分画像を書き出す。比較対象の画像を暗くした上に、差分画素を赤、除外領域を青で重ねる。
+
+    Args:
+        actual (numpy.ndarray): 比較対象のRGB画像（高さ×幅×3、uint8）。
+        mask (numpy.ndarray): 差分画素の真偽値の配列（高さ×幅）。
+        ignore_mask (numpy.ndarray): 除外領域の真偽値の配列（高さ×幅）。
+        diff_path (Path): 差分画像の保存先。
+    """
+    from PIL import Image
+
+    image = (actual // 3).astype('uint8')
+    image[ignore_mask] = (0, 0, 96)
+    image[mask] = (255, 0, 0)
+    diff_path.parent.mkdir(parents=True, exist_ok=True)
+    Image.fromarray(image).save(diff_path, format='PNG')
+
+class VisualDiff:
+    """
+    スクリーンショットとベースライン画像を比較するクラス。
+
+    比較はプロセスプールで並列に実行し、大量の画像の組を複数のCPUコアで比較する。
+    画像処理には NumPy と Pillow を使用する（requirements.txt を参照）。
+
+    Attributes:
+        options (VisualDiffOptions): 比較の設定。
+    """
+    def __init__(self, options: VisualDiffOptions=VisualDiffOptions(), max_workers: Optional[int]=None):
+        """
+        Args:
+            options (VisualDiffOptions): 比較の設定。Default to VisualDiffOptions().
+            max_workers (Optional[int]): ワーカープロセス数。Noneの場合はCPU数。
+        """
+        for module_name in ('numpy', 'PIL'):
+            if importlib.util.find_spec(module_name) is None:
+                raise ImportError('画像の比較には NumPy と Pillow が必要（pip install -r requirements.txt）')
+        self.options = options
+        self._executor = ProcessPoolExecutor(max_workers=max_workers)
+
+    def submit(self, baseline_path: Path, actual_path: Path, diff_path: Optional[Path]=None) -> Future:
+        """
+        1組の画像の比較を投入する。
+
+        Args:
+            baseline_path (Path): ベースライン画像のパス。
+            actual_path (Path): 比較対象の画像のパス。
+            diff_path (Optional[Path]): 差分画像の保存先。Noneの場合は書き出さない。
+
+        Returns:
+            Future: 比較結果（VisualDiffResult）を返すFuture。
+        """
+        return self._executor.submit(compare_images, baseline_path, actual_path, self.options, diff_path)
+
+    def compare_many(self, pairs: Iterable[tuple[Path, Path, Optional[Path]]]) -> list[VisualDiffResult]:
+        """
+        複数の画像の組を並列に比較する。
+
+        Args:
+            pairs (Iterable[tuple[Path, Path, Optional[Path]]]): ベースライン画像・比較対象の画像・差分画像の保存先の組。
+
+        Returns:
+            list[VisualDiffResult]: 比較結果の一覧（投入順）。
+        """
+        futures = [self.submit(*pair) for pair in pairs]
+        return [future.result() for future in futures]
+
+    def close(self):
+        """
+        全ての比較の完了を待機し、ワーカープロセスを停止する。
+        """
+        self._executor.shutdown(wait=True)
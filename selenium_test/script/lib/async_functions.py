@@ -0,0 +1,445 @@
+# Python
+import asyncio
+import contextlib
+import functools
+import os
+import re
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable, Optional, Sequence
+from pathlib import Path
+
+# Selenium
+from selenium.webdriver.common.by import By
+
+# engine
+from script.engine.async_driver import AsyncWebDriver, AsyncWebDriverClient, AsyncWebDriverError
+from script.engine.async_http import AsyncHttpError
+from script.engine.case_loader import CaseContext
+from script.engine.launch_profile import LaunchProfile
+from script.engine.page_snapshot import SNAPSHOT_SCRIPT, PageSnapshot
+from script.engine.page_timing import TIMING_SCRIPT, PageTiming
+from script.engine.path_manager import PathManager
+from script.engine.report_directory import ReportDirectory
+from script.engine.save_screenshot import SaveScreenshot
+from script.engine.step_tracer import StepTracer
+from script.engine.text_report import TextReport
+
+# lib
+from script.lib import functions
+from script.lib.functions import DEFAULT_PAGE_TIMING_RESOURCES, DEFAULT_POLL_FREQUENCY, DEFAULT_WAIT_TIMEOUT
+
+def _traced(category: str='function'):
+    """
+    コルーチン関数の処理時間を StepTracer の区間として記録するデコレータを生成する。
+
+    Args:
+        category (str): 区間の種類。Default to 'function'.
+
+    Returns:
+        Callable: デコレータ。
+    """
+    def decorator(func: Callable[..., Awaitable]) -> Callable[..., Awaitable]:
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            with StepTracer.trace(func.__name__, category):
+                return await func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def get_max_sessions() -> Optional[int]:
+    """
+    同時に開くセッション数の上限を取得する。
+    環境変数 SELENIUM_TEST_MAX_SESSIONS が設定されている場合はその値を使用する。
+
+    Returns:
+        Optional[int]: セッション数の上限。未設定の場合は None（Gridのスロット数を使用する）。
+    """
+    value = os.environ.get('SELENIUM_TEST_MAX_SESSIONS')
+    return int(value) if value else None
+
+def create_client(max_sessions: Optional[int]=None) -> AsyncWebDriverClient:
+    """
+    接続先のSelenium Grid（ハブ）に対する AsyncWebDriverClient を生成する。
+
+    Args:
+        max_sessions (Optional[int]): 同時に開くセッション数の上限。Noneの場合は get_max_sessions の値を使用する。
+
+    Returns:
+        AsyncWebDriverClient: AsyncWebDriverClientインスタンス。
+    """
+    return AsyncWebDriverClient(functions.get_selenium_url(),
+                                max_sessions=max_sessions if max_sessions is not None else get_max_sessions())
+
+@contextlib.asynccontextmanager
+async def open_session(client: AsyncWebDriverClient,
+                       profile: Optional[LaunchProfile]=None) -> AsyncIterator[AsyncWebDriver]:
+    """
+    起動プロファイルに従ってセッションを生成し、with ブロックを抜ける際に終了する。
+
+    Args:
+        client (AsyncWebDriverClient): AsyncWebDriverClientインスタンス。
+        profile (Optional[LaunchProfile]): 起動プロファイル。Noneの場合は get_current_launch_profile の値を使用する。
+
+    Yields:
+        AsyncWebDriver: 生成したセッション。
+    """
+    profile = profile if profile is not None else functions.get_current_launch_profile()
+    async with client.session(profile.to_options().to_capabilities()) as driver:
+        if profile.window_size is None:
+            await driver.maximize_window()
+        yield driver
+
+async def _wait_until(condition: Callable[[], Awaitable[Any]], description: str,
+                      text_report: Optional[TextReport]=None, timeout: float=DEFAULT_WAIT_TIMEOUT,
+                      poll_frequency: float=DEFAULT_POLL_FREQUENCY, is_raise: bool=True) -> Any:
+    """
+    条件が成立するまで待機し、実際の待機時間をテキストレポートに記録する。
+    確認の間隔は asyncio.sleep で待機し、その間は他のセッションの処理に制御を譲る。
+
+    Args:
+        condition (Callable[[], Awaitable[Any]]): 待機条件。真となる値を返した時点で待機を終了する。
+        description (str): 待機内容の説明（レポート出力用）。
+        text_report (Optional[TextReport]): TextReportインスタンス。Noneの場合は記録しない。
+        timeout (float): タイムアウト秒数。Default to DEFAULT_WAIT_TIMEOUT.
+        poll_frequency (float): 条件の確認間隔（秒）。Default to DEFAULT_POLL_FREQUENCY.
+        is_raise (bool): タイムアウト時に例外を送出するか否かを判定するフラグ。Default to True.
+
+    Returns:
+        Any: 条件が返した値。タイムアウトかつ is_raise が False の場合は None。
+
+    Raises:
+        TimeoutError: タイムアウトかつ is_raise が True の場合。
+    """
+    start = time.perf_counter()
+    with StepTracer.trace(description, 'wait'):
+        while True:
+            value = await condition()
+            if value:
+                if text_report is not None:
+                    text_report.comment(f'待機完了: {description}（{time.perf_counter() - start:.3f}秒）')
+                return value
+            if time.perf_counter() - start >= timeout:
+                break
+            await asyncio.sleep(poll_frequency)
+    if text_report is not None:
+        text_report.comment(f'待機タイムアウト: {description}（{time.perf_counter() - start:.3f}秒）')
+    if is_raise:
+        raise TimeoutError(f'待機タイムアウト: {description}')
+    return None
+
+async def wait_for_page_load(driver: AsyncWebDriver, text_report: Optional[TextReport]=None,
+                             timeout: float=DEFAULT_WAIT_TIMEOUT, poll_frequency: float=DEFAULT_POLL_FREQUENCY):
+    """
+    ページの読み込みが完了する（document.readyState が get_loaded_ready_states の値になる）まで待機する。
+
+    Args:
+        driver (AsyncWebDriver): AsyncWebDriverインスタンス。
+        text_report (Optional[TextReport]): TextReportインスタンス。Noneの場合は待機時間を記録しない。
+        timeout (float): タイムアウト秒数。Default to DEFAULT_WAIT_TIMEOUT.
+        poll_frequency (float): 条件の確認間隔（秒）。Default to DEFAULT_POLL_FREQUENCY.
+    """
+    ready_states = functions.get_loaded_ready_states(driver)
+
+    async def condition() -> bool:
+        return await driver.execute_script('return document.readyState;') in ready_states
+
+    await _wait_until(condition, 'ページ読み込み完了', text_report, timeout, poll_frequency)
+
+async def take_page_snapshot(driver: AsyncWebDriver, locators: Sequence[tuple[str, str]]=(),
+                             attribute_names: Sequence[str]=()) -> PageSnapshot:
+    """
+    ページタイトル・URL・読み込み状態・指定要素のテキストと属性を1回のスクリプト実行でまとめて取得する。
+
+    Args:
+        driver (AsyncWebDriver): AsyncWebDriverインスタンス。
+        locators (Sequence[tuple[str, str]]): 状態を取得する要素のロケータ一覧。Default to ().
+        attribute_names (Sequence[str]): 各要素から取得する属性名の一覧。Default to ().
+
+    Returns:
+        PageSnapshot: ページ状態（変更不可）。
+    """
+    with StepTracer.trace('ページ状態取得', 'snapshot'):
+        value = await driver.execute_script(SNAPSHOT_SCRIPT, [list(locator) for locator in locators],
+                                            list(attribute_names))
+        return PageSnapshot.from_value(value, locators, attribute_names)
+
+async def wait_for_page_snapshot(driver: AsyncWebDriver, predicate: Callable[[PageSnapshot], bool],
+                                 description: str, locators: Sequence[tuple[str, str]]=(),
+                                 attribute_names: Sequence[str]=(), text_report: Optional[TextReport]=None,
+                                 timeout: float=DEFAULT_WAIT_TIMEOUT, poll_frequency: float=DEFAULT_POLL_FREQUENCY,
+                                 is_raise: bool=False) -> PageSnapshot:
+    """
+    ページ状態が条件を満たすまで待機する。確認1回あたりのリモートへの往復は1回のみ。
+
+    Args:
+        driver (AsyncWebDriver): AsyncWebDriverインスタンス。
+        predicate (Callable[[PageSnapshot], bool]): ページ状態を受け取り、条件を満たす場合に True を返す関数。
+        description (str): 待機内容（テキストレポートへの記録に使用）。
+        locators (Sequence[tuple[str, str]]): 状態を取得する要素のロケータ一覧。Default to ().
+        attribute_names (Sequence[str]): 各要素から取得する属性名の一覧。Default to ().
+        text_report (Optional[TextReport]): TextReportインスタンス。Noneの場合は待機時間を記録しない。
+        timeout (float): タイムアウト秒数。Default to DEFAULT_WAIT_TIMEOUT.
+        poll_frequency (float): 条件の確認間隔（秒）。Default to DEFAULT_POLL_FREQUENCY.
+        is_raise (bool): タイムアウト時に例外を送出するか否かを判定するフラグ。Default to False.
+
+    Returns:
+        PageSnapshot: 条件を満たしたページ状態。タイムアウトかつ is_raise が False の場合は最後に取得したページ状態。
+    """
+    snapshots = []
+
+    async def condition() -> Any:
+        snapshots[:] = [await take_page_snapshot(driver, locators, attribute_names)]
+        return snapshots[0] if predicate(snapshots[0]) else False
+
+    snapshot = await _wait_until(condition, description, text_report, timeout, poll_frequency, is_raise)
+    return snapshot if snapshot else snapshots[0]
+
+async def save_screenshot(driver: AsyncWebDriver, report_dir_path: Path, image_file_name: str='',
+                          extension: Optional[str]='png', is_add_datetime: bool=True,
+                          datetime_format: str="%Y%m%d_%H%M%S") -> Path:
+    """
+    スクリーンショット画像を保存する（create_save_screenshot が返す関数に相当）。
+    画像の取得のみをイベントループで待機し、デコードと書き込みはスレッドで行う。
+
+    Args:
+        driver (AsyncWebDriver): AsyncWebDriverインスタンス。
+        report_dir_path (Path): 結果レポート格納用フォルダのパス。
+        image_file_name (str): 保存する画像ファイル名。
+        extension (Optional[str]): 拡張子。Noneの場合はfile_nameをそのまま使用。Default to 'png'
+        is_add_datetime (bool): ファイル名に日時を付加するか否かを判定するフラグ。Default to True.
+        datetime_format (str): 日付と時刻のフォーマット。Default to 'YYYYMMDD_HHMMSS'
+
+    Returns:
+        Path: 保存先のパス。
+    """
+    save_image = SaveScreenshot(PathManager(report_dir_path), functions.get_screenshot_pipeline(report_dir_path),
+                                functions.get_screenshot_store(report_dir_path), functions.get_screenshot_transcoder(),
+                                functions.get_screenshot_buffer(report_dir_path))
+    png_base64 = await driver.get_screenshot_as_base64()
+    return await asyncio.to_thread(save_image.save_png_base64, png_base64, image_file_name, extension,
+                                   is_add_datetime, datetime_format)
+
+async def record_page_timing(driver: AsyncWebDriver, report_dir_path: Path) -> Optional[PageTiming]:
+    """
+    表示中のページの読み込み時間（Navigation Timing・Resource Timing）を1回のスクリプト実行で取得し、記録する。
+    取得に失敗しても（通信の失敗・タイムアウトを含む）試験は継続する。
+
+    Args:
+        driver (AsyncWebDriver): AsyncWebDriverインスタンス。
+        report_dir_path (Path): 結果ディレクトリのパス。
+
+    Returns:
+        Optional[PageTiming]: 読み込み時間。無効な場合や取得できなかった場合は None。
+    """
+    if not functions.is_collect_page_timing():
+        return None
+    with StepTracer.trace('読み込み時間取得', 'timing'):
+        try:
+            timing = PageTiming.from_value(await driver.execute_script(TIMING_SCRIPT, DEFAULT_PAGE_TIMING_RESOURCES))
+        except (AsyncWebDriverError, AsyncHttpError, asyncio.TimeoutError,
+                AttributeError, KeyError, TypeError, ValueError):
+            return None
+    functions.store_page_timing(report_dir_path, timing)
+    return timing
+
+@_traced()
+async def open_web_page(driver: AsyncWebDriver, report_dir_path: Path, url: str,
+                        text_report: Optional[TextReport]=None, is_wait: bool=True,
+                        timeout: float=DEFAULT_WAIT_TIMEOUT):
+    """
+    Webページを開く。
+    ページの読み込み時間を記録ファイル（events.jsonl）に記録する（環境変数 SELENIUM_TEST_PAGE_TIMING が '0' の場合を除く）。
+
+    Args:
+        driver (AsyncWebDriver): AsyncWebDriverインスタンス。
+        report_dir_path (Path): 結果レポート格納用フォルダのパス。
+        url (str): 遷移先URL。
+        text_report (Optional[TextReport]): TextReportインスタンス。Noneの場合は待機時間を記録しない。
+        is_wait (bool): ページの読み込み完了を待機するか否かを判定するフラグ。Default to True.
+        timeout (float): 待機のタイムアウト秒数。Default to DEFAULT_WAIT_TIMEOUT.
+    """
+    await driver.get(url)
+    if is_wait: await wait_for_page_load(driver, text_report=text_report, timeout=timeout)
+    await record_page_timing(driver, report_dir_path)
+    await save_screenshot(driver, report_dir_path, image_file_name=url)
+
+@_traced()
+async def confirm_page_title(driver: AsyncWebDriver, report_dir_path: Path,
+                             text_report: TextReport, expected_result: str,
+                             is_wait: bool=True, timeout: float=DEFAULT_WAIT_TIMEOUT):
+    """
+    Webページのページタイトルを確認する。
+    ページタイトルが期待結果になるまで待機してから確認する（タイムアウト時はNG）。
+
+    Args:
+        driver (AsyncWebDriver): AsyncWebDriverインスタンス。
+        report_dir_path (Path): 結果レポート格納用フォルダのパス。
+        text_report (TextReport): TextReportインスタンス。
+        expected_result (str): 期待結果となるページタイトル。
+        is_wait (bool): ページタイトルが期待結果になるまで待機するか否かを判定するフラグ。Default to True.
+        timeout (float): 待機のタイムアウト秒数。Default to DEFAULT_WAIT_TIMEOUT.
+    """
+    if is_wait:
+        snapshot = await wait_for_page_snapshot(driver, lambda s: s.title == expected_result,
+                                                f'ページタイトル「{expected_result}」', text_report=text_report,
+                                                timeout=timeout)
+    else:
+        snapshot = await take_page_snapshot(driver)
+    await save_screenshot(driver, report_dir_path, image_file_name=snapshot.title)
+    if snapshot.title == expected_result:
+        text_report.comment(f'ページタイトルが「{expected_result}」であることを確認_OK')
+    else:
+        raise Exception(f'ページタイトルが「{snapshot.title}」であり「{expected_result}」ではない_NG')
+
+@_traced()
+async def confirm_url(driver: AsyncWebDriver, report_dir_path: Path,
+                      text_report: TextReport, expected_result: str,
+                      is_wait: bool=True, timeout: float=DEFAULT_WAIT_TIMEOUT):
+    """
+    WebページのURLを確認する。
+    URLが期待結果になり、ページの読み込みが完了するまで待機してから確認する（タイムアウト時はNG）。
+    遷移先のページの読み込み時間を記録ファイル（events.jsonl）に記録する（記録済みのナビゲーションを除く）。
+
+    Args:
+        driver (AsyncWebDriver): AsyncWebDriverインスタンス。
+        report_dir_path (Path): 結果レポート格納用フォルダのパス。
+        text_report (TextReport): TextReportインスタンス。
+        expected_result (str): 期待結果となる遷移先URL。
+        is_wait (bool): URLが期待結果になるまで待機するか否かを判定するフラグ。Default to True.
+        timeout (float): 待機のタイムアウト秒数。Default to DEFAULT_WAIT_TIMEOUT.
+    """
+    if is_wait:
+        ready_states = functions.get_loaded_ready_states(driver)
+        snapshot = await wait_for_page_snapshot(
+            driver, lambda s: s.url == expected_result and s.ready_state in ready_states,
+            f'URL「{expected_result}」', text_report=text_report, timeout=timeout)
+    else:
+        snapshot = await take_page_snapshot(driver)
+    await record_page_timing(driver, report_dir_path)
+    await save_screenshot(driver, report_dir_path, image_file_name=snapshot.url)
+    if snapshot.url == expected_result:
+        text_report.comment(f'URLが「{expected_result}」であることを確認_OK')
+    else:
+        raise Exception(f'URLが「{snapshot.url}」であり「{expected_result}」ではない_NG')
+
+@_traced()
+async def get_calender_year_and_month(driver: AsyncWebDriver, report_dir_path: Path,
+                                      text_report: TextReport) -> tuple[str, str]:
+    """
+    カレンダーの年月を取得する。
+
+    Args:
+        driver (AsyncWebDriver): AsyncWebDriverインスタンス。
+        report_dir_path (Path): 結果レポート格納用フォルダのパス。
+        text_report (TextReport): TextReportインスタンス。
+
+    Returns:
+        tuple[str, str]: 以下の2つの文字列を含むタプル。
+            - year: 年（例: '2025'）
+            - month: 月（例: '8'）
+    """
+    caption = (By.TAG_NAME, 'caption')
+    snapshot = await wait_for_page_snapshot(driver, lambda s: s.element(*caption).text.strip() != '',
+                                            '要素表示（caption）', locators=[caption], text_report=text_report,
+                                            is_raise=True)
+    displayed_calender_text = snapshot.element(*caption).text
+    year, month = re.findall(r'\d+', displayed_calender_text)
+
+    await save_screenshot(driver, report_dir_path, image_file_name=displayed_calender_text)
+    text_report.comment(f'表示中のカレンダー: {displayed_calender_text}')
+    return year, month
+
+@_traced()
+async def confirm_calender_year_and_month_match(driver: AsyncWebDriver, report_dir_path: Path,
+                                                text_report: TextReport, year: str, month: str):
+    """
+    カレンダーの年月が試験項目で指定された年月に一致することを確認する。
+
+    Args:
+        driver (AsyncWebDriver): AsyncWebDriverインスタンス。
+        report_dir_path (Path): 結果レポート格納用フォルダのパス。
+        text_report (TextReport): TextReportインスタンス。
+        year: 年（例: '2025'）
+        month: 月（例: '8'）
+    """
+    text_report.comment(f'{year}年{month}月のカレンダーが表示されていることを確認する')
+    calender_year, calender_month = await get_calender_year_and_month(driver, report_dir_path, text_report)
+    if year == calender_year and month == calender_month:
+        text_report.comment(f'{year}年{month}月のカレンダーが表示されていることを確認_OK')
+    else:
+        raise Exception(f'{year}年{month}月のカレンダーが表示されていない_NG')
+
+async def run_case(main: Callable[[CaseContext], Awaitable[Any]], script_path: Path,
+                   client: Optional[AsyncWebDriverClient]=None,
+                   profile: Optional[LaunchProfile]=None) -> CaseContext:
+    """
+    コルーチン関数のエントリーポイント（async def main(ctx)）を持つテストケースを実行する。
+    functions.run_case と同様に、結果ディレクトリ・テキストレポート・セッションを準備して main を呼び出し、
+    例外が発生しなければOK、発生すればNGとエラー内容を記入した上で、セッションを終了し、テキストレポートをクローズする。
+    ctx.driver には AsyncWebDriver を設定する。
+
+    Args:
+        main (Callable[[CaseContext], Awaitable[Any]]): テストケースの本体。
+        script_path (Path): テストケーススクリプトのパス。
+        client (Optional[AsyncWebDriverClient]): セッションの生成に使用するインスタンス。
+            Noneの場合は create_client で生成し、終了時に閉じる。
+        profile (Optional[LaunchProfile]): 起動プロファイル。Noneの場合は get_current_launch_profile の値を使用する。
+
+    Returns:
+        CaseContext: 実行後のコンテキスト（試験結果は ctx.text_report.result）。
+    """
+    report_dir_path = ReportDirectory(script_path).make_result_directory()
+    # テキストレポートが使用中とする StepTracer・EventLog は、このタスクのコンテキストに設定される
+    ctx = CaseContext(script_path=script_path, report_dir_path=report_dir_path,
+                      text_report=functions.get_text_report_instance(report_dir_path))
+    owned_client = create_client() if client is None else None
+    try:
+        async with open_session(client or owned_client, profile) as driver:
+            ctx.driver = driver
+            await main(ctx)
+            # 結果の記入時にスクリーンショットの書き込み完了を待機するため、スレッドで行う
+            await asyncio.to_thread(ctx.text_report.test_result, 'OK')
+    except Exception:
+        await asyncio.to_thread(ctx.text_report.test_result, 'NG')
+        ctx.text_report.error_details()
+    finally:
+        if owned_client is not None:
+            await owned_client.close()
+        # バッファリングモードの書き込みスレッドを停止する
+        await asyncio.to_thread(ctx.text_report.close)
+    return ctx
+
+async def run_cases(cases: Sequence[tuple[Callable[[CaseContext], Awaitable[Any]], Path]],
+                    client: AsyncWebDriverClient, profile: Optional[LaunchProfile]=None) -> list[CaseContext]:
+    """
+    複数のテストケースを1つのイベントループで並行して実行する。
+    同時に開くセッション数は client の max_sessions 以下に制限される。
+
+    Args:
+        cases (Sequence[tuple[Callable[[CaseContext], Awaitable[Any]], Path]]): テストケースの本体とスクリプトのパスの組の一覧。
+        client (AsyncWebDriverClient): セッションの生成に使用するインスタンス。
+        profile (Optional[LaunchProfile]): 起動プロファイル。Noneの場合は get_current_launch_profile の値を使用する。
+
+    Returns:
+        list[CaseContext]: 実行後のコンテキスト（cases と同じ順）。
+    """
+    return list(await asyncio.gather(*(run_case(main, script_path, client, profile) for main, script_path in cases)))
+
+def run(main: Callable[[CaseContext], Awaitable[Any]], script_path: Optional[Path]=None) -> CaseContext:
+    """
+    コルーチン関数のエントリーポイントを持つテストケースを、新しいイベントループで実行する。
+
+    テストケーススクリプトからは以下のように呼び出す。
+        if __name__ == '__main__':
+            async_functions.run(main)
+
+    Args:
+        main (Callable[[CaseContext], Awaitable[Any]]): テストケースの本体。
+        script_path (Optional[Path]): テストケーススクリプトのパス。Noneの場合は呼び出し元のスクリプト。
+
+    Returns:
+        CaseContext: 実行後のコンテキスト。
+    """
+    if script_path is None:
+        script_path = functions.get_caller_script_path()
+    return asyncio.run(run_case(main, script_path))
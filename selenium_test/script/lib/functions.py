@@ -1,21 +1,87 @@
 # Python
+import atexit
+import base64
+import functools
 import inspect
+import os
 import re
-from typing import Optional
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Optional, Sequence
 from pathlib import Path
 
 # Selenium
 from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.action_chains import ActionChains
+from selenium.webdriver.remote.webelement import WebElement
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.common.exceptions import TimeoutException, WebDriverException
 
 # engine
+from script.engine.case_loader import CaseContext
+from script.engine.command_profiler import CommandProfiler
 from script.engine.datetime_utils import DatetimeUtils
+from script.engine.event_log import EVENT_PAGE_TIMING, EventLog
+from script.engine.launch_profile import LaunchProfile, get_launch_profile
+from script.engine.page_snapshot import PageSnapshot
+from script.engine.page_timing import PageTiming
 from script.engine.path_manager import PathManager
 from script.engine.report_directory import ReportDirectory
 from script.engine.save_screenshot import SaveScreenshot
+from script.engine.screenshot_buffer import ScreenshotBuffer
+from script.engine.screenshot_pipeline import ScreenshotPipeline
+from script.engine.screenshot_store import ScreenshotStore
+from script.engine.screenshot_transcoder import ScreenshotTranscoder
+from script.engine.session_pool import SessionPool
+from script.engine.step_tracer import StepTracer
 from script.engine.text_report import TextReport
+from script.engine.visual_diff import VisualDiffOptions, compare_images
+
+# セッションプール（set_session_pool で設定された場合のみ使用する）
+_session_pool: Optional[SessionPool] = None
+
+# 結果ディレクトリごとのスクリーンショット非同期書き込みパイプライン
+_screenshot_pipelines: dict[Path, ScreenshotPipeline] = {}
+
+# 結果ディレクトリごとのスクリーンショットのリングバッファ（NG時のみ書き込む）
+_screenshot_buffers: dict[Path, ScreenshotBuffer] = {}
+
+# スクリーンショットの再エンコード・サムネイル生成（プロセス内で共有する）
+_screenshot_transcoder: Optional[ScreenshotTranscoder] = None
+
+# 結果ディレクトリごとに最後に記録したナビゲーションの開始時刻と、load まで記録できたか否か
+_page_timing_origins: dict[Path, tuple[float, bool]] = {}
+
+# 接続先のSelenium Grid（ハブ）のデフォルトのURL
+DEFAULT_SELENIUM_URL = 'http://selenium:4444/wd/hub'
+
+# 待機処理のデフォルトのタイムアウト秒数と確認間隔（秒）
+DEFAULT_WAIT_TIMEOUT = 10.0
+DEFAULT_POLL_FREQUENCY = 0.1
+
+# ページの読み込み時間とともに記録する、読み込み時間の長いリソースの数
+DEFAULT_PAGE_TIMING_RESOURCES = 10
+
+def _traced(category: str='function'):
+    """
+    関数の処理時間を StepTracer の区間として記録するデコレータを生成する。
+
+    Args:
+        category (str): 区間の種類。Default to 'function'.
+
+    Returns:
+        Callable: デコレータ。
+    """
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with StepTracer.trace(func.__name__, category):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
 
 def get_caller_script_path(layer: int=2) -> Path:
     """
@@ -28,7 +94,8 @@ def get_caller_script_path(layer: int=2) -> Path:
     Returns:
         Path: 呼び出し元のファイルパス（例: script/test_case_01.py）
     """
-    return Path(inspect.stack()[layer].filename).resolve()
+    # inspect.stack() は全フレームのソースを読み込むため、必要なフレームのみを参照する
+    return Path(sys._getframe(layer).f_code.co_filename).resolve()
 
 def make_result_directory() -> Path:
     """
@@ -44,9 +111,54 @@ def make_result_directory() -> Path:
     report_dir_obj = ReportDirectory(caller_script_path)
     return report_dir_obj.make_result_directory()
 
+def run_case(main: Callable[[CaseContext], Any], script_path: Optional[Path]=None) -> CaseContext:
+    """
+    エントリーポイント形式のテストケース（main(ctx)）を実行する。
+    結果ディレクトリ・テキストレポート・ドライバーを準備して main を呼び出し、
+    例外が発生しなければOK、発生すればNGとエラー内容を記入した上で、ドライバーを解放し、テキストレポートをクローズする。
+    main がコルーチン関数（async def main(ctx)）の場合は async_functions.run で実行する。
+
+    テストケーススクリプトからは以下のように呼び出す。
+        if __name__ == '__main__':
+            functions.run_case(main)
+
+    Args:
+        main (Callable[[CaseContext], Any]): テストケースの本体。
+        script_path (Optional[Path]): テストケーススクリプトのパス。Noneの場合は呼び出し元のスクリプト。
+
+    Returns:
+        CaseContext: 実行後のコンテキスト（試験結果は ctx.text_report.result）。
+    """
+    if script_path is None:
+        script_path = get_caller_script_path()
+    if inspect.iscoroutinefunction(main):
+        # lib（コルーチン関数の main は非同期のクライアントで実行する）
+        from script.lib import async_functions
+        return async_functions.run(main, script_path)
+    report_dir_path = ReportDirectory(script_path).make_result_directory()
+    ctx = CaseContext(script_path=script_path, report_dir_path=report_dir_path,
+                      text_report=get_text_report_instance(report_dir_path))
+    try:
+        ctx.driver = generate_selenium_driver()
+        main(ctx)
+        ctx.text_report.test_result(result='OK')
+    except Exception:
+        ctx.text_report.test_result(result='NG')
+        ctx.text_report.error_details()
+    finally:
+        if ctx.driver is not None:
+            release_selenium_driver(ctx.driver)
+        # バッファリングモードの書き込みスレッドを停止する（ワーカープロセスでは atexit が実行されないため）
+        ctx.text_report.close()
+    return ctx
+
 def get_text_report_instance(report_dir_path: Path) -> TextReport:
     """
     TextReportインスタンスを取得する。
+    試験結果の記入前に、スクリーンショットの書き込み完了を待機するよう設定する。
+    スクリーンショットをメモリ上に保持する設定の場合は、NGの記入時とエラー内容の記入時に書き込むよう設定する。
+    環境変数 SELENIUM_TEST_PROFILE_COMMANDS が '1' の場合は、WebDriverコマンドの計測を開始し、
+    試験結果の記入前に計測結果を出力するよう設定する。
 
     Args:
         report_dir_path (Path): 結果ディレクトリのパス。
@@ -54,28 +166,282 @@ def get_text_report_instance(report_dir_path: Path) -> TextReport:
     Returns:
         TextReport: TextReportインスタンス。
     """
-    return TextReport(report_dir_path)
+    text_report = TextReport(report_dir_path)
+    if get_screenshot_buffer(report_dir_path) is not None:
+        text_report.add_result_hook(lambda result: finish_screenshot_buffer(report_dir_path, text_report, result))
+        text_report.add_error_hook(lambda message: persist_screenshots(report_dir_path, text_report))
+    text_report.add_result_hook(lambda result: wait_for_screenshots(report_dir_path))
+    text_report.add_result_hook(lambda result: _page_timing_origins.pop(report_dir_path, None))
+    if is_profile_commands():
+        profiler = CommandProfiler(report_dir_path.name)
+        profiler.activate()
+        text_report.add_result_hook(
+            lambda result: finish_command_profile(profiler, report_dir_path, text_report))
+    return text_report
+
+def is_profile_commands() -> bool:
+    """
+    WebDriverコマンドの計測が有効か否かを判定する。
 
-def generate_selenium_driver() -> webdriver.Remote:
+    Returns:
+        bool: 環境変数 SELENIUM_TEST_PROFILE_COMMANDS が '1' の場合は True。
     """
-    Selenium Web Driverを生成する。
+    return os.environ.get('SELENIUM_TEST_PROFILE_COMMANDS') == '1'
+
+def finish_command_profile(profiler: CommandProfiler, report_dir_path: Path, text_report: TextReport):
+    """
+    WebDriverコマンドの計測を終了し、計測結果を結果ディレクトリに出力する。
+
+    Args:
+        profiler (CommandProfiler): CommandProfilerインスタンス。
+        report_dir_path (Path): 結果ディレクトリのパス。
+        text_report (TextReport): TextReportインスタンス。
+    """
+    profiler.deactivate()
+    profiler.export(report_dir_path)
+    records = profiler.records
+    text_report.comment(f'WebDriverコマンド: {len(records)}回、合計{sum(record.latency for record in records):.3f}秒'
+                        f'（詳細: command_profile.txt）')
+
+def get_selenium_url() -> str:
+    """
+    接続先のSelenium Grid（ハブ）のURLを取得する。
+    環境変数 SELENIUM_HUB_URL が設定されている場合はその値を使用する。
+
+    Returns:
+        str: ハブのURL。
+    """
+    return os.environ.get('SELENIUM_HUB_URL', DEFAULT_SELENIUM_URL)
+
+def get_current_launch_profile() -> LaunchProfile:
+    """
+    使用する起動プロファイルを取得する。
+    環境変数 SELENIUM_TEST_PROFILE にプロファイル名が設定されている場合はその値を使用する。
+
+    Returns:
+        LaunchProfile: 起動プロファイル。
+    """
+    return get_launch_profile(os.environ.get('SELENIUM_TEST_PROFILE', 'default'))
+
+def generate_new_selenium_driver(profile: Optional[LaunchProfile]=None) -> webdriver.Remote:
+    """
+    Selenium Web Driverを新規に生成する。
+
+    Args:
+        profile (Optional[LaunchProfile]): 起動プロファイル。Noneの場合は get_current_launch_profile の値を使用する。
 
     Returns:
         driver (webdriver.Remote): webdriver.Remoteインスタンス。
     """
-    selenium_url = 'http://selenium:4444/wd/hub'
-    options = Options()
-    # ヘッドレスモードの場合はブラウザを起動せずに実施する
-    # options.add_argument('--headless')
-    # chromeのSandBox機能無効化
-    options.add_argument('--no-sandbox')
-    # chromeが共有メモリを使わないようにする（仮想環境のクラッシュ予防）
-    options.add_argument('--disable-dev-shm-usage')
+    profile = profile if profile is not None else get_current_launch_profile()
+    driver = webdriver.Remote(command_executor=get_selenium_url(), options=profile.to_options())
+    profile.setup_window(driver)
+    return driver
+
+def set_session_pool(session_pool: Optional[SessionPool]):
+    """
+    generate_selenium_driver / release_selenium_driver が使用するセッションプールを設定する。
+
+    Args:
+        session_pool (Optional[SessionPool]): SessionPoolインスタンス。Noneの場合はプールを使用しない。
+    """
+    global _session_pool
+    _session_pool = session_pool
+
+@_traced('webdriver')
+def generate_selenium_driver() -> webdriver.Remote:
+    """
+    Selenium Web Driverを取得する。
+    セッションプールが設定されている場合はプールから払い出し、なければ新規に生成する。
 
-    driver = webdriver.Remote(command_executor=selenium_url, options=options)
-    driver.maximize_window()
+    Returns:
+        driver (webdriver.Remote): webdriver.Remoteインスタンス。
+    """
+    driver = _session_pool.acquire() if _session_pool is not None else generate_new_selenium_driver()
+    StepTracer.install(driver)
+    if is_profile_commands():
+        CommandProfiler.install(driver)
     return driver
 
+@_traced('webdriver')
+def release_selenium_driver(driver: webdriver.Remote):
+    """
+    使用済みのSelenium Web Driverを解放する。
+    セッションプールが設定されている場合はプールに返却し、なければ終了する。
+
+    Args:
+        driver (webdriver.Remote): webdriver.Remoteインスタンス。
+    """
+    if _session_pool is not None:
+        _session_pool.release(driver)
+    else:
+        driver.quit()
+
+def _wait_until(driver: webdriver.Remote, condition: Callable[[webdriver.Remote], Any], description: str,
+                text_report: Optional[TextReport]=None, timeout: float=DEFAULT_WAIT_TIMEOUT,
+                poll_frequency: float=DEFAULT_POLL_FREQUENCY, is_raise: bool=True) -> Any:
+    """
+    条件が成立するまで待機し、実際の待機時間をテキストレポートに記録する。
+
+    Args:
+        driver (webdriver.Remote): webdriver.Remoteインスタンス。
+        condition (Callable[[webdriver.Remote], Any]): 待機条件。真となる値を返した時点で待機を終了する。
+        description (str): 待機内容の説明（レポート出力用）。
+        text_report (Optional[TextReport]): TextReportインスタンス。Noneの場合は記録しない。
+        timeout (float): タイムアウト秒数。Default to DEFAULT_WAIT_TIMEOUT.
+        poll_frequency (float): 条件の確認間隔（秒）。Default to DEFAULT_POLL_FREQUENCY.
+        is_raise (bool): タイムアウト時に例外を送出するか否かを判定するフラグ。Default to True.
+
+    Returns:
+        Any: 条件が返した値。タイムアウトかつ is_raise が False の場合は None。
+    """
+    start = time.perf_counter()
+    try:
+        with StepTracer.trace(description, 'wait'):
+            value = WebDriverWait(driver, timeout, poll_frequency=poll_frequency).until(condition)
+    except TimeoutException:
+        if text_report is not None:
+            text_report.comment(f'待機タイムアウト: {description}（{time.perf_counter() - start:.3f}秒）')
+        if is_raise:
+            raise
+        return None
+    if text_report is not None:
+        text_report.comment(f'待機完了: {description}（{time.perf_counter() - start:.3f}秒）')
+    return value
+
+def get_loaded_ready_states(driver: webdriver.Remote) -> tuple[str, ...]:
+    """
+    読み込み完了とみなす document.readyState の値を取得する。
+    ページ読み込み戦略が 'eager' / 'none' のセッションでは、DOM構築完了（'interactive'）の時点で完了とみなす。
+
+    Args:
+        driver (webdriver.Remote): webdriver.Remoteインスタンス。
+
+    Returns:
+        tuple[str, ...]: 読み込み完了とみなす document.readyState の値。
+    """
+    capabilities = getattr(driver, 'capabilities', None) or {}
+    if capabilities.get('pageLoadStrategy') in ('eager', 'none'):
+        return ('interactive', 'complete')
+    return ('complete',)
+
+def wait_for_page_load(driver: webdriver.Remote, text_report: Optional[TextReport]=None,
+                       timeout: float=DEFAULT_WAIT_TIMEOUT, poll_frequency: float=DEFAULT_POLL_FREQUENCY):
+    """
+    ページの読み込みが完了する（document.readyState が get_loaded_ready_states の値になる）まで待機する。
+
+    Args:
+        driver (webdriver.Remote): webdriver.Remoteインスタンス。
+        text_report (Optional[TextReport]): TextReportインスタンス。Noneの場合は待機時間を記録しない。
+        timeout (float): タイムアウト秒数。Default to DEFAULT_WAIT_TIMEOUT.
+        poll_frequency (float): 条件の確認間隔（秒）。Default to DEFAULT_POLL_FREQUENCY.
+    """
+    ready_states = get_loaded_ready_states(driver)
+    _wait_until(driver, lambda d: d.execute_script('return document.readyState;') in ready_states,
+                'ページ読み込み完了', text_report, timeout, poll_frequency)
+
+def wait_for_element_visible(driver: webdriver.Remote, by: str, value: str,
+                             text_report: Optional[TextReport]=None, timeout: float=DEFAULT_WAIT_TIMEOUT,
+                             poll_frequency: float=DEFAULT_POLL_FREQUENCY) -> WebElement:
+    """
+    要素が表示されるまで待機する。
+
+    Args:
+        driver (webdriver.Remote): webdriver.Remoteインスタンス。
+        by (str): ロケータの種類（例: By.XPATH）。
+        value (str): ロケータの値。
+        text_report (Optional[TextReport]): TextReportインスタンス。Noneの場合は待機時間を記録しない。
+        timeout (float): タイムアウト秒数。Default to DEFAULT_WAIT_TIMEOUT.
+        poll_frequency (float): 条件の確認間隔（秒）。Default to DEFAULT_POLL_FREQUENCY.
+
+    Returns:
+        WebElement: 表示された要素。
+    """
+    return _wait_until(driver, EC.visibility_of_element_located((by, value)),
+                       f'要素表示（{value}）', text_report, timeout, poll_frequency)
+
+def wait_for_element_clickable(driver: webdriver.Remote, by: str, value: str,
+                               text_report: Optional[TextReport]=None, timeout: float=DEFAULT_WAIT_TIMEOUT,
+                               poll_frequency: float=DEFAULT_POLL_FREQUENCY) -> WebElement:
+    """
+    要素がクリック可能になるまで待機する。
+
+    Args:
+        driver (webdriver.Remote): webdriver.Remoteインスタンス。
+        by (str): ロケータの種類（例: By.LINK_TEXT）。
+        value (str): ロケータの値。
+        text_report (Optional[TextReport]): TextReportインスタンス。Noneの場合は待機時間を記録しない。
+        timeout (float): タイムアウト秒数。Default to DEFAULT_WAIT_TIMEOUT.
+        poll_frequency (float): 条件の確認間隔（秒）。Default to DEFAULT_POLL_FREQUENCY.
+
+    Returns:
+        WebElement: クリック可能になった要素。
+    """
+    return _wait_until(driver, EC.element_to_be_clickable((by, value)),
+                       f'要素クリック可能（{value}）', text_report, timeout, poll_frequency)
+
+def wait_for_url_change(driver: webdriver.Remote, url: str, text_report: Optional[TextReport]=None,
+                        timeout: float=DEFAULT_WAIT_TIMEOUT, poll_frequency: float=DEFAULT_POLL_FREQUENCY) -> str:
+    """
+    URLが指定のURLから変化するまで待機する。
+
+    Args:
+        driver (webdriver.Remote): webdriver.Remoteインスタンス。
+        url (str): 変化前のURL。
+        text_report (Optional[TextReport]): TextReportインスタンス。Noneの場合は待機時間を記録しない。
+        timeout (float): タイムアウト秒数。Default to DEFAULT_WAIT_TIMEOUT.
+        poll_frequency (float): 条件の確認間隔（秒）。Default to DEFAULT_POLL_FREQUENCY.
+
+    Returns:
+        str: 変化後のURL。
+    """
+    return _wait_until(driver, lambda d: d.current_url if d.current_url != url else False,
+                       'URL変化', text_report, timeout, poll_frequency)
+
+def wait_for_title_change(driver: webdriver.Remote, title: str, text_report: Optional[TextReport]=None,
+                          timeout: float=DEFAULT_WAIT_TIMEOUT, poll_frequency: float=DEFAULT_POLL_FREQUENCY) -> str:
+    """
+    ページタイトルが指定のタイトルから変化するまで待機する。
+
+    Args:
+        driver (webdriver.Remote): webdriver.Remoteインスタンス。
+        title (str): 変化前のページタイトル。
+        text_report (Optional[TextReport]): TextReportインスタンス。Noneの場合は待機時間を記録しない。
+        timeout (float): タイムアウト秒数。Default to DEFAULT_WAIT_TIMEOUT.
+        poll_frequency (float): 条件の確認間隔（秒）。Default to DEFAULT_POLL_FREQUENCY.
+
+    Returns:
+        str: 変化後のページタイトル。
+    """
+    return _wait_until(driver, lambda d: d.title if d.title != title else False,
+                       'ページタイトル変化', text_report, timeout, poll_frequency)
+
+def wait_for_dom_quiet(driver: webdriver.Remote, quiet_ms: int=500, text_report: Optional[TextReport]=None,
+                       timeout: float=DEFAULT_WAIT_TIMEOUT, poll_frequency: float=DEFAULT_POLL_FREQUENCY):
+    """
+    DOMの変更が quiet_ms ミリ秒間発生しなくなるまで待機する。
+    初回呼び出し時にページへ MutationObserver を設置し、最終変更時刻を記録させる。
+
+    Args:
+        driver (webdriver.Remote): webdriver.Remoteインスタンス。
+        quiet_ms (int): DOMの変更が発生しない状態が継続すべき時間（ミリ秒）。Default to 500.
+        text_report (Optional[TextReport]): TextReportインスタンス。Noneの場合は待機時間を記録しない。
+        timeout (float): タイムアウト秒数。Default to DEFAULT_WAIT_TIMEOUT.
+        poll_frequency (float): 条件の確認間隔（秒）。Default to DEFAULT_POLL_FREQUENCY.
+    """
+    script = '''
+        if (window.__seleniumTestLastMutation === undefined) {
+            window.__seleniumTestLastMutation = performance.now();
+            new MutationObserver(function () {
+                window.__seleniumTestLastMutation = performance.now();
+            }).observe(document, {subtree: true, childList: true, attributes: true, characterData: true});
+        }
+        return performance.now() - window.__seleniumTestLastMutation >= arguments[0];
+    '''
+    _wait_until(driver, lambda d: d.execute_script(script, quiet_ms),
+                f'DOM変更停止（{quiet_ms}ミリ秒）', text_report, timeout, poll_frequency)
+
+@_traced()
 def get_now_datetime(text_report: TextReport, is_comment: bool=True) -> tuple[str, str, str, str, str, str, str]:
     """
     現在の年月日時刻を取得する。
@@ -96,6 +462,147 @@ def get_now_datetime(text_report: TextReport, is_comment: bool=True) -> tuple[st
     """
     return DatetimeUtils.get_now_datetime(text_report=text_report, is_comment=is_comment)
 
+def get_screenshot_store(report_dir_path: Path) -> Optional[ScreenshotStore]:
+    """
+    重複を排除してスクリーンショットを保存するための ScreenshotStore を取得する。
+    環境変数 SELENIUM_TEST_SCREENSHOT_STORE が '1' の場合のみ有効。
+    画像の実体は 'results/.screenshot_store' に格納し、全ての結果ディレクトリで共有する。
+
+    Args:
+        report_dir_path (Path): 結果ディレクトリのパス。
+
+    Returns:
+        Optional[ScreenshotStore]: ScreenshotStoreインスタンス。無効な場合は None。
+    """
+    if os.environ.get('SELENIUM_TEST_SCREENSHOT_STORE') != '1':
+        return None
+    return ScreenshotStore(report_dir_path.parent / '.screenshot_store')
+
+def get_screenshot_pipeline(report_dir_path: Path) -> Optional[ScreenshotPipeline]:
+    """
+    結果ディレクトリに対応するスクリーンショット非同期書き込みパイプラインを取得する。
+    環境変数 SELENIUM_TEST_ASYNC_SCREENSHOT が '1' の場合のみ有効。
+
+    Args:
+        report_dir_path (Path): 結果ディレクトリのパス。
+
+    Returns:
+        Optional[ScreenshotPipeline]: ScreenshotPipelineインスタンス。無効な場合は None。
+    """
+    if os.environ.get('SELENIUM_TEST_ASYNC_SCREENSHOT') != '1':
+        return None
+    if report_dir_path not in _screenshot_pipelines:
+        _screenshot_pipelines[report_dir_path] = ScreenshotPipeline(store=get_screenshot_store(report_dir_path))
+    return _screenshot_pipelines[report_dir_path]
+
+def get_screenshot_buffer(report_dir_path: Path) -> Optional[ScreenshotBuffer]:
+    """
+    結果ディレクトリに対応するスクリーンショットのリングバッファを取得する。
+    環境変数 SELENIUM_TEST_SCREENSHOT_BUFFER に保持する枚数が設定されている場合のみ有効。
+    環境変数 SELENIUM_TEST_SCREENSHOT_BUFFER_MB が設定されている場合は、保持する合計サイズ（MB）の上限とする。
+
+    Args:
+        report_dir_path (Path): 結果ディレクトリのパス。
+
+    Returns:
+        Optional[ScreenshotBuffer]: ScreenshotBufferインスタンス。無効な場合は None。
+    """
+    max_count = os.environ.get('SELENIUM_TEST_SCREENSHOT_BUFFER')
+    if not max_count:
+        return None
+    if report_dir_path not in _screenshot_buffers:
+        max_mb = os.environ.get('SELENIUM_TEST_SCREENSHOT_BUFFER_MB')
+        _screenshot_buffers[report_dir_path] = ScreenshotBuffer(
+            max_count=int(max_count), max_bytes=int(float(max_mb) * 1024 * 1024) if max_mb else 64 * 1024 * 1024)
+    return _screenshot_buffers[report_dir_path]
+
+def persist_screenshots(report_dir_path: Path, text_report: Optional[TextReport]=None) -> list[Path]:
+    """
+    リングバッファに保持しているスクリーンショットを結果ディレクトリへ書き込む。
+    NG・エラー以外で画像を残したい場合は、テストケースから直接呼び出す。
+
+    Args:
+        report_dir_path (Path): 結果ディレクトリのパス。
+        text_report (Optional[TextReport]): TextReportインスタンス。Noneの場合は書き込み件数を記録しない。
+
+    Returns:
+        list[Path]: 書き込んだファイルのパス一覧。バッファが無効または空の場合は空。
+    """
+    buffer = _screenshot_buffers.get(report_dir_path)
+    if buffer is None or not len(buffer):
+        return []
+    with StepTracer.trace('スクリーンショット書き込み', 'screenshot'):
+        paths = buffer.persist(get_screenshot_store(report_dir_path), get_screenshot_transcoder())
+    if text_report is not None:
+        dropped = f'（上限超過で破棄: {buffer.dropped}件）' if buffer.dropped else ''
+        text_report.comment(f'保持していたスクリーンショット {len(paths)}件を書き込み{dropped}')
+    return paths
+
+def finish_screenshot_buffer(report_dir_path: Path, text_report: TextReport, result: str):
+    """
+    試験結果の記入前に、リングバッファを後片付けする。
+    NGの場合、または環境変数 SELENIUM_TEST_KEEP_SCREENSHOTS が '1' の場合は書き込み、それ以外は破棄する。
+
+    Args:
+        report_dir_path (Path): 結果ディレクトリのパス。
+        text_report (TextReport): TextReportインスタンス。
+        result (str): 試験結果（'OK' / 'NG'）。
+    """
+    if result != 'OK' or os.environ.get('SELENIUM_TEST_KEEP_SCREENSHOTS') == '1':
+        persist_screenshots(report_dir_path, text_report)
+    buffer = _screenshot_buffers.pop(report_dir_path, None)
+    if buffer is not None:
+        buffer.clear()
+
+def get_screenshot_transcoder() -> Optional[ScreenshotTranscoder]:
+    """
+    保存後のスクリーンショットを再エンコード・サムネイル生成する ScreenshotTranscoder を取得する。
+    環境変数 SELENIUM_TEST_TRANSCODE に変換後の形式（'png' / 'webp' / 'jpeg'）が設定されている場合のみ有効。
+    環境変数 SELENIUM_TEST_TRANSCODE_QUALITY が設定されている場合は、その品質で非可逆圧縮する。
+
+    Returns:
+        Optional[ScreenshotTranscoder]: ScreenshotTranscoderインスタンス。無効な場合は None。
+    """
+    global _screenshot_transcoder
+    image_format = os.environ.get('SELENIUM_TEST_TRANSCODE')
+    if not image_format:
+        return None
+    if _screenshot_transcoder is None:
+        quality = os.environ.get('SELENIUM_TEST_TRANSCODE_QUALITY')
+        _screenshot_transcoder = ScreenshotTranscoder(image_format=image_format,
+                                                      quality=int(quality) if quality else 80,
+                                                      is_lossless=not quality)
+        # 単体で実行した場合のプロセス終了時（ワーカープロセスでは init_worker で登録した終了処理で停止する）
+        atexit.register(close_screenshot_transcoder)
+    return _screenshot_transcoder
+
+def close_screenshot_transcoder():
+    """
+    ScreenshotTranscoder の変換の完了を待機し、ワーカープロセスを停止する。
+    停止しないまま終了すると、multiprocessing の終了処理が変換用のワーカープロセスの終了を待ち続ける。
+    """
+    global _screenshot_transcoder
+    transcoder, _screenshot_transcoder = _screenshot_transcoder, None
+    if transcoder is not None:
+        transcoder.close()
+
+@_traced('screenshot')
+def wait_for_screenshots(report_dir_path: Path) -> list[Path]:
+    """
+    結果ディレクトリに対する非同期のスクリーンショット書き込み、および変換が全て完了するまで待機する。
+
+    Args:
+        report_dir_path (Path): 結果ディレクトリのパス。
+
+    Returns:
+        list[Path]: 書き込みが完了したファイルのパス一覧。
+    """
+    pipeline = _screenshot_pipelines.pop(report_dir_path, None)
+    paths = pipeline.close() if pipeline is not None else []
+    if _screenshot_transcoder is not None:
+        _screenshot_transcoder.join()
+    return paths
+
 def create_save_screenshot(path: Path):
     """
     スクリーンショット画像を保存する関数を生成するファクトリ関数。
@@ -109,7 +616,8 @@ def create_save_screenshot(path: Path):
         save (Callable[webdriver.Remote, str]): スクリーンショット画像を保存する関数。
     """
     path_manager = PathManager(path)
-    save_screenshot = SaveScreenshot(path_manager)
+    save_screenshot = SaveScreenshot(path_manager, get_screenshot_pipeline(path), get_screenshot_store(path),
+                                     get_screenshot_transcoder(), get_screenshot_buffer(path))
 
     def save(driver: webdriver.Remote, image_file_name: str='',
              extension: Optional[str]='.png', is_add_datetime: bool=True,
@@ -128,56 +636,190 @@ def create_save_screenshot(path: Path):
 
     return save
 
-def open_web_page(driver: webdriver.Remote, report_dir_path: Path, url: str):
+def is_collect_page_timing() -> bool:
+    """
+    ページの読み込み時間の記録が有効か否かを判定する。
+
+    Returns:
+        bool: 環境変数 SELENIUM_TEST_PAGE_TIMING が '0' 以外（未設定を含む）の場合は True。
+    """
+    return os.environ.get('SELENIUM_TEST_PAGE_TIMING') != '0'
+
+def store_page_timing(report_dir_path: Path, timing: PageTiming) -> bool:
+    """
+    ページの読み込み時間を、実行中の手順の番号とともに記録ファイル（events.jsonl）へ記録する。
+    同じナビゲーションは1回のみ記録する。ただし前回の記録時に load が未到達だった場合は、到達後に記録し直す。
+
+    Args:
+        report_dir_path (Path): 結果ディレクトリのパス。
+        timing (PageTiming): 読み込み時間。
+
+    Returns:
+        bool: 記録した場合は True。記録済みのナビゲーションの場合は False。
+    """
+    previous = _page_timing_origins.get(report_dir_path)
+    is_complete = timing.load is not None
+    if previous is not None and previous[0] == timing.time_origin and (previous[1] or not is_complete):
+        return False
+    _page_timing_origins[report_dir_path] = (timing.time_origin, is_complete)
+    tracer = StepTracer.current()
+    EventLog.record(EVENT_PAGE_TIMING, step_index=tracer.step_index if tracer is not None else 0,
+                    **timing.to_event_fields())
+    return True
+
+def record_page_timing(driver: webdriver.Remote, report_dir_path: Path) -> Optional[PageTiming]:
+    """
+    表示中のページの読み込み時間（Navigation Timing・Resource Timing）を1回のスクリプト実行で取得し、記録する。
+    取得に失敗しても試験は継続する。
+
+    Args:
+        driver (webdriver.Remote): webdriver.Remoteインスタンス。
+        report_dir_path (Path): 結果ディレクトリのパス。
+
+    Returns:
+        Optional[PageTiming]: 読み込み時間。無効な場合や取得できなかった場合は None。
+    """
+    if not is_collect_page_timing():
+        return None
+    with StepTracer.trace('読み込み時間取得', 'timing'):
+        try:
+            timing = PageTiming.take(driver, DEFAULT_PAGE_TIMING_RESOURCES)
+        except (WebDriverException, AttributeError, KeyError, TypeError, ValueError):
+            return None
+    store_page_timing(report_dir_path, timing)
+    return timing
+
+@_traced()
+def open_web_page(driver: webdriver.Remote, report_dir_path: Path, url: str,
+                  text_report: Optional[TextReport]=None, is_wait: bool=True,
+                  timeout: float=DEFAULT_WAIT_TIMEOUT):
     """
     Webページを開く。
+    ページの読み込み時間を記録ファイル（events.jsonl）に記録する（環境変数 SELENIUM_TEST_PAGE_TIMING が '0' の場合を除く）。
 
     Args:
         driver (webdriver.Remote): webdriver.Remoteインスタンス。
-        text_report (TextReport): TextReportインスタンス。
+        report_dir_path (Path): 結果レポート格納用フォルダのパス。
         url (str): 遷移先URL。
+        text_report (Optional[TextReport]): TextReportインスタンス。Noneの場合は待機時間を記録しない。
+        is_wait (bool): ページの読み込み完了を待機するか否かを判定するフラグ。Default to True.
+        timeout (float): 待機のタイムアウト秒数。Default to DEFAULT_WAIT_TIMEOUT.
     """
     driver.get(url)
+    if is_wait: wait_for_page_load(driver, text_report=text_report, timeout=timeout)
+    record_page_timing(driver, report_dir_path)
     save = create_save_screenshot(report_dir_path)
     save(driver, image_file_name=url)
 
+def take_page_snapshot(driver: webdriver.Remote, locators: Sequence[tuple[str, str]]=(),
+                       attribute_names: Sequence[str]=()) -> PageSnapshot:
+    """
+    ページタイトル・URL・読み込み状態・指定要素のテキストと属性を1回のスクリプト実行でまとめて取得する。
+
+    Args:
+        driver (webdriver.Remote): webdriver.Remoteインスタンス。
+        locators (Sequence[tuple[str, str]]): 状態を取得する要素のロケータ一覧（例: [(By.TAG_NAME, 'caption')]）。Default to ().
+        attribute_names (Sequence[str]): 各要素から取得する属性名の一覧。Default to ().
+
+    Returns:
+        PageSnapshot: ページ状態（変更不可）。
+    """
+    with StepTracer.trace('ページ状態取得', 'snapshot'):
+        return PageSnapshot.take(driver, locators, attribute_names)
+
+def wait_for_page_snapshot(driver: webdriver.Remote, predicate: Callable[[PageSnapshot], bool], description: str,
+                           locators: Sequence[tuple[str, str]]=(), attribute_names: Sequence[str]=(),
+                           text_report: Optional[TextReport]=None, timeout: float=DEFAULT_WAIT_TIMEOUT,
+                           poll_frequency: float=DEFAULT_POLL_FREQUENCY, is_raise: bool=False) -> PageSnapshot:
+    """
+    ページ状態が条件を満たすまで待機する。確認1回あたりのリモートへの往復は1回のみ。
+
+    Args:
+        driver (webdriver.Remote): webdriver.Remoteインスタンス。
+        predicate (Callable[[PageSnapshot], bool]): ページ状態を受け取り、条件を満たす場合に True を返す関数。
+        description (str): 待機内容（テキストレポートへの記録に使用）。
+        locators (Sequence[tuple[str, str]]): 状態を取得する要素のロケータ一覧。Default to ().
+        attribute_names (Sequence[str]): 各要素から取得する属性名の一覧。Default to ().
+        text_report (Optional[TextReport]): TextReportインスタンス。Noneの場合は待機時間を記録しない。
+        timeout (float): タイムアウト秒数。Default to DEFAULT_WAIT_TIMEOUT.
+        poll_frequency (float): 条件の確認間隔（秒）。Default to DEFAULT_POLL_FREQUENCY.
+        is_raise (bool): タイムアウト時に例外を送出するか否かを判定するフラグ。Default to False.
+
+    Returns:
+        PageSnapshot: 条件を満たしたページ状態。タイムアウトかつ is_raise が False の場合は最後に取得したページ状態。
+    """
+    snapshots = []
+
+    def condition(d: webdriver.Remote) -> Any:
+        snapshots[:] = [PageSnapshot.take(d, locators, attribute_names)]
+        return snapshots[0] if predicate(snapshots[0]) else False
+
+    snapshot = _wait_until(driver, condition, description, text_report, timeout, poll_frequency, is_raise)
+    if snapshot:
+        return snapshot
+    return snapshots[0] if snapshots else take_page_snapshot(driver, locators, attribute_names)
+
+@_traced()
 def confirm_page_title(driver: webdriver.Remote, report_dir_path: Path,
-                       text_report: TextReport, expected_result: str):
+                       text_report: TextReport, expected_result: str,
+                       is_wait: bool=True, timeout: float=DEFAULT_WAIT_TIMEOUT):
     """
     Webページのページタイトルを確認する。
+    ページタイトルが期待結果になるまで待機してから確認する（タイムアウト時はNG）。
 
     Args:
         driver (webdriver.Remote): webdriver.Remoteインスタンス。
         report_dir_path (Path): 結果レポート格納用フォルダのパス。
         text_report (TextReport): TextReportインスタンス。
         expected_result (str): 期待結果となるページタイトル。
+        is_wait (bool): ページタイトルが期待結果になるまで待機するか否かを判定するフラグ。Default to True.
+        timeout (float): 待機のタイムアウト秒数。Default to DEFAULT_WAIT_TIMEOUT.
     """
+    if is_wait:
+        snapshot = wait_for_page_snapshot(driver, lambda s: s.title == expected_result,
+                                          f'ページタイトル「{expected_result}」', text_report=text_report, timeout=timeout)
+    else:
+        snapshot = take_page_snapshot(driver)
     # driver.save_screenshot(f'{str(report_dir_path)}/{driver.title}.png')
     save = create_save_screenshot(report_dir_path)
-    save(driver, image_file_name=driver.title)
-    if driver.title == expected_result:
+    save(driver, image_file_name=snapshot.title)
+    if snapshot.title == expected_result:
         text_report.comment(f'ページタイトルが「{expected_result}」であることを確認_OK')
     else:
-        raise Exception(f'ページタイトルが「{driver.title}」であり「{expected_result}」ではない_NG')
+        raise Exception(f'ページタイトルが「{snapshot.title}」であり「{expected_result}」ではない_NG')
 
+@_traced()
 def confirm_url(driver: webdriver.Remote, report_dir_path: Path,
-                text_report: TextReport, expected_result: str):
+                text_report: TextReport, expected_result: str,
+                is_wait: bool=True, timeout: float=DEFAULT_WAIT_TIMEOUT):
     """
     WebページのURLを確認する。
+    URLが期待結果になり、ページの読み込みが完了するまで待機してから確認する（タイムアウト時はNG）。
+    遷移先のページの読み込み時間を記録ファイル（events.jsonl）に記録する（記録済みのナビゲーションを除く）。
 
     Args:
         driver (webdriver.Remote): webdriver.Remoteインスタンス。
         report_dir_path (Path): 結果レポート格納用フォルダのパス。
         text_report (TextReport): TextReportインスタンス。
         expected_result (str): 期待結果となる遷移先URL。
+        is_wait (bool): URLが期待結果になるまで待機するか否かを判定するフラグ。Default to True.
+        timeout (float): 待機のタイムアウト秒数。Default to DEFAULT_WAIT_TIMEOUT.
     """
+    if is_wait:
+        ready_states = get_loaded_ready_states(driver)
+        snapshot = wait_for_page_snapshot(driver, lambda s: s.url == expected_result and s.ready_state in ready_states,
+                                          f'URL「{expected_result}」', text_report=text_report, timeout=timeout)
+    else:
+        snapshot = take_page_snapshot(driver)
+    record_page_timing(driver, report_dir_path)
     save = create_save_screenshot(report_dir_path)
-    save(driver, image_file_name=driver.current_url)
-    if driver.current_url == expected_result:
+    save(driver, image_file_name=snapshot.url)
+    if snapshot.url == expected_result:
         text_report.comment(f'URLが「{expected_result}」であることを確認_OK')
     else:
-        raise Exception(f'URLが「{driver.current_url}」であり「{expected_result}」ではない_NG')
+        raise Exception(f'URLが「{snapshot.url}」であり「{expected_result}」ではない_NG')
     
+@_traced()
 def get_calender_year_and_month(driver: webdriver.Remote, report_dir_path: Path,
                                 text_report: TextReport) -> tuple[str, str]:
     """
@@ -193,14 +835,19 @@ def get_calender_year_and_month(driver: webdriver.Remote, report_dir_path: Path,
             - year: 年（例: '2025'）
             - month: 月（例: '8'）
     """
-    displayed_calender_el = driver.find_element(By.TAG_NAME, 'caption')
-    year, month = re.findall(r'\d+', displayed_calender_el.text)
+    caption = (By.TAG_NAME, 'caption')
+    snapshot = wait_for_page_snapshot(driver, lambda s: s.element(*caption).text.strip() != '',
+                                      '要素表示（caption）', locators=[caption], text_report=text_report,
+                                      is_raise=True)
+    displayed_calender_text = snapshot.element(*caption).text
+    year, month = re.findall(r'\d+', displayed_calender_text)
     
     save = create_save_screenshot(report_dir_path)
-    save(driver, image_file_name=displayed_calender_el.text)
-    text_report.comment(f'表示中のカレンダー: {displayed_calender_el.text}')
+    save(driver, image_file_name=displayed_calender_text)
+    text_report.comment(f'表示中のカレンダー: {displayed_calender_text}')
     return year, month
 
+@_traced()
 def confirm_calender_year_and_month_match(driver: webdriver.Remote,
                                           report_dir_path: Path,
                                           text_report: TextReport,
@@ -221,4 +868,73 @@ def confirm_calender_year_and_month_match(driver: webdriver.Remote,
     if year == calender_year and month == calender_month:
         text_report.comment(f'{year}年{month}月のカレンダーが表示されていることを確認_OK')
     else:
-        raise Exception(f'{year}年{month}月のカレンダーが表示されていない_NG')
\ No newline at end of file
+        raise Exception(f'{year}年{month}月のカレンダーが表示されていない_NG')
+
+def get_baseline_dir_path(report_dir_path: Path) -> Path:
+    """
+    結果ディレクトリのテストケースに対応するベースライン画像の格納ディレクトリを取得する。
+    環境変数 SELENIUM_TEST_BASELINE_DIR が設定されている場合はその配下、未設定なら 'test/baselines' 配下とする。
+
+    Args:
+        report_dir_path (Path): 結果ディレクトリのパス（例: results/test_case_01_3）。
+
+    Returns:
+        Path: ベースライン画像の格納ディレクトリのパス（例: test/baselines/test_case_01）。
+    """
+    baseline_root = os.environ.get('SELENIUM_TEST_BASELINE_DIR')
+    baseline_root_path = Path(baseline_root) if baseline_root else report_dir_path.parent.parent / 'baselines'
+    return baseline_root_path / re.sub(r'_\d+$', '', report_dir_path.name)
+
+@_traced()
+def confirm_visual_match(driver: webdriver.Remote, report_dir_path: Path, text_report: TextReport,
+                         name: str, ignore_regions: Sequence[tuple[int, int, int, int]]=(),
+                         tolerance: int=VisualDiffOptions.tolerance,
+                         max_diff_ratio: float=VisualDiffOptions.max_diff_ratio):
+    """
+    表示中の画面のスクリーンショットがベースライン画像と一致することを確認する。
+    スクリーンショットは他のスクリーンショットと同様に 'visual_<name>.png' として保存し
+    （リングバッファが有効な場合はメモリ上に保持するのみ）、比較は一時ファイルに書き出した画像で行う。
+    不一致の場合は差分画像 'visual_<name>_diff.png' を書き出す。
+    環境変数 SELENIUM_TEST_UPDATE_BASELINE が '1' の場合は、スクリーンショットをベースライン画像として保存する（確認はOKとする）。
+    それ以外でベースライン画像が存在しない場合はNGとする。
+
+    Args:
+        driver (webdriver.Remote): webdriver.Remoteインスタンス。
+        report_dir_path (Path): 結果レポート格納用フォルダのパス。
+        text_report (TextReport): TextReportインスタンス。
+        name (str): 比較する画面の名前（ベースライン画像のファイル名）。
+        ignore_regions (Sequence[tuple[int, int, int, int]]): 比較から除外する領域（x, y, 幅, 高さ）。Default to ().
+        tolerance (int): 画素ごとの許容差（0〜255）。Default to VisualDiffOptions.tolerance.
+        max_diff_ratio (float): 許容する差分画素の割合（0〜1）。Default to VisualDiffOptions.max_diff_ratio.
+    """
+    path_manager = PathManager(report_dir_path)
+    save_image = SaveScreenshot(path_manager, get_screenshot_pipeline(report_dir_path),
+                                get_screenshot_store(report_dir_path), get_screenshot_transcoder(),
+                                get_screenshot_buffer(report_dir_path))
+    png_base64 = driver.get_screenshot_as_base64()
+    save_image.save_png_base64(png_base64, f'visual_{name}', is_add_datetime=False)
+    png = base64.b64decode(png_base64)
+    baseline_path = get_baseline_dir_path(report_dir_path) / f'{name}.png'
+    if os.environ.get('SELENIUM_TEST_UPDATE_BASELINE') == '1':
+        baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        baseline_path.write_bytes(png)
+        text_report.comment(f'ベースライン画像「{baseline_path.name}」を保存_OK')
+        return
+    if not baseline_path.is_file():
+        raise Exception(f'ベースライン画像「{baseline_path}」が存在しない'
+                        f'（作成する場合は SELENIUM_TEST_UPDATE_BASELINE=1 を指定して実行）_NG')
+
+    options = VisualDiffOptions(tolerance=tolerance, max_diff_ratio=max_diff_ratio,
+                                ignore_regions=tuple(tuple(region) for region in ignore_regions))
+    # 保存先のファイルは非同期書き込み・リングバッファ・重複排除の設定によっては存在しないため、一時ファイルで比較する
+    with tempfile.TemporaryDirectory() as temp_dir:
+        actual_path = Path(temp_dir) / f'visual_{name}.png'
+        actual_path.write_bytes(png)
+        result = compare_images(baseline_path, actual_path, options,
+                                diff_path=path_manager.get_path(f'visual_{name}_diff', 'png'))
+    if result.is_match:
+        text_report.comment(f'画面「{name}」がベースライン画像と一致することを確認_OK'
+                            f'（{result.reason}、差分 {result.diff_ratio:.4%}）')
+    else:
+        raise Exception(f'画面「{name}」がベースライン画像と一致しない（{result.reason}、'
+                        f'差分 {result.diff_ratio:.4%}、差分タイル {len(result.changed_tiles)}件）_NG')
\ No newline at end of file
@@ -1,40 +1,23 @@
-# Python
-import time
-
-# Selenium
-from selenium import webdriver
-
 # engine（抽象度が高くlibから参照しており、testからは参照しない）
 
 # lib
 from script.lib import functions
 
-def main(driver: webdriver.Remote):
+def main(ctx: functions.CaseContext):
+    driver, report_dir_path, text_report = ctx.driver, ctx.report_dir_path, ctx.text_report
+
     text_report.procedure('手順1.「http://racer.xsrv.jp/portfolio/index.html」を開く')
-    functions.open_web_page(driver, report_dir_path=report_dir_path, url='http://racer.xsrv.jp/portfolio/index.html')
-    time.sleep(5)
+    functions.open_web_page(driver, report_dir_path=report_dir_path, url='http://racer.xsrv.jp/portfolio/index.html',
+                            text_report=text_report)
 
     text_report.expected_result('期待結果1.ページタイトルが「web-pattern1(home) | portfolio」であること')
     functions.confirm_page_title(driver,
                                  report_dir_path=report_dir_path,
                                  text_report=text_report,
                                  expected_result='web-pattern1(home) | portfolio')
-    time.sleep(2)
 
 ##### 実行部 #####
-try:
-    ### 準備 ###
-    report_dir_path = functions.make_result_directory()
-    text_report = functions.get_text_report_instance(report_dir_path)
-    ### Seleniumドライバー生成 ###
-    driver = functions.generate_selenium_driver()
-    ### 走行 ###
-    main(driver)
-    text_report.test_result(result='OK')
-except Exception as e:
-    text_report.test_result(result='NG')
-    text_report.error_details()
-finally:
-    driver.quit()
-
-
+# 準備（結果ディレクトリ・テキストレポート・Seleniumドライバー生成）、試験結果の記入、ドライバーの解放は
+# functions.run_case が行う。ランナーから実行する場合は main のみが呼び出される
+if __name__ == '__main__':
+    functions.run_case(main)
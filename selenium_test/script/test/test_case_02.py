@@ -1,8 +1,4 @@
-# Python
-import time
-
 # Selenium
-from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.action_chains import ActionChains
 
@@ -11,24 +7,25 @@ from selenium.webdriver.common.action_chains import ActionChains
 # lib
 from script.lib import functions
 
-def main(driver: webdriver.Remote):
+def main(ctx: functions.CaseContext):
+    driver, report_dir_path, text_report = ctx.driver, ctx.report_dir_path, ctx.text_report
+
     text_report.procedure('手順1.「http://racer.xsrv.jp/portfolio/index.html」を開く')
     functions.open_web_page(driver, report_dir_path=report_dir_path,
-                            url='http://racer.xsrv.jp/portfolio/index.html')
-    time.sleep(5)
+                            url='http://racer.xsrv.jp/portfolio/index.html',
+                            text_report=text_report)
 
     text_report.procedure('手順2.「JavaScript」をマウスオーバーする')
     javascript_el = driver.find_element(By.XPATH, '//li[@class="subnavi"][2]')
     ActionChains(driver).move_to_element(javascript_el).perform()
+    functions.wait_for_element_visible(driver, By.LINK_TEXT, 'カレンダー', text_report=text_report)
 
     save = functions.create_save_screenshot(report_dir_path)
     save(driver, image_file_name='JavaScriptマウスオーバー')
-    time.sleep(2)
 
     text_report.procedure('手順3.「カレンダー」をクリックする')
-    calender_el = driver.find_element(By.LINK_TEXT, 'カレンダー')
+    calender_el = functions.wait_for_element_clickable(driver, By.LINK_TEXT, 'カレンダー', text_report=text_report)
     calender_el.click()
-    time.sleep(2)
 
     text_report.expected_result('期待結果3-1.URLが「http://racer.xsrv.jp/portfolio/javascript/calendar.html」であること')
     functions.confirm_url(driver,
@@ -46,19 +43,7 @@ def main(driver: webdriver.Remote):
                                                     month=month)
 
 ##### 実行部 #####
-try:
-    ### 準備 ###
-    report_dir_path = functions.make_result_directory()
-    text_report = functions.get_text_report_instance(report_dir_path)
-    ### Seleniumドライバー生成 ###
-    driver = functions.generate_selenium_driver()
-    ### 走行 ###
-    main(driver)
-    text_report.test_result(result='OK')
-except Exception as e:
-    text_report.test_result(result='NG')
-    text_report.error_details()
-finally:
-    driver.quit()
-
-
+# 準備（結果ディレクトリ・テキストレポート・Seleniumドライバー生成）、試験結果の記入、ドライバーの解放は
+# functions.run_case が行う。ランナーから実行する場合は main のみが呼び出される
+if __name__ == '__main__':
+    functions.run_case(main)
@@ -0,0 +1,121 @@
+# Python
+import argparse
+import asyncio
+import contextlib
+import inspect
+import io
+import os
+import sys
+import time
+from typing import Optional
+from pathlib import Path
+
+# engine
+from script.engine.case_loader import CaseLoader
+from script.engine.launch_profile import PROFILES
+from script.engine.suite_runner import SuiteRunner, TestCaseResult
+
+TEST_DIR_PATH = Path(__file__).resolve().parent.parent / 'test'
+
+def parse_args(argv: list[str]) -> argparse.Namespace:
+    """
+    コマンドライン引数を解析する。
+
+    Args:
+        argv (list[str]): コマンドライン引数。
+
+    Returns:
+        argparse.Namespace: 解析結果。
+    """
+    parser = argparse.ArgumentParser(
+        description='コルーチン関数のエントリーポイント（async def main(ctx)）を持つテストケースを、'
+                    '1プロセスで多数のセッションを並行して開いて実行する。')
+    parser.add_argument('scripts', nargs='*', type=Path,
+                        help='実行するテストケーススクリプト。省略時は test ディレクトリから探索する。')
+    parser.add_argument('-k', '--pattern', default='test_case_*.py',
+                        help='探索するスクリプトのファイル名パターン。')
+    parser.add_argument('-n', '--max-sessions', type=int, default=None,
+                        help='同時に開くセッション数の上限（省略時は環境変数 SELENIUM_TEST_MAX_SESSIONS、'
+                             '未設定ならGridのスロット数）。')
+    parser.add_argument('-r', '--repeat', type=int, default=1, help='各テストケースを実行する回数。')
+    parser.add_argument('-q', '--quiet', action='store_true', help='テストケースのターミナル出力を抑止する。')
+    parser.add_argument('--launch-profile', choices=sorted(PROFILES), default=None,
+                        help='ブラウザの起動プロファイル（環境変数 SELENIUM_TEST_PROFILE と同等、省略時は default）。')
+    parser.add_argument('--hub-url', default=None,
+                        help='接続先のSelenium GridのURL（環境変数 SELENIUM_HUB_URL と同等）。')
+    parser.add_argument('--stub-webdriver', action='store_true',
+                        help='Selenium Gridの代わりにWebDriverスタブサーバー（tools/webdriver_stub.py）を起動して使用する。')
+    return parser.parse_args(argv)
+
+async def run_all(cases: list[tuple], max_sessions: Optional[int]) -> tuple[list[TestCaseResult], int]:
+    """
+    テストケースを1つのクライアントで並行して実行する。
+
+    Args:
+        cases (list[tuple]): テストケースの本体とスクリプトのパスの組の一覧。
+        max_sessions (Optional[int]): 同時に開くセッション数の上限。
+
+    Returns:
+        tuple[list[TestCaseResult], int]: 実行結果の一覧と、同時に開いたセッション数の上限。
+    """
+    # lib
+    from script.lib import async_functions
+
+    async with async_functions.create_client(max_sessions) as client:
+        async def run_one(main, script_path: Path) -> TestCaseResult:
+            start = time.perf_counter()
+            ctx = await async_functions.run_case(main, script_path, client)
+            return TestCaseResult(test_case=script_path.stem, result=ctx.text_report.result or 'NG',
+                                  elapsed=time.perf_counter() - start, report_dir_path=ctx.report_dir_path)
+
+        results = await asyncio.gather(*(run_one(main, script_path) for main, script_path in cases))
+        return list(results), client.max_sessions
+
+def main(argv: list[str]) -> int:
+    """
+    テストケースを並行して実行し、集計結果を出力する。
+
+    Args:
+        argv (list[str]): コマンドライン引数。
+
+    Returns:
+        int: 終了コード。全件OKなら 0、NGを含む場合は 1。
+    """
+    args = parse_args(argv)
+    if args.launch_profile:
+        os.environ['SELENIUM_TEST_PROFILE'] = args.launch_profile
+    if args.hub_url:
+        os.environ['SELENIUM_HUB_URL'] = args.hub_url
+
+    loader = CaseLoader()
+    script_paths = [path.resolve() for path in args.scripts] or SuiteRunner(TEST_DIR_PATH, args.pattern).discover()
+    cases = []
+    for script_path in script_paths:
+        loaded = loader.load(script_path)
+        if not inspect.iscoroutinefunction(loaded.main):
+            print(f'{script_path.stem}: async def main(ctx) を持たないため実行しない（tools/run_tests.py で実行する）')
+            continue
+        cases.extend([(loaded.main, loaded.script_path)] * args.repeat)
+    if not cases:
+        print('実行対象のテストケースはありません。')
+        return 0
+
+    stub = None
+    if args.stub_webdriver:
+        # tools
+        from script.tools.webdriver_stub import WebDriverStub
+        stub = WebDriverStub().start()
+        os.environ['SELENIUM_HUB_URL'] = stub.url
+    start = time.perf_counter()
+    try:
+        with contextlib.redirect_stdout(io.StringIO()) if args.quiet else contextlib.nullcontext():
+            results, max_sessions = asyncio.run(run_all(cases, args.max_sessions))
+    finally:
+        if stub is not None:
+            stub.stop()
+    print(f'同時セッション数の上限: {max_sessions}')
+    print(SuiteRunner.summarize(results, time.perf_counter() - start))
+    return 0 if results and all(result.result == 'OK' for result in results) else 1
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,112 @@
+# Python
+import argparse
+import json
+import sqlite3
+import sys
+from contextlib import closing
+from datetime import timedelta
+from typing import Optional
+from pathlib import Path
+
+# engine
+from script.engine.clock import get_clock
+from script.engine.results_catalog import ResultsCatalog
+
+RESULTS_DIR_PATH = Path(__file__).resolve().parent.parent / 'test' / 'results'
+
+def parse_args(argv: list[str]) -> argparse.Namespace:
+    """
+    コマンドライン引数を解析する。
+
+    Args:
+        argv (list[str]): コマンドライン引数。
+
+    Returns:
+        argparse.Namespace: 解析結果。
+    """
+    parser = argparse.ArgumentParser(description='結果のカタログ（SQLite）を検索・集計・再構築する。')
+    parser.add_argument('--results-dir', type=Path, default=RESULTS_DIR_PATH, help='results ディレクトリのパス。')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    runs_parser = subparsers.add_parser('runs', help='条件に一致する実行を新しい順に一覧表示する。')
+    runs_parser.add_argument('-t', '--test-case', default=None, help='テストケース名（例: test_case_02）。')
+    runs_parser.add_argument('-r', '--result', choices=['OK', 'NG'], default=None, help='試験結果。')
+    runs_parser.add_argument('--error', default=None, help='エラー概要に含まれる文字列（例: カレンダー）。')
+    runs_parser.add_argument('--artifacts', action='store_true', help='成果物のパスも表示する。')
+    runs_parser.add_argument('-n', '--limit', type=int, default=50, help='最大件数（0 で無制限）。')
+
+    stats_parser = subparsers.add_parser('stats', help='テストケースごとの合格率を集計する。')
+    stats_parser.add_argument('-t', '--test-case', default=None, help='テストケース名。')
+
+    for period_parser in (runs_parser, stats_parser):
+        period_parser.add_argument('--days', type=float, default=None, help='直近の日数に開始した実行に絞り込む。')
+        period_parser.add_argument('--since', default=None, help='この日時以降に開始した実行（例: 2025-08-01）。')
+        period_parser.add_argument('--until', default=None, help='この日時より前に開始した実行（例: 2025-09-01）。')
+
+    sql_parser = subparsers.add_parser('sql', help='任意のSELECT文を読み取り専用で実行する（テーブル名: runs）。')
+    sql_parser.add_argument('statement', help='SQL文。')
+
+    subparsers.add_parser('rebuild', help='results ディレクトリの結果ディレクトリとアーカイブの内容をカタログに登録し直す。')
+    return parser.parse_args(argv)
+
+def get_since(args: argparse.Namespace) -> Optional[str]:
+    """
+    '--days' / '--since' から検索開始日時を求める。
+
+    Args:
+        args (argparse.Namespace): コマンドライン引数。
+
+    Returns:
+        Optional[str]: 検索開始日時（ISO 8601形式）。指定がない場合は None。
+    """
+    if args.days is not None:
+        return (get_clock().now() - timedelta(days=args.days)).isoformat(timespec='seconds')
+    return args.since
+
+def main(argv: list[str]) -> int:
+    """
+    サブコマンドを実行する。
+
+    Args:
+        argv (list[str]): コマンドライン引数。
+
+    Returns:
+        int: 終了コード。
+    """
+    args = parse_args(argv)
+    catalog = ResultsCatalog.for_results_dir(args.results_dir)
+
+    if args.command == 'runs':
+        rows = catalog.query(test_case=args.test_case, result=args.result, since=get_since(args), until=args.until,
+                             error_like=args.error, limit=args.limit or None)
+        for row in rows:
+            error = f'  {row["error_summary"]}' if row['error_summary'] else ''
+            archived = f'  アーカイブ: {row["archived_to"]}' if row['archived_to'] else ''
+            print(f'{row["run_name"]}  {row["result"] or "-"}  {row["started_at"] or "-"}  '
+                  f'{row["ended_at"] or "-"}{error}{archived}')
+            if args.artifacts:
+                for artifact in json.loads(row['artifacts']):
+                    print(f'    {Path(row["report_dir_path"]) / artifact}')
+        print(f'{len(rows)} 件')
+    elif args.command == 'stats':
+        for row in catalog.pass_rates(test_case=args.test_case, since=get_since(args), until=args.until):
+            print(f'{row["test_case"]}  実行: {row["total"]}  OK: {row["ok"]}  NG: {row["ng"]}  '
+                  f'合格率: {row["pass_rate"]:.1%}')
+    elif args.command == 'sql':
+        # 読み取り専用で開き、カタログを書き換えられないようにする
+        try:
+            with closing(sqlite3.connect(f'{catalog.db_path.resolve().as_uri()}?mode=ro', uri=True)) as connection:
+                cursor = connection.execute(args.statement)
+                if cursor.description is not None:
+                    print('\t'.join(column[0] for column in cursor.description))
+                    for row in cursor:
+                        print('\t'.join('' if value is None else str(value) for value in row))
+        except sqlite3.Error as e:
+            print(f'SQLの実行に失敗した: {e}', file=sys.stderr)
+            return 2
+    elif args.command == 'rebuild':
+        print(f'{catalog.rebuild(args.results_dir)} 件を登録した')
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,65 @@
+# Python
+import argparse
+import json
+import sys
+from pathlib import Path
+
+# engine
+from script.engine.event_log import iter_event_log_paths, iter_events, summarize_run
+
+RESULTS_DIR_PATH = Path(__file__).resolve().parent.parent / 'test' / 'results'
+
+def parse_args(argv: list[str]) -> argparse.Namespace:
+    """
+    コマンドライン引数を解析する。
+
+    Args:
+        argv (list[str]): コマンドライン引数。
+
+    Returns:
+        argparse.Namespace: 解析結果。
+    """
+    parser = argparse.ArgumentParser(description='結果ディレクトリの記録ファイル（events.jsonl）を集計・抽出する。')
+    parser.add_argument('--results-dir', type=Path, default=RESULTS_DIR_PATH, help='results ディレクトリのパス。')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    summary_parser = subparsers.add_parser('summary', help='実行ごとの試験結果・所要時間・エラーを集計する。')
+    summary_parser.add_argument('--ng-only', action='store_true', help='NG（または試験結果未記入）の実行のみ表示する。')
+
+    events_parser = subparsers.add_parser('events', help='指定した種類のレコードをJSON Lines形式で出力する。')
+    events_parser.add_argument('--type', dest='types', action='append', default=None,
+                               help='出力するイベントの種類（複数指定可、例: error）。省略時は全て。')
+    return parser.parse_args(argv)
+
+def main(argv: list[str]) -> int:
+    """
+    サブコマンドを実行する。記録ファイルは1件ずつ読み出し、全体をメモリに溜めない。
+
+    Args:
+        argv (list[str]): コマンドライン引数。
+
+    Returns:
+        int: 終了コード。
+    """
+    args = parse_args(argv)
+
+    if args.command == 'summary':
+        counts = {'OK': 0, 'NG': 0}
+        for path in iter_event_log_paths(args.results_dir):
+            summary = summarize_run(path)
+            result = summary.result or '-'
+            counts['OK' if result == 'OK' else 'NG'] += 1
+            if args.ng_only and result == 'OK':
+                continue
+            error = f'  {summary.first_error.splitlines()[0]}' if summary.first_error else ''
+            print(f'{summary.run_name}  {result}  {summary.elapsed:.1f}秒  手順: {summary.steps}  '
+                  f'スクリーンショット: {summary.screenshots}{error}')
+        print(f'OK: {counts["OK"]}  NG: {counts["NG"]}  合計: {counts["OK"] + counts["NG"]}')
+    elif args.command == 'events':
+        for path in iter_event_log_paths(args.results_dir):
+            for event in iter_events(path, args.types):
+                print(json.dumps({'run': path.parent.name, **event}, ensure_ascii=False))
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,152 @@
+# Python
+import argparse
+import math
+import sys
+from pathlib import Path
+
+# engine
+from script.engine.event_log import EVENT_PAGE_TIMING, EventLog, iter_events
+from script.engine.page_timing import SIZE_METRICS, TIME_METRICS, PageTiming, ResourceTiming
+from script.engine.page_timing_history import MetricComparison, PageTimingHistory, RegressionOptions
+
+RESULTS_DIR_PATH = Path(__file__).resolve().parent.parent / 'test' / 'results'
+
+def parse_args(argv: list[str]) -> argparse.Namespace:
+    """
+    コマンドライン引数を解析する。
+
+    Args:
+        argv (list[str]): コマンドライン引数。
+
+    Returns:
+        argparse.Namespace: 解析結果。
+    """
+    defaults = RegressionOptions()
+    parser = argparse.ArgumentParser(description='記録ファイル（events.jsonl）に記録したページの読み込み時間を表示・比較する。')
+    parser.add_argument('--results-dir', type=Path, default=RESULTS_DIR_PATH, help='results ディレクトリのパス。')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    show_parser = subparsers.add_parser('show', help='1回分の実行の読み込み時間と、読み込み時間の長いリソースを表示する。')
+    show_parser.add_argument('run_name', help='結果ディレクトリ名（例: test_case_01_3）。')
+
+    compare_parser = subparsers.add_parser(
+        'compare', help='最新の実行を過去の実行と比較し、有意な劣化を検出する（劣化があれば終了コード 1）。')
+    compare_parser.add_argument('test_cases', nargs='*', help='テストケース名（例: test_case_01）。省略時は全て。')
+    compare_parser.add_argument('--run', type=int, default=None, metavar='NUM',
+                                help='比較する実行の連番（省略時は最新の実行）。')
+    compare_parser.add_argument('--history', type=int, default=defaults.history,
+                                help='比較対象とする過去のOKの実行数。')
+    compare_parser.add_argument('--alpha', type=float, default=defaults.alpha, help='有意水準。')
+    compare_parser.add_argument('--min-change', type=float, default=defaults.min_change,
+                                help='劣化とみなす変化率の下限（0.1 = 10%%増）。')
+    compare_parser.add_argument('--min-delta-ms', type=float, default=defaults.min_delta_ms,
+                                help='時間の指標で劣化とみなす増加量の下限（ミリ秒）。')
+    compare_parser.add_argument('--metric', dest='metrics', action='append', default=None,
+                                choices=TIME_METRICS + SIZE_METRICS + ('resource_count',),
+                                help=f'比較する指標（複数指定可、省略時は {", ".join(defaults.metrics)}）。')
+    compare_parser.add_argument('--all', action='store_true', help='劣化していない指標も表示する。')
+    return parser.parse_args(argv)
+
+def format_value(metric: str, value: float) -> str:
+    """
+    指標の値を単位付きの文字列に変換する。
+
+    Args:
+        metric (str): 指標名。
+        value (float): 値。
+
+    Returns:
+        str: 単位付きの値。
+    """
+    if metric in TIME_METRICS:
+        return f'{value:.0f}ms'
+    if metric in SIZE_METRICS:
+        return f'{value / 1024:.1f}KB'
+    return f'{value:g}'
+
+def format_comparison(comparison: MetricComparison) -> str:
+    """
+    比較結果を1行の文字列に変換する。
+
+    Args:
+        comparison (MetricComparison): 比較結果。
+
+    Returns:
+        str: 比較結果。
+    """
+    mark = '劣化' if comparison.is_regression else '    '
+    change = f'{comparison.change:+.0%}' if math.isfinite(comparison.change) else '+inf'
+    return (f'  {mark}  {comparison.step}  {comparison.metric}: {format_value(comparison.metric, comparison.current)}'
+            f'（過去{comparison.samples}件の平均 {format_value(comparison.metric, comparison.baseline)}、'
+            f'{change}、p={comparison.p_value:.4f}）')
+
+def show(results_dir_path: Path, run_name: str) -> int:
+    """
+    1回分の実行の読み込み時間を表示する。
+
+    Args:
+        results_dir_path (Path): 'results'ディレクトリのパス。
+        run_name (str): 結果ディレクトリ名。
+
+    Returns:
+        int: 終了コード。
+    """
+    path = results_dir_path / run_name / EventLog.FILE_NAME
+    if not path.is_file():
+        print(f'記録ファイルがない: {path}', file=sys.stderr)
+        return 2
+    for event in iter_events(path, [EVENT_PAGE_TIMING]):
+        metrics = event.get('metrics', {})
+        resources = tuple(ResourceTiming(**resource) for resource in event.get('resources', []))
+        timing = PageTiming(url=event.get('url', ''), time_origin=event.get('time_origin', 0),
+                            ttfb=metrics.get('ttfb'), dom_interactive=metrics.get('dom_interactive'),
+                            dom_content_loaded=metrics.get('dom_content_loaded'), load=metrics.get('load'),
+                            transfer_size=metrics.get('transfer_size', 0),
+                            resource_count=metrics.get('resource_count', 0),
+                            resource_transfer_size=metrics.get('resource_transfer_size', 0),
+                            slowest_resources=resources)
+        print(f'手順{event.get("step_index", 0)}  {timing.url}')
+        print(f'  {timing.summary()}')
+        for resource in timing.slowest_resources:
+            print(f'    {resource.duration:>8.0f}ms  {resource.transfer_size / 1024:>8.1f}KB  '
+                  f'{resource.initiator_type:<8}  {resource.name}')
+    return 0
+
+def main(argv: list[str]) -> int:
+    """
+    サブコマンドを実行する。
+
+    Args:
+        argv (list[str]): コマンドライン引数。
+
+    Returns:
+        int: 終了コード。compare で劣化を検出した場合は 1。
+    """
+    args = parse_args(argv)
+    if args.command == 'show':
+        return show(args.results_dir, args.run_name)
+
+    defaults = RegressionOptions()
+    options = RegressionOptions(history=args.history, alpha=args.alpha, min_change=args.min_change,
+                                min_delta_ms=args.min_delta_ms, min_samples=defaults.min_samples,
+                                metrics=tuple(args.metrics) if args.metrics else defaults.metrics)
+    history = PageTimingHistory(args.results_dir, options)
+    regressions = 0
+    for test_case, runs in history.list_runs(args.test_cases or None).items():
+        current, baseline_runs, comparisons = history.compare_latest(runs, args.run)
+        if current is None:
+            continue
+        if len(baseline_runs) < options.min_samples:
+            print(f'{current.path.name}: 比較できる過去のOKの実行が {len(baseline_runs)}件のため判定しない'
+                  f'（{options.min_samples}件以上必要）')
+            continue
+        found = [comparison for comparison in comparisons if comparison.is_regression]
+        regressions += len(found)
+        print(f'{current.path.name}: 過去{len(baseline_runs)}件と比較、劣化 {len(found)}件')
+        for comparison in comparisons if args.all else found:
+            print(format_comparison(comparison))
+    print(f'劣化: {regressions}件')
+    return 1 if regressions else 0
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
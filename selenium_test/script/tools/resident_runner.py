@@ -0,0 +1,347 @@
+# Python
+import argparse
+import hmac
+import json
+import os
+import secrets
+import socket
+import socketserver
+import sys
+import threading
+import time
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, Optional
+
+# engine
+from script.engine.case_loader import CaseLoader
+from script.engine.suite_runner import SuiteRunner, TestCaseResult, run_test_case
+
+TEST_DIR_PATH = Path(__file__).resolve().parent.parent / 'test'
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+# トークンファイルの格納先（ポートごとに 'resident_runner_<ポート>.token' を作成する）
+TOKEN_DIR_PATH = TEST_DIR_PATH / 'results' / '.run_index'
+
+class ResidentRequestHandler(socketserver.StreamRequestHandler):
+    """
+    常駐ランナーへの要求を1件処理するハンドラ。
+    要求・応答はいずれも1行のJSONとする。要求には起動時にトークンファイルへ書き出したトークンを含める。
+
+    要求:
+        {"token": "...", "command": "run", "scripts": ["...test_case_01.py", ...], "quiet": true}
+        {"token": "...", "command": "ping"}
+        {"token": "...", "command": "shutdown"}
+    応答:
+        {"results": [TestCaseResult の辞書, ...]} / {"status": "ok"} / {"error": "..."}
+    """
+    def handle(self):
+        line = self.rfile.readline()
+        try:
+            request = json.loads(line)
+            response = self.server.dispatch(request)
+        except Exception as e:
+            response = {'error': f'{type(e).__name__}: {e}'}
+        self.wfile.write(json.dumps(response, ensure_ascii=False).encode('utf-8') + b'\n')
+
+class ResidentServer(socketserver.TCPServer):
+    """
+    Selenium・engine・lib を1度だけ読み込み、要求に応じてテストケースをプロセス内で実行する常駐ランナー。
+
+    テストケーススクリプトは CaseLoader で読み込み、エントリーポイント形式（main(ctx)）であれば
+    読み込み済みの main を繰り返し呼び出す。セッションはセッションプールで使い回す。
+    テストケースは要求を受けた順に1件ずつ実行する（ドライバーとセッションプールを共有するため）。
+    同じホストの他のユーザーやプロセスから任意のスクリプトを実行されないよう、トークンが一致しない要求は拒否し、
+    実行できるスクリプトは test_dir_path 配下のファイルに限る。
+
+    Attributes:
+        loader (CaseLoader): スクリプトの読み込みキャッシュ。
+        is_quiet (bool): テストケースの標準出力を抑止するか否かの既定値。
+        token (str): 要求に含めるトークン。生成時にランダムに作成する。
+        test_dir_path (Path): 実行できるスクリプトを格納するディレクトリのパス。
+    """
+    allow_reuse_address = True
+
+    def __init__(self, address: tuple[str, int], is_quiet: bool=True, test_dir_path: Path=TEST_DIR_PATH):
+        """
+        Args:
+            address (tuple[str, int]): 待ち受けるホストとポート。
+            is_quiet (bool): テストケースの標準出力を抑止するか否かの既定値。Default to True.
+            test_dir_path (Path): 実行できるスクリプトを格納するディレクトリのパス。Default to TEST_DIR_PATH.
+        """
+        super().__init__(address, ResidentRequestHandler)
+        self.loader = CaseLoader()
+        self.is_quiet = is_quiet
+        self.token = secrets.token_hex(32)
+        self.test_dir_path = test_dir_path.resolve()
+
+    def dispatch(self, request: dict[str, Any]) -> dict[str, Any]:
+        """
+        要求を処理し、応答を返す。
+
+        Args:
+            request (dict[str, Any]): 要求。
+
+        Returns:
+            dict[str, Any]: 応答。
+
+        Raises:
+            PermissionError: トークンが一致しない場合、または test_dir_path 配下以外のスクリプトを指定した場合。
+        """
+        if not hmac.compare_digest(str(request.get('token', '')).encode('utf-8'), self.token.encode('utf-8')):
+            raise PermissionError('トークンが一致しない')
+        command = request.get('command', 'run')
+        if command == 'ping':
+            return {'status': 'ok', 'pid': os.getpid()}
+        if command == 'shutdown':
+            # serve_forever と同じスレッドから shutdown を呼ぶと終了待ちでデッドロックするため、別スレッドから呼ぶ
+            threading.Thread(target=self.shutdown, daemon=True).start()
+            return {'status': 'ok'}
+        if command == 'run':
+            is_quiet = request.get('quiet', self.is_quiet)
+            script_paths = [Path(script).resolve() for script in request.get('scripts', [])]
+            for script_path in script_paths:
+                if not script_path.is_relative_to(self.test_dir_path):
+                    raise PermissionError(f'{self.test_dir_path} 配下以外のスクリプトは実行できない: {script_path}')
+            results = []
+            for script_path in script_paths:
+                result = run_test_case(script_path, is_quiet=is_quiet, loader=self.loader)
+                print(f'[{result.result}] {result.test_case} ({result.elapsed:.1f}秒)')
+                results.append(result_to_dict(result))
+            return {'results': results}
+        raise ValueError(f'未対応のコマンド: {command}')
+
+def result_to_dict(result: TestCaseResult) -> dict[str, Any]:
+    """
+    TestCaseResult をJSONに変換できる辞書にする。
+
+    Args:
+        result (TestCaseResult): 実行結果。
+
+    Returns:
+        dict[str, Any]: 実行結果の辞書。
+    """
+    data = asdict(result)
+    data['report_dir_path'] = str(result.report_dir_path) if result.report_dir_path else None
+    return data
+
+def result_from_dict(data: dict[str, Any]) -> TestCaseResult:
+    """
+    result_to_dict で変換した辞書から TestCaseResult を復元する。
+
+    Args:
+        data (dict[str, Any]): 実行結果の辞書。
+
+    Returns:
+        TestCaseResult: 実行結果。
+    """
+    report_dir_path = Path(data['report_dir_path']) if data.get('report_dir_path') else None
+    return TestCaseResult(test_case=data['test_case'], result=data['result'], elapsed=data['elapsed'],
+                          report_dir_path=report_dir_path, error=data.get('error', ''))
+
+def get_token_path(args: argparse.Namespace) -> Path:
+    """
+    トークンファイルのパスを取得する。
+
+    Args:
+        args (argparse.Namespace): コマンドライン引数。
+
+    Returns:
+        Path: '--token-file' で指定したパス。省略時は 'test/results/.run_index/resident_runner_<ポート>.token'。
+    """
+    if args.token_file is not None:
+        return args.token_file
+    return TOKEN_DIR_PATH / f'resident_runner_{args.port}.token'
+
+def write_token(token_path: Path, token: str):
+    """
+    トークンを所有者のみが読み書きできるファイルに書き出す。
+
+    Args:
+        token_path (Path): トークンファイルのパス。
+        token (str): トークン。
+    """
+    token_path.parent.mkdir(parents=True, exist_ok=True)
+    fd = os.open(token_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, 'w', encoding='ascii') as f:
+        # 既存のファイルを上書きした場合もパーミッションを揃える
+        os.chmod(token_path, 0o600)
+        f.write(token)
+
+def read_token(args: argparse.Namespace) -> Optional[str]:
+    """
+    常駐ランナーが起動時に書き出したトークンを読み込む。
+
+    Args:
+        args (argparse.Namespace): コマンドライン引数。
+
+    Returns:
+        Optional[str]: トークン。トークンファイルが存在しない場合（常駐ランナーが起動していない場合）は None。
+    """
+    try:
+        return get_token_path(args).read_text(encoding='ascii').strip()
+    except FileNotFoundError:
+        return None
+
+def request(host: str, port: int, payload: dict[str, Any], token: str,
+            timeout: Optional[float]=None) -> dict[str, Any]:
+    """
+    常駐ランナーへ要求を送り、応答を受け取る。
+
+    Args:
+        host (str): 常駐ランナーのホスト。
+        port (int): 常駐ランナーのポート。
+        payload (dict[str, Any]): 要求。
+        token (str): 常駐ランナーが起動時に書き出したトークン。
+        timeout (float): 応答待ちのタイムアウト（秒）。Noneの場合は待ち続ける。Default to None.
+
+    Returns:
+        dict[str, Any]: 応答。
+
+    Raises:
+        RuntimeError: 常駐ランナーがエラーを返した場合。
+    """
+    payload = {'token': token, **payload}
+    with socket.create_connection((host, port), timeout=timeout) as sock:
+        sock.sendall(json.dumps(payload, ensure_ascii=False).encode('utf-8') + b'\n')
+        with sock.makefile('rb') as f:
+            response = json.loads(f.readline())
+    if 'error' in response:
+        raise RuntimeError(response['error'])
+    return response
+
+def serve(args: argparse.Namespace) -> int:
+    """
+    常駐ランナーを起動し、shutdown 要求を受けるまで待ち受ける。
+
+    Args:
+        args (argparse.Namespace): コマンドライン引数。
+
+    Returns:
+        int: 終了コード。
+    """
+    if args.launch_profile:
+        os.environ['SELENIUM_TEST_PROFILE'] = args.launch_profile
+    if args.hub_url:
+        os.environ['SELENIUM_HUB_URL'] = args.hub_url
+    stub = None
+    if args.stub_webdriver:
+        # tools
+        from script.tools.webdriver_stub import WebDriverStub
+        stub = WebDriverStub().start()
+        os.environ['SELENIUM_HUB_URL'] = stub.url
+
+    # 重いモジュール（Selenium・engine・lib）はここで1度だけ読み込む
+    start = time.perf_counter()
+    # engine
+    from script.engine.session_pool import SessionPool
+    # lib
+    from script.lib import functions
+    session_pool = SessionPool(functions.generate_new_selenium_driver, max_size=1, max_reuse=args.max_reuse)
+    functions.set_session_pool(session_pool)
+    print(f'読み込み完了: {time.perf_counter() - start:.2f}秒')
+
+    try:
+        with ResidentServer((args.host, args.port), is_quiet=not args.verbose) as server:
+            # 待ち受けを開始できた場合のみ書き出す（起動中の別の常駐ランナーのトークンを上書きしない）
+            token_path = get_token_path(args)
+            write_token(token_path, server.token)
+            try:
+                print(f'待ち受け中: {args.host}:{server.server_address[1]} (pid {os.getpid()}、'
+                      f'トークン: {token_path})', flush=True)
+                server.serve_forever()
+            finally:
+                token_path.unlink(missing_ok=True)
+    finally:
+        session_pool.close()
+        if stub is not None:
+            stub.stop()
+    return 0
+
+def run(args: argparse.Namespace) -> int:
+    """
+    常駐ランナーにテストケースを実行させ、集計結果を出力する。
+
+    Args:
+        args (argparse.Namespace): コマンドライン引数。
+
+    Returns:
+        int: 終了コード。全件OKなら 0、NGを含む場合は 1。
+    """
+    token = read_token(args)
+    if token is None:
+        print(f'トークンファイルが存在しない（常駐ランナーが起動していない）: {get_token_path(args)}', file=sys.stderr)
+        return 2
+    script_paths = [path.resolve() for path in args.scripts] or \
+        SuiteRunner(TEST_DIR_PATH, pattern=args.pattern).discover()
+    start = time.perf_counter()
+    payload = {'command': 'run', 'scripts': [str(path) for path in script_paths]}
+    if args.verbose:
+        payload['quiet'] = False
+    response = request(args.host, args.port, payload, token)
+    results = [result_from_dict(data) for data in response['results']]
+    print(SuiteRunner.summarize(results, time.perf_counter() - start))
+    return 0 if results and all(result.result == 'OK' for result in results) else 1
+
+def shutdown(args: argparse.Namespace) -> int:
+    """
+    常駐ランナーを終了させる。
+
+    Args:
+        args (argparse.Namespace): コマンドライン引数。
+
+    Returns:
+        int: 終了コード。
+    """
+    token = read_token(args)
+    if token is None:
+        print(f'トークンファイルが存在しない（常駐ランナーが起動していない）: {get_token_path(args)}', file=sys.stderr)
+        return 2
+    request(args.host, args.port, {'command': 'shutdown'}, token)
+    return 0
+
+def main(argv: list[str]) -> int:
+    """
+    常駐ランナーの起動・実行要求・終了を行う。
+
+    Args:
+        argv (list[str]): コマンドライン引数。
+
+    Returns:
+        int: 終了コード。
+    """
+    parser = argparse.ArgumentParser(description='Selenium を1度だけ読み込み、テストケースをプロセス内で繰り返し実行する常駐ランナー。')
+    parser.add_argument('--host', default=DEFAULT_HOST, help='待ち受ける（接続する）ホスト。')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help='待ち受ける（接続する）ポート。')
+    parser.add_argument('--token-file', type=Path, default=None,
+                        help='トークンファイルのパス（省略時は test/results/.run_index/resident_runner_<ポート>.token）。')
+    parser.add_argument('-v', '--verbose', action='store_true', help='テストケースのターミナル出力を抑止しない。')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    serve_parser = subparsers.add_parser('serve', help='常駐ランナーを起動する。')
+    serve_parser.add_argument('--max-reuse', type=int,
+                              default=int(os.environ.get('SELENIUM_TEST_SESSION_MAX_REUSE', '20')),
+                              help='1セッションあたりの最大使用回数（省略時は環境変数 SELENIUM_TEST_SESSION_MAX_REUSE、未設定なら 20）。')
+    serve_parser.add_argument('--launch-profile', default=None,
+                              help='ブラウザの起動プロファイル（環境変数 SELENIUM_TEST_PROFILE と同等）。')
+    serve_parser.add_argument('--hub-url', default=None,
+                              help='接続先のSelenium GridのURL（環境変数 SELENIUM_HUB_URL と同等）。')
+    serve_parser.add_argument('--stub-webdriver', action='store_true',
+                              help='Selenium Gridの代わりにWebDriverスタブサーバーを起動して使用する。')
+    serve_parser.set_defaults(handler=serve)
+
+    run_parser = subparsers.add_parser('run', help='常駐ランナーにテストケースを実行させる。')
+    run_parser.add_argument('scripts', nargs='*', type=Path,
+                            help='実行するテストケーススクリプト。省略時は test ディレクトリから探索する。')
+    run_parser.add_argument('-k', '--pattern', default='test_case_*.py',
+                            help='探索するスクリプトのファイル名パターン。')
+    run_parser.set_defaults(handler=run)
+
+    shutdown_parser = subparsers.add_parser('shutdown', help='常駐ランナーを終了させる。')
+    shutdown_parser.set_defaults(handler=shutdown)
+
+    args = parser.parse_args(argv)
+    return args.handler(args)
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
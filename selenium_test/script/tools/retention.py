@@ -0,0 +1,76 @@
+# Python
+import argparse
+import sys
+from pathlib import Path
+
+# engine
+from script.engine.results_catalog import ResultsCatalog
+from script.engine.results_retention import ResultsRetention, RetentionPolicy
+from script.engine.screenshot_store import ScreenshotStore
+
+RESULTS_DIR_PATH = Path(__file__).resolve().parent.parent / 'test' / 'results'
+
+def parse_args(argv: list[str]) -> argparse.Namespace:
+    """
+    コマンドライン引数を解析する。
+
+    Args:
+        argv (list[str]): コマンドライン引数。
+
+    Returns:
+        argparse.Namespace: 解析結果。
+    """
+    parser = argparse.ArgumentParser(description='結果ディレクトリの保持ポリシー適用とアーカイブ操作を行う。')
+    parser.add_argument('--results-dir', type=Path, default=RESULTS_DIR_PATH, help='results ディレクトリのパス。')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    apply_parser = subparsers.add_parser('apply', help='保持ポリシーを適用し、期限切れの結果ディレクトリをアーカイブする。')
+    apply_parser.add_argument('--keep-last', type=int, default=None, help='テストケースごとに保持する最新の実行数。')
+    apply_parser.add_argument('--keep-days', type=float, default=None, help='保持する経過日数。')
+    apply_parser.add_argument('--no-keep-ng', action='store_true', help='NGの実行も保持ポリシーの対象とする。')
+    apply_parser.add_argument('--dry-run', action='store_true', help='アーカイブ対象を表示するのみとする。')
+    apply_parser.add_argument('--gc-store', action='store_true',
+                              help='アーカイブ後、参照されなくなったスクリーンショットの実体を削除する。')
+
+    list_parser = subparsers.add_parser('list', help='アーカイブ済みの実行を一覧表示する。')
+    list_parser.add_argument('test_case', nargs='?', default=None, help='テストケース名（例: test_case_01）。')
+
+    extract_parser = subparsers.add_parser('extract', help='アーカイブから1回分の実行を展開する。')
+    extract_parser.add_argument('run_name', help='結果ディレクトリ名（例: test_case_01_3）。')
+    extract_parser.add_argument('dest', type=Path, help='展開先ディレクトリ。')
+    return parser.parse_args(argv)
+
+def main(argv: list[str]) -> int:
+    """
+    サブコマンドを実行する。
+
+    Args:
+        argv (list[str]): コマンドライン引数。
+
+    Returns:
+        int: 終了コード。
+    """
+    args = parse_args(argv)
+    retention = ResultsRetention(args.results_dir, catalog=ResultsCatalog.for_results_dir(args.results_dir))
+
+    if args.command == 'apply':
+        policy = RetentionPolicy(keep_last=args.keep_last, keep_days=args.keep_days, keep_ng=not args.no_keep_ng)
+        expired = retention.select_expired(policy)
+        for run in expired:
+            print(f'{"[dry-run] " if args.dry_run else ""}アーカイブ: {run.path.name}（{run.result or "-"}）')
+        if not args.dry_run:
+            archived = retention.archive(expired)
+            print(f'{len(archived)} 件をアーカイブした')
+            if args.gc_store:
+                store = ScreenshotStore(args.results_dir / '.screenshot_store')
+                if store.store_dir.is_dir():
+                    print(f'{store.collect_garbage(args.results_dir)} 件のスクリーンショットの実体を削除した')
+    elif args.command == 'list':
+        for run_name in retention.list_archived_runs(args.test_case):
+            print(run_name)
+    elif args.command == 'extract':
+        print(retention.extract_run(args.run_name, args.dest))
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,224 @@
+# Python
+import argparse
+import multiprocessing.util
+import os
+import sys
+import time
+from typing import Optional
+from pathlib import Path
+
+# engine
+from script.engine.duration_history import DurationHistory
+from script.engine.launch_profile import PROFILES
+from script.engine.run_manifest import RunManifest
+from script.engine.suite_runner import SuiteRunner
+
+TEST_DIR_PATH = Path(__file__).resolve().parent.parent / 'test'
+ROOT_DIR_PATH = TEST_DIR_PATH.parent.parent
+
+def parse_args(argv: list[str]) -> argparse.Namespace:
+    """
+    コマンドライン引数を解析する。
+
+    Args:
+        argv (list[str]): コマンドライン引数。
+
+    Returns:
+        argparse.Namespace: 解析結果。
+    """
+    parser = argparse.ArgumentParser(description='テストケーススクリプトを並列実行する。')
+    parser.add_argument('scripts', nargs='*', type=Path,
+                        help='実行するテストケーススクリプト。省略時は test ディレクトリから探索する。')
+    parser.add_argument('-w', '--workers', type=int, default=None,
+                        help='ワーカープロセス数（省略時は環境変数 SELENIUM_TEST_WORKERS、未設定なら 4）。')
+    parser.add_argument('-k', '--pattern', default='test_case_*.py',
+                        help='探索するスクリプトのファイル名パターン。')
+    parser.add_argument('-q', '--quiet', action='store_true',
+                        help='テストケースのターミナル出力を抑止する。')
+    parser.add_argument('--max-reuse', type=int,
+                        default=int(os.environ.get('SELENIUM_TEST_SESSION_MAX_REUSE', '20')),
+                        help='1セッションあたりの最大使用回数（省略時は環境変数 SELENIUM_TEST_SESSION_MAX_REUSE、未設定なら 20）。')
+    parser.add_argument('--no-session-reuse', action='store_true',
+                        help='セッションを使い回さず、テストケースごとに新規生成する。')
+    parser.add_argument('--buffered-report', action='store_true',
+                        help='テキストレポートをバッファリングモードで書き込む（環境変数 SELENIUM_TEST_BUFFERED_REPORT=1 と同等）。')
+    parser.add_argument('--async-screenshot', action='store_true',
+                        help='スクリーンショットを非同期に書き込む（環境変数 SELENIUM_TEST_ASYNC_SCREENSHOT=1 と同等）。')
+    parser.add_argument('--screenshot-store', action='store_true',
+                        help='スクリーンショットの重複を排除して保存する（環境変数 SELENIUM_TEST_SCREENSHOT_STORE=1 と同等）。')
+    parser.add_argument('--screenshot-buffer', type=int, default=None, metavar='COUNT',
+                        help='スクリーンショットを直近 COUNT 枚までメモリ上に保持し、NG・エラー時のみ書き込む'
+                             '（環境変数 SELENIUM_TEST_SCREENSHOT_BUFFER と同等）。')
+    parser.add_argument('--keep-screenshots', action='store_true',
+                        help='--screenshot-buffer 指定時も、OKの場合を含め常に書き込む（環境変数 SELENIUM_TEST_KEEP_SCREENSHOTS=1 と同等）。')
+    parser.add_argument('--transcode', choices=['png', 'webp', 'jpeg'], default=None,
+                        help='スクリーンショットを指定形式に変換し、サムネイルを生成する（環境変数 SELENIUM_TEST_TRANSCODE と同等）。')
+    parser.add_argument('--profile-commands', action='store_true',
+                        help='WebDriverコマンドの往復時間を計測する（環境変数 SELENIUM_TEST_PROFILE_COMMANDS=1 と同等）。')
+    parser.add_argument('--no-page-timing', action='store_true',
+                        help='ページの読み込み時間を記録しない（環境変数 SELENIUM_TEST_PAGE_TIMING=0 と同等）。')
+    parser.add_argument('--launch-profile', choices=sorted(PROFILES), default=None,
+                        help='ブラウザの起動プロファイル（環境変数 SELENIUM_TEST_PROFILE と同等、省略時は default）。')
+    parser.add_argument('--hub-url', default=None,
+                        help='接続先のSelenium GridのURL（環境変数 SELENIUM_HUB_URL と同等）。')
+    parser.add_argument('--stub-webdriver', action='store_true',
+                        help='Selenium Gridの代わりにWebDriverスタブサーバー（tools/webdriver_stub.py）を起動して使用する。')
+    parser.add_argument('--shard', type=parse_shard, default=None, metavar='INDEX/COUNT',
+                        help='予測所要時間が均等になるようテストケースを COUNT 個に分割し、INDEX 番目（1始まり）のみ実行する。')
+    parser.add_argument('--no-history', action='store_true',
+                        help='所要時間の記録を使用せず、ファイル名順に実行する。')
+    parser.add_argument('--failed-only', action='store_true',
+                        help='前回NGだったテストケースのみ実行する。')
+    parser.add_argument('--changed', action='store_true',
+                        help='前回の実行からスクリプトまたは依存する lib・engine のモジュールが変わったテストケースのみ実行する'
+                             '（--failed-only と同時に指定した場合はいずれかに該当するもの）。')
+    return parser.parse_args(argv)
+
+def parse_shard(value: str) -> tuple[int, int]:
+    """
+    '--shard' の値（'INDEX/COUNT' 形式）を解析する。
+
+    Args:
+        value (str): 引数の値（例: '1/3'）。
+
+    Returns:
+        tuple[int, int]: 分割番号（1始まり）と分割数。
+
+    Raises:
+        argparse.ArgumentTypeError: 形式が正しくない場合。
+    """
+    try:
+        index, count = (int(part) for part in value.split('/'))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f'INDEX/COUNT の形式で指定する: {value}')
+    if not 1 <= index <= count:
+        raise argparse.ArgumentTypeError(f'INDEX は 1 以上 COUNT 以下で指定する: {value}')
+    return index, count
+
+def select_script_paths(manifest: RunManifest, script_paths: list[Path],
+                        is_failed_only: bool, is_changed: bool) -> list[Path]:
+    """
+    記録をもとに、前回NGだったテストケース・入力が変わったテストケースを選び出し、選んだ理由を出力する。
+
+    Args:
+        manifest (RunManifest): 試験結果と入力のハッシュの記録。
+        script_paths (list[Path]): テストケーススクリプトのパス一覧。
+        is_failed_only (bool): 前回NGだったテストケースを選ぶか否かを判定するフラグ。
+        is_changed (bool): 入力が変わったテストケースを選ぶか否かを判定するフラグ。
+
+    Returns:
+        list[Path]: 選んだテストケーススクリプトのパス一覧（元の順序を保つ）。
+    """
+    selected = []
+    for path in script_paths:
+        reasons = []
+        if is_failed_only and manifest.last_result(path.stem) == 'NG':
+            reasons.append('前回NG')
+        if is_changed:
+            changes = manifest.changes(path)
+            if changes:
+                reasons.append('変更: ' + ', '.join(changes))
+        if reasons:
+            print(f'{path.stem}: {" / ".join(reasons)}')
+            selected.append(path)
+    print(f'選択: {len(selected)}件 / {len(script_paths)}件（残りはスキップ）')
+    return selected
+
+def init_worker(max_reuse: Optional[int]):
+    """
+    ワーカープロセスを初期化する。
+    ワーカー専用のセッションプールを設定し、プロセス終了時にセッションを終了させる。
+    スクリーンショットの変換用のプロセスプールも、プロセス終了時に停止させる。
+    Selenium を含む lib はワーカープロセス内でのみ読み込み、親プロセスでは読み込まない。
+
+    Args:
+        max_reuse (Optional[int]): 1セッションあたりの最大使用回数。Noneの場合はセッションを使い回さない。
+    """
+    # lib
+    from script.lib import functions
+    # ワーカープロセスは atexit を実行せずに終了するため、multiprocessing の終了処理に登録する
+    # （exitpriority を指定した終了処理は、子プロセスの終了待ちより前に実行される）。
+    # 変換用のプロセスプールは、キュー（exitpriority=10）の送信スレッドが停止する前に停止させる必要がある
+    multiprocessing.util.Finalize(None, functions.close_screenshot_transcoder, exitpriority=20)
+    if max_reuse is None:
+        return
+    # engine
+    from script.engine.session_pool import SessionPool
+    session_pool = SessionPool(functions.generate_new_selenium_driver, max_size=1, max_reuse=max_reuse)
+    functions.set_session_pool(session_pool)
+    multiprocessing.util.Finalize(session_pool, session_pool.close, exitpriority=10)
+
+def main(argv: list[str]) -> int:
+    """
+    テストケーススクリプトを並列実行し、集計結果を出力する。
+
+    Args:
+        argv (list[str]): コマンドライン引数。
+
+    Returns:
+        int: 終了コード。全件OKなら 0、NGを含む場合は 1。
+    """
+    args = parse_args(argv)
+    if args.buffered_report:
+        # ワーカープロセスへ環境変数として引き継ぐ
+        os.environ['SELENIUM_TEST_BUFFERED_REPORT'] = '1'
+    if args.async_screenshot:
+        os.environ['SELENIUM_TEST_ASYNC_SCREENSHOT'] = '1'
+    if args.screenshot_store:
+        os.environ['SELENIUM_TEST_SCREENSHOT_STORE'] = '1'
+    if args.screenshot_buffer:
+        os.environ['SELENIUM_TEST_SCREENSHOT_BUFFER'] = str(args.screenshot_buffer)
+    if args.keep_screenshots:
+        os.environ['SELENIUM_TEST_KEEP_SCREENSHOTS'] = '1'
+    if args.transcode:
+        os.environ['SELENIUM_TEST_TRANSCODE'] = args.transcode
+    if args.profile_commands:
+        os.environ['SELENIUM_TEST_PROFILE_COMMANDS'] = '1'
+    if args.no_page_timing:
+        os.environ['SELENIUM_TEST_PAGE_TIMING'] = '0'
+    if args.launch_profile:
+        os.environ['SELENIUM_TEST_PROFILE'] = args.launch_profile
+    if args.hub_url:
+        os.environ['SELENIUM_HUB_URL'] = args.hub_url
+    history = None
+    if not args.no_history:
+        history = DurationHistory(TEST_DIR_PATH / 'results')
+        if not history.history_path.is_file() and (TEST_DIR_PATH / 'results').is_dir():
+            # 初回は過去の結果ディレクトリから記録を作成する
+            history.rebuild()
+    manifest = RunManifest(TEST_DIR_PATH / 'results', ROOT_DIR_PATH)
+    runner = SuiteRunner(TEST_DIR_PATH, pattern=args.pattern, workers=args.workers, is_quiet=args.quiet,
+                         initializer=init_worker, initargs=(None if args.no_session_reuse else args.max_reuse,),
+                         history=history, manifest=manifest)
+    script_paths = [path.resolve() for path in args.scripts] or runner.discover()
+    if args.failed_only or args.changed:
+        script_paths = select_script_paths(manifest, script_paths, args.failed_only, args.changed)
+        if not script_paths:
+            print('実行対象のテストケースはありません。')
+            return 0
+    if args.shard is not None:
+        index, count = args.shard
+        shards = (history or DurationHistory(TEST_DIR_PATH / 'results')).shard(script_paths, count)
+        script_paths = shards[index - 1]
+        print(f'シャード {index}/{count}: {", ".join(path.stem for path in script_paths) or "（なし）"}')
+        if not script_paths:
+            # テストケース数より分割数が多い場合など、割り当てがないシャードは成功とする
+            return 0
+
+    stub = None
+    if args.stub_webdriver:
+        # tools
+        from script.tools.webdriver_stub import WebDriverStub
+        stub = WebDriverStub().start()
+        os.environ['SELENIUM_HUB_URL'] = stub.url
+    start = time.perf_counter()
+    try:
+        results = runner.run(script_paths)
+    finally:
+        if stub is not None:
+            stub.stop()
+    print(SuiteRunner.summarize(results, time.perf_counter() - start))
+    return 0 if results and all(result.result == 'OK' for result in results) else 1
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
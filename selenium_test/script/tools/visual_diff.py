@@ -0,0 +1,125 @@
+# Python
+import argparse
+import re
+import sys
+import time
+from typing import Optional
+from pathlib import Path
+
+# engine
+from script.engine.visual_diff import VisualDiff, VisualDiffOptions
+
+def parse_region(value: str) -> tuple[int, int, int, int]:
+    """
+    '--ignore' の値（'x,y,幅,高さ' 形式）を解析する。
+
+    Args:
+        value (str): 引数の値（例: '0,0,1920,80'）。
+
+    Returns:
+        tuple[int, int, int, int]: 除外領域（x, y, 幅, 高さ）。
+
+    Raises:
+        argparse.ArgumentTypeError: 形式が正しくない場合。
+    """
+    try:
+        x, y, width, height = (int(part) for part in value.split(','))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f'x,y,幅,高さ の形式で指定する: {value}')
+    return x, y, width, height
+
+def collect_pairs(baseline_dir: Path, actual_dir: Path,
+                  diff_dir: Optional[Path]) -> list[tuple[Path, Path, Optional[Path]]]:
+    """
+    functions.confirm_visual_match が結果ディレクトリに保存したスクリーンショット（'visual_<名前>.png'）と、
+    対応するベースライン画像（'<ベースラインのディレクトリ>/<テストケース名>/<名前>.png'）の組を収集する。
+    その他のスクリーンショット、差分画像（'visual_<名前>_diff.png'）、サムネイルは対象外とする。
+
+    Args:
+        baseline_dir (Path): ベースライン画像のディレクトリ（例: test/baselines）。
+        actual_dir (Path): 'results' ディレクトリ、または結果ディレクトリ（例: test/results/test_case_01_3）。
+        diff_dir (Optional[Path]): 差分画像の保存先ディレクトリ。Noneの場合は書き出さない。
+
+    Returns:
+        list[tuple[Path, Path, Optional[Path]]]: （ベースライン画像, 比較対象の画像, 差分画像）のパスの組の一覧。
+    """
+    pairs = []
+    for actual_path in sorted(actual_dir.rglob('visual_*.png')):
+        if actual_path.stem.endswith('_diff') or actual_path.parent.name == 'thumbnails':
+            continue
+        name = actual_path.stem.removeprefix('visual_')
+        # 結果ディレクトリ名（test_case_01_3）から実行回数を除いたものがテストケース名
+        test_case = re.sub(r'_\d+$', '', actual_path.parent.name)
+        diff_path = None
+        if diff_dir is not None:
+            diff_path = diff_dir / actual_path.parent.name / f'{actual_path.stem}_diff.png'
+        pairs.append((baseline_dir / test_case / f'{name}.png', actual_path, diff_path))
+    return pairs
+
+def parse_args(argv: list[str]) -> argparse.Namespace:
+    """
+    コマンドライン引数を解析する。
+
+    Args:
+        argv (list[str]): コマンドライン引数。
+
+    Returns:
+        argparse.Namespace: 解析結果。
+    """
+    defaults = VisualDiffOptions()
+    parser = argparse.ArgumentParser(description='スクリーンショットをベースライン画像と並列に比較する。')
+    parser.add_argument('baseline_dir', type=Path,
+                        help='ベースライン画像のディレクトリ（<テストケース名>/<名前>.png を格納する。例: test/baselines）。')
+    parser.add_argument('actual_dir', type=Path,
+                        help="'results' ディレクトリ、または結果ディレクトリ。"
+                             "confirm_visual_match が保存した visual_<名前>.png をベースライン画像と比較する。")
+    parser.add_argument('--diff-dir', type=Path, default=None,
+                        help='差分画像の保存先ディレクトリ（不一致の画像のみ書き出す）。省略時は書き出さない。')
+    parser.add_argument('--tolerance', type=int, default=defaults.tolerance, help='画素ごとの許容差（0〜255）。')
+    parser.add_argument('--max-diff-ratio', type=float, default=defaults.max_diff_ratio,
+                        help='許容する差分画素の割合（0〜1）。')
+    parser.add_argument('--tile-size', type=int, default=defaults.tile_size, help='差分を集計するタイルの一辺（画素）。')
+    parser.add_argument('--ignore', type=parse_region, action='append', default=[], metavar='X,Y,W,H',
+                        help='比較から除外する領域（複数指定可）。')
+    parser.add_argument('-j', '--workers', type=int, default=None, help='ワーカープロセス数（省略時はCPU数）。')
+    return parser.parse_args(argv)
+
+def main(argv: list[str]) -> int:
+    """
+    ベースライン画像と比較対象の画像を比較し、結果を出力する。
+
+    Args:
+        argv (list[str]): コマンドライン引数。
+
+    Returns:
+        int: 終了コード。全て一致なら 0、不一致を含む場合は 1。
+    """
+    args = parse_args(argv)
+    options = VisualDiffOptions(tolerance=args.tolerance, max_diff_ratio=args.max_diff_ratio,
+                                tile_size=args.tile_size, ignore_regions=tuple(args.ignore))
+    pairs = collect_pairs(args.baseline_dir, args.actual_dir, args.diff_dir)
+
+    start = time.perf_counter()
+    visual_diff = VisualDiff(options, max_workers=args.workers)
+    try:
+        results = visual_diff.compare_many(pairs)
+    finally:
+        visual_diff.close()
+
+    mismatch_count = 0
+    for result in results:
+        if not result.is_match:
+            mismatch_count += 1
+            diff = f'  差分画像: {result.diff_path}' if result.diff_path else ''
+            print(f'[NG] {result.actual_path.relative_to(args.actual_dir)}  {result.reason}  '
+                  f'{result.diff_ratio:.4%}{diff}')
+    reasons = {}
+    for result in results:
+        reasons[result.reason] = reasons.get(result.reason, 0) + 1
+    print(f'一致: {len(results) - mismatch_count}  不一致: {mismatch_count}  合計: {len(results)}  '
+          f'所要時間: {time.perf_counter() - start:.1f}秒')
+    print('内訳: ' + '  '.join(f'{reason}={count}' for reason, count in sorted(reasons.items())))
+    return 1 if mismatch_count else 0
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,791 @@
+# Python
+import argparse
+import base64
+import itertools
+import json
+import random
+import re
+import struct
+import sys
+import threading
+import time
+import uuid
+import zlib
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Optional
+
+# engine
+from script.engine.clock import get_clock
+from script.engine.page_snapshot import SNAPSHOT_SCRIPT
+from script.engine.page_timing import TIMING_SCRIPT
+
+# W3C WebDriver の要素参照のキー
+ELEMENT_KEY = 'element-6066-11e4-a52e-4f735466cecf'
+
+# エラー名とHTTPステータスコード（W3C WebDriver 仕様）
+ERROR_STATUS = {
+    'invalid argument': 400,
+    'element not interactable': 400,
+    'invalid session id': 404,
+    'no such element': 404,
+    'no such window': 404,
+    'stale element reference': 404,
+    'unknown command': 404,
+    'unknown error': 500,
+}
+
+HOME_URL = 'http://racer.xsrv.jp/portfolio/index.html'
+CALENDAR_URL = 'http://racer.xsrv.jp/portfolio/javascript/calendar.html'
+
+class WebDriverError(Exception):
+    """
+    W3C WebDriver のエラーレスポンスとして返す例外。
+
+    Attributes:
+        error (str): エラー名（例: 'no such element'）。
+        message (str): エラーメッセージ。
+    """
+    def __init__(self, error: str, message: str=''):
+        """
+        Args:
+            error (str): エラー名。
+            message (str): エラーメッセージ。Default to ''.
+        """
+        super().__init__(f'{error}: {message}')
+        self.error = error
+        self.message = message
+
+@dataclass
+class StubElement:
+    """
+    スタブのページに配置する要素を表すクラス。
+
+    Attributes:
+        key (str): ページ内で一意な要素のキー。
+        tag (str): タグ名。
+        text (str): 表示テキスト。
+        xpaths (tuple[str, ...]): この要素に一致するXPath。
+        css_selectors (tuple[str, ...]): この要素に一致するCSSセレクタ（タグ名は常に一致する）。
+        href (Optional[str]): リンク先URL。クリック時に遷移する。
+        is_displayed (bool): 表示されているか否か。
+        reveals (tuple[str, ...]): マウスオーバー時に表示される要素のキー。
+    """
+    key: str
+    tag: str
+    text: str = ''
+    xpaths: tuple[str, ...] = ()
+    css_selectors: tuple[str, ...] = ()
+    href: Optional[str] = None
+    is_displayed: bool = True
+    reveals: tuple[str, ...] = ()
+
+    def matches(self, using: str, value: str) -> bool:
+        """
+        ロケータがこの要素に一致するか判定する。
+
+        Args:
+            using (str): ロケータの種類（'css selector' / 'xpath' / 'link text' など）。
+            value (str): ロケータの値。
+
+        Returns:
+            bool: 一致すれば True。
+        """
+        if using == 'css selector':
+            return value == self.tag or value in self.css_selectors
+        if using == 'tag name':
+            return value == self.tag
+        if using == 'xpath':
+            return value in self.xpaths
+        if using == 'link text':
+            return self.tag == 'a' and self.text.strip() == value
+        if using == 'partial link text':
+            return self.tag == 'a' and value in self.text
+        if using == 'id':
+            return f'#{value}' in self.css_selectors
+        return False
+
+@dataclass
+class StubPage:
+    """
+    スタブが返すページを表すクラス。
+
+    Attributes:
+        title (str): ページタイトル。
+        elements (list[StubElement]): ページ内の要素。
+        color (tuple[int, int, int]): スクリーンショットの背景色。
+        load_time (float): 読み込み時間として返す load イベントまでの時間（ミリ秒、遷移ごとに ±10% 揺らす）。
+        resources (tuple[tuple[str, str, int], ...]): 読み込んだリソースとして返す (URL, 読み込みの起点, 転送量) の一覧。
+    """
+    title: str
+    elements: list[StubElement] = field(default_factory=list)
+    color: tuple[int, int, int] = (255, 255, 255)
+    load_time: float = 300.0
+    resources: tuple[tuple[str, str, int], ...] = ()
+
+def build_portfolio_pages() -> dict[str, StubPage]:
+    """
+    テストケースが参照するポートフォリオサイトのページを模したスタブのページを生成する。
+    カレンダーの年月は生成時点の日本時間とする。
+
+    Returns:
+        dict[str, StubPage]: URLとページの辞書。
+    """
+    now = get_clock().now()
+    return {
+        HOME_URL: StubPage(
+            title='web-pattern1(home) | portfolio',
+            elements=[StubElement(key='subnavi_javascript', tag='li', text='JavaScript',
+                                  xpaths=('//li[@class="subnavi"][2]',), css_selectors=('.subnavi',),
+                                  reveals=('calendar_link',)),
+                      StubElement(key='calendar_link', tag='a', text='カレンダー', href=CALENDAR_URL,
+                                  is_displayed=False)],
+            color=(240, 244, 248),
+            resources=(('http://racer.xsrv.jp/portfolio/css/style.css', 'link', 8200),
+                       ('http://racer.xsrv.jp/portfolio/js/main.js', 'script', 15400),
+                       ('http://racer.xsrv.jp/portfolio/img/top.jpg', 'img', 120300))),
+        CALENDAR_URL: StubPage(
+            title='カレンダー | portfolio',
+            elements=[StubElement(key='caption', tag='caption', text=f'{now.year}年{now.month}月')],
+            color=(250, 246, 236),
+            resources=(('http://racer.xsrv.jp/portfolio/css/style.css', 'link', 8200),
+                       ('http://racer.xsrv.jp/portfolio/javascript/js/calendar.js', 'script', 6100))),
+    }
+
+def make_png(width: int, height: int, color: tuple[int, int, int]) -> bytes:
+    """
+    単色のPNG画像を生成する（Pillowを使用しない）。
+
+    Args:
+        width (int): 幅。
+        height (int): 高さ。
+        color (tuple[int, int, int]): 色（RGB）。
+
+    Returns:
+        bytes: PNG画像のバイト列。
+    """
+    def chunk(chunk_type: bytes, data: bytes) -> bytes:
+        return struct.pack('>I', len(data)) + chunk_type + data + struct.pack('>I', zlib.crc32(chunk_type + data))
+
+    row = b'\x00' + bytes(color) * width
+    header = struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0)
+    return (b'\x89PNG\r\n\x1a\n' + chunk(b'IHDR', header)
+            + chunk(b'IDAT', zlib.compress(row * height, 6)) + chunk(b'IEND', b''))
+
+class StubSession:
+    """
+    スタブのブラウザセッション1つ分の状態を保持するクラス。
+
+    Attributes:
+        session_id (str): セッションID。
+        capabilities (dict): セッションのケイパビリティ。
+        url (str): 表示中のURL。
+        page (StubPage): 表示中のページ。
+    """
+    WINDOW_HANDLE = 'stub-window-1'
+
+    def __init__(self, capabilities: dict, pages_factory: Callable[[], dict[str, StubPage]]):
+        """
+        Args:
+            capabilities (dict): セッションのケイパビリティ。
+            pages_factory (Callable[[], dict[str, StubPage]]): 遷移のたびに呼び出すページ生成関数。
+        """
+        self.session_id = uuid.uuid4().hex
+        self.capabilities = capabilities
+        self._pages_factory = pages_factory
+        self._generation = itertools.count()
+        self.window_rect = {'x': 0, 'y': 0, 'width': 1280, 'height': 720}
+        self.navigate('about:blank')
+
+    def navigate(self, url: str):
+        """
+        URLに遷移する。定義されていないURLの場合は空のページとする。
+
+        Args:
+            url (str): 遷移先URL。
+        """
+        self.url = url
+        self.page = self._pages_factory().get(url, StubPage(title=''))
+        # 遷移前の要素参照は無効（stale）とする
+        self._page_id = next(self._generation)
+        self._elements = {element.key: element for element in self.page.elements}
+        self._timing = self._make_timing()
+
+    def _make_timing(self) -> dict:
+        """
+        TIMING_SCRIPT の戻り値を模擬的に生成する。時間はページの load_time を基準に遷移ごとに揺らす。
+
+        Returns:
+            dict: TIMING_SCRIPT の戻り値と同じ形式の値。
+        """
+        load = self.page.load_time * random.uniform(0.9, 1.1)
+        resources = [{'name': name, 'initiatorType': initiator_type, 'startTime': round(load * 0.3, 1),
+                      'duration': round(load * 0.5 * size / (size + 50000), 1), 'transferSize': size}
+                     for name, initiator_type, size in self.page.resources]
+        return {'url': self.url,
+                'timeOrigin': round(get_clock().time() * 1000, 3),
+                'navigation': {'ttfb': load * 0.2, 'domInteractive': load * 0.5, 'domContentLoaded': load * 0.6,
+                               'load': load, 'transferSize': 4096},
+                'resourceCount': len(resources),
+                'resourceTransferSize': sum(resource['transferSize'] for resource in resources),
+                'resources': sorted(resources, key=lambda resource: -resource['duration'])}
+
+    def find(self, using: str, value: str) -> list[StubElement]:
+        """
+        ロケータに一致する要素を検索する。
+
+        Args:
+            using (str): ロケータの種類。
+            value (str): ロケータの値。
+
+        Returns:
+            list[StubElement]: 一致した要素の一覧。
+        """
+        return [element for element in self.page.elements if element.matches(using, value)]
+
+    def to_reference(self, element: StubElement) -> dict:
+        """
+        要素の参照（W3C WebDriver 形式）を生成する。
+
+        Args:
+            element (StubElement): 要素。
+
+        Returns:
+            dict: 要素の参照。
+        """
+        return {ELEMENT_KEY: f'{self._page_id}:{element.key}'}
+
+    def resolve(self, element_id: str) -> StubElement:
+        """
+        要素IDから要素を取得する。
+
+        Args:
+            element_id (str): 要素ID。
+
+        Returns:
+            StubElement: 要素。
+
+        Raises:
+            WebDriverError: 遷移前の要素、または存在しない要素の場合。
+        """
+        page_id, _, key = element_id.partition(':')
+        if page_id != str(self._page_id) or key not in self._elements:
+            raise WebDriverError('stale element reference', f'要素が無効になっている: {element_id}')
+        return self._elements[key]
+
+    def hover(self, element: StubElement):
+        """
+        要素をマウスオーバーし、連動して表示される要素を表示する。
+
+        Args:
+            element (StubElement): マウスオーバーする要素。
+        """
+        for key in element.reveals:
+            if key in self._elements:
+                self._elements[key].is_displayed = True
+
+    def execute_script(self, script: str, args: list) -> Any:
+        """
+        テストで使用するスクリプトのみを模擬的に実行する。
+
+        Args:
+            script (str): スクリプト。
+            args (list): スクリプトの引数。
+
+        Returns:
+            Any: スクリプトの戻り値。対応していないスクリプトの場合は None。
+        """
+        if script.startswith('/* isDisplayed */'):
+            return self.resolve(args[0][ELEMENT_KEY]).is_displayed
+        if script == SNAPSHOT_SCRIPT:
+            locators, attribute_names = args
+            elements = []
+            for by, value in locators:
+                found = self.find(by, value)
+                elements.append({'text': found[0].text, 'attributes': dict.fromkeys(attribute_names)}
+                                if found else None)
+            return {'title': self.page.title, 'url': self.url, 'readyState': 'complete', 'elements': elements}
+        if script == TIMING_SCRIPT:
+            return {**self._timing, 'resources': self._timing['resources'][:args[0]]}
+        if 'document.readyState' in script:
+            return 'complete'
+        if '__seleniumTestLastMutation' in script:
+            return True
+        if script.strip() == 'return 1;':
+            return 1
+        return None
+
+class WebDriverStub:
+    """
+    W3C WebDriver のエンドポイントのうち、テストケースと functions が使用するものを実装したスタブサーバー。
+
+    Selenium Grid・ブラウザ・外部サイトを使用せずに、定義済みのページとPNG画像を返す。
+    フレームワーク自体のオーバーヘッドの計測や、性能改善機能のオフラインでの動作確認に使用する。
+    コマンドごとの遅延（latency + 0〜jitter 秒）と失敗（failure_rate の確率、または
+    fail_commands に含まれるコマンド）を注入できる。
+
+    Attributes:
+        latency (float): コマンドごとに付加する遅延（秒）。
+        jitter (float): 遅延に加算する揺らぎの最大値（秒）。
+        failure_rate (float): コマンドを失敗させる確率（0〜1）。
+        fail_commands (frozenset[str]): 常に失敗させるコマンド名（例: 'screenshot'）。
+        screenshot_size (tuple[int, int]): スクリーンショットの大きさ（幅, 高さ）。
+    """
+    # (HTTPメソッド, パスの正規表現, コマンド名)
+    ROUTES = [
+        ('GET', r'/status', 'status'),
+        ('POST', r'/session', 'newSession'),
+        ('DELETE', r'/session/(?P<sid>[^/]+)', 'deleteSession'),
+        ('POST', r'/session/(?P<sid>[^/]+)/timeouts', 'setTimeouts'),
+        ('POST', r'/session/(?P<sid>[^/]+)/url', 'get'),
+        ('GET', r'/session/(?P<sid>[^/]+)/url', 'getCurrentUrl'),
+        ('GET', r'/session/(?P<sid>[^/]+)/title', 'getTitle'),
+        ('GET', r'/session/(?P<sid>[^/]+)/window', 'getWindowHandle'),
+        ('POST', r'/session/(?P<sid>[^/]+)/window', 'switchToWindow'),
+        ('DELETE', r'/session/(?P<sid>[^/]+)/window', 'closeWindow'),
+        ('GET', r'/session/(?P<sid>[^/]+)/window/handles', 'getWindowHandles'),
+        ('GET', r'/session/(?P<sid>[^/]+)/window/rect', 'getWindowRect'),
+        ('POST', r'/session/(?P<sid>[^/]+)/window/rect', 'setWindowRect'),
+        ('POST', r'/session/(?P<sid>[^/]+)/window/maximize', 'maximizeWindow'),
+        ('GET', r'/session/(?P<sid>[^/]+)/cookie', 'getCookies'),
+        ('DELETE', r'/session/(?P<sid>[^/]+)/cookie', 'deleteAllCookies'),
+        ('POST', r'/session/(?P<sid>[^/]+)/element', 'findElement'),
+        ('POST', r'/session/(?P<sid>[^/]+)/elements', 'findElements'),
+        ('GET', r'/session/(?P<sid>[^/]+)/element/(?P<eid>[^/]+)/text', 'getElementText'),
+        ('GET', r'/session/(?P<sid>[^/]+)/element/(?P<eid>[^/]+)/enabled', 'isElementEnabled'),
+        ('GET', r'/session/(?P<sid>[^/]+)/element/(?P<eid>[^/]+)/name', 'getElementTagName'),
+        ('POST', r'/session/(?P<sid>[^/]+)/element/(?P<eid>[^/]+)/click', 'clickElement'),
+        ('POST', r'/session/(?P<sid>[^/]+)/actions', 'actions'),
+        ('DELETE', r'/session/(?P<sid>[^/]+)/actions', 'releaseActions'),
+        ('GET', r'/session/(?P<sid>[^/]+)/screenshot', 'screenshot'),
+        ('POST', r'/session/(?P<sid>[^/]+)/execute/sync', 'executeScript'),
+    ]
+
+    def __init__(self, host: str='127.0.0.1', port: int=0, latency: float=0.0, jitter: float=0.0,
+                 failure_rate: float=0.0, fail_commands: tuple[str, ...]=(),
+                 screenshot_size: tuple[int, int]=(1280, 720),
+                 pages_factory: Callable[[], dict[str, StubPage]]=build_portfolio_pages,
+                 seed: Optional[int]=None):
+        """
+        Args:
+            host (str): 待ち受けるホスト。Default to '127.0.0.1'.
+            port (int): 待ち受けるポート番号。0の場合は空いているポートを使用する。Default to 0.
+            latency (float): コマンドごとに付加する遅延（秒）。Default to 0.0.
+            jitter (float): 遅延に加算する揺らぎの最大値（秒）。Default to 0.0.
+            failure_rate (float): コマンドを失敗させる確率（0〜1）。Default to 0.0.
+            fail_commands (tuple[str, ...]): 常に失敗させるコマンド名。Default to ().
+            screenshot_size (tuple[int, int]): スクリーンショットの大きさ。Default to (1280, 720).
+            pages_factory (Callable[[], dict[str, StubPage]]): ページ生成関数。Default to build_portfolio_pages.
+            seed (Optional[int]): 遅延・失敗の注入に使用する乱数のシード。Default to None.
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.fail_commands = frozenset(fail_commands)
+        self.screenshot_size = screenshot_size
+        self._pages_factory = pages_factory
+        self._random = random.Random(seed)
+        self._sessions = {}
+        self._screenshots = {}
+        self._command_counts = {}
+        self._lock = threading.Lock()
+        self._routes = [(method, re.compile(pattern + '$'), name) for method, pattern, name in self.ROUTES]
+        self._server = ThreadingHTTPServer((host, port), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        """
+        スタブサーバーのURL（command_executor / SELENIUM_HUB_URL に指定する値）を取得する。
+
+        Returns:
+            str: URL。
+        """
+        host, port = self._server.server_address[:2]
+        return f'http://{host}:{port}'
+
+    @property
+    def command_counts(self) -> dict[str, int]:
+        """
+        コマンドごとの受信回数を取得する。
+
+        Returns:
+            dict[str, int]: コマンド名と受信回数の辞書。
+        """
+        with self._lock:
+            return dict(self._command_counts)
+
+    def start(self) -> 'WebDriverStub':
+        """
+        バックグラウンドのスレッドで待ち受けを開始する。
+
+        Returns:
+            WebDriverStub: このインスタンス。
+        """
+        self._thread = threading.Thread(target=self._server.serve_forever, name='webdriver-stub', daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self):
+        """
+        現在のスレッドで待ち受ける（KeyboardInterrupt で終了する）。
+        """
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+
+    def stop(self):
+        """
+        待ち受けを終了する。
+        """
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> 'WebDriverStub':
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def dispatch(self, method: str, path: str, body: dict) -> Any:
+        """
+        リクエストをコマンドとして処理する。
+        セッションを対象とするコマンドは、'_command_<コマンド名>' メソッドにセッション・リクエストボディ・
+        要素ID（パスに含まれない場合は None）を渡して処理し、その戻り値をレスポンスの 'value' とする。
+
+        Args:
+            method (str): HTTPメソッド。
+            path (str): パス（'/wd/hub' などの接頭辞を含んでよい）。
+            body (dict): リクエストボディ。
+
+        Returns:
+            Any: レスポンスの 'value' に格納する値。
+
+        Raises:
+            WebDriverError: コマンドが失敗した場合。
+        """
+        # Grid のURL（.../wd/hub）を指定された場合も処理できるよう、接頭辞を除去する
+        match = re.search(r'/(session|status)(/|$)', path)
+        path = path[match.start():] if match else path
+        for route_method, pattern, name in self._routes:
+            route_match = pattern.match(path)
+            if route_method == method and route_match:
+                break
+        else:
+            raise WebDriverError('unknown command', f'{method} {path}')
+
+        with self._lock:
+            self._command_counts[name] = self._command_counts.get(name, 0) + 1
+            delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0.0)
+            is_failure = name in self.fail_commands or (self.failure_rate and self._random.random() < self.failure_rate)
+        if delay:
+            time.sleep(delay)
+        if is_failure and name != 'status':
+            raise WebDriverError('unknown error', f'注入された失敗: {name}')
+
+        params = route_match.groupdict()
+        if name == 'status':
+            return {'ready': True, 'message': 'webdriver stub'}
+        if name == 'newSession':
+            return self._new_session(body)
+        session = self._get_session(params['sid'])
+        handler = getattr(self, f'_command_{name}')
+        return handler(session, body, params.get('eid'))
+
+    def _new_session(self, body: dict) -> dict:
+        """
+        W3C WebDriver の New Session（POST /session）。要求された capabilities の一部を反映したセッションを生成する。
+
+        Args:
+            body (dict): リクエストボディ。
+
+        Returns:
+            dict: セッションIDと capabilities。
+        """
+        requested = body.get('capabilities', {}).get('alwaysMatch', {})
+        capabilities = {'browserName': requested.get('browserName', 'chrome'),
+                        'browserVersion': 'stub',
+                        'platformName': 'linux',
+                        'pageLoadStrategy': requested.get('pageLoadStrategy', 'normal'),
+                        'acceptInsecureCerts': False,
+                        'setWindowRect': True}
+        session = StubSession(capabilities, self._pages_factory)
+        with self._lock:
+            self._sessions[session.session_id] = session
+        return {'sessionId': session.session_id, 'capabilities': capabilities}
+
+    def _get_session(self, session_id: str) -> StubSession:
+        """
+        セッションIDに対応するセッションを取得する。
+
+        Args:
+            session_id (str): セッションID。
+
+        Returns:
+            StubSession: セッション。
+
+        Raises:
+            WebDriverError: セッションが存在しない場合。
+        """
+        with self._lock:
+            session = self._sessions.get(session_id)
+        if session is None:
+            raise WebDriverError('invalid session id', session_id)
+        return session
+
+    def _command_deleteSession(self, session: StubSession, body: dict, element_id: Optional[str]) -> None:
+        """
+        W3C WebDriver の Delete Session（DELETE /session/{session id}）。セッションを破棄する。
+        """
+        with self._lock:
+            self._sessions.pop(session.session_id, None)
+
+    def _command_setTimeouts(self, session: StubSession, body: dict, element_id: Optional[str]) -> None:
+        """
+        W3C WebDriver の Set Timeouts（POST /session/{session id}/timeouts）。タイムアウトは使用しないため何もしない。
+        """
+        return None
+
+    def _command_get(self, session: StubSession, body: dict, element_id: Optional[str]) -> None:
+        """
+        W3C WebDriver の Navigate To（POST /session/{session id}/url）。指定のURLのページへ遷移する。
+        """
+        session.navigate(body['url'])
+
+    def _command_getCurrentUrl(self, session: StubSession, body: dict, element_id: Optional[str]) -> str:
+        """
+        W3C WebDriver の Get Current URL（GET /session/{session id}/url）。表示中のページのURLを返す。
+        """
+        return session.url
+
+    def _command_getTitle(self, session: StubSession, body: dict, element_id: Optional[str]) -> str:
+        """
+        W3C WebDriver の Get Title（GET /session/{session id}/title）。表示中のページのタイトルを返す。
+        """
+        return session.page.title
+
+    def _command_getWindowHandle(self, session: StubSession, body: dict, element_id: Optional[str]) -> str:
+        """
+        W3C WebDriver の Get Window Handle（GET /session/{session id}/window）。唯一のウィンドウのハンドルを返す。
+        """
+        return session.WINDOW_HANDLE
+
+    def _command_switchToWindow(self, session: StubSession, body: dict, element_id: Optional[str]) -> None:
+        """
+        W3C WebDriver の Switch To Window（POST /session/{session id}/window）。唯一のウィンドウ以外を指定された場合は失敗する。
+        """
+        if body.get('handle') != session.WINDOW_HANDLE:
+            raise WebDriverError('no such window', str(body.get('handle')))
+
+    def _command_closeWindow(self, session: StubSession, body: dict, element_id: Optional[str]) -> list:
+        """
+        W3C WebDriver の Close Window（DELETE /session/{session id}/window）。残りのウィンドウハンドル（常に空）を返す。
+        """
+        return []
+
+    def _command_getWindowHandles(self, session: StubSession, body: dict, element_id: Optional[str]) -> list:
+        """
+        W3C WebDriver の Get Window Handles（GET /session/{session id}/window/handles）。唯一のウィンドウのハンドルを返す。
+        """
+        return [session.WINDOW_HANDLE]
+
+    def _command_getWindowRect(self, session: StubSession, body: dict, element_id: Optional[str]) -> dict:
+        """
+        W3C WebDriver の Get Window Rect（GET /session/{session id}/window/rect）。ウィンドウの位置と大きさを返す。
+        """
+        return session.window_rect
+
+    def _command_setWindowRect(self, session: StubSession, body: dict, element_id: Optional[str]) -> dict:
+        """
+        W3C WebDriver の Set Window Rect（POST /session/{session id}/window/rect）。指定された項目のみ更新し、更新後の位置と大きさを返す。
+        """
+        session.window_rect.update({key: value for key, value in body.items() if value is not None})
+        return session.window_rect
+
+    def _command_maximizeWindow(self, session: StubSession, body: dict, element_id: Optional[str]) -> dict:
+        """
+        W3C WebDriver の Maximize Window（POST /session/{session id}/window/maximize）。1920x1080 に最大化し、位置と大きさを返す。
+        """
+        session.window_rect = {'x': 0, 'y': 0, 'width': 1920, 'height': 1080}
+        return session.window_rect
+
+    def _command_getCookies(self, session: StubSession, body: dict, element_id: Optional[str]) -> list:
+        """
+        W3C WebDriver の Get All Cookies（GET /session/{session id}/cookie）。Cookie は保持しないため常に空を返す。
+        """
+        return []
+
+    def _command_deleteAllCookies(self, session: StubSession, body: dict, element_id: Optional[str]) -> None:
+        """
+        W3C WebDriver の Delete All Cookies（DELETE /session/{session id}/cookie）。Cookie は保持しないため何もしない。
+        """
+        return None
+
+    def _command_findElement(self, session: StubSession, body: dict, element_id: Optional[str]) -> dict:
+        """
+        W3C WebDriver の Find Element（POST /session/{session id}/element）。最初に一致した要素の参照を返し、なければ失敗する。
+        """
+        found = session.find(body['using'], body['value'])
+        if not found:
+            raise WebDriverError('no such element', f'{body["using"]}={body["value"]}')
+        return session.to_reference(found[0])
+
+    def _command_findElements(self, session: StubSession, body: dict, element_id: Optional[str]) -> list:
+        """
+        W3C WebDriver の Find Elements（POST /session/{session id}/elements）。一致した全ての要素の参照を返す。
+        """
+        return [session.to_reference(element) for element in session.find(body['using'], body['value'])]
+
+    def _command_getElementText(self, session: StubSession, body: dict, element_id: Optional[str]) -> str:
+        """
+        W3C WebDriver の Get Element Text（GET /session/{session id}/element/{element id}/text）。非表示の要素は空文字列を返す。
+        """
+        element = session.resolve(element_id)
+        return element.text if element.is_displayed else ''
+
+    def _command_isElementEnabled(self, session: StubSession, body: dict, element_id: Optional[str]) -> bool:
+        """
+        W3C WebDriver の Is Element Enabled（GET /session/{session id}/element/{element id}/enabled）。有効な要素は常に True を返す。
+        """
+        session.resolve(element_id)
+        return True
+
+    def _command_getElementTagName(self, session: StubSession, body: dict, element_id: Optional[str]) -> str:
+        """
+        W3C WebDriver の Get Element Tag Name（GET /session/{session id}/element/{element id}/name）。要素のタグ名を返す。
+        """
+        return session.resolve(element_id).tag
+
+    def _command_clickElement(self, session: StubSession, body: dict, element_id: Optional[str]) -> None:
+        """
+        W3C WebDriver の Element Click（POST /session/{session id}/element/{element id}/click）。リンクの場合は遷移し、非表示の要素は失敗する。
+        """
+        element = session.resolve(element_id)
+        if not element.is_displayed:
+            raise WebDriverError('element not interactable', element.key)
+        if element.href is not None:
+            session.navigate(element.href)
+
+    def _command_actions(self, session: StubSession, body: dict, element_id: Optional[str]) -> None:
+        """
+        W3C WebDriver の Perform Actions（POST /session/{session id}/actions）。要素へのポインター移動のみをマウスオーバーとして処理する。
+        """
+        for source in body.get('actions', []):
+            for action in source.get('actions', []):
+                origin = action.get('origin')
+                if action.get('type') == 'pointerMove' and isinstance(origin, dict) and ELEMENT_KEY in origin:
+                    session.hover(session.resolve(origin[ELEMENT_KEY]))
+
+    def _command_releaseActions(self, session: StubSession, body: dict, element_id: Optional[str]) -> None:
+        """
+        W3C WebDriver の Release Actions（DELETE /session/{session id}/actions）。入力状態は保持しないため何もしない。
+        """
+        return None
+
+    def _command_screenshot(self, session: StubSession, body: dict, element_id: Optional[str]) -> str:
+        """
+        W3C WebDriver の Take Screenshot（GET /session/{session id}/screenshot）。ページの色で塗りつぶしたPNG画像をBase64文字列で返す。
+        """
+        color = session.page.color
+        with self._lock:
+            png_base64 = self._screenshots.get(color)
+        if png_base64 is None:
+            png_base64 = base64.b64encode(make_png(*self.screenshot_size, color)).decode('ascii')
+            with self._lock:
+                self._screenshots[color] = png_base64
+        return png_base64
+
+    def _command_executeScript(self, session: StubSession, body: dict, element_id: Optional[str]) -> Any:
+        """
+        W3C WebDriver の Execute Script（POST /session/{session id}/execute/sync）。StubSession.execute_script で模擬的に実行する。
+        """
+        return session.execute_script(body.get('script', ''), body.get('args', []))
+
+    def _make_handler(self) -> type:
+        """
+        このインスタンスにリクエストを渡すリクエストハンドラのクラスを生成する。
+
+        Returns:
+            type: BaseHTTPRequestHandler のサブクラス。
+        """
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            # Selenium のクライアントは接続を使い回すため、keep-alive に対応する
+            protocol_version = 'HTTP/1.1'
+            # ヘッダーとボディを別々に送信するため、Nagleアルゴリズムによる遅延（約40ms）を避ける
+            disable_nagle_algorithm = True
+
+            def _handle(self):
+                length = int(self.headers.get('Content-Length') or 0)
+                raw = self.rfile.read(length) if length else b''
+                try:
+                    body = json.loads(raw) if raw else {}
+                    status, payload = 200, {'value': stub.dispatch(self.command, self.path, body)}
+                except WebDriverError as e:
+                    status = ERROR_STATUS.get(e.error, 500)
+                    payload = {'value': {'error': e.error, 'message': e.message, 'stacktrace': ''}}
+                except Exception as e:
+                    status = 500
+                    payload = {'value': {'error': 'unknown error', 'message': repr(e), 'stacktrace': ''}}
+                data = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json; charset=utf-8')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            do_GET = do_POST = do_DELETE = _handle
+
+            def log_message(self, format: str, *args):
+                pass
+
+        return Handler
+
+def parse_args(argv: list[str]) -> argparse.Namespace:
+    """
+    コマンドライン引数を解析する。
+
+    Args:
+        argv (list[str]): コマンドライン引数。
+
+    Returns:
+        argparse.Namespace: 解析結果。
+    """
+    parser = argparse.ArgumentParser(description='W3C WebDriver のスタブサーバーを起動する。')
+    parser.add_argument('--host', default='127.0.0.1', help='待ち受けるホスト。')
+    parser.add_argument('--port', type=int, default=4444, help='待ち受けるポート番号。')
+    parser.add_argument('--latency', type=float, default=0.0, help='コマンドごとに付加する遅延（秒）。')
+    parser.add_argument('--jitter', type=float, default=0.0, help='遅延に加算する揺らぎの最大値（秒）。')
+    parser.add_argument('--failure-rate', type=float, default=0.0, help='コマンドを失敗させる確率（0〜1）。')
+    parser.add_argument('--fail-command', action='append', default=[],
+                        help='常に失敗させるコマンド名（例: screenshot）。複数指定可。')
+    parser.add_argument('--seed', type=int, default=None, help='遅延・失敗の注入に使用する乱数のシード。')
+    return parser.parse_args(argv)
+
+def main(argv: list[str]) -> int:
+    """
+    スタブサーバーを起動する。
+
+    Args:
+        argv (list[str]): コマンドライン引数。
+
+    Returns:
+        int: 終了コード。
+    """
+    args = parse_args(argv)
+    stub = WebDriverStub(host=args.host, port=args.port, latency=args.latency, jitter=args.jitter,
+                         failure_rate=args.failure_rate, fail_commands=tuple(args.fail_command), seed=args.seed)
+    print(f'WebDriverスタブサーバーを起動した: {stub.url}（SELENIUM_HUB_URL={stub.url} を指定して実行する）')
+    try:
+        stub.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
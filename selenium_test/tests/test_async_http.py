@@ -0,0 +1,70 @@
+# Python
+import asyncio
+import unittest
+
+# engine
+from script.engine.async_http import AsyncHttpError, AsyncHttpPool
+
+RESPONSE = b'HTTP/1.1 200 OK\r\nContent-Type: application/json\r\nContent-Length: 11\r\n\r\n{"value":1}'
+
+class AsyncHttpPoolRetryTest(unittest.IsolatedAsyncioTestCase):
+    """
+    AsyncHttpPool の、使い回した接続が切断された場合の再送に関する試験。
+    """
+    async def asyncSetUp(self):
+        self.requests = []
+        # 各接続の2件目のリクエストに対する振る舞い（None: 応答せず切断、bytes: 送信して切断）
+        self.second_response = None
+        self.server = await asyncio.start_server(self.handle, '127.0.0.1', 0)
+        port = self.server.sockets[0].getsockname()[1]
+        self.pool = AsyncHttpPool(f'http://127.0.0.1:{port}', timeout=5.0)
+
+    async def asyncTearDown(self):
+        await self.pool.close()
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """
+        1件目のリクエストには応答し、2件目のリクエストは受信した上で応答せずに（または途中まで応答して）切断する。
+
+        Args:
+            reader (asyncio.StreamReader): 受信用のストリーム。
+            writer (asyncio.StreamWriter): 送信用のストリーム。
+        """
+        try:
+            for count in range(2):
+                head = await reader.readuntil(b'\r\n\r\n')
+                length = int(head.lower().split(b'content-length:')[1].split(b'\r\n')[0])
+                await reader.readexactly(length)
+                self.requests.append(head.split(b' ', 1)[0].decode('ascii'))
+                if count == 0:
+                    writer.write(RESPONSE)
+                elif self.second_response is not None:
+                    writer.write(self.second_response)
+                await writer.drain()
+        except asyncio.IncompleteReadError:
+            pass
+        finally:
+            writer.close()
+
+    async def test_get_is_resent_when_no_response_arrived(self):
+        await self.pool.request('GET', '/status')
+        self.assertEqual(await self.pool.request('GET', '/status'), (200, {'value': 1}))
+        self.assertEqual(self.requests, ['GET', 'GET', 'GET'])
+
+    async def test_post_is_not_resent(self):
+        await self.pool.request('GET', '/status')
+        with self.assertRaises(AsyncHttpError):
+            await self.pool.request('POST', '/element/1/click', {})
+        self.assertEqual(self.requests, ['GET', 'POST'])
+
+    async def test_get_is_not_resent_after_partial_response(self):
+        self.second_response = RESPONSE[:20]
+        await self.pool.request('GET', '/status')
+        with self.assertRaises(AsyncHttpError):
+            await self.pool.request('GET', '/status')
+        self.assertEqual(self.requests, ['GET', 'GET'])
+
+if __name__ == '__main__':
+    unittest.main()
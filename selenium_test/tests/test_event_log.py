@@ -0,0 +1,62 @@
+# Python
+import base64
+import importlib.util
+import tempfile
+import unittest
+from pathlib import Path
+
+# engine
+from script.engine.event_log import EVENT_SCREENSHOT, EventLog, iter_events, record_screenshot
+from script.engine.screenshot_transcoder import ScreenshotTranscoder
+
+# 1x1 の PNG 画像
+PNG_BYTES = base64.b64decode('iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mP8z8DwHwAFBQIAX8jx0gAAAABJRU5ErkJggg==')
+
+@unittest.skipIf(importlib.util.find_spec('PIL') is None, 'Pillow が必要')
+class RecordScreenshotTest(unittest.TestCase):
+    """
+    record_screenshot の変換時の記録に関する試験。
+    """
+    def setUp(self):
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.base_dir_path = Path(self._temp_dir.name)
+        self.event_log = EventLog(self.base_dir_path / EventLog.FILE_NAME, 'tc_1')
+        self.transcoder = ScreenshotTranscoder(max_workers=1)
+
+    def tearDown(self):
+        self.transcoder.close()
+        self._temp_dir.cleanup()
+
+    def read_screenshot_events(self) -> list[dict]:
+        """
+        記録ファイルの screenshot レコードを読み出す。
+
+        Returns:
+            list[dict]: screenshot レコードの一覧。
+        """
+        return list(iter_events(self.event_log.path, [EVENT_SCREENSHOT]))
+
+    def test_transcoded_path_is_recorded(self):
+        path = self.base_dir_path / 'a.png'
+        path.write_bytes(PNG_BYTES)
+        record_screenshot(self.event_log, path, self.base_dir_path, self.transcoder, name='a')
+        self.transcoder.join()
+
+        events = self.read_screenshot_events()
+        self.assertEqual([event['path'] for event in events], ['a.webp'])
+        self.assertFalse(path.exists())
+        self.assertTrue((self.base_dir_path / events[0]['path']).is_file())
+        self.assertTrue((self.base_dir_path / events[0]['thumbnail']).is_file())
+
+    def test_source_path_is_recorded_when_transcode_fails(self):
+        path = self.base_dir_path / 'a.png'
+        path.write_bytes(b'broken')
+        record_screenshot(self.event_log, path, self.base_dir_path, self.transcoder, name='a')
+        with self.assertRaises(Exception):
+            self.transcoder.join()
+
+        self.assertEqual([event['path'] for event in self.read_screenshot_events()], ['a.png'])
+        self.assertTrue(path.exists())
+
+if __name__ == '__main__':
+    unittest.main()
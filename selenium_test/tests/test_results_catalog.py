@@ -0,0 +1,98 @@
+# Python
+import sqlite3
+import tempfile
+import unittest
+from contextlib import closing
+from pathlib import Path
+
+# engine
+from script.engine.results_catalog import ResultsCatalog
+from script.engine.results_retention import ResultsRetention
+
+class ResultsCatalogArchiveTest(unittest.TestCase):
+    """
+    ResultsCatalog の再構築・アーカイブ済みの実行の登録に関する試験。
+    """
+    def setUp(self):
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.results_dir_path = Path(self._temp_dir.name) / 'results'
+        self.catalog = ResultsCatalog.for_results_dir(self.results_dir_path)
+        self.retention = ResultsRetention(self.results_dir_path, catalog=self.catalog)
+
+    def tearDown(self):
+        self._temp_dir.cleanup()
+
+    def make_run(self, run_name: str, result: str='OK') -> Path:
+        """
+        試験用の結果ディレクトリを作成し、カタログに登録する。
+
+        Args:
+            run_name (str): 結果ディレクトリ名。
+            result (str): 試験結果。Default to 'OK'.
+
+        Returns:
+            Path: 結果ディレクトリのパス。
+        """
+        run_dir_path = self.results_dir_path / run_name
+        run_dir_path.mkdir(parents=True)
+        (run_dir_path / f'{run_name}.txt').write_text(
+            f'2026-10-01 09:00:00  手順1\n2026-10-01 09:00:05  試験結果_{result}\n', encoding='utf-8')
+        self.catalog.register_result(run_dir_path, result, ended_at='2026-10-01T09:00:05+09:00')
+        return run_dir_path
+
+    def get_rows(self) -> dict[str, sqlite3.Row]:
+        """
+        カタログの全ての行を取得する。
+
+        Returns:
+            dict[str, sqlite3.Row]: 結果ディレクトリ名ごとの行。
+        """
+        return {row['run_name']: row for row in self.catalog.query()}
+
+    def test_archive_marks_rows(self):
+        self.make_run('tc_1')
+        self.make_run('tc_2', result='NG')
+        self.retention.archive([run for run in self.retention.iter_runs() if run.num == 1])
+
+        rows = self.get_rows()
+        self.assertEqual(rows['tc_1']['archived_to'], str(self.retention.get_archive_path('tc')))
+        self.assertEqual(rows['tc_1']['result'], 'OK')
+        self.assertIsNone(rows['tc_2']['archived_to'])
+
+    def test_rebuild_keeps_archived_rows(self):
+        self.make_run('tc_1', result='NG')
+        self.make_run('tc_2')
+        self.retention.archive([run for run in self.retention.iter_runs() if run.num == 1])
+
+        self.assertEqual(self.catalog.rebuild(self.results_dir_path), 2)
+        rows = self.get_rows()
+        self.assertEqual(set(rows), {'tc_1', 'tc_2'})
+        self.assertEqual(rows['tc_1']['result'], 'NG')
+        self.assertEqual(rows['tc_1']['archived_to'], str(self.retention.get_archive_path('tc')))
+        self.assertEqual(rows['tc_2']['started_at'], '2026-10-01T09:00:00+09:00')
+
+    def test_rebuild_registers_archived_runs_missing_from_catalog(self):
+        self.make_run('tc_1')
+        ResultsRetention(self.results_dir_path).archive(list(self.retention.iter_runs()))
+        self.catalog.db_path.unlink()
+
+        self.assertEqual(ResultsCatalog(self.catalog.db_path).rebuild(self.results_dir_path), 1)
+        row = self.get_rows()['tc_1']
+        self.assertEqual((row['test_case'], row['run_num']), ('tc', 1))
+        self.assertEqual(row['archived_to'], str(self.retention.get_archive_path('tc')))
+
+    def test_existing_catalog_gets_archived_to_column(self):
+        self.catalog.db_path.parent.mkdir(parents=True)
+        with closing(sqlite3.connect(self.catalog.db_path)) as connection:
+            connection.execute('CREATE TABLE runs (run_name TEXT PRIMARY KEY, test_case TEXT NOT NULL, '
+                               'run_num INTEGER NOT NULL, started_at TEXT, ended_at TEXT, result TEXT, '
+                               "error_summary TEXT, report_dir_path TEXT NOT NULL, artifacts TEXT NOT NULL DEFAULT '[]')")
+            connection.execute("INSERT INTO runs (run_name, test_case, run_num, report_dir_path) "
+                               "VALUES ('tc_1', 'tc', 1, 'results/tc_1')")
+            connection.commit()
+
+        rows = self.get_rows()
+        self.assertIsNone(rows['tc_1']['archived_to'])
+
+if __name__ == '__main__':
+    unittest.main()
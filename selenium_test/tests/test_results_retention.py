@@ -0,0 +1,149 @@
+# Python
+import subprocess
+import sys
+import tempfile
+import textwrap
+import unittest
+import zipfile
+from unittest import mock
+from pathlib import Path
+
+# engine
+from script.engine.results_retention import ResultsRetention
+
+PROJECT_DIR_PATH = Path(__file__).resolve().parent.parent
+
+class ResultsRetentionArchiveTest(unittest.TestCase):
+    """
+    ResultsRetention.archive の中断・再実行に関する試験。
+    """
+    def setUp(self):
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.results_dir_path = Path(self._temp_dir.name) / 'results'
+        self.retention = ResultsRetention(self.results_dir_path)
+
+    def tearDown(self):
+        self._temp_dir.cleanup()
+
+    def make_run(self, run_name: str, file_count: int=3) -> Path:
+        """
+        試験用の結果ディレクトリを作成する。
+
+        Args:
+            run_name (str): 結果ディレクトリ名。
+            file_count (int): テキストレポート以外のファイル数。Default to 3.
+
+        Returns:
+            Path: 結果ディレクトリのパス。
+        """
+        run_dir_path = self.results_dir_path / run_name
+        run_dir_path.mkdir(parents=True)
+        (run_dir_path / f'{run_name}.txt').write_text('試験結果_OK\n', encoding='utf-8')
+        for i in range(file_count):
+            (run_dir_path / f'file_{i}.log').write_text(f'{run_name} {i}\n' * 100, encoding='utf-8')
+        return run_dir_path
+
+    def archive_all(self) -> list[Path]:
+        """
+        'results' ディレクトリ内の全ての結果ディレクトリをアーカイブする。
+
+        Returns:
+            list[Path]: アーカイブした結果ディレクトリのパス一覧。
+        """
+        return self.retention.archive(sorted(self.retention.iter_runs(), key=lambda run: run.num))
+
+    def test_killed_while_writing_keeps_existing_archive(self):
+        self.make_run('tc_1')
+        self.archive_all()
+        self.make_run('tc_2')
+
+        # 3つ目のファイルの書き込み中にプロセスを強制終了させる
+        script = textwrap.dedent(f'''
+            import os, zipfile
+            from pathlib import Path
+            from script.engine.results_retention import ResultsRetention
+            original_write = zipfile.ZipFile.write
+            calls = []
+            def write(self, *args, **kwargs):
+                calls.append(args)
+                if len(calls) == 3:
+                    # 書き込み済みの内容をディスクへ出力した上で終了する
+                    self.fp.flush()
+                    os._exit(1)
+                return original_write(self, *args, **kwargs)
+            zipfile.ZipFile.write = write
+            retention = ResultsRetention(Path({str(self.results_dir_path)!r}))
+            retention.archive(list(retention.iter_runs()))
+        ''')
+        process = subprocess.run([sys.executable, '-c', script], cwd=PROJECT_DIR_PATH)
+        self.assertEqual(process.returncode, 1)
+
+        with zipfile.ZipFile(self.retention.get_archive_path('tc')) as zf:
+            self.assertIsNone(zf.testzip())
+        self.assertEqual(self.retention.list_archived_runs('tc'), ['tc_1'])
+        self.assertTrue((self.results_dir_path / 'tc_2').is_dir())
+
+        # 再実行すると中断した実行もアーカイブされる
+        self.assertEqual([path.name for path in self.archive_all()], ['tc_2'])
+        self.assertEqual(self.retention.list_archived_runs('tc'), ['tc_1', 'tc_2'])
+        extracted = self.retention.extract_run('tc_2', Path(self._temp_dir.name) / 'restore')
+        self.assertEqual(len(list(extracted.iterdir())), 4)
+
+    def test_error_while_writing_keeps_sources_and_archive(self):
+        self.make_run('tc_1')
+        self.archive_all()
+        self.make_run('tc_2')
+
+        original_write = zipfile.ZipFile.write
+        calls = []
+
+        def write(zf, *args, **kwargs):
+            calls.append(args)
+            if len(calls) == 2:
+                raise OSError('disk full')
+            return original_write(zf, *args, **kwargs)
+
+        with mock.patch.object(zipfile.ZipFile, 'write', write):
+            with self.assertRaises(OSError):
+                self.archive_all()
+        self.assertEqual(self.retention.list_archived_runs('tc'), ['tc_1'])
+        self.assertTrue((self.results_dir_path / 'tc_2').is_dir())
+        self.assertEqual(list(self.retention.archive_dir_path.glob('*.tmp')), [])
+
+        self.assertEqual([path.name for path in self.archive_all()], ['tc_2'])
+        self.assertEqual(self.retention.list_archived_runs('tc'), ['tc_1', 'tc_2'])
+
+    def test_partially_archived_run_is_replaced(self):
+        run_dir_path = self.make_run('tc_1')
+        self.make_run('tc_2')
+        # 以前の書き込み方式で、途中までのファイルのみがアーカイブに残った状態を作る
+        self.retention.archive_dir_path.mkdir(parents=True)
+        with zipfile.ZipFile(self.retention.get_archive_path('tc'), mode='w') as zf:
+            zf.write(run_dir_path / 'tc_1.txt', 'tc_1/tc_1.txt')
+
+        self.assertEqual([path.name for path in self.archive_all()], ['tc_1', 'tc_2'])
+        with zipfile.ZipFile(self.retention.get_archive_path('tc')) as zf:
+            names = zf.namelist()
+        self.assertEqual(len(names), len(set(names)))
+        self.assertEqual(sum(name.startswith('tc_1/') for name in names), 4)
+
+    def test_already_archived_run_is_removed(self):
+        self.make_run('tc_1')
+        self.archive_all()
+        self.retention.extract_run('tc_1', self.results_dir_path)
+
+        self.assertEqual([path.name for path in self.archive_all()], ['tc_1'])
+        self.assertFalse((self.results_dir_path / 'tc_1').exists())
+        self.assertEqual(self.retention.list_archived_runs('tc'), ['tc_1'])
+
+    def test_different_run_with_same_name_is_kept(self):
+        self.make_run('tc_1')
+        self.archive_all()
+        self.make_run('tc_1', file_count=1)
+        (self.results_dir_path / 'tc_1' / 'file_0.log').write_text('other\n', encoding='utf-8')
+
+        self.assertEqual(self.archive_all(), [])
+        self.assertTrue((self.results_dir_path / 'tc_1').is_dir())
+
+if __name__ == '__main__':
+    unittest.main()
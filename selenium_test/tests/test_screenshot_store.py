@@ -0,0 +1,43 @@
+# Python
+import os
+import stat
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+# engine
+from script.engine.screenshot_store import BLOB_MODE, ScreenshotStore
+
+class ScreenshotStoreTest(unittest.TestCase):
+    """
+    ScreenshotStore の保存に関する試験。
+    """
+    def setUp(self):
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.base_dir_path = Path(self._temp_dir.name)
+        self.store = ScreenshotStore(self.base_dir_path / '.screenshot_store')
+
+    def tearDown(self):
+        self._temp_dir.cleanup()
+
+    @unittest.skipIf(sys.platform == 'win32', 'パーミッションは POSIX のみ')
+    def test_blob_mode_follows_umask(self):
+        umask = os.umask(0)
+        os.umask(umask)
+        path = self.base_dir_path / 'a.png'
+        blob_path = self.store.put(b'png', path)
+
+        self.assertEqual(BLOB_MODE, 0o666 & ~umask)
+        self.assertEqual(stat.S_IMODE(blob_path.stat().st_mode), BLOB_MODE)
+        self.assertEqual(stat.S_IMODE(path.stat().st_mode), BLOB_MODE)
+
+    def test_same_content_is_stored_once(self):
+        first = self.store.put(b'png', self.base_dir_path / 'a.png')
+        second = self.store.put(b'png', self.base_dir_path / 'b.png')
+
+        self.assertEqual(first, second)
+        self.assertEqual(len(list(self.store.store_dir.glob('*/*.png'))), 1)
+
+if __name__ == '__main__':
+    unittest.main()